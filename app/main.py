@@ -3,6 +3,9 @@
 Building Manager Pro - Punto de entrada principal
 """
 
+# Medir el arranque desde antes de importar el resto de la aplicación
+from manager.app import startup_timing
+
 import tkinter as tk
 
 # Importar paths_config primero para asegurar que esté disponible
@@ -11,19 +14,32 @@ from manager.app.paths_config import ensure_dirs, get_splash_path
 from manager.app.logger import logger
 from manager.app.services.user_service import user_service
 from manager.app.ui.components.theme_manager import theme_manager
-from manager.app.ui.views.main_window import MainWindow
 from manager.app.ui.views.login_view import LoginView
 from manager.app.ui.views.create_admin_view import CreateAdminView
 
+startup_timing.mark("importación")
+
 
 SPLASH_DURATION_MS = 1200  # 1.2 segundos
 
 
 def _on_gate_success(root: tk.Tk, user):
     """Tras login o creación de admin: reemplaza la pantalla por la ventana principal."""
+    # La ventana principal (y con ella las vistas) se importa al pasar el login
+    from manager.app.ui.views.main_window import MainWindow
     for w in root.winfo_children():
         w.destroy()
     MainWindow(root=root, current_user=user)
+    root.update_idletasks()
+    # Despachador de la bandeja de salida: envía los emails que quedaron pendientes
+    try:
+        from manager.app.services.email_outbox import email_outbox
+        if email_outbox.pending_count():
+            email_outbox.start()
+    except Exception as e:
+        logger.warning("No se pudo iniciar el envío de emails pendientes: %s", e)
+    startup_timing.mark("ventana principal visible")
+    startup_timing.report()
 
 
 def _show_login_or_create_admin(root: tk.Tk):
@@ -50,6 +66,7 @@ def _show_login_or_create_admin(root: tk.Tk):
     gate.pack(fill="both", expand=True)
     root.update_idletasks()
     root.deiconify()  # Mostrar ventana ya centrada
+    startup_timing.mark("login visible")
     # Foco en contraseña tras un breve retraso (Windows asigna foco al toplevel al mostrarse)
     if hasattr(gate, "focus_password_entry"):
         root.after(150, gate.focus_password_entry)
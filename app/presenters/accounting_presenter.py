@@ -5,12 +5,76 @@ calcula totales y gestiona exportaciones.
 """
 
 import csv
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 from manager.app.logger import logger
 from manager.app.paths_config import EXPORTS_DIR, ensure_dirs
+from manager.app.services.date_keys import key_to_display, record_date_key
+
+
+class MovementIndex:
+    """
+    Movimientos normalizados ordenados por fecha, con listas de posiciones por tipo e
+    inquilino. Los rangos de fechas se resuelven con bisect sobre las fechas ISO
+    (YYYY-MM-DD se ordena igual que la fecha), sin recorrer todos los movimientos.
+    Cada movimiento lleva "saldo": la suma acumulada (prefijo) de entradas menos salidas
+    del libro completo hasta ese movimiento inclusive.
+    """
+
+    def __init__(self, movements: List[Dict[str, Any]]):
+        # Orden ascendente por fecha y, a igual fecha, inverso al original: leído al revés
+        # queda fecha DESC conservando el orden original en los empates
+        order = sorted(range(len(movements)), key=lambda i: (movements[i]["fecha"], -i))
+        self._movements = [dict(movements[i]) for i in order]
+        self._dates = [m["fecha"] for m in self._movements]
+        saldo = 0.0
+        for m in self._movements:
+            if m.get("direccion") == "entrada":
+                saldo += m["monto"]
+            elif m.get("direccion") == "salida":
+                saldo -= m["monto"]
+            m["saldo"] = round(saldo, 2)
+        self._by_type: Dict[str, List[int]] = {}
+        self._by_tenant: Dict[Any, List[int]] = {}
+        for pos, m in enumerate(self._movements):
+            self._by_type.setdefault(m["tipo"], []).append(pos)
+            self._by_tenant.setdefault(m.get("id_inquilino"), []).append(pos)
+
+    def query(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        tenant_id: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Movimientos en [date_from, date_to] (inclusive) del tipo e inquilino dados, por fecha DESC."""
+        lo = bisect_left(self._dates, date_from) if date_from else 0
+        hi = bisect_right(self._dates, date_to) if date_to else len(self._dates)
+        if lo >= hi:
+            return []
+        candidates = []
+        if movement_type:
+            candidates.append(self._by_type.get(movement_type, []))
+        if tenant_id is not None:
+            candidates.append(self._by_tenant.get(tenant_id, []))
+        if not candidates:
+            return self._movements[hi - 1:lo - 1 if lo else None:-1]
+        # Posiciones de la lista más corta dentro del rango, verificando el otro filtro
+        positions = min(candidates, key=len)
+        positions = positions[bisect_left(positions, lo):bisect_left(positions, hi)]
+        result = []
+        for pos in reversed(positions):
+            m = self._movements[pos]
+            if movement_type and m["tipo"] != movement_type:
+                continue
+            if tenant_id is not None and m.get("id_inquilino") != tenant_id:
+                continue
+            result.append(m)
+        return result
 
 
 class AccountingPresenter:
@@ -32,6 +96,10 @@ class AccountingPresenter:
         self._expense_service = expense_service
         self._accounting_service = accounting_service
 
+        # fuente -> (estado del servicio, movimientos normalizados) y el índice armado con ellos
+        self._movement_sources: Dict[str, Tuple[Any, List[Dict[str, Any]]]] = {}
+        self._movement_index: Optional[MovementIndex] = None
+
     # ------------------------------------------------------------------
     # Consolidación y normalización
     # ------------------------------------------------------------------
@@ -53,54 +121,83 @@ class AccountingPresenter:
             tenant_id: Filtrar por ID de inquilino (aplica a pagos y asientos manuales).
 
         Returns:
-            Lista de movimientos normalizados ordenados por fecha DESC.
+            Lista de movimientos normalizados ordenados por fecha DESC
+            (a igual fecha: pagos, gastos y asientos, en orden de registro). Cada uno
+            incluye "saldo", el saldo acumulado del libro (sin filtros) tras el movimiento.
         """
-        movements: List[Dict[str, Any]] = []
+        index = self._get_movement_index()
+        return [dict(m) for m in index.query(date_from, date_to, movement_type, tenant_id)]
 
-        # --- Pagos ---
-        try:
-            self._payment_service._load_data()
-            for pago in self._payment_service.get_all_payments():
-                mov = self._normalize_payment(pago)
-                if mov:
-                    movements.append(mov)
-        except Exception as exc:
-            logger.warning("Error al cargar pagos para consolidación: %s", exc)
-
-        # --- Gastos ---
-        try:
-            self._expense_service._load_data()
-            for gasto in self._expense_service.get_all_expenses():
-                mov = self._normalize_expense(gasto)
-                if mov:
-                    movements.append(mov)
-        except Exception as exc:
-            logger.warning("Error al cargar gastos para consolidación: %s", exc)
-
-        # --- Asientos contables ---
-        try:
-            self._accounting_service._load_data()
-            for asiento in self._accounting_service.get_all_entries():
-                movs = self._normalize_entry(asiento)
-                movements.extend(movs)
-        except Exception as exc:
-            logger.warning("Error al cargar asientos contables para consolidación: %s", exc)
-
-        # --- Aplicar filtros en memoria ---
-        filtered = self._apply_filters(movements, date_from, date_to, movement_type, tenant_id)
-
-        # --- Ordenar por fecha DESC ---
-        filtered.sort(key=lambda m: m["fecha"], reverse=True)
-        return filtered
+    def _get_movement_index(self) -> "MovementIndex":
+        """
+        Índice de movimientos normalizados. Cada fuente se vuelve a normalizar solo si su
+        servicio cambió desde la última consulta (estado de su almacén); si ninguna cambió
+        se reutiliza el índice completo.
+        """
+        sources = (
+            ("pagos", self._payment_service, self._normalize_payments),
+            ("gastos", self._expense_service, self._normalize_expenses),
+            ("asientos contables", self._accounting_service, self._normalize_entries),
+        )
+        changed = False
+        for name, service, normalize in sources:
+            try:
+                service._load_data()
+                state = self._source_state(service)
+                cached = self._movement_sources.get(name)
+                if cached is not None and state is not None and cached[0] == state:
+                    continue
+                self._movement_sources[name] = (state, normalize())
+            except Exception as exc:
+                logger.warning("Error al cargar %s para consolidación: %s", name, exc)
+                self._movement_sources[name] = (None, [])
+            changed = True
+        if changed or self._movement_index is None:
+            movements: List[Dict[str, Any]] = []
+            for name, _, _ in sources:
+                movements.extend(self._movement_sources[name][1])
+            self._movement_index = MovementIndex(movements)
+        return self._movement_index
+
+    @staticmethod
+    def _source_state(service) -> Any:
+        """Estado de los datos cargados del servicio (None si no se conoce)."""
+        states = getattr(service, "_loaded_states", None)
+        if states is not None:
+            return tuple(sorted(states.items())) if states else None
+        return getattr(service, "_loaded_state", None)
+
+    def _normalize_payments(self) -> List[Dict[str, Any]]:
+        movements = []
+        for pago in self._payment_service.get_all_payments():
+            mov = self._normalize_payment(pago)
+            if mov:
+                movements.append(mov)
+        return movements
+
+    def _normalize_expenses(self) -> List[Dict[str, Any]]:
+        movements = []
+        for gasto in self._expense_service.get_all_expenses():
+            mov = self._normalize_expense(gasto)
+            if mov:
+                movements.append(mov)
+        return movements
+
+    def _normalize_entries(self) -> List[Dict[str, Any]]:
+        movements = []
+        for asiento in self._accounting_service.get_all_entries():
+            movements.extend(self._normalize_entry(asiento))
+        return movements
 
     def _normalize_payment(self, pago: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Normaliza un pago al formato unificado de movimiento."""
         try:
             fecha_raw = pago.get("fecha_pago", "")
-            # fecha_pago viene en DD/MM/YYYY
-            dt = datetime.strptime(fecha_raw, "%d/%m/%Y")
-            fecha = dt.strftime("%Y-%m-%d")
-            fecha_display = fecha_raw  # ya está en DD/MM/YYYY
+            # Clave canónica YYYY-MM-DD; fecha_pago ya viene en DD/MM/YYYY para mostrar
+            fecha = record_date_key(pago, "fecha_pago")
+            if fecha is None:
+                raise ValueError(f"fecha_pago inválida: {fecha_raw!r}")
+            fecha_display = fecha_raw
             nombre = pago.get("nombre_inquilino", "")
             return {
                 "fecha": fecha,
@@ -121,9 +218,10 @@ class AccountingPresenter:
     def _normalize_expense(self, gasto: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Normaliza un gasto al formato unificado de movimiento."""
         try:
-            fecha = gasto.get("fecha", "")  # ya en YYYY-MM-DD
-            dt = datetime.strptime(fecha, "%Y-%m-%d")
-            fecha_display = dt.strftime("%d/%m/%Y")
+            fecha = record_date_key(gasto, "fecha")
+            if fecha is None:
+                raise ValueError(f"fecha inválida: {gasto.get('fecha')!r}")
+            fecha_display = key_to_display(fecha)
             categoria = gasto.get("categoria", "")
             subtipo = gasto.get("subtipo", "")
             descripcion = f"{categoria} - {subtipo}" if subtipo else categoria
@@ -149,12 +247,9 @@ class AccountingPresenter:
         Un asiento de apertura puede generar uno o dos movimientos.
         """
         tipo = asiento.get("tipo", "manual")
-        fecha = asiento.get("fecha", "")
-        try:
-            dt = datetime.strptime(fecha, "%Y-%m-%d")
-            fecha_display = dt.strftime("%d/%m/%Y")
-        except Exception:
-            fecha_display = fecha
+        key = record_date_key(asiento, "fecha")
+        fecha = key or asiento.get("fecha", "")
+        fecha_display = key_to_display(key) if key else fecha
 
         if tipo == "apertura":
             return self._normalize_opening_entry(asiento, fecha, fecha_display)
@@ -221,34 +316,6 @@ class AccountingPresenter:
             "id_inquilino": asiento.get("id_inquilino"),
         }]
 
-    def _apply_filters(
-        self,
-        movements: List[Dict[str, Any]],
-        date_from: Optional[str],
-        date_to: Optional[str],
-        movement_type: Optional[str],
-        tenant_id: Optional[int],
-    ) -> List[Dict[str, Any]]:
-        """Aplica filtros en memoria sin modificar la lista original."""
-        result = movements
-
-        if date_from:
-            result = [m for m in result if m["fecha"] >= date_from]
-
-        if date_to:
-            result = [m for m in result if m["fecha"] <= date_to]
-
-        if movement_type:
-            result = [m for m in result if m["tipo"] == movement_type]
-
-        if tenant_id is not None:
-            result = [
-                m for m in result
-                if m.get("id_inquilino") == tenant_id
-            ]
-
-        return result
-
     # ------------------------------------------------------------------
     # Cálculo de totales
     # ------------------------------------------------------------------
@@ -282,7 +349,9 @@ class AccountingPresenter:
 
     def get_income_statement(self, date_from: str, date_to: str) -> Dict[str, Any]:
         """
-        Genera el estado de resultados para un período dado.
+        Genera el estado de resultados para un período dado. Los meses cerrados que caen
+        completos en el período salen de su instantánea de cierre; el resto se calcula con
+        los acumulados mensuales (meses completos) o recorriendo los movimientos.
 
         Args:
             date_from: Fecha inicio en formato YYYY-MM-DD.
@@ -290,8 +359,102 @@ class AccountingPresenter:
 
         Returns:
             Dict con ingresos_arriendo, egresos_por_categoria, ajustes_netos,
-            balance_neto, date_from y date_to.
+            balance_neto, periodos_cerrados (meses tomados de cierres), date_from y date_to.
+        """
+        ingresos_arriendo = 0.0
+        egresos_por_categoria: Dict[str, float] = {}
+        ajustes_netos = 0.0
+
+        def accumulate(ingresos: float, egresos: Dict[str, float], ajustes: float) -> None:
+            nonlocal ingresos_arriendo, ajustes_netos
+            ingresos_arriendo += ingresos
+            ajustes_netos += ajustes
+            for cat, monto in egresos.items():
+                egresos_por_categoria[cat] = egresos_por_categoria.get(cat, 0.0) + monto
+
+        closures, open_ranges = self._split_closed_months(date_from, date_to)
+        for closure in closures:
+            accumulate(
+                float(closure.get("ingresos_arriendo", 0.0)),
+                closure.get("egresos_por_categoria", {}),
+                float(closure.get("ajustes_netos", 0.0)),
+            )
+        for range_from, range_to in open_ranges:
+            months = self._full_month_range(range_from, range_to)
+            if months is not None:
+                accumulate(*self._income_statement_from_rollups(*months))
+            else:
+                accumulate(*self._income_statement_from_movements(range_from, range_to))
+
+        # Categorías de mayor a menor egreso
+        egresos_por_categoria = dict(
+            sorted(egresos_por_categoria.items(), key=lambda item: item[1], reverse=True)
+        )
+
+        balance_neto = ingresos_arriendo - sum(egresos_por_categoria.values()) + ajustes_netos
+
+        return {
+            "date_from": date_from,
+            "date_to": date_to,
+            "ingresos_arriendo": ingresos_arriendo,
+            "egresos_por_categoria": egresos_por_categoria,
+            "ajustes_netos": ajustes_netos,
+            "balance_neto": balance_neto,
+            "periodos_cerrados": [c["periodo"] for c in closures],
+        }
+
+    @staticmethod
+    def _month_bounds(period: str) -> Tuple[str, str]:
+        """Primer y último día ("YYYY-MM-DD") del mes "YYYY-MM"."""
+        year, month = int(period[:4]), int(period[5:7])
+        return f"{period}-01", f"{period}-{monthrange(year, month)[1]:02d}"
+
+    def _split_closed_months(
+        self, date_from: str, date_to: str
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
         """
+        Separa el período en los cierres de los meses que contiene completos y los tramos
+        abiertos que quedan antes y después (los cierres son meses consecutivos).
+        """
+        closures = [
+            c for c in self._accounting_service.get_closed_periods()
+            if date_from <= self._month_bounds(c["periodo"])[0]
+            and self._month_bounds(c["periodo"])[1] <= date_to
+        ]
+        if not closures:
+            return [], [(date_from, date_to)]
+        first_day = datetime.strptime(self._month_bounds(closures[0]["periodo"])[0], "%Y-%m-%d")
+        last_day = datetime.strptime(self._month_bounds(closures[-1]["periodo"])[1], "%Y-%m-%d")
+        open_ranges = []
+        if date_from < first_day.strftime("%Y-%m-%d"):
+            open_ranges.append((date_from, (first_day - timedelta(days=1)).strftime("%Y-%m-%d")))
+        if last_day.strftime("%Y-%m-%d") < date_to:
+            open_ranges.append(((last_day + timedelta(days=1)).strftime("%Y-%m-%d"), date_to))
+        return closures, open_ranges
+
+    @staticmethod
+    def _full_month_range(date_from: str, date_to: str) -> Optional[Tuple[str, str]]:
+        """("YYYY-MM", "YYYY-MM") si el rango abarca meses completos; None en otro caso."""
+        try:
+            start = datetime.strptime(date_from, "%Y-%m-%d")
+            end = datetime.strptime(date_to, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            return None
+        if start.day != 1 or (end + timedelta(days=1)).day != 1 or start > end:
+            return None
+        return start.strftime("%Y-%m"), end.strftime("%Y-%m")
+
+    def _income_statement_from_rollups(
+        self, month_from: str, month_to: str
+    ) -> Tuple[float, Dict[str, float], float]:
+        """Totales del estado de resultados a partir de los acumulados mensuales (O(meses))."""
+        balances = self._accounting_service.get_period_balances(month_from, month_to)
+        return balances["ingresos_arriendo"], balances["egresos_por_categoria"], balances["ajustes_netos"]
+
+    def _income_statement_from_movements(
+        self, date_from: str, date_to: str
+    ) -> Tuple[float, Dict[str, float], float]:
+        """Totales del estado de resultados recorriendo los movimientos (rangos con meses parciales)."""
         movements = self.consolidate_movements(date_from=date_from, date_to=date_to)
 
         ingresos_arriendo = sum(
@@ -314,17 +477,23 @@ class AccountingPresenter:
             if m["fuente"] in ("manual", "apertura") and m["direccion"] == "salida"
         )
         ajustes_netos = ajustes_entradas - ajustes_salidas
+        return ingresos_arriendo, egresos_por_categoria, ajustes_netos
 
-        balance_neto = ingresos_arriendo - sum(egresos_por_categoria.values()) + ajustes_netos
+    # ------------------------------------------------------------------
+    # Cierre de períodos
+    # ------------------------------------------------------------------
 
-        return {
-            "date_from": date_from,
-            "date_to": date_to,
-            "ingresos_arriendo": ingresos_arriendo,
-            "egresos_por_categoria": egresos_por_categoria,
-            "ajustes_netos": ajustes_netos,
-            "balance_neto": balance_neto,
-        }
+    def is_period_closed(self, period: str) -> bool:
+        """True si el mes "YYYY-MM" está cerrado."""
+        return self._accounting_service.is_period_closed(period)
+
+    def close_period(self, period: str) -> Dict[str, Any]:
+        """Cierra el mes "YYYY-MM" (ver AccountingService.close_period)."""
+        return self._accounting_service.close_period(period)
+
+    def reopen_period(self, period: str) -> List[str]:
+        """Reabre el mes y los posteriores; retorna los períodos reabiertos."""
+        return self._accounting_service.reopen_period(period)
 
     # ------------------------------------------------------------------
     # Exportación
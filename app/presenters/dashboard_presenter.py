@@ -40,12 +40,11 @@ class DashboardPresenter:
                 if t.get("estado_pago") != "inactivo"
                 and t.get("estado_pago") in ("moroso", "pendiente_registro", "pendiente_pago")
             ]
+            arrears_by_tenant = tenant_service.get_arrears_info_bulk(
+                [t.get("id") for t in pending if t.get("id")]
+            )
             total = 0.0
-            for t in pending:
-                tenant_id = t.get("id")
-                if not tenant_id:
-                    continue
-                info = tenant_service.get_arrears_info(tenant_id)
+            for info in arrears_by_tenant.values():
                 if info is not None:
                     # amount_pending incluye el período actual si ya estamos en él (pago por mes completo)
                     pending = float(info.get("amount_pending", info.get("total_expected", 0)) or 0)
@@ -57,41 +56,19 @@ class DashboardPresenter:
             return 0.0
 
     def get_payments_of_current_month(self) -> float:
-        """Total de ingresos del mes actual (pagos registrados)."""
+        """Total de ingresos del mes actual (pagos registrados, desde los acumulados mensuales)."""
         try:
-            payment_service._load_data()
-            now = datetime.datetime.now()
-            pagos = payment_service.get_all_payments()
-            pagos_mes = [p for p in pagos if self._is_payment_in_current_month(p, now)]
-            return sum(float(p.get("monto", 0)) for p in pagos_mes)
+            month = datetime.datetime.now().strftime("%Y-%m")
+            return payment_service.monthly_rollup().totals(month, month)[0]
         except Exception as e:
             logger.warning("Error al calcular ingresos del mes: %s", e)
             return 0.0
 
-    def _is_payment_in_current_month(self, pago: Dict[str, Any], now: datetime.datetime) -> bool:
-        """True si el pago pertenece al mes actual (fecha_pago DD/MM/YYYY o fecha ISO)."""
-        try:
-            fecha = pago.get("fecha_pago", "") or pago.get("fecha", "")
-            if not fecha:
-                return False
-            if "/" in str(fecha):
-                parts = str(fecha).strip().split("/")
-                if len(parts) == 3:
-                    dia, mes, anio = int(parts[0]), int(parts[1]), int(parts[2])
-                    return mes == now.month and anio == now.year
-            else:
-                fecha_dt = datetime.datetime.strptime(str(fecha)[:10], "%Y-%m-%d")
-                return fecha_dt.month == now.month and fecha_dt.year == now.year
-        except Exception:
-            return False
-
     def get_expenses_of_current_month(self) -> float:
         """Total de gastos del mes actual."""
         try:
-            expense_service._load_data()
-            now = datetime.datetime.now()
-            expenses = expense_service.filter_expenses(year=now.year, month=now.month)
-            return sum(float(e.get("monto", 0)) for e in expenses)
+            month = datetime.datetime.now().strftime("%Y-%m")
+            return expense_service.monthly_rollup().totals(month, month)[0]
         except Exception as e:
             logger.warning("Error al calcular gastos del mes: %s", e)
             return 0.0
@@ -101,14 +78,8 @@ class DashboardPresenter:
     def get_payments_of_current_year(self) -> float:
         """Total de ingresos del año actual."""
         try:
-            payment_service._load_data()
-            now = datetime.datetime.now()
-            pagos = payment_service.get_all_payments()
-            return sum(
-                float(p.get("monto", 0))
-                for p in pagos
-                if self._is_payment_in_year(p, now.year)
-            )
+            year = datetime.datetime.now().year
+            return payment_service.monthly_rollup().totals(f"{year:04d}-01", f"{year:04d}-12")[0]
         except Exception as e:
             logger.warning("Error al calcular ingresos del año: %s", e)
             return 0.0
@@ -116,10 +87,8 @@ class DashboardPresenter:
     def get_expenses_of_current_year(self) -> float:
         """Total de gastos del año actual."""
         try:
-            expense_service._load_data()
-            now = datetime.datetime.now()
-            expenses = expense_service.filter_expenses(year=now.year)
-            return sum(float(e.get("monto", 0)) for e in expenses)
+            year = datetime.datetime.now().year
+            return expense_service.monthly_rollup().totals(f"{year:04d}-01", f"{year:04d}-12")[0]
         except Exception as e:
             logger.warning("Error al calcular gastos del año: %s", e)
             return 0.0
@@ -155,19 +124,3 @@ class DashboardPresenter:
         except Exception as e:
             logger.warning("Error al calcular tasa de ocupación: %s", e)
             return {"total": 0, "occupied": 0, "rate": 0.0}
-
-    def _is_payment_in_year(self, pago: Dict[str, Any], year: int) -> bool:
-        """True si el pago pertenece al año indicado."""
-        try:
-            fecha = pago.get("fecha_pago", "") or pago.get("fecha", "")
-            if not fecha:
-                return False
-            if "/" in str(fecha):
-                parts = str(fecha).strip().split("/")
-                if len(parts) == 3:
-                    return int(parts[2]) == year
-            else:
-                return datetime.datetime.strptime(str(fecha)[:10], "%Y-%m-%d").year == year
-        except Exception:
-            return False
-        return False
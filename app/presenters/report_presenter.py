@@ -34,8 +34,8 @@ class ReportPresenter:
         try:
             tenant_service._load_data()
             payment_service._load_data()
-            apartment_service._load_data()
-            building_service._load_buildings()
+            apartment_service.reload_data()
+            building_service.reload_data()
             expense_service._load_data()
         except Exception as e:
             logger.warning("Error al recargar datos para reportes: %s", e)
@@ -48,7 +48,7 @@ class ReportPresenter:
         """
         tenant_service._load_data()
         payment_service._load_data()
-        apartment_service._load_data()
+        apartment_service.reload_data()
         tenant_service.recalculate_all_payment_statuses()
         tenant_service._load_data()
 
@@ -60,6 +60,10 @@ class ReportPresenter:
         if not pending_tenants:
             return ""
 
+        arrears_by_tenant = tenant_service.get_arrears_info_bulk(
+            [t.get("id") for t in pending_tenants if t.get("id") is not None]
+        )
+
         report = []
         report.append("=" * 60)
         report.append("REPORTE DE PAGOS PENDIENTES")
@@ -101,7 +105,7 @@ class ReportPresenter:
             raw_id = tenant.get("id")
             tenant_id = int(raw_id) if raw_id is not None else None
             if tenant_id is not None:
-                arrears = tenant_service.get_arrears_info(tenant_id)
+                arrears = arrears_by_tenant.get(tenant_id)
                 if arrears and arrears.get("estado_pago") in ("moroso", "pendiente_pago", "pendiente_registro"):
                     meses_mora = int(arrears.get("meses_mora", 0) or 0)
                     dias_del_periodo = int(arrears.get("dias_del_periodo_actual", 0) or 0)
@@ -4,11 +4,12 @@ Responsable de: carga de datos, filtrado y coordinación con el servicio.
 La vista solo muestra datos y delega acciones aquí.
 """
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Callable, Dict, Any, List, Optional
 
 from manager.app.services.tenant_service import tenant_service
 from manager.app.services.apartment_service import apartment_service
+from manager.app.services.date_keys import date_key, record_date_key
 from manager.app.logger import logger
 
 
@@ -24,6 +25,7 @@ class TenantPresenter:
         self._on_navigate = on_navigate
         self._on_data_change = on_data_change
         self._on_register_payment = on_register_payment
+        self._search = tenant_service.search_session()
 
     def load_tenants(self) -> List[Dict[str, Any]]:
         """Carga inquilinos desde el servicio (recarga, recalcula estados y devuelve lista)."""
@@ -44,28 +46,11 @@ class TenantPresenter:
         """Aplica filtros a la lista de inquilinos. filter_state: search_text, apartment, status, date_from, date_to, rent_min, rent_max."""
         filtered = list(all_tenants)
 
-        search_text = (filter_state.get("search_text") or "").strip().lower()
+        search_text = (filter_state.get("search_text") or "").strip()
         if search_text:
-            def matches_apartment_number(tenant: Dict[str, Any]) -> bool:
-                apt_id = tenant.get("apartamento")
-                if apt_id is None:
-                    return False
-                apt = apartment_service.get_apartment_by_id(apt_id) if hasattr(apartment_service, "get_apartment_by_id") else None
-                if not apt:
-                    all_apts = apartment_service.get_all_apartments()
-                    apt = next((a for a in all_apts if a.get("id") == apt_id), None)
-                if apt:
-                    return search_text in str(apt.get("number", "")).lower()
-                return False
-
-            filtered = [
-                t for t in filtered
-                if search_text in str(t.get("nombre", "")).lower()
-                or search_text in str(t.get("numero_documento", "")).lower()
-                or matches_apartment_number(t)
-                or search_text in str(t.get("email", "")).lower()
-                or search_text in str(t.get("telefono", "")).lower()
-            ]
+            # Índice del servicio: sin distinguir mayúsculas ni tildes, refinando la búsqueda anterior
+            matching_ids = self._search.search(search_text)
+            filtered = [t for t in filtered if t.get("id") in matching_ids]
 
         apartment = filter_state.get("apartment", "Todos")
         if apartment and apartment != "Todos":
@@ -73,10 +58,7 @@ class TenantPresenter:
                 apt_id = tenant.get("apartamento")
                 if apt_id is None:
                     return False
-                apt = apartment_service.get_apartment_by_id(apt_id) if hasattr(apartment_service, "get_apartment_by_id") else None
-                if not apt:
-                    all_apts = apartment_service.get_all_apartments()
-                    apt = next((a for a in all_apts if a.get("id") == apt_id), None)
+                apt = apartment_service.get_apartment_by_id(apt_id)
                 if not apt:
                     return False
                 apt_number = apt.get("number", "")
@@ -101,24 +83,17 @@ class TenantPresenter:
         date_from_str = filter_state.get("date_from") or ""
         date_to_str = filter_state.get("date_to") or ""
         if date_from_str or date_to_str:
-            def parse_date(s: str):
-                try:
-                    return datetime.strptime(s.strip(), "%d/%m/%Y").date()
-                except (ValueError, AttributeError):
-                    return None
-            d_from = parse_date(date_from_str) if date_from_str else None
-            d_to = parse_date(date_to_str) if date_to_str else None
+            # Los límites se comparan con la clave canónica de fecha_ingreso (YYYY-MM-DD)
+            key_from = date_key(date_from_str) if date_from_str else None
+            key_to = date_key(date_to_str) if date_to_str else None
 
             def in_range(tenant: Dict[str, Any]) -> bool:
-                fi = tenant.get("fecha_ingreso") or ""
-                if not fi:
-                    return False
-                d = parse_date(fi)
-                if d is None:
+                key = record_date_key(tenant, "fecha_ingreso")
+                if key is None:
                     return False
-                if d_from is not None and d < d_from:
+                if key_from is not None and key < key_from:
                     return False
-                if d_to is not None and d > d_to:
+                if key_to is not None and key > key_to:
                     return False
                 return True
             filtered = [t for t in filtered if in_range(t)]
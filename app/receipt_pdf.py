@@ -1,10 +1,24 @@
 """
 Generación de recibo de pago en PDF con diseño profesional.
 Unificado para uso en PaymentsView, TenantDetailsView y NotificationService.
+
+También genera el estado de cuenta de un inquilino (historial de pagos). Para generar
+muchos documentos (ver reporting.receipt_batch) el número de apartamento se puede pasar
+ya resuelto: apartment evita consultar apartment_service.
+
+Las partes fijas se preparan una sola vez por proceso (ReceiptTemplate): el logo ya
+codificado como imagen PDF y el marco del recibo (barra, títulos, líneas, caja de
+certificación y firmas) como un form XObject ya comprimido. Cada recibo solo dibuja el
+texto variable. La plantilla se vuelve a preparar si cambia el archivo del logo o los
+colores del diseño.
 """
+import copy
+import os
+import threading
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Colores del recibo (diseño profesional)
 HEADER_BG = (0.12, 0.32, 0.55)       # Azul corporativo #1e5290
@@ -16,15 +30,26 @@ LINE_COLOR = (0.88, 0.88, 0.88)
 CERT_BG = (0.97, 0.97, 0.97)
 SIGN_LABEL = (0.4, 0.4, 0.4)
 
+# Alto de la barra superior (encabezado)
+HEADER_H = 72
 
-def _get_apartment_display(tenant: Dict[str, Any]) -> str:
-    """Obtiene el número de apartamento para mostrar (no el ID)."""
-    from manager.app.services.apartment_service import apartment_service
+MARGIN = 50
+# Caja del logo en el encabezado
+LOGO_W, LOGO_H = 52, 44
+
+RECEIPT_TITLE = "RECIBO DE PAGO DE ARRENDAMIENTO"
+# Versión del diseño del recibo: al cambiarlo, subirla para que receipt_store regenere los PDF
+RECEIPT_LAYOUT_VERSION = 1
+
+
+def apartment_display(tenant: Dict[str, Any],
+                      get_apartment: Callable[[int], Optional[Dict[str, Any]]]) -> str:
+    """Número de apartamento para mostrar (no el ID); get_apartment busca el apartamento por id."""
     apt_id = tenant.get("apartamento", "")
     if not apt_id:
         return "N/A"
     try:
-        apt = apartment_service.get_apartment_by_id(int(apt_id))
+        apt = get_apartment(int(apt_id))
         if apt and apt.get("number"):
             return str(apt["number"])
         return str(apt_id)
@@ -32,11 +57,231 @@ def _get_apartment_display(tenant: Dict[str, Any]) -> str:
         return str(apt_id)
 
 
+def _get_apartment_display(tenant: Dict[str, Any]) -> str:
+    """Obtiene el número de apartamento para mostrar (no el ID)."""
+    from manager.app.services.apartment_service import apartment_service
+    return apartment_display(tenant, apartment_service.get_apartment_by_id)
+
+
+def resolve_logo_path(logo_path: Optional[str] = None) -> Optional[str]:
+    """logo_path si se indica; si no, el logo de la aplicación (None si no hay)."""
+    if logo_path is not None:
+        return logo_path
+    try:
+        from manager.app.paths_config import get_logo_path
+        lp = get_logo_path()
+        return str(lp) if lp else None
+    except Exception:
+        return None
+
+
+def _theme() -> Tuple[Any, ...]:
+    """Colores del diseño (parte de la clave de la plantilla)."""
+    return (HEADER_BG, HEADER_TEXT, SUBTITLE_GRAY, SECTION_HEADER, BODY_TEXT, LINE_COLOR,
+            CERT_BG, SIGN_LABEL)
+
+
+class ReceiptTemplate:
+    """
+    Partes fijas de los documentos con un logo dado. Los objetos PDF no se pueden
+    compartir entre documentos: cada PDF registra copias de la imagen del logo y del
+    form del marco, que comparten los bytes ya codificados.
+    """
+
+    FRAME_FORM = "ReciboMarco"
+
+    def __init__(self, logo_path: Optional[str] = None):
+        from reportlab.lib.pagesizes import letter
+        self.pagesize = letter
+        self._image = None
+        self._image_name = None
+        self._smask = None
+        logo = load_logo(logo_path)
+        if logo is not None:
+            try:
+                self._prepare_logo(logo)
+            except Exception:
+                self._image = None
+        self._prepare_frame()
+
+    @property
+    def has_logo(self) -> bool:
+        return self._image is not None
+
+    def _prepare_logo(self, logo: Any) -> None:
+        """Codifica el logo como lo hace canvas.drawImage(logo, mask="auto")."""
+        from reportlab.lib.utils import _digester
+        from reportlab.pdfbase import pdfdoc
+        rawdata = logo.getRGBData()
+        mdata = logo._dataA.getRGBData() if logo._dataA else b"auto"
+        name = _digester(rawdata + mdata)
+        image = pdfdoc.PDFImageXObject(name, logo, mask="auto")
+        image.name = name
+        self._smask = getattr(image, "_smask", None)
+        if self._smask is not None:
+            del image._smask
+        self._image_name = name
+        self._image = image
+
+    def _prepare_frame(self) -> None:
+        """Dibuja el marco en un lienzo auxiliar y guarda su contenido comprimido."""
+        from reportlab.pdfbase import pdfdoc
+        from reportlab.pdfgen import canvas
+        scratch = canvas.Canvas(BytesIO(), pagesize=self.pagesize)
+        _draw_receipt_frame(scratch, *self.pagesize, self.has_logo)
+        # Los nombres internos de las fuentes (/F1, /F2...) dependen del orden de registro
+        self._fonts = list(scratch._doc.fontMapping.items())
+        # Solo Flate: se comprime una vez y ASCII85 agregaría un 25 % al tamaño de cada PDF
+        self._frame_stream = pdfdoc.PDFZCompress.encode(
+            pdfdoc.pdfdocEnc("\n".join([scratch._preamble] + scratch._code)))
+
+    def draw_frame(self, c) -> None:
+        """Marco del recibo; si las fuentes del documento no coinciden, se dibuja sin el form."""
+        from reportlab.pdfbase import pdfdoc
+        doc = c._doc
+        if c._pagesize != self.pagesize or any(doc.getInternalFontName(font) != internal
+                                               for font, internal in self._fonts):
+            _draw_receipt_frame(c, *c._pagesize, self.has_logo)
+            return
+        if not doc.hasForm(self.FRAME_FORM):
+            form = pdfdoc.PDFFormXObject(0, 0, *self.pagesize)
+            form.hasImages = 0
+            form.Contents = pdfdoc.PDFStream(
+                pdfdoc.PDFDictionary({"Filter": pdfdoc.PDFArray([pdfdoc.PDFName(pdfdoc.PDFZCompress.pdfname)])}),
+                self._frame_stream)
+            doc.addForm(self.FRAME_FORM, form)
+        c.doForm(self.FRAME_FORM)
+
+    def draw_logo(self, c, x: float, y: float, w: float, h: float) -> bool:
+        """Dibuja el logo (como canvas.drawImage); False si no hay logo."""
+        if self._image is None:
+            return False
+        doc = c._doc
+        reg_name = doc.getXObjectName(self._image_name)
+        if reg_name not in doc.idToObject:
+            image = copy.copy(self._image)
+            c._setXObjects(image)
+            doc.Reference(image, reg_name)
+            doc.addForm(self._image_name, image)
+            if self._smask is not None:
+                smask = copy.copy(self._smask)
+                c._setXObjects(smask)
+                image.smask = doc.Reference(smask, doc.getXObjectName(smask.name))
+        c._currentPageHasImages = 1
+        c.saveState()
+        c.translate(x, y)
+        c.scale(w, h)
+        c._code.append("/%s Do" % reg_name)
+        c.restoreState()
+        c._formsinuse.append(self._image_name)
+        return True
+
+
+# Plantilla por ruta de logo: ruta -> ((mtime, tamaño, colores), plantilla)
+_templates: Dict[str, Tuple[Any, ReceiptTemplate]] = {}
+_templates_lock = threading.Lock()
+
+
+def receipt_template(logo_path: Optional[str] = None) -> ReceiptTemplate:
+    """Plantilla del proceso para logo_path (como en resolve_logo_path; "" = sin logo)."""
+    path = resolve_logo_path(logo_path) or ""
+    try:
+        st = os.stat(path) if path else None
+        stamp = (st.st_mtime_ns, st.st_size) if st else None
+    except OSError:
+        stamp = None
+    version = (stamp, _theme())
+    with _templates_lock:
+        cached = _templates.get(path)
+        if cached is None or cached[0] != version:
+            cached = (version, ReceiptTemplate(path if stamp else None))
+            _templates[path] = cached
+        return cached[1]
+
+
+def _receipt_rows(height: float) -> Tuple[float, ...]:
+    """Posiciones verticales del cuerpo del recibo (el diseño es fijo)."""
+    first_line = height - HEADER_H - 32
+    tenant_title = first_line - 24
+    second_line = tenant_title - 84
+    payment_title = second_line - 24
+    cert_y = payment_title - 134
+    third_line = cert_y - 44
+    signatures = third_line - 28
+    return first_line, tenant_title, second_line, payment_title, cert_y, third_line, signatures
+
+
+def _draw_receipt_frame(c, width, height, has_logo: bool) -> None:
+    """Partes fijas del recibo: encabezado (sin logo ni fecha), secciones, certificación y firmas."""
+    margin = MARGIN
+    content_width = width - 2 * margin
+    first_line, tenant_title, second_line, payment_title, cert_y, third_line, y = _receipt_rows(height)
+
+    c.setFillColorRGB(*HEADER_BG)
+    c.rect(0, height - HEADER_H, width, HEADER_H, fill=1, stroke=0)
+    if not has_logo:
+        _draw_logo_placeholder(c, *_logo_box(height))
+    c.setFillColorRGB(*HEADER_TEXT)
+    c.setFont("Helvetica-Bold", 20)
+    c.drawString(margin + LOGO_W + 20, height - 38, RECEIPT_TITLE)
+
+    # Líneas separadoras y títulos de sección
+    c.setStrokeColorRGB(*LINE_COLOR)
+    c.setLineWidth(0.5)
+    c.line(margin, first_line, width - margin, first_line)
+    c.line(margin, second_line, width - margin, second_line)
+    c.line(margin, third_line, width - margin, third_line)
+    c.setFillColorRGB(*SECTION_HEADER)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(margin, tenant_title, "DATOS DEL INQUILINO")
+    c.drawString(margin, payment_title, "DETALLES DEL PAGO")
+
+    # Caja de certificación
+    c.setFillColorRGB(*CERT_BG)
+    c.roundRect(margin, cert_y, content_width, 36, 4, fill=1, stroke=1)
+    c.setFillColorRGB(*BODY_TEXT)
+    c.setFont("Helvetica-Oblique", 9)
+    c.drawString(margin + 12, cert_y + 14, "Este recibo certifica que el inquilino ha realizado el pago")
+    c.drawString(margin + 12, cert_y + 2, "correspondiente al arriendo en la fecha indicada.")
+
+    # Firmas
+    c.setFillColorRGB(*SIGN_LABEL)
+    c.setFont("Helvetica", 10)
+    sig_line_w = 140
+    # Administrador (izquierda)
+    c.drawString(margin, y, "Firma administrador:")
+    c.setStrokeColorRGB(0.3, 0.3, 0.3)
+    c.setLineWidth(0.3)
+    c.line(margin, y - 18, margin + sig_line_w, y - 18)
+    # Inquilino (derecha)
+    right_x = width - margin - sig_line_w - 20
+    c.drawString(right_x, y, "Firma inquilino:")
+    c.line(right_x, y - 18, right_x + sig_line_w, y - 18)
+
+
+def receipt_fields(payment: Dict[str, Any], tenant: Dict[str, Any],
+                   apartment: Optional[str] = None) -> Dict[str, str]:
+    """
+    Textos variables del recibo, tal como se dibujan (la fecha de emisión aparte).
+    apartment: número de apartamento ya resuelto (si no, se consulta apartment_service).
+    """
+    return {
+        "nombre": str(payment.get("nombre_inquilino") or tenant.get("nombre", "")),
+        "apartamento": apartment if apartment is not None else _get_apartment_display(tenant),
+        "documento": str(tenant.get("numero_documento", "N/A")),
+        "fecha": str(payment.get("fecha_pago", "")),
+        "monto": f"${float(payment.get('monto', 0)):,.2f}",
+        "metodo": str(payment.get("metodo", "")),
+        "observaciones": (payment.get("observaciones") or "").strip() or "—",
+    }
+
+
 def generate_payment_receipt_pdf(
     payment: Dict[str, Any],
     tenant: Dict[str, Any],
     filepath: str,
     logo_path: Optional[str] = None,
+    apartment: Optional[str] = None,
 ) -> str:
     """
     Genera un PDF de recibo de pago con diseño profesional.
@@ -44,67 +289,86 @@ def generate_payment_receipt_pdf(
     :param payment: dict con nombre_inquilino, fecha_pago, monto, metodo, observaciones
     :param tenant: dict con apartamento, numero_documento, nombre
     :param filepath: ruta donde guardar el PDF
-    :param logo_path: ruta opcional a imagen PNG/JPG para el logo (ej. assets/logo.png)
+    :param logo_path: ruta opcional a imagen PNG/JPG para el logo (ej. assets/logo.png); "" sin logo
+    :param apartment: número de apartamento ya resuelto (si no, se consulta apartment_service)
     :return: filepath
     """
-    from reportlab.lib.pagesizes import letter
     from reportlab.pdfgen import canvas
 
-    c = canvas.Canvas(filepath, pagesize=letter)
-    width, height = letter
-    margin = 50
-    content_width = width - 2 * margin
+    template = receipt_template(logo_path)
+    c = canvas.Canvas(filepath, pagesize=template.pagesize)
+    width, height = template.pagesize
+    margin = MARGIN
 
-    # --- Encabezado: barra superior ---
-    header_h = 72
-    c.setFillColorRGB(*HEADER_BG)
-    c.rect(0, height - header_h, width, header_h, fill=1, stroke=0)
+    template.draw_frame(c)
+    template.draw_logo(c, *_logo_box(height))
+    _draw_issued_date(c, height)
 
-    # Logo: imagen o placeholder
-    logo_left = margin
-    logo_w, logo_h = 52, 44
-    logo_y = height - header_h + (header_h - logo_h) / 2
-    if logo_path is None:
-        try:
-            from manager.app.paths_config import get_logo_path
-            lp = get_logo_path()
-            logo_path = str(lp) if lp else None
-        except Exception:
-            logo_path = None
-    if logo_path and Path(logo_path).exists():
-        try:
-            from reportlab.lib.utils import ImageReader
-            img = ImageReader(logo_path)
-            c.drawImage(img, logo_left, logo_y, width=logo_w, height=logo_h, mask="auto")
-        except Exception:
-            _draw_logo_placeholder(c, logo_left, logo_y, logo_w, logo_h)
-    else:
-        _draw_logo_placeholder(c, logo_left, logo_y, logo_w, logo_h)
+    fields = receipt_fields(payment, tenant, apartment)
 
-    # Título y fecha en el encabezado
-    c.setFillColorRGB(*HEADER_TEXT)
-    c.setFont("Helvetica-Bold", 20)
-    c.drawString(margin + logo_w + 20, height - 38, "RECIBO DE PAGO DE ARRENDAMIENTO")
-    c.setFont("Helvetica", 10)
-    c.setFillColorRGB(0.9, 0.9, 0.9)
-    c.drawString(margin + logo_w + 20, height - 58, f"Emitido: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+    _, tenant_title, _, payment_title, _, _, _ = _receipt_rows(height)
+    c.setFillColorRGB(*BODY_TEXT)
+    c.setFont("Helvetica", 11)
+    # Datos del Inquilino
+    y = tenant_title - 20
+    c.drawString(margin + 8, y, f"Nombre:        {fields['nombre']}")
+    y -= 18
+    c.drawString(margin + 8, y, f"Apartamento:   {fields['apartamento']}")
+    y -= 18
+    c.drawString(margin + 8, y, f"Documento:     {fields['documento']}")
+    # Detalles del Pago
+    y = payment_title - 20
+    c.drawString(margin + 8, y, f"Fecha de pago:    {fields['fecha']}")
+    y -= 18
+    c.drawString(margin + 8, y, f"Monto:            {fields['monto']}")
+    y -= 18
+    c.drawString(margin + 8, y, f"Método:           {fields['metodo']}")
+    y -= 18
+    c.drawString(margin + 8, y, f"Observaciones:    {fields['observaciones']}")
+
+    c.save()
+    return filepath
+
+
+def generate_account_statement_pdf(
+    tenant: Dict[str, Any],
+    payments: List[Dict[str, Any]],
+    filepath: str,
+    logo_path: Optional[str] = None,
+    apartment: Optional[str] = None,
+) -> str:
+    """
+    Genera el estado de cuenta de un inquilino: sus datos y el historial de pagos (del más
+    antiguo al más reciente) con el total pagado. Las filas siguen en páginas nuevas si
+    no caben. Mismo encabezado y colores que el recibo.
+
+    :param tenant: dict con nombre, apartamento, numero_documento, valor_arriendo, fecha_ingreso
+    :param payments: pagos del inquilino (fecha_pago, monto, metodo, observaciones)
+    :param filepath: ruta donde guardar el PDF
+    :param logo_path, apartment: como en generate_payment_receipt_pdf
+    :return: filepath
+    """
+    from reportlab.pdfgen import canvas
+    from manager.app.services.date_keys import record_date_key
+
+    template = receipt_template(logo_path)
+    c = canvas.Canvas(filepath, pagesize=template.pagesize)
+    width, height = template.pagesize
+    margin = MARGIN
 
-    # --- Contenido ---
-    y = height - header_h - 32
+    _draw_header(c, width, height, "ESTADO DE CUENTA", template)
 
-    # Línea separadora
+    y = height - HEADER_H - 32
     c.setStrokeColorRGB(*LINE_COLOR)
     c.setLineWidth(0.5)
     c.line(margin, y, width - margin, y)
     y -= 24
 
-    apt_display = _get_apartment_display(tenant)
-    nombre = payment.get("nombre_inquilino") or tenant.get("nombre", "")
-    doc = tenant.get("numero_documento", "N/A")
-    fecha = payment.get("fecha_pago", "")
-    monto = float(payment.get("monto", 0))
-    metodo = payment.get("metodo", "")
-    obs = (payment.get("observaciones") or "").strip() or "—"
+    apt_display = apartment if apartment is not None else _get_apartment_display(tenant)
+    try:
+        rent = float(tenant.get("valor_arriendo") or 0)
+    except (TypeError, ValueError):
+        rent = 0.0
 
     # Sección: Datos del Inquilino
     c.setFillColorRGB(*SECTION_HEADER)
@@ -113,68 +377,118 @@ def generate_payment_receipt_pdf(
     y -= 20
     c.setFillColorRGB(*BODY_TEXT)
     c.setFont("Helvetica", 11)
-    c.drawString(margin + 8, y, f"Nombre:        {nombre}")
-    y -= 18
-    c.drawString(margin + 8, y, f"Apartamento:   {apt_display}")
-    y -= 18
-    c.drawString(margin + 8, y, f"Documento:     {doc}")
-    y -= 28
+    for label, value in (("Nombre:", tenant.get("nombre", "")),
+                         ("Apartamento:", apt_display),
+                         ("Documento:", tenant.get("numero_documento", "N/A")),
+                         ("Arriendo:", f"${rent:,.2f}"),
+                         ("Fecha de ingreso:", tenant.get("fecha_ingreso") or "—")):
+        c.drawString(margin + 8, y, label)
+        c.drawString(margin + 130, y, str(value))
+        y -= 18
+    y -= 10
 
-    # Línea separadora
     c.setStrokeColorRGB(*LINE_COLOR)
     c.line(margin, y, width - margin, y)
     y -= 24
 
-    # Sección: Detalles del Pago
+    # Sección: Historial de pagos (tabla)
     c.setFillColorRGB(*SECTION_HEADER)
     c.setFont("Helvetica-Bold", 12)
-    c.drawString(margin, y, "DETALLES DEL PAGO")
-    y -= 20
-    c.setFillColorRGB(*BODY_TEXT)
-    c.setFont("Helvetica", 11)
-    c.drawString(margin + 8, y, f"Fecha de pago:    {fecha}")
-    y -= 18
-    c.drawString(margin + 8, y, f"Monto:            ${monto:,.2f}")
-    y -= 18
-    c.drawString(margin + 8, y, f"Método:           {metodo}")
-    y -= 18
-    c.drawString(margin + 8, y, f"Observaciones:    {obs}")
-    y -= 32
+    c.drawString(margin, y, "HISTORIAL DE PAGOS")
+    y -= 22
 
-    # Caja de certificación
-    cert_y = y - 28
-    c.setFillColorRGB(*CERT_BG)
-    c.setStrokeColorRGB(*LINE_COLOR)
-    c.roundRect(margin, cert_y, content_width, 36, 4, fill=1, stroke=1)
-    c.setFillColorRGB(*BODY_TEXT)
-    c.setFont("Helvetica-Oblique", 9)
-    c.drawString(margin + 12, cert_y + 14, "Este recibo certifica que el inquilino ha realizado el pago")
-    c.drawString(margin + 12, cert_y + 2, "correspondiente al arriendo en la fecha indicada.")
-    y = cert_y - 44
+    columns = (margin + 8, margin + 200, margin + 220, margin + 320)
+
+    def draw_column_titles(y):
+        c.setFillColorRGB(*SIGN_LABEL)
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(columns[0], y, "Fecha")
+        c.drawRightString(columns[1], y, "Monto")
+        c.drawString(columns[2], y, "Método")
+        c.drawString(columns[3], y, "Observaciones")
+        c.setStrokeColorRGB(*LINE_COLOR)
+        c.line(margin, y - 6, width - margin, y - 6)
+        c.setFillColorRGB(*BODY_TEXT)
+        c.setFont("Helvetica", 10)
+        return y - 20
 
-    # Línea separadora antes de firmas
+    ordered = sorted(payments, key=lambda p: record_date_key(p, "fecha_pago") or "")
+    total = 0.0
+    if ordered:
+        y = draw_column_titles(y)
+    else:
+        c.setFillColorRGB(*BODY_TEXT)
+        c.setFont("Helvetica", 11)
+        c.drawString(margin + 8, y, "Sin pagos registrados.")
+        y -= 18
+    for payment in ordered:
+        if y < margin + 40:
+            c.showPage()
+            y = draw_column_titles(height - margin)
+        try:
+            amount = float(payment.get("monto", 0))
+        except (TypeError, ValueError):
+            amount = 0.0
+        total += amount
+        obs = (payment.get("observaciones") or "").strip()
+        c.drawString(columns[0], y, str(payment.get("fecha_pago", "")))
+        c.drawRightString(columns[1], y, f"${amount:,.2f}")
+        c.drawString(columns[2], y, str(payment.get("metodo", ""))[:18])
+        c.drawString(columns[3], y, obs if len(obs) <= 36 else obs[:35] + "…")
+        y -= 16
+
+    # Totales
+    if y < margin + 50:
+        c.showPage()
+        y = height - margin
+    y -= 6
     c.setStrokeColorRGB(*LINE_COLOR)
     c.line(margin, y, width - margin, y)
-    y -= 28
-
-    # Firmas
-    c.setFillColorRGB(*SIGN_LABEL)
-    c.setFont("Helvetica", 10)
-    sig_line_w = 140
-    # Administrador (izquierda)
-    c.drawString(margin, y, "Firma administrador:")
-    c.setStrokeColorRGB(0.3, 0.3, 0.3)
-    c.setLineWidth(0.3)
-    c.line(margin, y - 18, margin + sig_line_w, y - 18)
-    # Inquilino (derecha)
-    right_x = width - margin - sig_line_w - 20
-    c.drawString(right_x, y, "Firma inquilino:")
-    c.line(right_x, y - 18, right_x + sig_line_w, y - 18)
+    y -= 20
+    c.setFillColorRGB(*SECTION_HEADER)
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(columns[0], y, f"Total pagado ({len(ordered)} pagos):")
+    c.drawRightString(width - margin, y, f"${total:,.2f}")
 
     c.save()
     return filepath
 
 
+def _logo_box(height) -> Tuple[float, float, float, float]:
+    """Posición y tamaño del logo en el encabezado: (x, y, ancho, alto)."""
+    return MARGIN, height - HEADER_H + (HEADER_H - LOGO_H) / 2, LOGO_W, LOGO_H
+
+
+def _draw_header(c, width, height, title: str, template: ReceiptTemplate) -> None:
+    """Barra superior con logo (o placeholder), título y fecha de emisión."""
+    c.setFillColorRGB(*HEADER_BG)
+    c.rect(0, height - HEADER_H, width, HEADER_H, fill=1, stroke=0)
+    if not template.draw_logo(c, *_logo_box(height)):
+        _draw_logo_placeholder(c, *_logo_box(height))
+    c.setFillColorRGB(*HEADER_TEXT)
+    c.setFont("Helvetica-Bold", 20)
+    c.drawString(MARGIN + LOGO_W + 20, height - 38, title)
+    _draw_issued_date(c, height)
+
+
+def _draw_issued_date(c, height) -> None:
+    """Fecha de emisión bajo el título del encabezado."""
+    c.setFont("Helvetica", 10)
+    c.setFillColorRGB(0.9, 0.9, 0.9)
+    c.drawString(MARGIN + LOGO_W + 20, height - 58, f"Emitido: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+
+
+def load_logo(logo_path: Optional[str]) -> Any:
+    """ImageReader del logo (None si no hay logo o no se puede leer)."""
+    if not logo_path or not Path(logo_path).exists():
+        return None
+    try:
+        from reportlab.lib.utils import ImageReader
+        return ImageReader(logo_path)
+    except Exception:
+        return None
+
+
 def _draw_logo_placeholder(c, x, y, w, h):
     """Dibuja un placeholder elegante para el logo."""
     c.setFillColorRGB(1, 1, 1)
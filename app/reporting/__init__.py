@@ -0,0 +1,26 @@
+"""
+Generación de reportes fuera del hilo de la interfaz.
+
+- snapshot: ReportSnapshot (copia de los datos de los servicios) y NoReportData.
+- periods: selección y filtro de períodos.
+- queries: agrupaciones y joins entre pagos, inquilinos y apartamentos sobre la instantánea.
+- payment_reports, expense_reports, tenant_reports: reportes como funciones puras.
+- jobs: ejecutor en segundo plano con progreso, cancelación y entrega a Tk por after().
+- receipt_batch: recibos y estados de cuenta PDF en lote, en el pool de procesos.
+"""
+
+from manager.app.reporting.jobs import JobCancelled, ReportJob, ReportJobExecutor, report_executor
+from manager.app.reporting.periods import build_period_selection, filter_by_period, period_label
+from manager.app.reporting.snapshot import NoReportData, ReportSnapshot
+
+__all__ = [
+    "JobCancelled",
+    "NoReportData",
+    "ReportJob",
+    "ReportJobExecutor",
+    "ReportSnapshot",
+    "build_period_selection",
+    "filter_by_period",
+    "period_label",
+    "report_executor",
+]
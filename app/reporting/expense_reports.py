@@ -0,0 +1,204 @@
+"""
+Reportes de gastos como funciones puras sobre una ReportSnapshot (ver payment_reports).
+Los gastos guardan la fecha en formato YYYY-MM-DD.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from manager.app.reporting.periods import filter_by_period, period_label, record_key
+from manager.app.reporting.queries import apartments_by_number
+from manager.app.reporting.snapshot import NoReportData, ReportSnapshot, report_header_date
+from manager.app.services.date_keys import key_to_display
+
+ProgressFn = Optional[Callable[[float, Optional[str]], None]]
+
+EXPENSE_DATE_FMT = "%Y-%m-%d"
+
+
+def filter_expenses(snapshot: ReportSnapshot, selection: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Gastos de la instantánea dentro del período; NoReportData si no hay ninguno."""
+    filtered = filter_by_period(snapshot.expenses, selection, 'fecha', EXPENSE_DATE_FMT, snapshot.now,
+                                source="expenses", version=snapshot.versions.get("expenses"))
+    if not filtered:
+        raise NoReportData("No hay gastos registrados para el período seleccionado.")
+    return filtered
+
+
+def unit_report_label(snapshot: ReportSnapshot, apt_num: Any) -> str:
+    """Etiqueta de la unidad para el reporte: 'Local 1', 'Apartamento 2', 'Apartamento General', etc."""
+    if apt_num == "General" or not apt_num:
+        return "Apartamento General"
+    apt = apartments_by_number(snapshot).get(str(apt_num))
+    if apt is None:
+        return f"Apartamento {apt_num}"
+    unit_type = apt.get("unit_type", "Apartamento Estándar")
+    number = apt.get("number", apt_num)
+    if unit_type in ("Local Comercial", "Local comercial"):
+        return f"Local {number}"
+    if unit_type == "Penthouse":
+        return f"Penthouse {number}"
+    if unit_type in ("Depósito", "Bodega") or "Depósito" in str(unit_type) or "Bodega" in str(unit_type):
+        return f"Depósito {number}"
+    return f"Apartamento {number}"
+
+
+def build_apartment_report(snapshot: ReportSnapshot, selection: Dict[str, Any],
+                           selected_apartment: Optional[str] = None, progress: ProgressFn = None) -> str:
+    """Reporte de gastos agrupados por apartamento ('General' para los gastos sin unidad)."""
+    filtered = filter_expenses(snapshot, selection)
+    period_name = period_label(selection, snapshot.now)
+    if selected_apartment and selected_apartment != "Todos":
+        filtered = [e for e in filtered if e.get('apartamento', '---') == selected_apartment]
+    if not filtered:
+        raise NoReportData("No hay gastos registrados para los criterios seleccionados.")
+
+    apt_expenses: Dict[str, Dict[str, Any]] = {}
+    for expense in filtered:
+        apt = expense.get('apartamento', 'General')
+        if apt == '---':
+            apt = 'General'
+        if apt not in apt_expenses:
+            apt_expenses[apt] = {'count': 0, 'total': 0, 'expenses': []}
+        apt_expenses[apt]['count'] += 1
+        apt_expenses[apt]['total'] += float(expense.get('monto', 0))
+        apt_expenses[apt]['expenses'].append(expense)
+
+    report = []
+    report.append("=" * 60)
+    report.append("REPORTE DE GASTOS POR APARTAMENTO")
+    if period_name:
+        report.append(f"Período: {period_name}")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    if selected_apartment:
+        report.append(f"APARTAMENTO SELECCIONADO: {selected_apartment}")
+        report.append("")
+    report.append(f"Total de apartamentos con gastos: {len(apt_expenses)}")
+    report.append("")
+    report.append("DETALLE POR APARTAMENTO:")
+    report.append("-" * 60)
+
+    def sort_key(item):
+        apt_num = item[0]
+        if apt_num == 'General':
+            return 'ZZZ'  # General al final
+        try:
+            return f"{int(apt_num):04d}"  # Ordenar numéricamente
+        except (TypeError, ValueError):
+            return apt_num
+
+    for apt_num, data in sorted(apt_expenses.items(), key=sort_key):
+        report.append(f"{unit_report_label(snapshot, apt_num)}:")
+        report.append(f"  • Total de gastos: {data['count']}")
+        report.append(f"  • Total gastado: ${data['total']:,.2f}")
+        report.append("")
+        report.append("  Historial de gastos:")
+        sorted_expenses = sorted(data['expenses'], key=lambda x: x.get('fecha', ''), reverse=True)
+        for expense in sorted_expenses[:5]:  # Mostrar últimos 5
+            key = record_key(expense, 'fecha', EXPENSE_DATE_FMT)
+            fecha_display = key_to_display(key) if key else expense.get('fecha', '')
+            report.append(f"    - {fecha_display}: ${float(expense.get('monto', 0)):,.2f} ({expense.get('categoria', 'N/A')})")
+        if len(sorted_expenses) > 5:
+            report.append(f"    ... y {len(sorted_expenses) - 5} gasto(s) más")
+        report.append("")
+
+    return "\n".join(report)
+
+
+def build_category_and_subtype_report(snapshot: ReportSnapshot, selection: Dict[str, Any],
+                                      progress: ProgressFn = None) -> str:
+    """Reporte combinado por categoría y subtipo."""
+    filtered = filter_expenses(snapshot, selection)
+    period_name = period_label(selection, snapshot.now)
+
+    categories_dict: Dict[str, Dict[str, Any]] = {}
+    subtype_dict: Dict[str, Dict[str, Any]] = {}
+    for expense in filtered:
+        category = expense.get('categoria', 'Sin categoría')
+        subtype = expense.get('subtipo', 'Sin subtipo')
+        monto = float(expense.get('monto', 0))
+        cat = categories_dict.setdefault(category, {'count': 0, 'total': 0})
+        cat['count'] += 1
+        cat['total'] += monto
+        sub = subtype_dict.setdefault(f"{category} - {subtype}",
+                                      {'category': category, 'subtype': subtype, 'count': 0, 'total': 0})
+        sub['count'] += 1
+        sub['total'] += monto
+
+    report = []
+    report.append("=" * 60)
+    report.append("REPORTE DE GASTOS POR CATEGORÍA Y SUBTIPO")
+    if period_name:
+        report.append(f"Período: {period_name}")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    total_general = sum(c['total'] for c in categories_dict.values())
+    report.append("RESUMEN GENERAL:")
+    report.append(f"  • Total de gastos: {len(filtered)}")
+    report.append(f"  • Total gastado: ${total_general:,.2f}")
+    report.append("")
+    report.append("ANÁLISIS POR SUBTIPO:")
+    report.append("-" * 60)
+    total_sub = sum(s['total'] for s in subtype_dict.values())
+    # Subtipos agrupados por categoría; categorías y subtipos por total descendente
+    by_category: Dict[str, List] = {}
+    for key, data in subtype_dict.items():
+        by_category.setdefault(data['category'], []).append((key, data))
+    for category, _ in sorted(categories_dict.items(), key=lambda x: x[1]['total'], reverse=True):
+        if category not in by_category:
+            continue
+        for key, data in sorted(by_category[category], key=lambda x: x[1]['total'], reverse=True):
+            percentage = (data['total'] / total_sub * 100) if total_sub else 0
+            report.append(f"Categoría: {data['category']}")
+            report.append(f"Subtipo: {data['subtype']}")
+            report.append(f"  • Cantidad de gastos: {data['count']}")
+            report.append(f"  • Total gastado: ${data['total']:,.2f}")
+            report.append(f"  • Porcentaje del total: {percentage:.2f}%")
+            report.append("")
+    return "\n".join(report)
+
+
+def build_year_comparison_report(snapshot: ReportSnapshot, year1: str, year2: str,
+                                 progress: ProgressFn = None) -> str:
+    """Comparativa del total de gastos entre dos años."""
+    version = snapshot.versions.get("expenses")
+    year1_expenses = filter_by_period(snapshot.expenses, {"type": "specific_year", "year": int(year1)},
+                                      'fecha', EXPENSE_DATE_FMT, snapshot.now, source="expenses", version=version)
+    year2_expenses = filter_by_period(snapshot.expenses, {"type": "specific_year", "year": int(year2)},
+                                      'fecha', EXPENSE_DATE_FMT, snapshot.now, source="expenses", version=version)
+    if not year1_expenses and not year2_expenses:
+        raise NoReportData("No hay gastos registrados para los años seleccionados.")
+
+    total1 = sum(float(e.get('monto', 0)) for e in year1_expenses)
+    total2 = sum(float(e.get('monto', 0)) for e in year2_expenses)
+
+    report = []
+    report.append("=" * 60)
+    report.append("COMPARATIVA ANUAL DE GASTOS")
+    report.append(f"{year1} vs {year2}")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append(f"AÑO {year1}:")
+    report.append(f"  • Total de gastos: {len(year1_expenses)}")
+    report.append(f"  • Total gastado: ${total1:,.2f}")
+    report.append("")
+    report.append(f"AÑO {year2}:")
+    report.append(f"  • Total de gastos: {len(year2_expenses)}")
+    report.append(f"  • Total gastado: ${total2:,.2f}")
+    report.append("")
+    report.append("ANÁLISIS COMPARATIVO:")
+    report.append("-" * 60)
+    difference = total1 - total2
+    difference_percent = (difference / total2 * 100) if total2 > 0 else 0
+    report.append(f"  • Diferencia absoluta: ${difference:,.2f}")
+    report.append(f"  • Variación porcentual: {difference_percent:+.2f}%")
+    if total1 > total2:
+        report.append(f"  • El año {year1} tuvo un {abs(difference_percent):.2f}% más de gastos que {year2}")
+    elif total1 < total2:
+        report.append(f"  • El año {year1} tuvo un {abs(difference_percent):.2f}% menos de gastos que {year2}")
+    else:
+        report.append("  • Ambos años tuvieron el mismo total de gastos")
+    return "\n".join(report)
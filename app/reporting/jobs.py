@@ -0,0 +1,187 @@
+"""
+Ejecutor de trabajos de reportes en segundo plano.
+
+Los reportes se envían a un pool de hilos (o de procesos, para trabajos de CPU
+pesados) y el resultado vuelve a Tk mediante sondeo con after(): Tk no es seguro
+entre hilos, así que los callbacks de la interfaz siempre corren en el hilo principal.
+Los trabajos en hilo reciben un callback progress(fraccion, mensaje) que además
+interrumpe el trabajo (JobCancelled) cuando se cancela.
+"""
+
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from manager.app.logger import logger
+
+# Estados de un trabajo
+STATUS_PENDING = "pendiente"
+STATUS_RUNNING = "en_curso"
+STATUS_DONE = "terminado"
+STATUS_FAILED = "error"
+STATUS_CANCELLED = "cancelado"
+
+# Intervalo de sondeo desde Tk (ms)
+POLL_MS = 50
+
+
+class JobCancelled(Exception):
+    """Se lanza dentro del trabajo cuando fue cancelado (desde progress())."""
+
+
+class ReportJob:
+    """Trabajo enviado al ejecutor: estado, progreso, resultado y cancelación."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = STATUS_PENDING
+        self.progress = 0.0
+        self.message = ""
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._cancel_event = threading.Event()
+        self._future: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+    def cancel(self) -> None:
+        """Pide la cancelación; si aún no empezó, no llega a ejecutarse."""
+        self._cancel_event.set()
+        if self._future is not None:
+            self._future.cancel()
+
+    def report_progress(self, fraction: float, message: Optional[str] = None) -> None:
+        """Actualiza el progreso (0..1). Lanza JobCancelled si el trabajo fue cancelado."""
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.name)
+        with self._lock:
+            self.progress = max(0.0, min(1.0, float(fraction)))
+            if message is not None:
+                self.message = message
+
+    def _run(self, fn: Callable[..., Any], args, kwargs) -> Any:
+        """Cuerpo del trabajo en modo hilo."""
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.name)
+        self.status = STATUS_RUNNING
+        return fn(*args, progress=self.report_progress, **kwargs)
+
+    def _finish(self, future: Future) -> None:
+        """Callback de fin del future: fija estado, resultado o error."""
+        if future.cancelled():
+            self.status = STATUS_CANCELLED
+            return
+        error = future.exception()
+        if isinstance(error, JobCancelled) or self._cancel_event.is_set():
+            # Un resultado que llega después de cancelar se descarta
+            self.status = STATUS_CANCELLED
+        elif error is not None:
+            self.error = error
+            self.status = STATUS_FAILED
+        else:
+            self.result = future.result()
+            with self._lock:
+                self.progress = 1.0
+            self.status = STATUS_DONE
+
+
+class ReportJobExecutor:
+    """Envía trabajos de reportes a pools creados en el primer uso."""
+
+    def __init__(self, max_workers: int = 2, max_process_workers: Optional[int] = None):
+        self._max_workers = max_workers
+        self._max_process_workers = max_process_workers
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                   thread_name_prefix="report")
+            return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self._max_process_workers)
+            return self._processes
+
+    def process_pool(self) -> ProcessPoolExecutor:
+        """
+        Pool de procesos compartido, para trabajos que reparten sus propias tareas en
+        procesos (p. ej. receipt_batch) desde un trabajo en hilo con progreso.
+        """
+        return self._process_pool()
+
+    def submit(self, name: str, fn: Callable[..., Any], *args, use_process: bool = False,
+               **kwargs) -> ReportJob:
+        """
+        Envía fn(*args, **kwargs) y devuelve el ReportJob.
+        En modo hilo fn recibe además progress=callback. Con use_process=True fn y sus
+        argumentos deben ser serializables (funciones de módulo y datos planos); no hay
+        progreso intermedio y solo se puede cancelar antes de que empiece.
+        """
+        job = ReportJob(name)
+        if use_process:
+            future = self._process_pool().submit(fn, *args, **kwargs)
+        else:
+            future = self._thread_pool().submit(job._run, fn, args, kwargs)
+        job._future = future
+        future.add_done_callback(job._finish)
+        return job
+
+    def deliver(self, widget, job: ReportJob, on_done: Callable[[Any], None],
+                on_error: Optional[Callable[[BaseException], None]] = None,
+                on_progress: Optional[Callable[[float, str], None]] = None,
+                on_cancelled: Optional[Callable[[], None]] = None,
+                poll_ms: int = POLL_MS) -> None:
+        """
+        Sondea el trabajo con widget.after() y llama a los callbacks en el hilo de Tk.
+        Si el widget se destruye antes de terminar, el trabajo se cancela.
+        """
+        def poll():
+            try:
+                alive = bool(widget.winfo_exists())
+            except Exception:
+                alive = False
+            if not alive:
+                job.cancel()
+                return
+            if not job.done:
+                if on_progress:
+                    on_progress(job.progress, job.message)
+                widget.after(poll_ms, poll)
+                return
+            if job.status == STATUS_DONE:
+                on_done(job.result)
+            elif job.status == STATUS_FAILED:
+                if on_error:
+                    on_error(job.error)
+                else:
+                    logger.error("Error en el reporte %s: %s", job.name, job.error)
+            elif on_cancelled:
+                on_cancelled()
+
+        widget.after(poll_ms, poll)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Detiene los pools (los trabajos pendientes se cancelan)."""
+        with self._lock:
+            pools = [p for p in (self._threads, self._processes) if p is not None]
+            self._threads = None
+            self._processes = None
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Ejecutor compartido por las vistas de reportes
+report_executor = ReportJobExecutor()
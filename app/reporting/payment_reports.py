@@ -0,0 +1,478 @@
+"""
+Reportes de pagos como funciones puras sobre una ReportSnapshot.
+
+Cada build_* recibe la instantánea (y los parámetros elegidos en la interfaz) y
+devuelve el texto del reporte, o lanza NoReportData con el mensaje para el usuario.
+El argumento progress es el callback del ejecutor de trabajos (opcional).
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from manager.app.reporting.periods import filter_by_period, period_label
+from manager.app.reporting.queries import (
+    payment_totals_by_tenant,
+    payments_with_apartment,
+    tenants_with_arrears,
+)
+from manager.app.reporting.snapshot import NoReportData, ReportSnapshot, report_header_date
+from manager.app.services.date_keys import record_date_key
+from manager.app.services.tenant_service import _add_months
+
+ProgressFn = Optional[Callable[[float, Optional[str]], None]]
+
+# Cada cuántos registros se informa progreso en los recorridos largos
+_PROGRESS_EVERY = 200
+
+
+def _progress(progress: ProgressFn, done: int, total: int, message: str) -> None:
+    if progress and (done % _PROGRESS_EVERY == 0 or done == total):
+        progress(done / total if total else 1.0, message)
+
+
+def _by_date_desc(payments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Pagos del más reciente al más antiguo (por la clave de fecha; las inválidas al final)."""
+    return sorted(payments, key=lambda x: record_date_key(x, 'fecha_pago') or "1900-01-01", reverse=True)
+
+
+def apartment_display_name(apt: Optional[Dict[str, Any]]) -> str:
+    """Nombre de la unidad para el reporte: Apto, Local, Penthouse, Depósito, etc."""
+    if not apt:
+        return "Unidad"
+    unit_type = apt.get("unit_type", "Apartamento Estándar")
+    unit_number = apt.get("number", "N/A")
+    if unit_type == "Local Comercial" or unit_type == "Local comercial":
+        return f"Local: {unit_number}"
+    if unit_type == "Penthouse":
+        return f"Penthouse: {unit_number}"
+    if unit_type == "Depósito" or "Depósito" in str(unit_type) or "Bodega" in str(unit_type):
+        return f"Depósito: {unit_number}"
+    if unit_type == "Apartamento Estándar" or unit_type == "Apartamento Estandar":
+        return f"Apto: {unit_number}"
+    return f"{unit_type}: {unit_number}"
+
+
+def payments_period_label(selection: Dict[str, Any], now: datetime) -> str:
+    """Nombre del período en los reportes de pagos (el mes actual usa el formato %B %Y)."""
+    if selection["type"] == "current_month":
+        return now.strftime('%B %Y')
+    return period_label(selection, now)
+
+
+def filter_payments(snapshot: ReportSnapshot, selection: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Pagos de la instantánea dentro del período; NoReportData si no hay ninguno."""
+    filtered = filter_by_period(snapshot.payments, selection, 'fecha_pago', "%d/%m/%Y", snapshot.now,
+                                source="payments", version=snapshot.versions.get("payments"))
+    if not filtered:
+        raise NoReportData("No hay pagos registrados para el período seleccionado.")
+    return filtered
+
+
+# ==================== REPORTES ====================
+
+def build_period_report(snapshot: ReportSnapshot, selection: Dict[str, Any], progress: ProgressFn = None) -> str:
+    """Reporte de pagos por período."""
+    payments = filter_payments(snapshot, selection)
+    period_name = payments_period_label(selection, snapshot.now)
+
+    report = []
+    report.append("=" * 60)
+    report.append(f"REPORTE DE PAGOS - {period_name.upper()}")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append("RESUMEN:")
+    report.append(f"  • Total de pagos: {len(payments)}")
+    report.append(f"  • Total recaudado: ${sum(float(p.get('monto', 0)) for p in payments):,.2f}")
+    report.append("")
+    report.append("DETALLE DE PAGOS:")
+    report.append("-" * 60)
+
+    payments_sorted = _by_date_desc(payments)
+    total = len(payments_sorted)
+    for i, payment in enumerate(payments_sorted, 1):
+        tenant_name = payment.get('nombre_inquilino', 'N/A')
+        apt_num = snapshot.apartment_number_for_payment(payment)
+        report.append(f"Fecha: {payment.get('fecha_pago', 'N/A')}")
+        report.append(f"  • Inquilino: {tenant_name} (Apt. {apt_num})")
+        report.append(f"  • Monto: ${float(payment.get('monto', 0)):,.2f}")
+        report.append(f"  • Método: {payment.get('metodo', 'N/A')}")
+        if payment.get('observaciones'):
+            report.append(f"  • Observaciones: {payment.get('observaciones')}")
+        report.append("")
+        _progress(progress, i, total, "Detallando pagos...")
+
+    return "\n".join(report)
+
+
+def build_tenant_payments_report(snapshot: ReportSnapshot, tenant_id: Any, progress: ProgressFn = None) -> str:
+    """Reporte de pagos de un inquilino."""
+    tenant = snapshot.tenants_by_id.get(tenant_id) or {}
+    payments = snapshot.payments_by_tenant.get(tenant_id, [])
+    if not payments:
+        raise NoReportData(f"No hay pagos registrados para {tenant.get('nombre', 'N/A')}.")
+
+    report = []
+    report.append("=" * 60)
+    report.append(f"REPORTE DE PAGOS - {tenant.get('nombre', 'N/A').upper()}")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append("INFORMACIÓN DEL INQUILINO:")
+    report.append(f"  • Nombre: {tenant.get('nombre', 'N/A')}")
+    report.append(f"  • Apartamento: {snapshot.apartment_number(tenant)}")
+    report.append(f"  • Documento: {tenant.get('numero_documento', 'N/A')}")
+    report.append(f"  • Valor de arriendo: ${float(tenant.get('valor_arriendo', 0)):,.2f}")
+    report.append("")
+    report.append("RESUMEN DE PAGOS:")
+    total_paid = sum(float(p.get('monto', 0)) for p in payments)
+    report.append(f"  • Total de pagos registrados: {len(payments)}")
+    report.append(f"  • Total pagado: ${total_paid:,.2f}")
+    report.append("")
+    report.append("HISTORIAL DE PAGOS:")
+    report.append("-" * 60)
+
+    for idx, payment in enumerate(_by_date_desc(payments), 1):
+        report.append(f"Pago #{idx}:")
+        report.append(f"  • Fecha: {payment.get('fecha_pago', 'N/A')}")
+        report.append(f"  • Monto: ${float(payment.get('monto', 0)):,.2f}")
+        report.append(f"  • Método: {payment.get('metodo', 'N/A')}")
+        if payment.get('observaciones'):
+            report.append(f"  • Observaciones: {payment.get('observaciones')}")
+        report.append("")
+
+    return "\n".join(report)
+
+
+def build_payment_method_report(snapshot: ReportSnapshot, selection: Dict[str, Any], progress: ProgressFn = None) -> str:
+    """Reporte de pagos agrupados por método de pago."""
+    filtered = filter_payments(snapshot, selection)
+    period_name = payments_period_label(selection, snapshot.now)
+
+    methods_dict: Dict[str, Dict[str, Any]] = {}
+    for payment in filtered:
+        method = payment.get('metodo', 'No especificado')
+        if method not in methods_dict:
+            methods_dict[method] = {'count': 0, 'total': 0}
+        methods_dict[method]['count'] += 1
+        methods_dict[method]['total'] += float(payment.get('monto', 0))
+
+    grand_total = sum(m['total'] for m in methods_dict.values())
+    report = []
+    report.append("=" * 60)
+    report.append("REPORTE POR MÉTODO DE PAGO")
+    if period_name:
+        report.append(f"Período: {period_name}")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append("RESUMEN GENERAL:")
+    report.append(f"  • Total de pagos: {len(filtered)}")
+    report.append(f"  • Total recaudado: ${grand_total:,.2f}")
+    report.append("")
+    report.append("ANÁLISIS POR MÉTODO:")
+    report.append("-" * 60)
+
+    for method, data in sorted(methods_dict.items(), key=lambda x: x[1]['total'], reverse=True):
+        percentage = (data['total'] / grand_total * 100) if methods_dict else 0
+        report.append(f"Método: {method}")
+        report.append(f"  • Cantidad de pagos: {data['count']}")
+        report.append(f"  • Total recaudado: ${data['total']:,.2f}")
+        report.append(f"  • Porcentaje del total: {percentage:.2f}%")
+        report.append("")
+
+    return "\n".join(report)
+
+
+def _mora_text(meses_mora: int, dias_del_periodo: int) -> str:
+    """Texto 'X meses y Y días' de la mora (1 período: solo los días del período actual)."""
+    if meses_mora == 1:
+        return f"{dias_del_periodo} día{'s' if dias_del_periodo != 1 else ''}"
+    meses_completos = meses_mora - 1
+    partes = []
+    if meses_completos > 0:
+        partes.append(f"{meses_completos} mes{'es' if meses_completos != 1 else ''}")
+    if dias_del_periodo > 0:
+        partes.append(f"{dias_del_periodo} día{'s' if dias_del_periodo != 1 else ''}")
+    return " y ".join(partes) if partes else "0"
+
+
+def build_pending_payments_report(snapshot: ReportSnapshot, progress: ProgressFn = None) -> str:
+    """
+    Reporte de pagos pendientes con mora integral. El estado de cada inquilino se
+    calcula sobre la instantánea con queries.tenants_with_arrears (la regla de
+    tenant_service.compute_payment_state), sin escribir en los servicios.
+    """
+    pending = tenants_with_arrears(
+        snapshot, on_tenant=lambda done, total: _progress(progress, done, total, "Calculando mora..."))
+
+    if not pending:
+        raise NoReportData("No hay inquilinos con pagos pendientes.")
+
+    report = []
+    report.append("=" * 60)
+    report.append("REPORTE DE PAGOS PENDIENTES")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append("RESUMEN:")
+    report.append(f"  • Inquilinos con pagos pendientes: {len(pending)}")
+    report.append("")
+    report.append("DETALLE DE INQUILINOS:")
+    report.append("-" * 60)
+
+    for tenant, estado, arrears in pending:
+        if estado == 'moroso':
+            estado_text = 'En Mora'
+        elif estado == 'pendiente_pago':
+            estado_text = 'Pendiente de pago'
+        else:
+            estado_text = 'Pendiente Registro'
+
+        report.append(f"Inquilino: {tenant.get('nombre', 'N/A')}")
+        report.append(f"  • Apartamento: {snapshot.apartment_number(tenant)}")
+        report.append(f"  • Documento: {tenant.get('numero_documento', 'N/A')}")
+        report.append(f"  • Teléfono: {tenant.get('telefono', 'N/A')}")
+        report.append(f"  • Estado: {estado_text}")
+        report.append(f"  • Valor de arriendo: ${float(tenant.get('valor_arriendo', 0)):,.2f}")
+
+        if arrears and (arrears.get("meses_mora", 0) or arrears.get("dias_del_periodo_actual", 0)
+                        or arrears.get("total_expected", 0)):
+            meses_mora = int(arrears.get("meses_mora", 0) or 0)
+            dias_del_periodo = int(arrears.get("dias_del_periodo_actual", 0) or 0)
+            first_unpaid = arrears.get("first_unpaid_due_date")
+            current_due = _add_months(first_unpaid, meses_mora - 1) if first_unpaid and meses_mora >= 1 else first_unpaid
+            if current_due:
+                report.append(f"  • Fecha de pago (vencimiento): {current_due.strftime('%d/%m/%Y')}")
+            report.append(f"  • Días en mora: {_mora_text(meses_mora, dias_del_periodo)}")
+            pending_amount = float(arrears.get("amount_pending", arrears.get("total_expected", 0)) or 0)
+            paid = float(arrears.get("total_paid", 0) or 0)
+            report.append(f"  • Monto total en mora: ${max(0.0, pending_amount - paid):,.2f}")
+
+        report.append("")
+
+    return "\n".join(report)
+
+
+def build_consolidated_income_report(snapshot: ReportSnapshot, selection: Dict[str, Any],
+                                     progress: ProgressFn = None) -> str:
+    """Reporte de ingresos consolidado del período, con comparativas del mes y año actuales."""
+    filtered = filter_payments(snapshot, selection)
+    period_name = payments_period_label(selection, snapshot.now)
+    now = snapshot.now
+
+    total_income = sum(float(p.get('monto', 0)) for p in filtered)
+    this_month = filter_by_period(filtered, {"type": "current_month"}, 'fecha_pago', "%d/%m/%Y", now)
+    this_year = filter_by_period(filtered, {"type": "current_year"}, 'fecha_pago', "%d/%m/%Y", now)
+    monthly = sum(float(p.get('monto', 0)) for p in this_month)
+    yearly = sum(float(p.get('monto', 0)) for p in this_year)
+    avg_payment = total_income / len(filtered) if filtered else 0
+    avg_monthly = monthly if this_month else 0
+    # Proyección anual basada en el mes actual
+    projected = monthly * 12 if this_month else 0
+
+    report = []
+    report.append("=" * 60)
+    report.append("REPORTE DE INGRESOS CONSOLIDADO")
+    if period_name:
+        report.append(f"Período: {period_name}")
+    report.append("=" * 60)
+    report.append(report_header_date(now))
+    report.append("")
+    if period_name:
+        report.append(f"PERÍODO SELECCIONADO: {period_name}")
+        report.append("")
+    report.append("RESUMEN FINANCIERO:")
+    report.append(f"  • Ingresos totales (histórico): ${total_income:,.2f}")
+    report.append(f"  • Ingresos del mes actual: ${monthly:,.2f}")
+    report.append(f"  • Ingresos del año actual: ${yearly:,.2f}")
+    report.append(f"  • Total de pagos procesados: {len(filtered)}")
+    report.append("")
+    report.append("ESTADÍSTICAS:")
+    report.append(f"  • Promedio por pago: ${avg_payment:,.2f}")
+    report.append(f"  • Promedio mensual (mes actual): ${avg_monthly:,.2f}")
+    if projected > 0:
+        report.append(f"  • Proyección anual (basada en mes actual): ${projected:,.2f}")
+    report.append("")
+    report.append("DETALLE POR PERÍODO:")
+    report.append("-" * 60)
+    report.append(f"  • Pagos en el mes actual: {len(this_month)}")
+    report.append(f"  • Pagos en el año actual: {len(this_year)}")
+
+    return "\n".join(report)
+
+
+def build_apartment_payments_report(snapshot: ReportSnapshot, selection: Dict[str, Any],
+                                    selected_apartment: Optional[str] = None, progress: ProgressFn = None) -> str:
+    """Reporte de pagos agrupados por apartamento (uno solo si selected_apartment)."""
+    filtered = filter_payments(snapshot, selection)
+    period_name = payments_period_label(selection, snapshot.now)
+
+    apt_payments: Dict[str, Dict[str, Any]] = {}
+    total = len(filtered)
+    for i, (payment, tenant, apt) in enumerate(payments_with_apartment(snapshot, filtered), 1):
+        _progress(progress, i, total, "Agrupando pagos...")
+        apt_num = apt.get('number', str(tenant.get('apartamento')))
+        if selected_apartment and apt_num != selected_apartment:
+            continue
+        if apt_num not in apt_payments:
+            apt_payments[apt_num] = {'payments': [], 'total': 0, 'count': 0, 'apartment': apt}
+        apt_payments[apt_num]['payments'].append(payment)
+        apt_payments[apt_num]['total'] += float(payment.get('monto', 0))
+        apt_payments[apt_num]['count'] += 1
+
+    if not apt_payments:
+        raise NoReportData("No hay pagos registrados para el apartamento y período seleccionados.")
+
+    report = []
+    report.append("=" * 60)
+    report.append("REPORTE DE PAGOS POR APARTAMENTO")
+    if period_name:
+        report.append(f"Período: {period_name}")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    if selected_apartment:
+        report.append(f"APARTAMENTO SELECCIONADO: {selected_apartment}")
+        report.append("")
+    report.append(f"Total de apartamentos con pagos: {len(apt_payments)}")
+    report.append("")
+    report.append("DETALLE POR APARTAMENTO:")
+    report.append("-" * 60)
+
+    for i, (apt_num, data) in enumerate(sorted(apt_payments.items(), key=lambda x: x[0])):
+        if i > 0:
+            report.append("")
+            report.append("-" * 60)
+            report.append("")
+        apt = data.get("apartment", {})
+        unit_label = apartment_display_name(apt) if apt else f"Apartamento {apt_num}"
+        report.append(f"{unit_label}:")
+        report.append(f"  • Total de pagos: {data['count']}")
+        report.append(f"  • Total recaudado: ${data['total']:,.2f}")
+        report.append("")
+        report.append("  Historial de pagos:")
+        sorted_payments = _by_date_desc(data['payments'])
+        for payment in sorted_payments[:5]:  # Mostrar últimos 5
+            report.append(f"    - {payment.get('fecha_pago', 'N/A')}: ${float(payment.get('monto', 0)):,.2f} ({payment.get('metodo', 'N/A')})")
+        if len(sorted_payments) > 5:
+            report.append(f"    ... y {len(sorted_payments) - 5} pago(s) más")
+        report.append("")
+
+    return "\n".join(report)
+
+
+def build_trends_report(snapshot: ReportSnapshot, progress: ProgressFn = None) -> str:
+    """
+    Análisis de tendencias: recaudo mensual y variación respecto al mes anterior.
+    Usa snapshot.payment_months si viene de los acumulados; si no, agrupa los pagos.
+    """
+    if not snapshot.payments and not snapshot.payment_months:
+        raise NoReportData("No hay suficientes pagos para analizar tendencias.")
+
+    monthly_data: Dict[str, Dict[str, Any]] = {}
+    for month_key, (month_total, count) in (snapshot.payment_months or {}).items():
+        name = datetime.strptime(month_key, "%Y-%m").strftime("%B %Y")
+        monthly_data[month_key] = {'name': name, 'total': month_total, 'count': count}
+    total = len(snapshot.payments)
+    for i, payment in enumerate(snapshot.payments, 1):
+        _progress(progress, i, total, "Agrupando por mes...")
+        key = record_date_key(payment, 'fecha_pago')
+        if not key:
+            continue
+        month_key = key[:7]
+        if month_key not in monthly_data:
+            name = datetime.strptime(month_key, "%Y-%m").strftime("%B %Y")
+            monthly_data[month_key] = {'name': name, 'total': 0, 'count': 0}
+        monthly_data[month_key]['total'] += float(payment.get('monto', 0))
+        monthly_data[month_key]['count'] += 1
+    sorted_months = sorted(monthly_data.items())
+
+    report = []
+    report.append("=" * 60)
+    report.append("ANÁLISIS DE TENDENCIAS DE PAGOS")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append("EVOLUCIÓN MENSUAL:")
+    report.append("-" * 60)
+
+    if not sorted_months:
+        report.append("No hay datos suficientes para analizar tendencias.")
+        return "\n".join(report)
+
+    for month_key, data in sorted_months:
+        report.append(f"{data['name']}:")
+        report.append(f"  • Total recaudado: ${data['total']:,.2f}")
+        report.append(f"  • Cantidad de pagos: {data['count']}")
+        report.append(f"  • Promedio por pago: ${data['total']/data['count']:,.2f}" if data['count'] > 0 else "  • Promedio por pago: $0.00")
+        report.append("")
+
+    if len(sorted_months) >= 2:
+        report.append("ANÁLISIS COMPARATIVO:")
+        report.append("-" * 60)
+        current_month = sorted_months[-1][1]
+        previous_month = sorted_months[-2][1]
+        change = current_month['total'] - previous_month['total']
+        change_percent = (change / previous_month['total'] * 100) if previous_month['total'] > 0 else 0
+        report.append(f"Variación respecto al mes anterior: ${change:,.2f} ({change_percent:+.2f}%)")
+
+    return "\n".join(report)
+
+
+def build_collection_efficiency_report(snapshot: ReportSnapshot, progress: ProgressFn = None) -> str:
+    """Reporte de eficiencia de cobro (recibido frente a 12 meses de arriendo)."""
+    if not snapshot.tenants:
+        raise NoReportData("No hay inquilinos registrados.")
+
+    tenant_efficiency = []
+    totals_by_tenant = payment_totals_by_tenant(snapshot)
+    total = len(snapshot.tenants)
+    for i, tenant in enumerate(snapshot.tenants, 1):
+        _progress(progress, i, total, "Calculando eficiencia...")
+        expected_rent = float(tenant.get('valor_arriendo', 0))
+        if expected_rent <= 0:
+            continue
+        received_total, payment_count = totals_by_tenant.get(tenant.get('id'), (0, 0))
+        # Pagos esperados asumiendo 12 meses (simplificado)
+        expected_total = expected_rent * 12
+        tenant_efficiency.append({
+            'tenant': tenant,
+            'expected': expected_total,
+            'received': received_total,
+            'efficiency': (received_total / expected_total * 100) if expected_total > 0 else 0,
+            'payment_count': payment_count
+        })
+
+    report = []
+    report.append("=" * 60)
+    report.append("REPORTE DE EFICIENCIA DE COBRO")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append("RESUMEN:")
+    report.append(f"  • Total de inquilinos: {len(snapshot.tenants)}")
+    report.append(f"  • Inquilinos analizados: {len(tenant_efficiency)}")
+    report.append("")
+
+    if not tenant_efficiency:
+        report.append("No hay datos suficientes para calcular eficiencia.")
+        return "\n".join(report)
+
+    avg_efficiency = sum(t['efficiency'] for t in tenant_efficiency) / len(tenant_efficiency)
+    report.append(f"  • Eficiencia promedio: {avg_efficiency:.2f}%")
+    report.append("")
+    report.append("DETALLE POR INQUILINO:")
+    report.append("-" * 60)
+
+    for data in sorted(tenant_efficiency, key=lambda x: x['efficiency'], reverse=True):
+        tenant = data['tenant']
+        report.append(f"Inquilino: {tenant.get('nombre', 'N/A')}")
+        report.append(f"  • Apartamento: {snapshot.apartment_number(tenant)}")
+        report.append(f"  • Esperado: ${data['expected']:,.2f}")
+        report.append(f"  • Recibido: ${data['received']:,.2f}")
+        report.append(f"  • Eficiencia: {data['efficiency']:.2f}%")
+        report.append(f"  • Pagos registrados: {data['payment_count']}")
+        report.append("")
+
+    return "\n".join(report)
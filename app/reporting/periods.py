@@ -0,0 +1,193 @@
+"""
+Filtro de registros por período para los reportes.
+
+La selección de período es un dict plano (armado en la interfaz a partir de la
+ventana de selección) para que el filtro pueda correr fuera del hilo de Tk:
+    {"type": "current_month" | "current_year" | "specific_month" | "specific_year" | "custom",
+     "year": int, "month": int, "month_name": str,
+     "date_from": datetime, "date_to": datetime, "date_from_text": str, "date_to_text": str}
+
+Todo período se traduce a un rango [primer día, último día] de claves "YYYY-MM-DD",
+que se comparan como texto. La clave de cada registro es la que guardan los servicios
+("<campo>_iso", ver services.date_keys); solo se parsea la fecha si falta. PeriodIndex
+guarda las claves ordenadas y responde cada período con dos búsquedas binarias. Con
+version (el estado de datos del servicio, ver data_version()) el índice se reutiliza
+entre instantáneas mientras los datos no cambien.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from manager.app.services.date_keys import key_field
+
+MONTH_NAMES = [
+    "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+    "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
+]
+
+
+def build_period_selection(period: str, year: str = "", month_name: str = "", year_only: str = "",
+                           date_from: str = "", date_to: str = "") -> Optional[Dict[str, Any]]:
+    """
+    Valida los valores de la ventana de período y arma la selección.
+    Retorna None si faltan campos o las fechas del rango no son válidas (DD/MM/YYYY).
+    """
+    if period in ("current_month", "current_year"):
+        return {"type": period}
+    if period == "specific_month":
+        if not year or not month_name:
+            return None
+        return {"type": period, "year": int(year), "month": MONTH_NAMES.index(month_name) + 1,
+                "month_name": month_name}
+    if period == "specific_year":
+        if not year_only:
+            return None
+        return {"type": period, "year": int(year_only)}
+    # Rango personalizado
+    date_from = (date_from or "").strip()
+    date_to = (date_to or "").strip()
+    if not date_from or not date_to:
+        return None
+    try:
+        return {"type": "custom",
+                "date_from": datetime.strptime(date_from, "%d/%m/%Y"),
+                "date_to": datetime.strptime(date_to, "%d/%m/%Y"),
+                "date_from_text": date_from, "date_to_text": date_to}
+    except ValueError:
+        return None
+
+
+def period_label(selection: Dict[str, Any], now: datetime) -> str:
+    """Nombre del período para títulos y encabezados de reportes."""
+    kind = selection["type"]
+    if kind == "current_month":
+        return f"{MONTH_NAMES[now.month - 1]} {now.year}"
+    if kind == "current_year":
+        return f"{now.year}"
+    if kind == "specific_month":
+        return f"{selection['month_name']} {selection['year']}"
+    if kind == "specific_year":
+        return f"Año {selection['year']}"
+    return f"{selection['date_from_text']} a {selection['date_to_text']}"
+
+
+# Orden de (día, mes, año) en las partes de la fecha para los formatos de la aplicación
+_DATE_PARTS = {"%d/%m/%Y": ("/", 0, 1, 2), "%Y-%m-%d": ("-", 2, 1, 0)}
+
+
+def parse_date_key(value: Any, date_fmt: str) -> Optional[str]:
+    """Clave "YYYY-MM-DD" de value en date_fmt; None si no es una fecha válida en ese formato."""
+    parts_spec = _DATE_PARTS.get(date_fmt)
+    if parts_spec is None:
+        try:
+            return datetime.strptime(value, date_fmt).date().isoformat()
+        except (TypeError, ValueError):
+            return None
+    if not isinstance(value, str):
+        return None
+    separator, day_at, month_at, year_at = parts_spec
+    parts = value.split(separator)
+    # Mismo criterio que strptime: solo dígitos, día y mes de 1 o 2 cifras y año de 4
+    if len(parts) != 3 or not all(part.isdigit() and part.isascii() for part in parts) \
+            or len(parts[day_at]) > 2 or len(parts[month_at]) > 2 or len(parts[year_at]) != 4:
+        return None
+    try:
+        return date(int(parts[year_at]), int(parts[month_at]), int(parts[day_at])).isoformat()
+    except ValueError:
+        return None
+
+
+def record_key(record: Dict[str, Any], date_field: str, date_fmt: str) -> Optional[str]:
+    """Clave "YYYY-MM-DD" del registro: la guardada por el servicio o, si falta, la parseada."""
+    key = record.get(key_field(date_field))
+    if key is not None:
+        return key
+    return parse_date_key(record.get(date_field, ''), date_fmt)
+
+
+def period_bounds(selection: Dict[str, Any], now: datetime) -> Tuple[str, str]:
+    """Primer y último día (claves "YYYY-MM-DD", inclusivos) del período seleccionado."""
+    kind = selection["type"]
+    if kind in ("current_month", "specific_month"):
+        year, month = (now.year, now.month) if kind == "current_month" else (selection["year"], selection["month"])
+        return date(year, month, 1).isoformat(), date(year, month, monthrange(year, month)[1]).isoformat()
+    if kind in ("current_year", "specific_year"):
+        year = now.year if kind == "current_year" else selection["year"]
+        return date(year, 1, 1).isoformat(), date(year, 12, 31).isoformat()
+    return selection["date_from"].date().isoformat(), selection["date_to"].date().isoformat()
+
+
+class PeriodIndex:
+    """Claves de fecha de una lista de registros, ordenadas, con la posición de cada uno."""
+
+    def __init__(self, keys: Sequence[Optional[str]]):
+        pairs = sorted((key, position) for position, key in enumerate(keys) if key is not None)
+        self.size = len(keys)
+        self._keys = [key for key, _ in pairs]
+        self._positions = [position for _, position in pairs]
+
+    @classmethod
+    def build(cls, records: Sequence[Dict[str, Any]], date_field: str, date_fmt: str) -> "PeriodIndex":
+        return cls([record_key(record, date_field, date_fmt) for record in records])
+
+    def positions(self, first: str, last: str) -> List[int]:
+        """Posiciones (en orden de la lista) de los registros con fecha en [first, last]."""
+        lo = bisect_left(self._keys, first)
+        hi = bisect_right(self._keys, last)
+        return sorted(self._positions[lo:hi])
+
+    def select(self, records: Sequence[Dict[str, Any]], selection: Dict[str, Any],
+               now: datetime) -> List[Dict[str, Any]]:
+        """Registros del período, en el orden original de records."""
+        return [records[i] for i in self.positions(*period_bounds(selection, now))]
+
+
+# (origen, campo, formato, versión, cantidad) -> PeriodIndex; los reportes corren en hilos
+_INDEX_CACHE_SIZE = 8
+_index_cache: "OrderedDict[Tuple, PeriodIndex]" = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def period_index(records: Sequence[Dict[str, Any]], date_field: str, date_fmt: str,
+                 source: str, version: Hashable) -> PeriodIndex:
+    """
+    Índice de records para el estado de datos version. records debe ser la lista del
+    servicio (o una copia en el mismo orden) tomada con esa versión.
+    """
+    key = (source, date_field, date_fmt, version, len(records))
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+    index = PeriodIndex.build(records, date_field, date_fmt)
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def filter_by_period(records: Iterable[Dict[str, Any]], selection: Dict[str, Any], date_field: str,
+                     date_fmt: str, now: datetime, source: Optional[str] = None,
+                     version: Optional[Hashable] = None) -> List[Dict[str, Any]]:
+    """
+    Registros cuya fecha (date_field en date_fmt) cae en el período, en su orden original;
+    las fechas inválidas se omiten. Con source y version se usa el índice en caché de esa
+    versión de los datos; sin ellos (p. ej. sobre un subconjunto ya filtrado) se recorre la
+    lista una vez.
+    """
+    if source is not None and version is not None:
+        records = records if isinstance(records, list) else list(records)
+        return period_index(records, date_field, date_fmt, source, version).select(records, selection, now)
+    first, last = period_bounds(selection, now)
+    filtered = []
+    for record in records:
+        key = record_key(record, date_field, date_fmt)
+        if key is not None and first <= key <= last:
+            filtered.append(record)
+    return filtered
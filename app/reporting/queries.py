@@ -0,0 +1,129 @@
+"""
+Consultas de reportes sobre una ReportSnapshot: agrupaciones hechas una sola vez
+(diccionarios por inquilino, apartamento o número de unidad) y joins reutilizables
+entre pagos, inquilinos y apartamentos. Cada join recorre los pagos una vez y resuelve
+inquilino y apartamento por diccionario, así el costo crece con pagos + inquilinos y no
+con su producto.
+
+Las agrupaciones se guardan en la instantánea: varios reportes sobre la misma
+instantánea no vuelven a agrupar.
+
+Uso:
+    for payment, tenant, apt in payments_with_apartment(snapshot, filtered):
+        ...
+    totals = payment_totals_by_tenant(snapshot)   # {id_inquilino: (suma, cantidad)}
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from manager.app.reporting.snapshot import ReportSnapshot
+from manager.app.services.tenant_service import compute_payment_state
+
+Record = Dict[str, Any]
+
+PENDING_STATUSES = ('pendiente_registro', 'pendiente_pago', 'moroso')
+
+
+def group_records(records: Iterable[Record], key: Callable[[Record], Any]) -> Dict[Any, List[Record]]:
+    """{clave: [registros]} conservando el orden de los registros; las claves None se omiten."""
+    grouped: Dict[Any, List[Record]] = {}
+    for record in records:
+        value = key(record)
+        if value is not None:
+            grouped.setdefault(value, []).append(record)
+    return grouped
+
+
+def _cached(snapshot: ReportSnapshot, name: str, build: Callable[[], Any]) -> Any:
+    cache = snapshot.query_cache
+    if name not in cache:
+        cache[name] = build()
+    return cache[name]
+
+
+def is_active_tenant(tenant: Record) -> bool:
+    return tenant.get('estado_pago') != 'inactivo'
+
+
+def tenants_by_apartment(snapshot: ReportSnapshot, active_only: bool = False) -> Dict[Any, List[Record]]:
+    """Inquilinos agrupados por el id de apartamento tal como está en el inquilino."""
+    def build():
+        tenants = snapshot.tenants
+        if active_only:
+            tenants = [t for t in tenants if is_active_tenant(t)]
+        return group_records(tenants, lambda t: t.get('apartamento') or None)
+    return _cached(snapshot, f"tenants_by_apartment:{active_only}", build)
+
+
+def apartments_by_number(snapshot: ReportSnapshot) -> Dict[str, Record]:
+    """Primer apartamento por número (como texto)."""
+    def build():
+        by_number: Dict[str, Record] = {}
+        for apt in snapshot.apartments:
+            by_number.setdefault(str(apt.get('number', '')), apt)
+        return by_number
+    return _cached(snapshot, "apartments_by_number", build)
+
+
+def payment_totals_by_tenant(snapshot: ReportSnapshot) -> Dict[Any, Tuple[float, int]]:
+    """{id_inquilino: (suma de montos, cantidad de pagos)} de todos los pagos."""
+    def build():
+        return {
+            tenant_id: (sum(float(p.get('monto', 0)) for p in payments), len(payments))
+            for tenant_id, payments in snapshot.payments_by_tenant.items()
+        }
+    return _cached(snapshot, "payment_totals_by_tenant", build)
+
+
+def payments_with_tenant(snapshot: ReportSnapshot,
+                         payments: Optional[Iterable[Record]] = None) -> Iterator[Tuple[Record, Optional[Record]]]:
+    """(pago, inquilino) para cada pago; el inquilino es None si no existe."""
+    tenants_by_id = snapshot.tenants_by_id
+    for payment in snapshot.payments if payments is None else payments:
+        yield payment, tenants_by_id.get(payment.get('id_inquilino'))
+
+
+def payments_with_apartment(snapshot: ReportSnapshot,
+                            payments: Optional[Iterable[Record]] = None) -> Iterator[Tuple[Record, Record, Record]]:
+    """
+    (pago, inquilino, apartamento) para los pagos cuyo inquilino existe y tiene un
+    apartamento registrado; los demás se omiten.
+    """
+    for payment, tenant in payments_with_tenant(snapshot, payments):
+        if not tenant:
+            continue
+        apt_id = tenant.get('apartamento')
+        if not apt_id:
+            continue
+        apt = snapshot.get_apartment(apt_id)
+        if apt:
+            yield payment, tenant, apt
+
+
+def tenant_payment_status(snapshot: ReportSnapshot, tenant: Record) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    (estado_pago, información de mora) calculados sobre la instantánea con la regla del
+    servicio (tenant_service.compute_payment_state) a la fecha de la instantánea.
+    """
+    return compute_payment_state(tenant, snapshot.payments_by_tenant.get(tenant.get('id'), []), snapshot.now)
+
+
+def tenants_with_arrears(snapshot: ReportSnapshot, tenants: Optional[Iterable[Record]] = None,
+                         statuses: Iterable[str] = PENDING_STATUSES,
+                         on_tenant: Optional[Callable[[int, int], None]] = None,
+                         ) -> List[Tuple[Record, str, Optional[Dict[str, Any]]]]:
+    """
+    (inquilino, estado, mora) de los inquilinos cuyo estado está en statuses, en orden.
+    on_tenant(hechos, total) se llama tras cada inquilino (p. ej. para informar progreso).
+    """
+    statuses = set(statuses)
+    tenants = snapshot.tenants if tenants is None else list(tenants)
+    total = len(tenants)
+    result = []
+    for i, tenant in enumerate(tenants, 1):
+        status, arrears = tenant_payment_status(snapshot, tenant)
+        if status in statuses:
+            result.append((tenant, status, arrears))
+        if on_tenant is not None:
+            on_tenant(i, total)
+    return result
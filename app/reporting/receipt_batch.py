@@ -0,0 +1,195 @@
+"""
+Generación en lote de recibos de pago y estados de cuenta en un pool de procesos.
+
+El lote se arma sobre una ReportSnapshot (tomada en el hilo de Tk): cada tarea es un
+dict plano con el pago o los pagos, el inquilino, el número de apartamento ya resuelto
+y la ruta de salida en la carpeta del inquilino (documentos_inquilinos). Los procesos
+no consultan servicios: reciben las tareas en bloques de CHUNK_SIZE junto con la ruta
+del logo; cada proceso prepara una sola vez la plantilla del recibo (logo codificado y
+marco fijo, ver receipt_pdf.receipt_template) y la reutiliza en todos sus documentos.
+
+generate_receipts / generate_statements se ejecutan como reportes (ReportJobRunner):
+corren en un hilo del ejecutor, reparten los bloques al pool de procesos e informan el
+progreso a medida que terminan. Devuelven un resumen:
+    {"generated": int, "failed": [(ruta, error)], "skipped": int, "reused": int, "elapsed": float}
+
+Los recibos usan el índice de receipt_store: no se generan los que ya están al día
+("reused") y los generados quedan registrados para que adjuntarlos no los vuelva a generar.
+
+Uso:
+    snapshot = ReportSnapshot(payments=payment_service.records(), tenants=..., apartments=...)
+    self._report_runner.run(generate_receipts, snapshot, selection, on_done=show_summary)
+"""
+
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from manager.app.paths_config import DOCUMENTOS_INQUILINOS_DIR, get_tenant_document_folder_name
+from manager.app.receipt_pdf import (
+    apartment_display,
+    generate_account_statement_pdf,
+    generate_payment_receipt_pdf,
+    receipt_fields,
+    resolve_logo_path,
+)
+from manager.app.reporting.jobs import JobCancelled, report_executor
+from manager.app.reporting.payment_reports import filter_payments
+from manager.app.reporting.queries import is_active_tenant
+from manager.app.reporting.snapshot import NoReportData, ReportSnapshot
+from manager.app.services.receipt_store import receipt_digest, receipt_path, receipt_store
+
+ProgressFn = Optional[Callable[[float, Optional[str]], None]]
+
+# Documentos por bloque enviado a un proceso (reparte el costo de enviar las tareas)
+CHUNK_SIZE = 20
+
+KIND_RECEIPT = "receipt"
+KIND_STATEMENT = "statement"
+
+
+def statement_path(tenant: Dict[str, Any], now) -> str:
+    """Ruta del estado de cuenta del día en la carpeta del inquilino."""
+    return str(DOCUMENTOS_INQUILINOS_DIR / get_tenant_document_folder_name(tenant)
+               / f"estado_cuenta_{now.strftime('%Y-%m-%d')}.pdf")
+
+
+def build_receipt_tasks(snapshot: ReportSnapshot,
+                        payments: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    Tareas de recibo para payments, cuántos se omitieron (pago sin inquilino) y cuántos
+    ya estaban al día en receipt_store.
+    """
+    tasks = []
+    skipped = 0
+    reused = 0
+    for payment in payments:
+        tenant = snapshot.tenants_by_id.get(payment.get("id_inquilino"))
+        if tenant is None:
+            skipped += 1
+            continue
+        apartment = apartment_display(tenant, snapshot.get_apartment)
+        digest = receipt_digest(receipt_fields(payment, tenant, apartment))
+        if receipt_store.current_path(payment.get("id"), digest):
+            reused += 1
+            continue
+        tasks.append({
+            "kind": KIND_RECEIPT,
+            "path": receipt_path(tenant, payment),
+            "payment": dict(payment),
+            "tenant": dict(tenant),
+            "apartment": apartment,
+            "digest": digest,
+        })
+    return tasks, skipped, reused
+
+
+def build_statement_tasks(snapshot: ReportSnapshot, tenants: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Tareas de estado de cuenta, una por inquilino, con todos sus pagos."""
+    payments_by_tenant = snapshot.payments_by_tenant
+    return [{
+        "kind": KIND_STATEMENT,
+        "path": statement_path(tenant, snapshot.now),
+        "tenant": dict(tenant),
+        "payments": [dict(p) for p in payments_by_tenant.get(tenant.get("id"), [])],
+        "apartment": apartment_display(tenant, snapshot.get_apartment),
+    } for tenant in tenants]
+
+
+def render_chunk(tasks: List[Dict[str, Any]], logo_path: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Genera los documentos de un bloque (corre en un proceso del pool).
+    logo_path es la ruta ya resuelta ("" sin logo). Devuelve (ruta, error) por tarea;
+    error es None si el PDF se generó.
+    """
+    results = []
+    for task in tasks:
+        path = task["path"]
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            if task["kind"] == KIND_STATEMENT:
+                generate_account_statement_pdf(task["tenant"], task["payments"], path, logo_path=logo_path,
+                                               apartment=task["apartment"])
+            else:
+                generate_payment_receipt_pdf(task["payment"], task["tenant"], path, logo_path=logo_path,
+                                             apartment=task["apartment"])
+            results.append((path, None))
+        except Exception as e:
+            results.append((path, str(e)))
+    return results
+
+
+def generate_documents(tasks: List[Dict[str, Any]], workers: Optional[int] = None,
+                       chunk_size: int = CHUNK_SIZE, logo_path: Optional[str] = None,
+                       progress: ProgressFn = None) -> Dict[str, Any]:
+    """
+    Genera los documentos de tasks en un pool de procesos: el compartido de
+    report_executor o, con workers, uno propio de ese tamaño (se cierra al terminar).
+    Si progress lanza JobCancelled, se cancelan los bloques que no empezaron.
+    """
+    started = time.perf_counter()
+    total = len(tasks)
+    logo_path = resolve_logo_path(logo_path) or ""
+    own_pool: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(max_workers=workers) if workers else None
+    pool: Executor = own_pool or report_executor.process_pool()
+    futures = [pool.submit(render_chunk, tasks[i:i + chunk_size], logo_path)
+               for i in range(0, total, chunk_size)]
+    generated = 0
+    failed: List[Tuple[str, str]] = []
+    done = 0
+    try:
+        if progress:
+            progress(0.0, f"Generando documentos: 0 de {total}...")
+        for future in as_completed(futures):
+            results = future.result()
+            for path, error in results:
+                if error is None:
+                    generated += 1
+                else:
+                    failed.append((path, error))
+            done += len(results)
+            if progress:
+                progress(done / total, f"Generando documentos: {done} de {total}...")
+    except JobCancelled:
+        for future in futures:
+            future.cancel()
+        raise
+    finally:
+        if own_pool is not None:
+            own_pool.shutdown(wait=True, cancel_futures=True)
+    return {"generated": generated, "failed": failed, "skipped": 0, "reused": 0,
+            "elapsed": time.perf_counter() - started}
+
+
+def generate_receipts(snapshot: ReportSnapshot, selection: Dict[str, Any], workers: Optional[int] = None,
+                      progress: ProgressFn = None) -> Dict[str, Any]:
+    """
+    Recibos de los pagos del período que no estén ya generados y al día; NoReportData si
+    no hay pagos con inquilino.
+    """
+    tasks, skipped, reused = build_receipt_tasks(snapshot, filter_payments(snapshot, selection))
+    if not tasks and not reused:
+        raise NoReportData("Los pagos del período no tienen un inquilino registrado.")
+    summary = generate_documents(tasks, workers=workers, progress=progress)
+    failed = {path for path, _ in summary["failed"]}
+    receipt_store.record((task["payment"].get("id"), task["tenant"].get("id"), task["path"], task["digest"])
+                         for task in tasks if task["path"] not in failed)
+    summary["skipped"] = skipped
+    summary["reused"] = reused
+    return summary
+
+
+def generate_statements(snapshot: ReportSnapshot, tenant_ids: Optional[Iterable[Any]] = None,
+                        workers: Optional[int] = None, progress: ProgressFn = None) -> Dict[str, Any]:
+    """
+    Estados de cuenta de los inquilinos tenant_ids (por defecto, de todos los activos);
+    NoReportData si no hay ninguno.
+    """
+    if tenant_ids is None:
+        tenants = [t for t in snapshot.tenants if is_active_tenant(t)]
+    else:
+        tenants = [snapshot.tenants_by_id[i] for i in tenant_ids if i in snapshot.tenants_by_id]
+    if not tenants:
+        raise NoReportData("No hay inquilinos para generar estados de cuenta.")
+    return generate_documents(build_statement_tasks(snapshot, tenants), workers=workers, progress=progress)
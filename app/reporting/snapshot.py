@@ -0,0 +1,93 @@
+"""
+Instantánea de datos para generar reportes fuera del hilo de la interfaz.
+
+Se toma en el hilo de Tk (copiando los registros de los servicios) y luego se pasa
+a funciones puras que arman el texto del reporte; así el trabajo pesado no compite
+con la interfaz ni con escrituras concurrentes de los servicios. Las tuplas de
+registros tipados de records() (services.records) son de solo lectura: se comparten
+sin copiar.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from manager.app.services.records import Record
+
+
+class NoReportData(Exception):
+    """No hay datos para el reporte solicitado; el mensaje se muestra al usuario."""
+
+
+def _copy_records(records: Optional[Iterable[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    if isinstance(records, tuple) and records and isinstance(records[0], Record):
+        return list(records)
+    return [dict(r) for r in (records or [])]
+
+
+class ReportSnapshot:
+    """Copia de pagos, inquilinos, apartamentos y gastos con índices por id."""
+
+    def __init__(self, payments=None, tenants=None, apartments=None, expenses=None,
+                 now: Optional[datetime] = None,
+                 payment_months: Optional[Dict[str, Tuple[float, int]]] = None,
+                 versions: Optional[Dict[str, Any]] = None):
+        self.payments = _copy_records(payments)
+        self.tenants = _copy_records(tenants)
+        self.apartments = _copy_records(apartments)
+        self.expenses = _copy_records(expenses)
+        self.now = now or datetime.now()
+        # {"YYYY-MM": (total, cantidad)} de los pagos, tomado de los acumulados mensuales
+        # del servicio; los reportes que solo necesitan totales por mes no copian los pagos
+        self.payment_months = dict(payment_months) if payment_months is not None else None
+        # {"payments" | "expenses": data_version() del servicio al copiar}; permite reutilizar
+        # los índices de período construidos para esa misma versión de los datos
+        self.versions = dict(versions or {})
+
+        # Primer registro por id (mismo resultado que un next(...) sobre la lista)
+        self.tenants_by_id: Dict[Any, Dict[str, Any]] = {}
+        for tenant in self.tenants:
+            self.tenants_by_id.setdefault(tenant.get('id'), tenant)
+        self.apartments_by_id: Dict[Any, Dict[str, Any]] = {}
+        for apt in self.apartments:
+            self.apartments_by_id.setdefault(apt.get('id'), apt)
+        self._payments_by_tenant: Optional[Dict[Any, List[Dict[str, Any]]]] = None
+        # Agrupaciones calculadas por reporting.queries (nombre -> resultado)
+        self.query_cache: Dict[str, Any] = {}
+
+    @property
+    def payments_by_tenant(self) -> Dict[Any, List[Dict[str, Any]]]:
+        """Pagos agrupados por id_inquilino (se calcula una vez, en orden de registro)."""
+        if self._payments_by_tenant is None:
+            grouped: Dict[Any, List[Dict[str, Any]]] = {}
+            for p in self.payments:
+                grouped.setdefault(p.get('id_inquilino'), []).append(p)
+            self._payments_by_tenant = grouped
+        return self._payments_by_tenant
+
+    def get_apartment(self, apartment_id: Any) -> Optional[Dict[str, Any]]:
+        """Apartamento por id (acepta el id como texto, igual que el campo del inquilino)."""
+        try:
+            return self.apartments_by_id.get(int(apartment_id))
+        except (TypeError, ValueError):
+            return None
+
+    def apartment_number(self, tenant: Dict[str, Any]) -> str:
+        """Número del apartamento de un inquilino ('N/A' si no tiene)."""
+        apt_id = tenant.get('apartamento', None)
+        if apt_id is not None:
+            apt = self.get_apartment(apt_id)
+            if apt and 'number' in apt:
+                return apt.get('number', 'N/A')
+        return str(apt_id) if apt_id else 'N/A'
+
+    def apartment_number_for_payment(self, payment: Dict[str, Any]) -> str:
+        """Número del apartamento del inquilino de un pago."""
+        tenant = self.tenants_by_id.get(payment.get('id_inquilino'))
+        if tenant:
+            return self.apartment_number(tenant)
+        return 'N/A'
+
+
+def report_header_date(now: datetime) -> str:
+    """Línea 'Fecha de generación' común a todos los reportes."""
+    return f"Fecha de generación: {now.strftime('%d/%m/%Y %H:%M')}"
@@ -0,0 +1,291 @@
+"""
+Reportes de gestión de inquilinos como funciones puras sobre una ReportSnapshot
+(ver payment_reports).
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from manager.app.reporting.queries import is_active_tenant, payment_totals_by_tenant, tenants_by_apartment
+from manager.app.reporting.snapshot import ReportSnapshot, report_header_date
+
+ProgressFn = Optional[Callable[[float, Optional[str]], None]]
+
+
+def _format_iso_date(value: Any) -> Any:
+    """Fecha ISO como DD/MM/YYYY; otros valores se devuelven sin cambios."""
+    if value and value != 'N/A':
+        try:
+            return datetime.fromisoformat(value).strftime('%d/%m/%Y')
+        except (TypeError, ValueError):
+            pass
+    return value
+
+
+def _unit_display(apt: Dict[str, Any]) -> str:
+    return f"{apt.get('unit_type', 'Apto')}: {apt.get('number', 'N/A')}"
+
+
+def apartment_display(snapshot: ReportSnapshot, tenant: Dict[str, Any]) -> str:
+    """Representación del apartamento de un inquilino ('Apto: 101', 'Local Comercial: 2', ...)."""
+    apt = snapshot.get_apartment(tenant.get('apartamento', None))
+    if apt:
+        apt_number = apt.get('number', 'N/A')
+        apt_type = apt.get('unit_type', 'Apartamento Estándar')
+        if apt_type == "Apartamento Estándar":
+            return f"Apto: {apt_number}"
+        return f"{apt_type}: {apt_number}"
+    return "Sin apartamento asignado"
+
+
+def _active(snapshot: ReportSnapshot):
+    return [t for t in snapshot.tenants if is_active_tenant(t)]
+
+
+def build_tenants_consolidated_report(snapshot: ReportSnapshot, progress: ProgressFn = None) -> str:
+    """Reporte consolidado de inquilinos (activos e inactivos)."""
+    tenants = snapshot.tenants
+    active = _active(snapshot)
+    inactive = [t for t in tenants if t.get('estado_pago') == 'inactivo']
+    status_map = {
+        'al_dia': 'Al Día',
+        'pendiente_registro': 'Pendiente Registro',
+        'moroso': 'En Mora',
+        'inactivo': 'Inactivo'
+    }
+
+    def format_tenant(tenant):
+        status = tenant.get('estado_pago', 'N/A')
+        lines = []
+        lines.append(f"Nombre: {tenant.get('nombre', 'N/A')}")
+        lines.append(f"  • Apartamento: {apartment_display(snapshot, tenant)}")
+        lines.append(f"  • Documento: {tenant.get('numero_documento', 'N/A')}")
+        lines.append(f"  • Teléfono: {tenant.get('telefono', 'N/A')}")
+        lines.append(f"  • Estado: {status_map.get(status, status)}")
+        lines.append(f"  • Arriendo: ${float(tenant.get('valor_arriendo', 0)):,.2f}")
+        # Si está inactivo, agregar información de desactivación
+        if status == 'inactivo':
+            lines.append(f"  • Motivo de desactivación: {tenant.get('motivo_desactivacion', 'N/A')}")
+            lines.append(f"  • Fecha de desactivación: {_format_iso_date(tenant.get('fecha_desactivacion', 'N/A'))}")
+        lines.append("")
+        return "\n".join(lines)
+
+    report = []
+    report.append("=" * 60)
+    report.append("REPORTE DE INQUILINOS")
+    report.append("=" * 60)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append("RESUMEN:")
+    report.append(f"  • Total de inquilinos: {len(tenants)}")
+    report.append(f"  • Inquilinos activos: {len(active)}")
+    report.append(f"  • Inquilinos inactivos: {len(inactive)}")
+    report.append("")
+
+    report.append("=" * 60)
+    report.append("INQUILINOS ACTIVOS")
+    report.append("=" * 60)
+    report.append("")
+    if active:
+        for tenant in active:
+            report.append(format_tenant(tenant))
+    else:
+        report.append("No hay inquilinos activos.")
+        report.append("")
+
+    if inactive:
+        report.append("=" * 60)
+        report.append("INQUILINOS INACTIVOS")
+        report.append("=" * 60)
+        report.append("")
+        for tenant in inactive:
+            report.append(format_tenant(tenant))
+
+    return "\n".join(report)
+
+
+def build_occupation_history_report(snapshot: ReportSnapshot, progress: ProgressFn = None) -> str:
+    """Historial de ocupación por apartamento."""
+    apt_tenants = tenants_by_apartment(snapshot)
+
+    report = []
+    report.append("=" * 70)
+    report.append("HISTORIAL DE OCUPACIÓN - GESTIÓN DE INQUILINOS")
+    report.append("=" * 70)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+
+    for apt in snapshot.apartments:
+        apt_id = apt.get('id')
+        report.append("=" * 70)
+        report.append(f"APARTAMENTO: {_unit_display(apt)}")
+        report.append("=" * 70)
+
+        if apt_id in apt_tenants:
+            for tenant in apt_tenants[apt_id]:
+                report.append(f"Inquilino: {tenant.get('nombre', 'N/A')}")
+                report.append(f"  Fecha de ingreso: {_format_iso_date(tenant.get('fecha_ingreso', 'N/A'))}")
+                if tenant.get('estado_pago') == 'inactivo':
+                    report.append(f"  Fecha de salida: {_format_iso_date(tenant.get('fecha_desactivacion', 'N/A'))}")
+                    report.append(f"  Motivo: {tenant.get('motivo_desactivacion', 'N/A')}")
+                else:
+                    report.append("  Estado: Activo")
+                report.append("")
+        else:
+            report.append("Estado: Disponible")
+            report.append("")
+
+    return "\n".join(report)
+
+
+def build_documents_report(snapshot: ReportSnapshot, progress: ProgressFn = None) -> str:
+    """Documentos registrados de los inquilinos activos."""
+    active_tenants = _active(snapshot)
+
+    report = []
+    report.append("=" * 70)
+    report.append("REPORTE DE DOCUMENTOS - GESTIÓN DE INQUILINOS")
+    report.append("=" * 70)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append(f"Total de inquilinos activos: {len(active_tenants)}")
+    report.append("")
+
+    for tenant in active_tenants:
+        report.append(f"Inquilino: {tenant.get('nombre', 'N/A')} - {apartment_display(snapshot, tenant)}")
+        report.append(f"  Documento de identidad: {tenant.get('numero_documento', 'N/A')}")
+        has_contract = tenant.get('contrato', '') != ''
+        has_ficha = tenant.get('ficha', '') != ''
+        report.append(f"  Contrato: {'✓ Presente' if has_contract else '✗ No registrado'}")
+        report.append(f"  Ficha: {'✓ Presente' if has_ficha else '✗ No registrado'}")
+        documentos = tenant.get('documentos', [])
+        if documentos:
+            report.append(f"  Documentos adicionales: {len(documentos)}")
+            for doc in documentos:
+                report.append(f"    - {doc.get('tipo', 'N/A')}: {doc.get('archivo', 'N/A')}")
+        else:
+            report.append("  Documentos adicionales: Ninguno")
+        report.append("")
+
+    return "\n".join(report)
+
+
+def build_emergency_contacts_report(snapshot: ReportSnapshot, progress: ProgressFn = None) -> str:
+    """Contactos de emergencia de los inquilinos activos."""
+    active_tenants = _active(snapshot)
+
+    report = []
+    report.append("=" * 70)
+    report.append("CONTACTOS DE EMERGENCIA - GESTIÓN DE INQUILINOS")
+    report.append("=" * 70)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append(f"Total de inquilinos activos: {len(active_tenants)}")
+    report.append("")
+
+    for tenant in active_tenants:
+        report.append(f"Inquilino: {tenant.get('nombre', 'N/A')} - {apartment_display(snapshot, tenant)}")
+        report.append(f"  Teléfono: {tenant.get('telefono', 'N/A')}")
+        report.append(f"  Email: {tenant.get('email', 'N/A')}")
+        # Contacto de emergencia (campos planos y/o anidados)
+        contacto = tenant.get('contacto_emergencia') or {}
+        nested = contacto if isinstance(contacto, dict) else {}
+        nombre_ec = nested.get('nombre') or tenant.get('contacto_emergencia_nombre', '').strip()
+        telefono_ec = nested.get('telefono') or tenant.get('contacto_emergencia_telefono', '').strip()
+        relacion_ec = nested.get('relacion') or tenant.get('contacto_emergencia_parentesco', '').strip()
+        if nombre_ec or telefono_ec:
+            report.append("  Contacto de Emergencia:")
+            report.append(f"    Nombre: {nombre_ec or 'N/A'}")
+            report.append(f"    Teléfono: {telefono_ec or 'N/A'}")
+            if relacion_ec:
+                report.append(f"    Relación: {relacion_ec}")
+        else:
+            report.append("  Contacto de Emergencia: No registrado")
+        report.append("")
+
+    return "\n".join(report)
+
+
+def build_financial_summary_report(snapshot: ReportSnapshot, progress: ProgressFn = None) -> str:
+    """Resumen financiero (arriendo, total pagado, último pago) por inquilino activo."""
+    active_tenants = _active(snapshot)
+
+    report = []
+    report.append("=" * 70)
+    report.append("RESUMEN FINANCIERO POR INQUILINO - GESTIÓN DE INQUILINOS")
+    report.append("=" * 70)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+
+    total_arriendos = 0
+    total_pagado = 0
+    totals_by_tenant = payment_totals_by_tenant(snapshot)
+    total = len(active_tenants)
+    for i, tenant in enumerate(active_tenants, 1):
+        if progress:
+            progress(i / total, "Sumando pagos...")
+        arriendo = float(tenant.get('valor_arriendo', 0))
+        total_arriendos += arriendo
+        report.append(f"Inquilino: {tenant.get('nombre', 'N/A')} - {apartment_display(snapshot, tenant)}")
+        report.append(f"  Arriendo mensual: ${arriendo:,.2f}")
+
+        payments = snapshot.payments_by_tenant.get(tenant.get('id'), [])
+        total_tenant_paid, payment_count = totals_by_tenant.get(tenant.get('id'), (0, 0))
+        total_pagado += total_tenant_paid
+        report.append(f"  Total pagado: ${total_tenant_paid:,.2f}")
+        report.append(f"  Número de pagos: {payment_count}")
+        if payments:
+            last_payment = max(payments, key=lambda p: p.get('fecha', ''))
+            report.append(f"  Último pago: {last_payment.get('fecha', 'N/A')} - ${float(last_payment.get('monto', 0)):,.2f}")
+        report.append("")
+
+    report.append("=" * 70)
+    report.append("RESUMEN GENERAL")
+    report.append("=" * 70)
+    report.append(f"Total de arriendos mensuales: ${total_arriendos:,.2f}")
+    report.append(f"Total pagado (histórico): ${total_pagado:,.2f}")
+    report.append(f"Inquilinos activos: {len(active_tenants)}")
+
+    return "\n".join(report)
+
+
+def build_availability_report(snapshot: ReportSnapshot, progress: ProgressFn = None) -> str:
+    """Apartamentos disponibles y ocupados (por inquilinos activos)."""
+    # Si hay varios inquilinos activos en la misma unidad se muestra el último registrado
+    occupied_apts = {apt_id: tenants[-1]
+                     for apt_id, tenants in tenants_by_apartment(snapshot, active_only=True).items()}
+
+    available = []
+    occupied = []
+    for apt in snapshot.apartments:
+        if apt.get('id') in occupied_apts:
+            occupied.append((_unit_display(apt), occupied_apts[apt.get('id')]))
+        else:
+            available.append(_unit_display(apt))
+
+    report = []
+    report.append("=" * 70)
+    report.append("DISPONIBILIDAD DE APARTAMENTOS - GESTIÓN DE INQUILINOS")
+    report.append("=" * 70)
+    report.append(report_header_date(snapshot.now))
+    report.append("")
+    report.append("=" * 70)
+    report.append("APARTAMENTOS DISPONIBLES")
+    report.append("=" * 70)
+    report.append(f"Total: {len(available)}")
+    report.append("")
+    for apt in available:
+        report.append(f"  • {apt}")
+    report.append("")
+    report.append("=" * 70)
+    report.append("APARTAMENTOS OCUPADOS")
+    report.append("=" * 70)
+    report.append(f"Total: {len(occupied)}")
+    report.append("")
+    for apt_display_text, tenant in occupied:
+        report.append(f"  • {apt_display_text}")
+        report.append(f"    Inquilino: {tenant.get('nombre', 'N/A')}")
+        report.append(f"    Fecha de ingreso: {_format_iso_date(tenant.get('fecha_ingreso', 'N/A'))}")
+        report.append("")
+
+    return "\n".join(report)
@@ -0,0 +1,14 @@
+"""
+Servicios de datos de Building Manager Pro.
+
+Cada módulo expone su servicio como singleton diferido (ver service_registry).
+transaction() agrupa cambios de uno o varios servicios en una escritura por archivo:
+
+    from manager.app import services
+    with services.transaction():
+        ...
+"""
+
+from manager.app.services.unit_of_work import UnitOfWork, current_unit_of_work, transaction
+
+__all__ = ["UnitOfWork", "current_unit_of_work", "transaction"]
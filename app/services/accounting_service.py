@@ -1,6 +1,7 @@
 """
 Servicio para gestionar los asientos contables del edificio.
-Persiste en accounting.json con dos listas: apertura y manual.
+Persiste en accounting.json con dos listas de asientos (apertura y manual) y la lista
+de cierres mensuales: instantáneas de los saldos de cada mes cerrado.
 """
 import json
 from pathlib import Path
@@ -10,6 +11,50 @@ from datetime import datetime
 from manager.app.paths_config import DATA_DIR, ensure_dirs
 from manager.app.persistence import save_json_atomic
 from manager.app.logger import logger
+from manager.app.services.date_keys import (
+    ENTRY_DATE_FIELDS, record_date_key, stamp_date_keys, stamp_stale, with_restamped
+)
+from manager.app.services.monthly_rollups import MonthlyRollup, month_of, to_amount
+from manager.app.services.service_registry import LazyService
+from manager.app.storage import open_store
+
+ENTRY_TYPES = ("apertura", "manual")
+# Sección de accounting.json con los cierres mensuales
+CLOSURES = "cierres"
+
+
+class ClosedPeriodError(ValueError):
+    """Se intentó registrar, modificar o eliminar un movimiento de un mes cerrado."""
+
+
+def _period_label(period: str) -> str:
+    """"YYYY-MM" -> "MM/YYYY"."""
+    return f"{period[5:7]}/{period[:4]}"
+
+
+def _shift_period(period: str, months: int) -> str:
+    """Suma (o resta) meses a un período "YYYY-MM"."""
+    index = int(period[:4]) * 12 + int(period[5:7]) - 1 + months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _rollup_rows(entry: Dict[str, Any]):
+    """
+    Aporte de un asiento a los acumulados mensuales (ver monthly_rollups). Un asiento de
+    apertura aporta una fila de entrada y otra de salida según sus montos.
+    """
+    key = record_date_key(entry, "fecha")
+    if not key:
+        return
+    month = key[:7]
+    if entry.get("tipo", "manual") == "apertura":
+        for direction, field in (("entrada", "monto_ingresos"), ("salida", "monto_egresos")):
+            amount = to_amount(entry.get(field))
+            if amount > 0:
+                yield month, ("apertura", direction, "", "", None, None), amount
+    else:
+        dims = ("manual", entry.get("direccion", "entrada"), entry.get("tipo_ajuste", ""), "", None, None)
+        yield month, dims, to_amount(entry.get("monto"))
 
 
 class AccountingService:
@@ -18,8 +63,17 @@ class AccountingService:
     DATA_FILE = DATA_DIR / "accounting.json"
 
     def __init__(self):
-        self._data: Dict[str, List[Dict[str, Any]]] = {"apertura": [], "manual": []}
+        self._data: Dict[str, List[Dict[str, Any]]] = {"apertura": [], "manual": [], CLOSURES: []}
         self._ensure_data_file()
+        self._stores = {
+            section: open_store(f"accounting_{section}", self.DATA_FILE)
+            for section in ENTRY_TYPES + (CLOSURES,)
+        }
+        self._loaded_states: Dict[str, Any] = {}
+        # Asientos con la clave de fecha corregida al cargar, aún no guardados (por lista)
+        self._restamped: Dict[str, List[Dict[str, Any]]] = {}
+        # Sumas y cantidades por mes/fuente/dirección de ambas listas
+        self._rollup = MonthlyRollup(_rollup_rows)
         self._load_data()
 
     # ------------------------------------------------------------------
@@ -31,23 +85,30 @@ class AccountingService:
         ensure_dirs()
         if not self.DATA_FILE.exists():
             self.DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-            save_json_atomic(self.DATA_FILE, {"apertura": [], "manual": []})
+            save_json_atomic(self.DATA_FILE, {"apertura": [], "manual": [], CLOSURES: []})
 
     def _load_data(self):
         """
         Carga los datos desde el archivo JSON.
         Si el archivo está corrupto, lo renombra a .bak, inicializa vacío y registra advertencia.
+        Si ninguna lista cambió desde la última carga, no se vuelve a leer.
         """
+        if all(store.is_fresh(self._loaded_states.get(et)) for et, store in self._stores.items()):
+            return
+        loaded_states = {et: store.state() for et, store in self._stores.items()}
         try:
-            with open(self.DATA_FILE, "r", encoding="utf-8") as f:
-                self._data = json.load(f)
+            self._data = {entry_type: store.load() for entry_type, store in self._stores.items()}
+            self._loaded_states = loaded_states
+            self._stamp_loaded_date_keys()
+            self._rebuild_rollup()
         except (FileNotFoundError, json.JSONDecodeError) as exc:
             bak = self.DATA_FILE.parent / (self.DATA_FILE.name + ".bak")
             try:
                 self.DATA_FILE.rename(bak)
             except Exception:
                 pass
-            self._data = {"apertura": [], "manual": []}
+            self._data = {"apertura": [], "manual": [], CLOSURES: []}
+            self._rebuild_rollup()
             logger.warning(
                 "accounting.json corrupto o no encontrado (%s). "
                 "Se renombró a %s y se inicializó vacío.",
@@ -55,14 +116,55 @@ class AccountingService:
                 bak,
             )
 
-    def _save_data(self):
-        """Persiste los datos usando escritura atómica."""
-        save_json_atomic(self.DATA_FILE, self._data)
+    def _save_data(
+        self,
+        entry_type: Optional[str] = None,
+        upserted: Optional[List[Dict[str, Any]]] = None,
+        deleted: Optional[List[int]] = None,
+    ):
+        """
+        Persiste los datos usando escritura atómica. Si se indica entry_type, solo se
+        guarda esa lista (y el backend puede limitarse a los registros upserted/deleted).
+        """
+        entry_types = (entry_type,) if entry_type else tuple(self._stores)
+        if upserted is None and deleted is None:
+            for et in entry_types:
+                if et in ENTRY_TYPES:
+                    for entry in self._data.get(et, []):
+                        stamp_date_keys(entry, ENTRY_DATE_FIELDS)
+        for et in entry_types:
+            store = self._stores.get(et)
+            if store is None:
+                logger.warning("Tipo de asiento desconocido, no se persiste: %s", et)
+                continue
+            restamped = self._restamped.pop(et, [])
+            store.save(self._data.get(et, []), upserted=with_restamped(upserted, deleted, restamped), deleted=deleted)
+        # Las listas comparten archivo en JSON: renovar el estado de todas
+        self._loaded_states = {et: store.state() for et, store in self._stores.items()}
+
+    def _stamp_loaded_date_keys(self):
+        """
+        Corrige en memoria la clave de fecha canónica de los asientos cargados (faltante o
+        desactualizada); se persiste con el próximo guardado de cada lista.
+        """
+        self._restamped = {entry_type: stamp_stale(self._data.get(entry_type, []), ENTRY_DATE_FIELDS)
+                           for entry_type in ENTRY_TYPES}
+
+    def _rebuild_rollup(self):
+        self._rollup.clear()
+        for entry_type in ENTRY_TYPES:
+            for entry in self._data.get(entry_type, []):
+                self._rollup.add(entry)
 
     # ------------------------------------------------------------------
     # Lectura
     # ------------------------------------------------------------------
 
+    def monthly_rollup(self) -> MonthlyRollup:
+        """Acumulados mensuales de asientos (fuentes "apertura" y "manual"), al día con el archivo."""
+        self._load_data()
+        return self._rollup
+
     def get_all_entries(self) -> List[Dict[str, Any]]:
         """Retorna una copia de todas las entradas (apertura + manual combinadas)."""
         self._load_data()
@@ -100,6 +202,7 @@ class AccountingService:
             Copia del registro creado.
         """
         self._load_data()
+        self.ensure_period_open(data.get("fecha"))
         entry_type = data.get("tipo", "manual")
         lista = self._data.setdefault(entry_type, [])
 
@@ -108,8 +211,10 @@ class AccountingService:
 
         now = datetime.now().isoformat(timespec="seconds")
         entry = {**data, "id": new_id, "creado_en": now, "actualizado_en": now}
+        stamp_date_keys(entry, ENTRY_DATE_FIELDS)
         lista.append(entry)
-        self._save_data()
+        self._rollup.add(entry)
+        self._save_data(entry_type, upserted=[entry])
         return entry.copy()
 
     def update_entry(self, entry_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -127,11 +232,15 @@ class AccountingService:
         for entry_type in ("apertura", "manual"):
             for i, entry in enumerate(self._data.get(entry_type, [])):
                 if entry.get("id") == entry_id:
+                    self.ensure_period_open(entry.get("fecha"), data.get("fecha"))
+                    self._rollup.remove(entry)
                     self._data[entry_type][i].update(data)
                     self._data[entry_type][i]["actualizado_en"] = datetime.now().isoformat(
                         timespec="seconds"
                     )
-                    self._save_data()
+                    stamp_date_keys(entry, ENTRY_DATE_FIELDS)
+                    self._rollup.add(entry)
+                    self._save_data(entry_type, upserted=[self._data[entry_type][i]])
                     return self._data[entry_type][i].copy()
         return None
 
@@ -150,11 +259,146 @@ class AccountingService:
             lista = self._data.get(entry_type, [])
             nueva_lista = [e for e in lista if e.get("id") != entry_id]
             if len(nueva_lista) < len(lista):
+                removed = [e for e in lista if e.get("id") == entry_id]
+                self.ensure_period_open(*(e.get("fecha") for e in removed))
+                for entry in removed:
+                    self._rollup.remove(entry)
                 self._data[entry_type] = nueva_lista
-                self._save_data()
+                self._save_data(entry_type, deleted=[entry_id])
                 return True
         return False
 
+    # ------------------------------------------------------------------
+    # Saldos y cierre de períodos
+    # ------------------------------------------------------------------
+
+    def get_period_balances(self, month_from: Optional[str], month_to: Optional[str]) -> Dict[str, Any]:
+        """
+        Saldos de los meses [month_from, month_to] ("YYYY-MM", None = sin límite) a partir
+        de los acumulados mensuales de pagos, gastos y asientos.
+        """
+        from manager.app.services.payment_service import payment_service
+        from manager.app.services.expense_service import expense_service
+
+        ingresos = payment_service.monthly_rollup().totals(month_from, month_to)[0]
+        egresos: Dict[str, float] = {}
+        by_category = expense_service.monthly_rollup().group_by("categoria", month_from, month_to)
+        for cat, (monto, _) in by_category.items():
+            cat = cat or "Sin categoría"
+            egresos[cat] = egresos.get(cat, 0.0) + monto
+        by_direction = self.monthly_rollup().group_by("direccion", month_from, month_to)
+        entradas = by_direction.get("entrada", (0.0, 0))[0]
+        salidas = by_direction.get("salida", (0.0, 0))[0]
+        return {
+            "ingresos_arriendo": ingresos,
+            "egresos_por_categoria": egresos,
+            "ajustes_entradas": entradas,
+            "ajustes_salidas": salidas,
+            "ajustes_netos": entradas - salidas,
+            "balance_neto": ingresos - sum(egresos.values()) + entradas - salidas,
+        }
+
+    def get_closed_periods(self) -> List[Dict[str, Any]]:
+        """Cierres mensuales (copias), del mes más antiguo al más reciente."""
+        self._load_data()
+        return sorted((dict(c) for c in self._data.get(CLOSURES, [])), key=lambda c: c.get("periodo", ""))
+
+    def get_closure(self, period: str) -> Optional[Dict[str, Any]]:
+        """Instantánea del mes "YYYY-MM" si está cerrado."""
+        self._load_data()
+        for closure in self._data.get(CLOSURES, []):
+            if closure.get("periodo") == period:
+                return dict(closure)
+        return None
+
+    def _last_closed_period(self) -> Optional[str]:
+        """Último mes cerrado ("YYYY-MM"); None si no hay cierres."""
+        return max((c.get("periodo", "") for c in self._data.get(CLOSURES, [])), default=None)
+
+    def is_period_closed(self, period: str) -> bool:
+        """
+        True si el mes "YYYY-MM" está cerrado. Los cierres son consecutivos y el primero
+        suma los meses anteriores en su saldo, así que todo mes hasta el último cierre lo está.
+        """
+        self._load_data()
+        last = self._last_closed_period()
+        return last is not None and period <= last
+
+    def ensure_period_open(self, *fechas: Any) -> None:
+        """
+        Lanza ClosedPeriodError si alguna de las fechas (DD/MM/YYYY o YYYY-MM-DD) cae en
+        un mes cerrado (hasta el último cierre, ver is_period_closed). Los servicios la
+        llaman antes de registrar, editar o eliminar.
+        """
+        self._load_data()
+        last = self._last_closed_period()
+        if last is None:
+            return
+        for fecha in fechas:
+            period = month_of(fecha)
+            if period is not None and period <= last:
+                raise ClosedPeriodError(
+                    f"El período {_period_label(period)} está cerrado. "
+                    "Reábralo desde el Estado de resultados para modificar sus movimientos."
+                )
+
+    def close_period(self, period: str) -> Dict[str, Any]:
+        """
+        Cierra el mes "YYYY-MM" guardando sus saldos (ingresos, egresos por categoría,
+        ajustes, neto y saldo acumulado) como una instantánea que ya no se recalcula.
+        Solo se cierran meses terminados y en orden: si ya hay cierres, el siguiente
+        al último cerrado.
+        """
+        self._load_data()
+        if month_of(f"{period}-01") != period:
+            raise ValueError(f"Período inválido: {period}")
+        if period >= datetime.now().strftime("%Y-%m"):
+            raise ValueError("Solo se pueden cerrar meses ya terminados.")
+        closures = self.get_closed_periods()
+        if closures:
+            last = closures[-1]
+            expected = _shift_period(last["periodo"], 1)
+            if period != expected:
+                raise ValueError(f"Los meses se cierran en orden: el siguiente a cerrar es {_period_label(expected)}.")
+            saldo_anterior = float(last.get("saldo_acumulado", 0.0))
+        else:
+            saldo_anterior = self.get_period_balances(None, _shift_period(period, -1))["balance_neto"]
+
+        balances = self.get_period_balances(period, period)
+        closure = {
+            "id": max((c.get("id", 0) for c in closures), default=0) + 1,
+            "periodo": period,
+            "ingresos_arriendo": round(balances["ingresos_arriendo"], 2),
+            "egresos_por_categoria": {cat: round(v, 2) for cat, v in balances["egresos_por_categoria"].items()},
+            "ajustes_entradas": round(balances["ajustes_entradas"], 2),
+            "ajustes_salidas": round(balances["ajustes_salidas"], 2),
+            "ajustes_netos": round(balances["ajustes_netos"], 2),
+            "balance_neto": round(balances["balance_neto"], 2),
+            "saldo_acumulado": round(saldo_anterior + balances["balance_neto"], 2),
+            "cerrado_en": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._data.setdefault(CLOSURES, []).append(closure)
+        self._save_data(CLOSURES, upserted=[closure])
+        logger.info("Período %s cerrado", period)
+        return dict(closure)
+
+    def reopen_period(self, period: str) -> List[str]:
+        """
+        Reabre el mes "YYYY-MM". Los cierres posteriores también se anulan porque su saldo
+        acumulado dependía de este mes (un mes anterior al primer cierre los anula todos).
+        Retorna los períodos reabiertos.
+        """
+        self._load_data()
+        closures = self._data.get(CLOSURES, [])
+        if not self.is_period_closed(period):
+            raise ValueError(f"El período {_period_label(period)} no está cerrado.")
+        removed = [c for c in closures if c.get("periodo", "") >= period]
+        self._data[CLOSURES] = [c for c in closures if c.get("periodo", "") < period]
+        self._save_data(CLOSURES, deleted=[c.get("id") for c in removed])
+        reopened = sorted(c.get("periodo") for c in removed)
+        logger.info("Períodos reabiertos: %s", ", ".join(reopened))
+        return reopened
+
 
 # Instancia global del servicio
-accounting_service = AccountingService()
+accounting_service = LazyService("accounting_service", AccountingService)
@@ -2,10 +2,14 @@ import json
 import os
 import re
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from manager.app.paths_config import DATA_DIR, ensure_dirs
 from manager.app.logger import logger
+from manager.app.services.records import ApartmentRecord, RecordCache, intern_fields
+from manager.app.services.service_registry import LazyService
+from manager.app.services.unit_of_work import transaction
+from manager.app.storage import open_store
 
 APARTMENTS_FILE = str(DATA_DIR / "apartments.json")
 
@@ -19,8 +23,16 @@ class ApartmentService:
 
     def __init__(self):
         self.apartments_file = APARTMENTS_FILE
+        self._store = open_store("apartments", self.apartments_file)
+        loaded_state = self._store.state()
         apartments, self._next_id, cleanup_needed = self._load_data()
         self.apartments = apartments
+        self._loaded_state = loaded_state
+        # Índice en memoria id -> apartamento
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._rebuild_index()
+        # Registros tipados de solo lectura (records())
+        self._records = RecordCache(ApartmentRecord)
         
         # Si se realizó una limpieza durante la carga, guardar el resultado para hacerlo permanente.
         if cleanup_needed:
@@ -31,11 +43,10 @@ class ApartmentService:
         """Carga, limpia y ordena los apartamentos desde el archivo JSON."""
         ensure_dirs()
         cleanup_needed = False
-        if not os.path.exists(self.apartments_file):
+        if not self._store.supports_query and not os.path.exists(self.apartments_file):
             return [], 1, False
         try:
-            with open(self.apartments_file, 'r', encoding='utf-8') as f:
-                apartments_from_file = json.load(f)
+            apartments_from_file = self._store.load()
 
             if not isinstance(apartments_from_file, list):
                 logger.warning("El archivo de apartamentos no contenía una lista. Se ha reiniciado.")
@@ -50,6 +61,7 @@ class ApartmentService:
 
             if not valid_apartments:
                 return [], 1, cleanup_needed
+            intern_fields(valid_apartments, ("unit_type", "status"))
             
             # Ordenar apartamentos por clave natural de su 'número'
             sorted_apartments = self._natural_sort_apartments(valid_apartments)
@@ -59,15 +71,31 @@ class ApartmentService:
         except (IOError, json.JSONDecodeError):
             return [], 1, False
 
-    def _save_data(self):
-        """Guarda la lista de apartamentos en el archivo JSON, manteniendo el orden."""
-        try:
-            sorted_apartments = self._natural_sort_apartments(self.apartments)
-            with open(self.apartments_file, 'w', encoding='utf-8') as f:
-                json.dump(sorted_apartments, f, indent=4, ensure_ascii=False)
-        except IOError as e:
-            logger.warning("Error al guardar datos de apartamentos: %s", e)
+    def _save_data(self, upserted: Optional[List[Dict[str, Any]]] = None, deleted: Optional[List[int]] = None):
+        """
+        Guarda la lista de apartamentos manteniendo el orden. Con upserted/deleted
+        el backend puede persistir solo los registros afectados.
+        """
+        if upserted is None and deleted is None:
+            # Guardado completo: la lista pudo modificarse desde fuera, reconstruir el índice
+            self._rebuild_index()
+            self._records.invalidate()
+        else:
+            self._records.invalidate(upserted or [])
+            for apt in upserted or []:
+                self._by_id[apt.get('id')] = apt
+            for apartment_id in deleted or []:
+                self._by_id.pop(apartment_id, None)
+        sorted_apartments = self._natural_sort_apartments(self.apartments)
+        if not self._store.save(sorted_apartments, upserted=upserted, deleted=deleted):
+            logger.warning("Error al guardar datos de apartamentos en %s", self.apartments_file)
+            return
+        self._loaded_state = self._store.state()
     
+    def _rebuild_index(self):
+        """Reconstruye el índice id -> apartamento a partir de self.apartments."""
+        self._by_id = {apt.get('id'): apt for apt in self.apartments}
+
     def _natural_sort_apartments(self, apartment_list: List[Dict[str, Any]]):
         """Ordena una lista de apartamentos usando ordenamiento natural por el campo 'number'."""
         return sorted(apartment_list, key=lambda x: _natural_sort_key(x.get('number', '')))
@@ -76,12 +104,13 @@ class ApartmentService:
         """Devuelve todos los apartamentos, ordenados."""
         return self._natural_sort_apartments(self.apartments)
 
+    def records(self) -> Tuple[ApartmentRecord, ...]:
+        """Apartamentos como registros tipados de solo lectura, en el orden de get_all_apartments."""
+        return self._records.records(self._natural_sort_apartments(self.apartments), self._loaded_state)
+
     def get_apartment_by_id(self, apartment_id: int) -> Optional[Dict[str, Any]]:
         """Busca un apartamento por su ID."""
-        for apt in self.apartments:
-            if apt.get('id') == apartment_id:
-                return apt
-        return None
+        return self._by_id.get(apartment_id)
 
     def create_apartment(self, apartment_data: Dict[str, Any], building_id: int) -> Dict[str, Any]:
         """Crea un nuevo apartamento asociado a un edificio."""
@@ -94,16 +123,39 @@ class ApartmentService:
         }
         self.apartments.append(new_apartment)
         self._next_id += 1
-        self._save_data()
+        self._save_data(upserted=[new_apartment])
         return new_apartment
 
+    def create_apartments(self, apartments_data: List[Dict[str, Any]], building_id: int) -> List[Dict[str, Any]]:
+        """
+        Crea varias unidades de un edificio con una sola escritura del archivo.
+        Se ejecuta en una transacción: si es parte de otra, se escribe al confirmar esa.
+        """
+        created = []
+        with transaction():
+            now = datetime.now().isoformat()
+            for apartment_data in apartments_data:
+                new_apartment = {
+                    "id": self._next_id,
+                    "building_id": building_id,
+                    "created_at": now,
+                    "updated_at": now,
+                    **apartment_data
+                }
+                self.apartments.append(new_apartment)
+                self._next_id += 1
+                created.append(new_apartment)
+            if created:
+                self._save_data(upserted=created)
+        return created
+
     def update_apartment(self, apartment_id: int, apartment_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Actualiza un apartamento existente."""
         for apt in self.apartments:
             if apt.get('id') == apartment_id:
                 apt.update(apartment_data)
                 apt['updated_at'] = datetime.now().isoformat()
-                self._save_data()
+                self._save_data(upserted=[apt])
                 return apt
         return None
 
@@ -112,22 +164,27 @@ class ApartmentService:
         initial_count = len(self.apartments)
         self.apartments = [apt for apt in self.apartments if apt.get('id') != apartment_id]
         if len(self.apartments) < initial_count:
-            self._save_data()
+            self._save_data(deleted=[apartment_id])
             return True
         return False
 
     def delete_apartments_by_building_id(self, building_id: int) -> bool:
         """Elimina todos los apartamentos asociados a un ID de edificio."""
-        initial_count = len(self.apartments)
+        removed_ids = [apt.get('id') for apt in self.apartments if apt.get('building_id') == building_id]
         self.apartments = [apt for apt in self.apartments if apt.get('building_id') != building_id]
-        if len(self.apartments) < initial_count:
-            self._save_data()
+        if removed_ids:
+            self._save_data(deleted=removed_ids)
             return True
         return False
 
     def reload_data(self):
-        """Recarga los datos de apartamentos desde el archivo JSON."""
+        """Recarga los datos de apartamentos desde el archivo JSON (solo si cambió desde la última carga)."""
+        if self._store.is_fresh(self._loaded_state):
+            return
+        loaded_state = self._store.state()
         apartments, self._next_id, _ = self._load_data()
         self.apartments = apartments
+        self._loaded_state = loaded_state
+        self._rebuild_index()
 
-apartment_service = ApartmentService()
\ No newline at end of file
+apartment_service = LazyService("apartment_service", ApartmentService)
\ No newline at end of file
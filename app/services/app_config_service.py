@@ -10,6 +10,7 @@ from typing import Dict, Any, Optional
 
 from manager.app.paths_config import DATA_DIR, ensure_dirs
 from manager.app.logger import logger
+from manager.app.services.service_registry import LazyService
 from manager.app.persistence import save_json_atomic
 
 
@@ -33,9 +34,14 @@ class AppConfigService:
                 "decimal_separator": ","
             },
             "date_format": "DD/MM/YYYY",
+            "storage": {
+                "backend": "json",
+                "journal": True
+            },
             "backup": {
                 "auto_backup_enabled": True,
                 "interval_hours": 6,
+                "incremental": False,
                 "max_backups": 10,
                 "auto_backup_password": "",
                 "cloud_folder": ""
@@ -133,12 +139,32 @@ class AppConfigService:
         self.config["date_format"] = date_format
         return self._save_config()
     
+    # Métodos para almacenamiento
+    def get_storage_backend(self) -> str:
+        """Obtiene el backend de almacenamiento de datos ("json" o "sqlite")"""
+        return (self.config.get("storage") or {}).get("backend", "json")
+
+    def set_storage_backend(self, backend: str) -> bool:
+        """
+        Establece el backend de almacenamiento. Aplica al reiniciar la aplicación;
+        al abrir SQLite por primera vez se importan los JSON existentes.
+        """
+        if backend not in ["json", "sqlite"]:
+            return False
+        self.config["storage"] = {**(self.config.get("storage") or {}), "backend": backend}
+        return self._save_config()
+
+    def get_storage_journal_enabled(self) -> bool:
+        """Si pagos y gastos guardan sus cambios en bitácora con backend JSON (por defecto sí)"""
+        return bool((self.config.get("storage") or {}).get("journal", True))
+
     # Métodos para backups
     def get_backup_config(self) -> Dict[str, Any]:
         """Obtiene la configuración de backups"""
         return self.config.get("backup", {
             "auto_backup_enabled": True,
             "interval_hours": 6,
+            "incremental": False,
             "max_backups": 10,
             "auto_backup_password": "",
             "cloud_folder": ""
@@ -191,4 +217,4 @@ class AppConfigService:
 
 
 # Instancia global del servicio
-app_config_service = AppConfigService()
+app_config_service = LazyService("app_config_service", AppConfigService)
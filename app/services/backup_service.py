@@ -2,12 +2,20 @@
 Servicio para gestión de backups completos del sistema
 Incluye todos los datos, documentos y metadatos para restauración completa.
 Soporta cifrado AES con contraseña (manual o guardada para automáticos) y copia a carpeta en la nube.
+
+Modo incremental: cada snapshot (backup_incremental_*.zip) solo guarda metadatos y un
+manifiesto ruta -> hash SHA-256. El contenido vive en un almacén de blobs direccionado
+por hash (paquetes ZIP en backups/incremental/packs, cifrados si hay contraseña), de modo
+que los documentos que no cambian se guardan una sola vez. Un índice por ruta
+(tamaño + mtime) evita volver a leer y hashear archivos sin cambios.
 """
 
 import os
 import shutil
 import json
+import hashlib
 import platform
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Callable
@@ -30,6 +38,14 @@ from manager.app.paths_config import (
     ensure_dirs,
 )
 from manager.app.logger import logger
+from manager.app.persistence import save_json_atomic
+from manager.app.services.service_registry import LazyService
+
+FULL_BACKUP_PATTERN = "backup_completo_*.zip"
+INCREMENTAL_BACKUP_PATTERN = "backup_incremental_*.zip"
+MANIFEST_NAME = "backup_manifest.json"
+# Sal fija para derivar el identificador de la clave de cifrado de cada paquete
+_KEY_ID_SALT = b"building-manager-backup-packs"
 
 
 class BackupService:
@@ -48,14 +64,18 @@ class BackupService:
     
     VERSION = "1.0.0"  # Versión del formato de backup
     
+    # Almacén de blobs de los backups incrementales (relativo a la carpeta del snapshot)
+    INCREMENTAL_SUBDIR = "incremental"
+    
     def __init__(self):
         self._ensure_backup_directory()
+        self._incremental_lock = threading.RLock()
         self._auto_backup_enabled = False
         self._backup_timer: Optional[Timer] = None
         self._max_backups = 5
         self._backup_interval_hours = 6
-        # Activar backups automáticos cada 6 horas (crear el primero inmediatamente)
-        self.start_auto_backup(create_immediately=True)
+        # Los backups automáticos (cada 6 horas) los activa la ventana principal una
+        # vez visible, con start_auto_backup(create_immediately=True)
     
     def _ensure_backup_directory(self):
         """Asegura que el directorio de backups existe"""
@@ -87,12 +107,7 @@ class BackupService:
         """
         try:
             if is_auto and password is None:
-                try:
-                    from manager.app.services.app_config_service import app_config_service
-                    backup_config = app_config_service.get_backup_config()
-                    password = (backup_config.get("auto_backup_password") or "").strip() or None
-                except Exception as e:
-                    logger.debug("No se pudo obtener contraseña de auto-backup: %s", e)
+                password = self._get_auto_backup_password()
 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_filename = f"backup_completo_{timestamp}.zip"
@@ -109,20 +124,9 @@ class BackupService:
                 backup_path = self.BACKUP_DIR / backup_filename
 
             backup_path.parent.mkdir(parents=True, exist_ok=True)
-            use_encryption = bool(password and _HAS_PYZIPPER)
-
-            if use_encryption:
-                with pyzipper.AESZipFile(
-                    backup_path,
-                    "w",
-                    compression=pyzipper.ZIP_DEFLATED,
-                    encryption=pyzipper.WZ_AES,
-                ) as zipf:
-                    zipf.setpassword(password.encode("utf-8"))
-                    self._write_backup_contents(zipf)
-            else:
-                with zipfile.ZipFile(backup_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-                    self._write_backup_contents(zipf)
+
+            with self._open_zip_for_write(backup_path, password) as zipf:
+                self._write_backup_contents(zipf)
 
             # Copiar a carpeta en la nube si está configurada
             self._copy_to_cloud_folder(backup_path)
@@ -136,23 +140,297 @@ class BackupService:
             logger.exception("Error al crear backup completo: %s", e)
             return None
 
-    def _write_backup_contents(self, zipf) -> None:
-        """Escribe el contenido del backup en el ZipFile ya abierto (estándar o pyzipper)."""
+    def _open_zip_for_write(self, path: Path, password: Optional[str] = None):
+        """Abre un ZIP para escritura: cifrado AES si hay contraseña y pyzipper disponible."""
+        if password and _HAS_PYZIPPER:
+            zipf = pyzipper.AESZipFile(
+                path,
+                "w",
+                compression=pyzipper.ZIP_DEFLATED,
+                encryption=pyzipper.WZ_AES,
+            )
+            zipf.setpassword(password.encode("utf-8"))
+            return zipf
+        return zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+
+    def _iter_backup_sources(self):
+        """
+        Recorre todo lo que entra en un backup: tuplas (arcname, ruta en disco, bytes).
+        Cada elemento trae la ruta (archivo a copiar) o los bytes (documento exportado).
+        """
+        # Con backend SQLite los JSON de data/ pueden estar desactualizados: se exportan
+        # desde el almacén activo para que el backup siempre contenga JSON vigentes.
+        # Con bitácora (pagos, gastos) se compacta antes para que el JSON incluya todo.
+        from manager.app.storage import compact_journals, export_documents
+        compact_journals()
+        exported = export_documents()
         if self.DATA_DIR.exists():
             for file_path in self.DATA_DIR.glob("*.json"):
-                zipf.write(file_path, f"data/{file_path.name}")
+                if file_path.name in exported:
+                    continue
+                yield f"data/{file_path.name}", file_path, None
+        for file_name, document in exported.items():
+            yield f"data/{file_name}", None, json.dumps(document, ensure_ascii=False, indent=2).encode("utf-8")
         for dir_name, dir_path in self.DOCUMENT_DIRS:
             if dir_path.exists() and dir_path.is_dir():
                 for file_path in dir_path.rglob("*"):
                     if file_path.is_file():
-                        arcname = f"{dir_name}/{file_path.relative_to(dir_path)}"
-                        zipf.write(file_path, arcname)
+                        yield f"{dir_name}/{file_path.relative_to(dir_path).as_posix()}", file_path, None
+
+    def _write_backup_contents(self, zipf) -> None:
+        """Escribe el contenido del backup en el ZipFile ya abierto (estándar o pyzipper)."""
+        for arcname, file_path, data in self._iter_backup_sources():
+            if file_path is not None:
+                zipf.write(file_path, arcname)
+            else:
+                zipf.writestr(arcname, data)
         metadata = self._create_metadata()
         metadata_json = json.dumps(metadata, indent=2, ensure_ascii=False)
         zipf.writestr("backup_metadata.json", metadata_json)
 
-    def _copy_to_cloud_folder(self, backup_path: Path) -> None:
-        """Si hay carpeta en la nube configurada, copia el backup allí."""
+    # ------------------------------------------------------------------
+    # Backups incrementales (snapshots + almacén de blobs por hash)
+    # ------------------------------------------------------------------
+
+    def _packs_dir(self, snapshot_dir: Path) -> Path:
+        """Carpeta de paquetes de blobs que acompaña a los snapshots de snapshot_dir."""
+        return snapshot_dir / self.INCREMENTAL_SUBDIR / "packs"
+
+    def _catalog_path(self) -> Path:
+        return self.BACKUP_DIR / self.INCREMENTAL_SUBDIR / "catalog.json"
+
+    def _file_index_path(self) -> Path:
+        return self.BACKUP_DIR / self.INCREMENTAL_SUBDIR / "file_index.json"
+
+    def _load_incremental_json(self, path: Path, default: Dict[str, Any]) -> Dict[str, Any]:
+        """Lee el catálogo o el índice de archivos; si falta o está corrupto, usa default."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning("No se pudo leer %s, se reconstruye: %s", path, e)
+        return default
+
+    def _load_catalog(self) -> Dict[str, Any]:
+        """
+        Catálogo del almacén incremental:
+        - packs: nombre -> {key_id, created_at} (key_id identifica la contraseña, None sin cifrar)
+        - blobs: hash -> {pack, size}
+        - snapshots: archivo -> {created_at, packs, files, total_bytes, new_bytes, shared_bytes, new_files}
+        """
+        catalog = self._load_incremental_json(self._catalog_path(), {})
+        for key in ("packs", "blobs", "snapshots"):
+            catalog.setdefault(key, {})
+        return catalog
+
+    @staticmethod
+    def _key_id(password: Optional[str]) -> Optional[str]:
+        """Identificador (derivado, no reversible) de la clave con la que se cifra un paquete."""
+        if not password:
+            return None
+        return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), _KEY_ID_SALT, 100_000).hex()
+
+    def create_incremental_backup(self, password: Optional[str] = None, is_auto: bool = False) -> Optional[str]:
+        """
+        Crea un snapshot incremental en el directorio de backups.
+
+        Solo los archivos cuyo contenido (hash SHA-256) no esté ya en el almacén se
+        escriben en un paquete nuevo; el resto se referencia. Los blobs se reutilizan
+        solo si su paquete se cifró con la misma contraseña.
+
+        Returns:
+            Ruta del snapshot creado o None si hay error
+        """
+        with self._incremental_lock:
+            pack_path = None
+            try:
+                if is_auto and password is None:
+                    password = self._get_auto_backup_password()
+                use_encryption = bool(password and _HAS_PYZIPPER)
+                key_id = self._key_id(password) if use_encryption else None
+
+                packs_dir = self._packs_dir(self.BACKUP_DIR)
+                packs_dir.mkdir(parents=True, exist_ok=True)
+                existing_packs = {p.name for p in packs_dir.glob("pack_*.zip")}
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                suffix = 0
+                # Nunca sobrescribir un snapshot o paquete existente (dos backups en el mismo segundo)
+                while True:
+                    stamp = timestamp if suffix == 0 else f"{timestamp}_{suffix}"
+                    snapshot_path = self.BACKUP_DIR / f"backup_incremental_{stamp}.zip"
+                    pack_name = f"pack_{stamp}.zip"
+                    if not snapshot_path.exists() and pack_name not in existing_packs:
+                        break
+                    suffix += 1
+                pack_path = packs_dir / pack_name
+
+                catalog = self._load_catalog()
+                file_index = self._load_incremental_json(self._file_index_path(), {})
+                seen_paths = set()
+                manifest: Dict[str, Dict[str, Any]] = {}
+                referenced_packs = set()
+                stats = {"total_bytes": 0, "new_bytes": 0, "shared_bytes": 0, "new_files": 0}
+                pack_zip = None
+
+                try:
+                    for arcname, file_path, data in self._iter_backup_sources():
+                        digest = None
+                        if file_path is not None:
+                            path_key = str(file_path)
+                            seen_paths.add(path_key)
+                            st = file_path.stat()
+                            cached = file_index.get(path_key)
+                            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                                # Sin cambios desde el último snapshot: no se vuelve a leer
+                                digest, size = cached[2], st.st_size
+                        if digest is None:
+                            if data is None:
+                                data = file_path.read_bytes()
+                            digest, size = hashlib.sha256(data).hexdigest(), len(data)
+                            if file_path is not None:
+                                file_index[path_key] = [st.st_size, st.st_mtime_ns, digest]
+
+                        blob = catalog["blobs"].get(digest)
+                        reusable = (
+                            blob is not None
+                            and blob.get("pack") in catalog["packs"]
+                            and catalog["packs"][blob["pack"]].get("key_id") == key_id
+                            and blob["pack"] in existing_packs
+                        )
+                        if reusable:
+                            stats["shared_bytes"] += size
+                        else:
+                            if data is None:
+                                data = file_path.read_bytes()
+                                digest, size = hashlib.sha256(data).hexdigest(), len(data)
+                                file_index[path_key] = [st.st_size, st.st_mtime_ns, digest]
+                            if pack_zip is None:
+                                pack_zip = self._open_zip_for_write(pack_path, password if use_encryption else None)
+                                existing_packs.add(pack_name)
+                                catalog["packs"][pack_name] = {"key_id": key_id, "created_at": datetime.now().isoformat()}
+                            pack_zip.writestr(digest, data)
+                            catalog["blobs"][digest] = {"pack": pack_name, "size": size}
+                            stats["new_bytes"] += size
+                            stats["new_files"] += 1
+                        blob_pack = catalog["blobs"][digest]["pack"]
+                        referenced_packs.add(blob_pack)
+                        stats["total_bytes"] += size
+                        manifest[arcname] = {"hash": digest, "size": size, "pack": blob_pack}
+                finally:
+                    if pack_zip is not None:
+                        pack_zip.close()
+
+                metadata = self._create_metadata()
+                metadata["backup_type"] = "incremental"
+                metadata["incremental"] = dict(stats, files=len(manifest), packs=sorted(referenced_packs))
+                with self._open_zip_for_write(snapshot_path, password if use_encryption else None) as zipf:
+                    zipf.writestr(MANIFEST_NAME, json.dumps({"files": manifest}, ensure_ascii=False, indent=2))
+                    zipf.writestr("backup_metadata.json", json.dumps(metadata, indent=2, ensure_ascii=False))
+
+                catalog["snapshots"][snapshot_path.name] = {
+                    "created_at": metadata["created_at"],
+                    "packs": sorted(referenced_packs),
+                    "files": len(manifest),
+                    **stats,
+                }
+                # Olvidar archivos que ya no existen para que el índice no crezca sin límite
+                file_index = {k: v for k, v in file_index.items() if k in seen_paths}
+                save_json_atomic(self._catalog_path(), catalog)
+                save_json_atomic(self._file_index_path(), file_index)
+
+                self._copy_to_cloud_folder(snapshot_path, packs=sorted(referenced_packs))
+                self._cleanup_old_backups()
+                logger.info(
+                    "Backup incremental %s: %d archivos, %d bytes nuevos, %d compartidos",
+                    snapshot_path.name, len(manifest), stats["new_bytes"], stats["shared_bytes"],
+                )
+                return str(snapshot_path)
+            except Exception as e:
+                logger.exception("Error al crear backup incremental: %s", e)
+                # Un paquete a medio escribir no quedó registrado en el catálogo: descartarlo
+                if pack_path is not None and pack_path.name not in self._load_catalog()["packs"]:
+                    pack_path.unlink(missing_ok=True)
+                return None
+
+    def _read_manifest(self, zipf) -> Dict[str, Dict[str, Any]]:
+        """Manifiesto ruta -> {hash, size, pack} de un snapshot incremental ya abierto."""
+        return json.loads(zipf.read(MANIFEST_NAME).decode("utf-8")).get("files", {})
+
+    def _restore_incremental(self, zipf, backup_file: Path, password: Optional[str], restored_files: List[str]) -> None:
+        """Reconstruye los archivos de un snapshot incremental leyendo cada blob de su paquete."""
+        manifest = self._read_manifest(zipf)
+        packs_dir = self._packs_dir(backup_file.parent)
+        # nombre de paquete -> (ZipFile abierto, conjunto de hashes que contiene)
+        open_packs: Dict[str, Any] = {}
+        all_packs = sorted(p.name for p in packs_dir.glob("pack_*.zip"))
+        try:
+            for arcname, entry in manifest.items():
+                target_path = self._restore_target(arcname)
+                if target_path is None:
+                    continue
+                digest = entry["hash"]
+                data = None
+                # El manifiesto indica el paquete; si no existe se busca en los demás
+                candidates = [entry.get("pack")] + all_packs
+                for name in candidates:
+                    if not name:
+                        continue
+                    if name not in open_packs:
+                        if not (packs_dir / name).exists():
+                            continue
+                        pack = self._open_backup_zip(packs_dir / name, password=password)
+                        open_packs[name] = (pack, set(pack.namelist()))
+                    pack, digests = open_packs[name]
+                    if digest in digests:
+                        data = pack.read(digest)
+                        break
+                if data is None:
+                    raise FileNotFoundError(f"Falta el contenido de {arcname} en el almacén de backups")
+                if hashlib.sha256(data).hexdigest() != digest:
+                    raise ValueError(f"El contenido de {arcname} no coincide con su hash")
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(target_path, "wb") as target:
+                    target.write(data)
+                restored_files.append(str(target_path))
+        finally:
+            for pack, _ in open_packs.values():
+                pack.close()
+
+    def _restore_target(self, member: str) -> Optional[Path]:
+        """Ruta de destino de un miembro del backup (data/ o carpetas de documentos)."""
+        if member.startswith("data/"):
+            return self.DATA_DIR / member.replace("data/", "")
+        if any(member.startswith(f"{d[0]}/") for d in self.DOCUMENT_DIRS):
+            return self.BASE_DIR / member
+        return None
+
+    def _get_auto_backup_password(self) -> Optional[str]:
+        """Contraseña de backups automáticos guardada en la configuración (o None)."""
+        try:
+            from manager.app.services.app_config_service import app_config_service
+            backup_config = app_config_service.get_backup_config()
+            return (backup_config.get("auto_backup_password") or "").strip() or None
+        except Exception as e:
+            logger.debug("No se pudo obtener contraseña de auto-backup: %s", e)
+            return None
+
+    def _is_incremental_enabled(self) -> bool:
+        """Indica si los backups automáticos deben ser incrementales (configuración)."""
+        try:
+            from manager.app.services.app_config_service import app_config_service
+            return bool(app_config_service.get_backup_config().get("incremental", False))
+        except Exception:
+            return False
+
+    def _copy_to_cloud_folder(self, backup_path: Path, packs: Optional[List[str]] = None) -> None:
+        """
+        Si hay carpeta en la nube configurada, copia el backup allí. Para snapshots
+        incrementales se copian también los paquetes de blobs que aún no estén en destino.
+        """
         try:
             from manager.app.services.app_config_service import app_config_service
             backup_config = app_config_service.get_backup_config()
@@ -162,6 +440,11 @@ class BackupService:
             dest_dir = Path(cloud_folder)
             if not dest_dir.is_dir():
                 dest_dir.mkdir(parents=True, exist_ok=True)
+            for pack_name in packs or []:
+                dest_pack = self._packs_dir(dest_dir) / pack_name
+                if not dest_pack.exists():
+                    dest_pack.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(self._packs_dir(backup_path.parent) / pack_name, dest_pack)
             dest_file = dest_dir / backup_path.name
             shutil.copy2(backup_path, dest_file)
             logger.info("Backup copiado a carpeta en la nube: %s", dest_file)
@@ -322,19 +605,15 @@ class BackupService:
                 result["safety_backup"] = safety_backup
 
             with self._open_backup_zip(backup_file, password=password) as zipf:
-                for member in zipf.namelist():
-                    if member == "backup_metadata.json":
-                        continue
-                    if member.startswith("data/"):
-                        file_name = member.replace("data/", "")
-                        target_path = self.DATA_DIR / file_name
-                        target_path.parent.mkdir(parents=True, exist_ok=True)
-                        with zipf.open(member) as source:
-                            with open(target_path, "wb") as target:
-                                target.write(source.read())
-                        result["restored_files"].append(str(target_path))
-                    elif any(member.startswith(f"{d[0]}/") for d in self.DOCUMENT_DIRS):
-                        target_path = self.BASE_DIR / member
+                if metadata.get("backup_type") == "incremental":
+                    self._restore_incremental(zipf, backup_file, password, result["restored_files"])
+                else:
+                    for member in zipf.namelist():
+                        if member == "backup_metadata.json":
+                            continue
+                        target_path = self._restore_target(member)
+                        if target_path is None:
+                            continue
                         target_path.parent.mkdir(parents=True, exist_ok=True)
                         with zipf.open(member) as source:
                             with open(target_path, "wb") as target:
@@ -362,17 +641,21 @@ class BackupService:
             from manager.app.services.expense_service import expense_service
             from manager.app.services.building_service import building_service
             
+            # Con backend SQLite, volcar al almacén los JSON recién restaurados
+            from manager.app.storage import import_json_files
+            import_json_files()
+
             # Recargar datos de cada servicio
             if hasattr(tenant_service, '_load_data'):
                 tenant_service._load_data()
             if hasattr(payment_service, '_load_data'):
                 payment_service._load_data()
-            if hasattr(apartment_service, '_load_data'):
-                apartment_service._load_data()
+            if hasattr(apartment_service, 'reload_data'):
+                apartment_service.reload_data()
             if hasattr(expense_service, '_load_data'):
                 expense_service._load_data()
-            if hasattr(building_service, '_load_buildings'):
-                building_service._load_buildings()
+            if hasattr(building_service, 'reload_data'):
+                building_service.reload_data()
                 
         except Exception as e:
             logger.warning("No se pudieron recargar todos los servicios: %s. Se recomienda reiniciar la aplicación.", e)
@@ -406,7 +689,17 @@ class BackupService:
                 return result
             with self._open_backup_zip(backup_file, password=password) as zipf:
                 result["files_count"] = len(zipf.namelist())
+                manifest = self._read_manifest(zipf) if MANIFEST_NAME in zipf.namelist() else None
             metadata = self._extract_metadata(backup_file, password=password)
+            if metadata and manifest is not None:
+                # Snapshot incremental: todos los paquetes que referencia deben existir
+                result["files_count"] = len(manifest)
+                packs_dir = self._packs_dir(backup_file.parent)
+                missing = sorted({e.get("pack") for e in manifest.values() if not (packs_dir / str(e.get("pack"))).exists()})
+                if missing:
+                    result["metadata"] = metadata
+                    result["message"] = f"Faltan paquetes del almacén incremental: {', '.join(missing)}"
+                    return result
             if metadata:
                 result["valid"] = True
                 result["metadata"] = metadata
@@ -420,22 +713,49 @@ class BackupService:
     def _cleanup_old_backups(self):
         """Elimina backups antiguos según la configuración de retención"""
         try:
-            backups = list(self.BACKUP_DIR.glob("backup_completo_*.zip"))
-            backups.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            # Mantener solo los más recientes según max_backups
-            if len(backups) > self._max_backups:
-                for old_backup in backups[self._max_backups:]:
-                    try:
-                        old_backup.unlink()
-                    except Exception as e:
-                        logger.warning("Error al eliminar backup antiguo: %s", e)
+            for pattern in (FULL_BACKUP_PATTERN, INCREMENTAL_BACKUP_PATTERN):
+                backups = list(self.BACKUP_DIR.glob(pattern))
+                backups.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+                
+                # Mantener solo los más recientes según max_backups
+                if len(backups) > self._max_backups:
+                    for old_backup in backups[self._max_backups:]:
+                        try:
+                            old_backup.unlink()
+                        except Exception as e:
+                            logger.warning("Error al eliminar backup antiguo: %s", e)
+            self._collect_unused_packs()
         except Exception as e:
             logger.warning("Error al limpiar backups antiguos: %s", e)
     
+    def _collect_unused_packs(self):
+        """Borra los paquetes de blobs que ya no referencia ningún snapshot incremental."""
+        catalog_path = self._catalog_path()
+        if not catalog_path.exists():
+            return
+        with self._incremental_lock:
+            catalog = self._load_catalog()
+            existing = {p.name for p in self.BACKUP_DIR.glob(INCREMENTAL_BACKUP_PATTERN)}
+            catalog["snapshots"] = {k: v for k, v in catalog["snapshots"].items() if k in existing}
+            in_use = {pack for snap in catalog["snapshots"].values() for pack in snap.get("packs", [])}
+            unused = [name for name in catalog["packs"] if name not in in_use]
+            if not unused:
+                save_json_atomic(catalog_path, catalog)
+                return
+            packs_dir = self._packs_dir(self.BACKUP_DIR)
+            for name in unused:
+                try:
+                    (packs_dir / name).unlink(missing_ok=True)
+                except Exception as e:
+                    logger.warning("Error al eliminar paquete de backup %s: %s", name, e)
+                    continue
+                del catalog["packs"][name]
+            catalog["blobs"] = {h: b for h, b in catalog["blobs"].items() if b.get("pack") in catalog["packs"]}
+            save_json_atomic(catalog_path, catalog)
+    
     def get_backup_status(self) -> Dict[str, Any]:
         """Obtiene el estado actual de los backups"""
-        backups = list(self.BACKUP_DIR.glob("backup_completo_*.zip"))
+        backups = list(self.BACKUP_DIR.glob(FULL_BACKUP_PATTERN)) + list(self.BACKUP_DIR.glob(INCREMENTAL_BACKUP_PATTERN))
         backups.sort(key=lambda x: x.stat().st_mtime, reverse=True)
         
         next_backup = None
@@ -473,7 +793,11 @@ class BackupService:
             self.stop_auto_backup()
         
         self._auto_backup_enabled = True
-        self._schedule_next_backup(create_now=create_immediately)
+        if create_immediately:
+            # El primer backup se genera en un hilo en segundo plano para no bloquear la interfaz
+            self._start_backup_timer(0)
+        else:
+            self._schedule_next_backup(create_now=False)
     
     def stop_auto_backup(self):
         """Detiene los backups automáticos"""
@@ -490,20 +814,32 @@ class BackupService:
         # Crear backup ahora si se indica (is_auto=True para usar contraseña de configuración)
         if create_now:
             try:
-                self.create_full_backup(is_auto=True)
+                if self._is_incremental_enabled():
+                    self.create_incremental_backup(is_auto=True)
+                else:
+                    self.create_full_backup(is_auto=True)
             except Exception as e:
                 logger.warning("Error al crear backup automático: %s", e)
         
         # Programar próximo backup
-        interval_seconds = self._backup_interval_hours * 3600
-        self._backup_timer = Timer(interval_seconds, lambda: self._schedule_next_backup(create_now=True))
+        if self._auto_backup_enabled:
+            self._start_backup_timer(self._backup_interval_hours * 3600)
+    
+    def _start_backup_timer(self, delay_seconds: float):
+        """Arranca el temporizador (hilo daemon) que ejecuta el próximo backup automático"""
+        self._backup_timer = Timer(delay_seconds, lambda: self._schedule_next_backup(create_now=True))
         self._backup_timer.daemon = True
         self._backup_timer.start()
     
     def get_backup_list(self) -> List[Dict[str, Any]]:
-        """Obtiene la lista de backups disponibles"""
-        backups = list(self.BACKUP_DIR.glob("backup_completo_*.zip"))
+        """
+        Obtiene la lista de backups disponibles (completos e incrementales).
+        new_bytes/shared_bytes indican cuánto contenido aportó cada backup y cuánto
+        comparte con los anteriores (en un backup completo todo es nuevo).
+        """
+        backups = list(self.BACKUP_DIR.glob(FULL_BACKUP_PATTERN)) + list(self.BACKUP_DIR.glob(INCREMENTAL_BACKUP_PATTERN))
         backups.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+        snapshots = self._load_catalog()["snapshots"] if self._catalog_path().exists() else {}
         
         backup_list = []
         for backup_file in backups:
@@ -515,8 +851,17 @@ class BackupService:
                 "path": str(backup_file),
                 "size": stat.st_size,
                 "created": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                "size_mb": round(stat.st_size / (1024 * 1024), 2)
+                "size_mb": round(stat.st_size / (1024 * 1024), 2),
+                "backup_type": "full",
+                "new_bytes": stat.st_size,
+                "shared_bytes": 0,
             }
+            snapshot = snapshots.get(backup_file.name)
+            if snapshot:
+                backup_info["backup_type"] = "incremental"
+                backup_info["new_bytes"] = snapshot.get("new_bytes", 0)
+                backup_info["shared_bytes"] = snapshot.get("shared_bytes", 0)
+                backup_info["files"] = snapshot.get("files", 0)
             
             if metadata:
                 backup_info["metadata"] = metadata
@@ -533,4 +878,4 @@ class BackupService:
 
 
 # Instancia global del servicio
-backup_service = BackupService()
+backup_service = LazyService("backup_service", BackupService)
@@ -8,6 +8,8 @@ from typing import Dict, Any, Optional, List
 
 from manager.app.paths_config import DATA_DIR, ensure_dirs
 from manager.app.logger import logger
+from manager.app.services.service_registry import LazyService
+from manager.app.services.unit_of_work import current_unit_of_work, transaction
 
 BUILDING_STRUCTURE_FILE = str(DATA_DIR / "building_structure.json")
 
@@ -31,13 +33,26 @@ class BuildingService:
             logger.warning("Error al cargar la estructura de los edificios: %s", e)
             return []
 
+    def reload_data(self):
+        """Vuelve a leer las estructuras de edificios desde el archivo JSON."""
+        self._buildings = self._load_buildings()
+
     def _save_buildings(self):
-        """Guarda la lista de estructuras actual en el archivo JSON."""
+        """Guarda la lista de estructuras actual en el archivo JSON (al confirmar, si hay transacción)."""
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.defer("building_structure", self._write_buildings, rollback=self.reload_data)
+            return
+        self._write_buildings()
+
+    def _write_buildings(self) -> bool:
         try:
             with open(BUILDING_STRUCTURE_FILE, 'w', encoding='utf-8') as f:
                 json.dump(self._buildings, f, indent=4, ensure_ascii=False)
+            return True
         except IOError as e:
             logger.warning("Error al guardar la estructura de los edificios: %s", e)
+            return False
 
     def _get_next_building_id(self) -> int:
         """Calcula el siguiente ID de edificio disponible."""
@@ -99,7 +114,8 @@ class BuildingService:
     ):
         """
         Crea y guarda la estructura completa de un nuevo edificio y genera sus unidades
-        individuales en el ApartmentService.
+        individuales en el ApartmentService. Todo se escribe al final en una transacción
+        (una escritura por archivo); si algo falla no queda un edificio a medias.
         """
         # Verificar si ya existe un edificio (versión profesional)
         if not self.can_create_new_building():
@@ -124,9 +140,6 @@ class BuildingService:
             "phone": phone,
             "email": email,
         }
-        self._buildings.append(new_building)
-        self._save_buildings()
-
         # 2. Generar los apartamentos para este nuevo edificio en ApartmentService
         apartments_to_create = []
         for floor_info in floors_config:
@@ -150,10 +163,12 @@ class BuildingService:
                 "bathrooms": "0", "area": "0",
                 "description": f"Unidad especial: {unit['type']}"
             })
-       
-        for apt_data in apartments_to_create:
-            # Asociar cada apartamento con el ID del nuevo edificio
-            apartment_service.create_apartment(apt_data, building_id)
+
+        with transaction():
+            self._buildings.append(new_building)
+            self._save_buildings()
+            # Asociar cada apartamento con el ID del nuevo edificio (una sola escritura)
+            apartment_service.create_apartments(apartments_to_create, building_id)
 
         return True
 
@@ -164,4 +179,4 @@ class BuildingService:
                 return b
         return None
 
-building_service = BuildingService() 
\ No newline at end of file
+building_service = LazyService("building_service", BuildingService)
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Clave de fecha canónica de los registros.
+
+Las fechas se guardan como texto en el formato de cada módulo (fecha_pago y
+fecha_ingreso en DD/MM/YYYY, fecha de gastos y asientos en YYYY-MM-DD). Al escribir
+un registro los servicios agregan, por cada campo de fecha, el campo "<campo>_iso"
+con la fecha en YYYY-MM-DD (con ceros), que se ordena y compara como texto: las
+lecturas comparan claves en lugar de parsear fechas.
+
+Al cargar un archivo se recalculan en memoria las claves que faltan (archivos anteriores)
+o que no coinciden con su campo (p. ej. la fecha se editó a mano en el JSON) con
+stamp_stale; leer no escribe el archivo: los registros corregidos se guardan con el
+próximo guardado del servicio (with_restamped). Un registro sin clave se resuelve
+parseando el campo (record_date_key).
+
+Uso:
+    stamp_date_keys(payment, PAYMENT_DATE_FIELDS)           # al crear o editar
+    record_date_key(payment, "fecha_pago")                  # "2025-03-07" o None
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+PAYMENT_DATE_FIELDS = ("fecha_pago",)
+TENANT_DATE_FIELDS = ("fecha_ingreso",)
+EXPENSE_DATE_FIELDS = ("fecha",)
+ENTRY_DATE_FIELDS = ("fecha",)
+
+KEY_SUFFIX = "_iso"
+
+
+def key_field(field: str) -> str:
+    """Nombre del campo con la clave canónica de field ("fecha_pago" -> "fecha_pago_iso")."""
+    return field + KEY_SUFFIX
+
+
+def date_key(value: Any) -> Optional[str]:
+    """
+    "YYYY-MM-DD" de una fecha "DD/MM/YYYY" (admite día y mes sin cero inicial) o ISO
+    (fecha o fecha y hora); None si no es una fecha válida.
+    """
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    if "/" in text:
+        parts = text.split("/")
+        if len(parts) != 3:
+            return None
+        day, month, year = parts
+    else:
+        # ISO: se descarta la hora ("2025-03-07T10:00:00" o "2025-03-07 10:00")
+        parts = text.split("T")[0].split(" ")[0].split("-")
+        if len(parts) != 3:
+            return None
+        year, month, day = parts
+    if not (len(year) == 4 and 1 <= len(month) <= 2 and 1 <= len(day) <= 2
+            and (year + month + day).isdigit()):
+        return None
+    try:
+        return date(int(year), int(month), int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+def stamp_date_keys(record: Dict[str, Any], fields: Sequence[str]) -> bool:
+    """Calcula las claves de los campos de fecha de record. True si alguna cambió."""
+    changed = False
+    for field in fields:
+        key = key_field(field)
+        value = date_key(record.get(field))
+        if value is None:
+            if key in record:
+                del record[key]
+                changed = True
+        elif record.get(key) != value:
+            record[key] = value
+            changed = True
+    return changed
+
+
+def stamp_stale(records: Iterable[Dict[str, Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Al cargar: recalcula las claves que faltan o no coinciden con su campo (fecha editada
+    fuera de la aplicación). Devuelve los registros modificados.
+    """
+    # Las fechas se repiten mucho: cada texto distinto se parsea una sola vez
+    keys: Dict[Any, Optional[str]] = {}
+    changed = []
+    for record in records:
+        stale = False
+        for field in fields:
+            value = record.get(field)
+            try:
+                expected = keys[value]
+            except KeyError:
+                expected = keys[value] = date_key(value)
+            except TypeError:
+                expected = date_key(value)
+            if record.get(key_field(field)) != expected:
+                stale = True
+        if stale and stamp_date_keys(record, fields):
+            changed.append(record)
+    return changed
+
+
+def with_restamped(upserted: Optional[List[Dict[str, Any]]], deleted: Optional[Iterable[Any]],
+                   restamped: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Registros de un guardado incremental más los corregidos al cargar (stamp_stale) que
+    siguen existiendo. En un guardado completo (sin upserted ni deleted) devuelve None.
+    """
+    if (upserted is None and deleted is None) or not restamped:
+        return upserted
+    gone = set(deleted or ())
+    listed = {id(record) for record in upserted or ()}
+    return list(upserted or ()) + [record for record in restamped
+                                   if id(record) not in listed and record.get("id") not in gone]
+
+
+def record_date_key(record: Dict[str, Any], field: str) -> Optional[str]:
+    """Clave "YYYY-MM-DD" de record[field]: la guardada o, si falta, la calculada."""
+    key = record.get(key_field(field))
+    if key is not None:
+        return key
+    return date_key(record.get(field))
+
+
+def key_to_datetime(key: Optional[str]) -> Optional[datetime]:
+    """datetime a las 00:00 de una clave "YYYY-MM-DD" (None si key es None)."""
+    if key is None:
+        return None
+    return datetime(int(key[:4]), int(key[5:7]), int(key[8:10]))
+
+
+def key_to_display(key: str) -> str:
+    """Clave "YYYY-MM-DD" como "DD/MM/YYYY" (formato de la interfaz)."""
+    return f"{key[8:10]}/{key[5:7]}/{key[:4]}"
@@ -0,0 +1,400 @@
+"""
+Bandeja de salida de emails (email_outbox.json) con envío en segundo plano.
+
+Los envíos pedidos desde la interfaz no esperan al servidor SMTP: enqueue() guarda el
+mensaje en la bandeja y devuelve su id de inmediato. Un hilo despachador envía los
+mensajes pendientes por una sesión SMTP y reintenta los fallos transitorios con espera
+exponencial (RETRY_BASE_SECONDS, el doble en cada intento, hasta RETRY_MAX_SECONDS) hasta
+MAX_ATTEMPTS intentos. Si no se puede conectar con el servidor (o las credenciales se
+rechazan), el intento se cuenta solo al primer mensaje y el resto espera a su reintento.
+La interfaz consulta get_status(id), p. ej. con after().
+
+Estados: "pendiente" -> "enviando" -> "enviado" | "fallido". Un mensaje que quedó en
+"enviando" al cerrarse la aplicación vuelve a "pendiente" al iniciar: puede enviarse dos
+veces, pero no se pierde. Si la entrada lleva "notification" (registro del historial de
+notificaciones), se guarda en notifications.json cuando el mensaje sale.
+
+Tipos de mensaje (kind):
+    "simple"      subject, body
+    "attachment"  subject, body, pdf_path
+    "receipt"     pdf_path, payment_date, payment_amount (texto de send_receipt_email)
+"""
+
+import json
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from manager.app.paths_config import DATA_DIR, ensure_dirs
+from manager.app.logger import logger
+from manager.app.services.email_service import email_service
+from manager.app.services.service_registry import LazyService
+from manager.app.storage import open_store
+
+STATUS_PENDING = "pendiente"
+STATUS_SENDING = "enviando"
+STATUS_SENT = "enviado"
+STATUS_FAILED = "fallido"
+
+KINDS = ("simple", "attachment", "receipt")
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 30 * 60
+# Espera máxima del despachador sin mensajes que enviar (vuelve a mirar la configuración)
+IDLE_WAIT_SECONDS = 60
+# Los mensajes enviados se conservan estos días en la bandeja (consulta de estado)
+KEEP_SENT_DAYS = 30
+
+
+def retry_delay(attempts: int) -> float:
+    """Segundos de espera antes del intento siguiente a attempts intentos fallidos."""
+    return min(RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_MAX_SECONDS)
+
+
+class EmailOutbox:
+    """Cola persistente de emails salientes y su hilo despachador."""
+
+    DATA_FILE = DATA_DIR / "email_outbox.json"
+
+    def __init__(self):
+        self._ensure_data_file()
+        self._store = open_store("outbox", self.DATA_FILE)
+        self._loaded_state = None
+        # Protege self.entries: la interfaz encola y el despachador actualiza estados
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connect: Optional[Callable[[], smtplib.SMTP]] = None
+        self._load_data()
+        self._recover()
+
+    def _ensure_data_file(self):
+        ensure_dirs()
+        if not self.DATA_FILE.exists():
+            self.DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.DATA_FILE, 'w', encoding='utf-8') as f:
+                json.dump([], f, ensure_ascii=False, indent=2)
+
+    def _load_data(self):
+        """Carga la bandeja (sin releer si el archivo no cambió)."""
+        with self._lock:
+            if self._store.is_fresh(self._loaded_state):
+                return
+            loaded_state = self._store.state()
+            try:
+                self.entries = self._store.load()
+                if not isinstance(self.entries, list):
+                    self.entries = []
+                self._loaded_state = loaded_state
+            except (FileNotFoundError, json.JSONDecodeError):
+                logger.warning("No se pudo leer la bandeja de salida: %s", self.DATA_FILE)
+                self.entries = []
+
+    def _save_data(self, upserted: Optional[List[Dict[str, Any]]] = None,
+                   deleted: Optional[List[int]] = None):
+        with self._lock:
+            if self._store.save(self.entries, upserted=upserted, deleted=deleted):
+                self._loaded_state = self._store.state()
+            else:
+                logger.warning("No se pudo guardar la bandeja de salida")
+
+    def _recover(self):
+        """
+        Al iniciar: los mensajes interrumpidos en "enviando" vuelven a "pendiente" y se
+        descartan los enviados hace más de KEEP_SENT_DAYS días.
+        """
+        cutoff = (datetime.now() - timedelta(days=KEEP_SENT_DAYS)).isoformat()
+        with self._lock:
+            interrupted = [e for e in self.entries if e.get("status") == STATUS_SENDING]
+            for entry in interrupted:
+                entry["status"] = STATUS_PENDING
+            old = [e.get("id") for e in self.entries
+                   if e.get("status") == STATUS_SENT and (e.get("sent_at") or "") < cutoff]
+            if old:
+                self.entries = [e for e in self.entries if e.get("id") not in old]
+            if interrupted or old:
+                self._save_data(upserted=interrupted, deleted=old)
+
+    def enqueue(
+        self,
+        kind: str,
+        recipient_email: str,
+        recipient_name: str,
+        subject: str = "",
+        body: str = "",
+        pdf_path: Optional[str] = None,
+        payment_date: Optional[str] = None,
+        payment_amount: Optional[float] = None,
+        notification: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Guarda un mensaje en la bandeja y despierta al despachador (lo inicia si hace
+        falta). Devuelve el id para consultar su estado con get_status.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Tipo de mensaje desconocido: {kind}")
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._load_data()
+            entry = {
+                "id": max((e.get("id", 0) for e in self.entries), default=0) + 1,
+                "kind": kind,
+                "recipient_email": recipient_email,
+                "recipient_name": recipient_name,
+                "subject": subject,
+                "body": body,
+                "pdf_path": pdf_path,
+                "payment_date": payment_date,
+                "payment_amount": payment_amount,
+                "notification": notification,
+                "status": STATUS_PENDING,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "last_error": None,
+                "created_at": now,
+                "sent_at": None,
+            }
+            self.entries.append(entry)
+            self._save_data(upserted=[entry])
+        self.start()
+        self._wake.set()
+        return entry["id"]
+
+    def get_status(self, outbox_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Estado de un mensaje: status, attempts, last_error, next_attempt_at y sent_at
+        (None si el id no existe).
+        """
+        with self._lock:
+            for entry in self.entries:
+                if entry.get("id") == outbox_id:
+                    return {key: entry.get(key) for key in
+                            ("id", "status", "attempts", "last_error", "next_attempt_at", "sent_at")}
+        return None
+
+    def references(self, pdf_path: str) -> bool:
+        """Hay un mensaje por enviar (pendiente o en envío) que adjunta pdf_path."""
+        with self._lock:
+            self._load_data()
+            return any(e.get("pdf_path") == pdf_path and e.get("status") in (STATUS_PENDING, STATUS_SENDING)
+                       for e in self.entries)
+
+    def pending_count(self) -> int:
+        """Mensajes aún por enviar (pendientes o en envío)."""
+        with self._lock:
+            return sum(1 for e in self.entries if e.get("status") in (STATUS_PENDING, STATUS_SENDING))
+
+    # ------------------------------------------------------------------
+    # Despachador
+    # ------------------------------------------------------------------
+
+    def start(self, connect: Optional[Callable[[], smtplib.SMTP]] = None) -> None:
+        """
+        Inicia el hilo despachador si no está corriendo. connect reemplaza la conexión
+        configurada (p. ej. un servidor SMTP local de prueba).
+        """
+        with self._lock:
+            if connect is not None:
+                self._connect = connect
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+            self._thread.start()
+
+    def wake(self) -> None:
+        """Despierta al despachador (p. ej. al guardar la configuración de email)."""
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Detiene el despachador al terminar el mensaje en curso."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.dispatch_due()
+            except Exception as e:
+                logger.exception("Error en el despachador de emails: %s", e)
+            self._wake.wait(self._seconds_to_next())
+            self._wake.clear()
+
+    def _can_send(self) -> bool:
+        """Hay una conexión de prueba o email configurado."""
+        return self._connect is not None or email_service.is_configured()
+
+    def _seconds_to_next(self) -> float:
+        """
+        Segundos hasta el próximo mensaje pendiente (como máximo IDLE_WAIT_SECONDS). Sin
+        email configurado se espera IDLE_WAIT_SECONDS o hasta wake() aunque haya mensajes.
+        """
+        if not self._can_send():
+            return IDLE_WAIT_SECONDS
+        with self._lock:
+            due = [e.get("next_attempt_at") or "" for e in self.entries if e.get("status") == STATUS_PENDING]
+        if not due:
+            return IDLE_WAIT_SECONDS
+        try:
+            wait = (datetime.fromisoformat(min(due)) - datetime.now()).total_seconds()
+        except ValueError:
+            wait = 0
+        return min(max(wait, 0.0), IDLE_WAIT_SECONDS)
+
+    def dispatch_due(self) -> int:
+        """
+        Envía los mensajes pendientes cuyo próximo intento ya llegó, por una sola sesión
+        SMTP. Devuelve cuántos se enviaron. Lo llama el despachador; sin email configurado
+        los mensajes esperan en la bandeja.
+        """
+        if not self._can_send():
+            return 0
+        connect = self._connect
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._load_data()
+            due = [e for e in self.entries
+                   if e.get("status") == STATUS_PENDING and (e.get("next_attempt_at") or "") <= now]
+            if not due:
+                return 0
+            for entry in due:
+                entry["status"] = STATUS_SENDING
+            self._save_data(upserted=due)
+
+        sent = 0
+        try:
+            sender = email_service.sender_address()
+            with email_service.open_session(connect) as session:
+                for position, entry in enumerate(due):
+                    if self._stop.is_set():
+                        self._release(due[position:])
+                        break
+                    try:
+                        message = self._build_message(entry)
+                    except OSError as e:
+                        self._finish(entry, STATUS_FAILED, f"No se pudo leer el PDF adjunto: {str(e)}")
+                        continue
+                    except Exception as e:
+                        # Entrada mal formada (falta un campo, monto no numérico...): no saldría nunca
+                        self._finish(entry, STATUS_FAILED, f"No se pudo armar el mensaje: {str(e)}")
+                        continue
+                    try:
+                        session.send(sender, entry["recipient_email"], message)
+                    except smtplib.SMTPRecipientsRefused:
+                        self._finish(entry, STATUS_FAILED, "El servidor rechazó la dirección de email del destinatario.")
+                        continue
+                    except smtplib.SMTPAuthenticationError as e:
+                        # Con credenciales rechazadas el resto tampoco saldría: se reintenta más tarde
+                        self._retry(entry, f"Error de autenticación SMTP. Detalles técnicos: {str(e)}")
+                        self._release_after(entry, due[position + 1:])
+                        break
+                    except (smtplib.SMTPException, OSError) as e:
+                        if not session.connected:
+                            # Sin conexión (servidor inaccesible): cada mensaje esperaría el
+                            # timeout y gastaría un intento, el resto se reintenta más tarde
+                            self._retry(entry, f"No se pudo conectar con el servidor SMTP: {str(e)}")
+                            self._release_after(entry, due[position + 1:])
+                            break
+                        self._retry(entry, f"Error SMTP: {str(e)}")
+                        continue
+                    except Exception as e:
+                        logger.exception("Error inesperado al enviar el email %s", entry.get("id"))
+                        self._retry(entry, f"Error al enviar: {str(e)}")
+                        continue
+                    self._finish(entry, STATUS_SENT, None)
+                    sent += 1
+        finally:
+            # Ninguna entrada queda en "enviando" si algo falló fuera de los casos anteriores
+            self._release([e for e in due if e.get("status") == STATUS_SENDING])
+        logger.info("Bandeja de salida: %d de %d mensajes enviados", sent, len(due))
+        return sent
+
+    def _build_message(self, entry: Dict[str, Any]) -> str:
+        """Arma el mensaje de una entrada al momento de enviarlo (lee el PDF si lo hay)."""
+        kind = entry.get("kind")
+        if kind == "receipt":
+            return email_service.build_receipt_message(
+                entry["recipient_email"], entry["recipient_name"], entry["pdf_path"],
+                entry.get("payment_date") or "", float(entry.get("payment_amount") or 0))
+        if kind == "attachment":
+            return email_service.build_attachment_message(
+                entry["recipient_email"], entry["recipient_name"], entry.get("subject", ""),
+                entry.get("body", ""), entry["pdf_path"])
+        return email_service.build_message(entry["recipient_email"], entry.get("subject", ""), entry.get("body", ""))
+
+    def _finish(self, entry: Dict[str, Any], status: str, error: Optional[str]):
+        """Cierra una entrada como enviada o fallida; al enviarse guarda su notificación."""
+        with self._lock:
+            entry["status"] = status
+            entry["last_error"] = error
+            if status == STATUS_SENT:
+                entry["attempts"] = entry.get("attempts", 0) + 1
+                entry["sent_at"] = datetime.now().isoformat()
+            self._save_data(upserted=[entry])
+        self._release_attachment(entry)
+        if status == STATUS_FAILED:
+            logger.warning("Email a %s descartado: %s", entry.get("recipient_email"), error)
+        elif entry.get("notification"):
+            try:
+                from manager.app.services.notification_service import notification_service
+                notification_service.record_sent(entry["notification"])
+            except Exception as e:
+                logger.exception("No se pudo guardar la notificación enviada en el historial: %s", e)
+
+    def _retry(self, entry: Dict[str, Any], error: str):
+        """Cuenta un intento fallido: programa el siguiente o, agotados, marca la entrada fallida."""
+        with self._lock:
+            attempts = entry.get("attempts", 0) + 1
+            entry["attempts"] = attempts
+            entry["last_error"] = error
+            if attempts >= MAX_ATTEMPTS:
+                entry["status"] = STATUS_FAILED
+            else:
+                entry["status"] = STATUS_PENDING
+                entry["next_attempt_at"] = (datetime.now() + timedelta(seconds=retry_delay(attempts))).isoformat()
+            self._save_data(upserted=[entry])
+        if entry["status"] == STATUS_FAILED:
+            self._release_attachment(entry)
+        logger.warning("Email a %s no enviado (intento %d de %d): %s",
+                       entry.get("recipient_email"), attempts, MAX_ATTEMPTS, error)
+
+    def _release_attachment(self, entry: Dict[str, Any]):
+        """El mensaje ya no se enviará: receipt_store puede borrar su PDF si era un recibo reemplazado."""
+        if not entry.get("pdf_path"):
+            return
+        try:
+            from manager.app.services.receipt_store import receipt_store
+            receipt_store.release(entry["pdf_path"])
+        except Exception as e:
+            logger.warning("No se pudo liberar el PDF adjunto %s: %s", entry.get("pdf_path"), e)
+
+    def _release_after(self, failed: Dict[str, Any], entries: List[Dict[str, Any]]):
+        """
+        Devuelve entries a "pendiente" para cuando se reintente failed (si failed agotó sus
+        intentos, dentro de RETRY_BASE_SECONDS).
+        """
+        next_attempt_at = failed.get("next_attempt_at") if failed.get("status") == STATUS_PENDING else None
+        if not next_attempt_at:
+            next_attempt_at = (datetime.now() + timedelta(seconds=RETRY_BASE_SECONDS)).isoformat()
+        self._release(entries, next_attempt_at)
+
+    def _release(self, entries: List[Dict[str, Any]], next_attempt_at: Optional[str] = None):
+        """Devuelve a "pendiente" entradas tomadas y no intentadas (sin contar intento)."""
+        if not entries:
+            return
+        with self._lock:
+            for entry in entries:
+                entry["status"] = STATUS_PENDING
+                if next_attempt_at:
+                    entry["next_attempt_at"] = next_attempt_at
+            self._save_data(upserted=entries)
+
+
+# Instancia global del servicio
+email_outbox = LazyService("email_outbox", EmailOutbox)
@@ -1,10 +1,15 @@
 """
 Servicio para envío de emails con adjuntos PDF
 Maneja la configuración SMTP y envío de recibos
+
+Para envíos masivos (campañas de notificaciones) open_session() entrega una conexión
+SMTP autenticada que se reutiliza entre mensajes y se reconecta si el servidor la
+cierra; SendRateLimiter espacia los envíos según max_per_minute de la configuración.
 """
 import smtplib
 import os
 import re
+import time
 import urllib.parse
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
@@ -13,10 +18,86 @@ from email.mime.base import MIMEBase
 from email import encoders
 from email.header import Header
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Callable
 import json
 
 from manager.app.paths_config import DATA_DIR, ensure_dirs
+from manager.app.logger import logger
+from manager.app.services.service_registry import LazyService
+
+# Segundos de espera de la conexión SMTP antes de darla por caída
+SMTP_TIMEOUT = 30
+# Envíos por minuto en campañas si la configuración no indica max_per_minute
+DEFAULT_MAX_PER_MINUTE = 20
+
+
+class SmtpSession:
+    """
+    Conexión SMTP reutilizable para enviar varios mensajes con un solo STARTTLS y login.
+    connect() abre y autentica la conexión; se llama en el primer envío y de nuevo si el
+    servidor cerró la conexión (SMTPServerDisconnected), reintentando ese mensaje una vez.
+    """
+
+    def __init__(self, connect: Callable[[], smtplib.SMTP]):
+        self._connect = connect
+        self._server: Optional[smtplib.SMTP] = None
+        self.connections = 0
+
+    def send(self, from_addr: str, to_addr: str, message: str) -> None:
+        """Envía un mensaje ya armado; las excepciones SMTP se propagan."""
+        for attempt in (1, 2):
+            if self._server is None:
+                self._server = self._connect()
+                self.connections += 1
+            try:
+                self._server.sendmail(from_addr, to_addr, message)
+                return
+            except smtplib.SMTPServerDisconnected:
+                self._server = None
+                if attempt == 2:
+                    raise
+                logger.info("Conexión SMTP cerrada por el servidor; reconectando")
+
+    @property
+    def connected(self) -> bool:
+        """Hay una conexión abierta (False antes del primer envío o si no se pudo conectar)."""
+        return self._server is not None
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._server = None
+
+    def __enter__(self) -> "SmtpSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SendRateLimiter:
+    """Espacia los envíos para no superar max_per_minute mensajes por minuto (0 = sin límite)."""
+
+    def __init__(self, max_per_minute: int, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._interval = 60.0 / max_per_minute if max_per_minute and max_per_minute > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next_at: Optional[float] = None
+
+    def wait(self) -> None:
+        """Espera hasta que se pueda enviar el siguiente mensaje."""
+        if not self._interval:
+            return
+        now = self._clock()
+        if self._next_at is not None and now < self._next_at:
+            self._sleep(self._next_at - now)
+            now = self._next_at
+        self._next_at = now + self._interval
 
 
 class EmailService:
@@ -40,7 +121,8 @@ class EmailService:
                     "smtp_port": 587,
                     "email": "",
                     "password": "",  # Se guardará la contraseña de aplicación
-                    "sender_name": "Building Manager Pro"
+                    "sender_name": "Building Manager Pro",
+                    "max_per_minute": DEFAULT_MAX_PER_MINUTE  # Envíos por minuto en campañas
                 }, f, ensure_ascii=False, indent=2)
     
     def _load_config(self):
@@ -55,12 +137,16 @@ class EmailService:
                 "smtp_port": 587,
                 "email": "",
                 "password": "",
-                "sender_name": "Building Manager Pro"
+                "sender_name": "Building Manager Pro",
+                "max_per_minute": DEFAULT_MAX_PER_MINUTE
             }
     
     def save_config(self, config_data: Dict[str, Any]) -> bool:
         """Guarda la configuración de email"""
         try:
+            # El límite de envíos no está en el formulario: se conserva si no se indica
+            max_per_minute = config_data.get("max_per_minute",
+                                             self.config.get("max_per_minute", DEFAULT_MAX_PER_MINUTE))
             # Determinar servidor SMTP según el proveedor
             provider = config_data.get("provider", "gmail")
             if provider == "gmail":
@@ -90,9 +176,14 @@ class EmailService:
                     "password": config_data.get("password", ""),
                     "sender_name": config_data.get("sender_name", "Building Manager Pro")
                 }
+            self.config["max_per_minute"] = int(max_per_minute)
             
             with open(self.CONFIG_FILE, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, ensure_ascii=False, indent=2)
+            # Con email recién configurado, la bandeja de salida envía sin esperar
+            from manager.app.services.email_outbox import email_outbox
+            if email_outbox.is_initialized:
+                email_outbox.wake()
             return True
         except Exception as e:
             print(f"Error al guardar configuración de email: {str(e)}")
@@ -108,6 +199,186 @@ class EmailService:
     def is_configured(self) -> bool:
         """Verifica si el email está configurado"""
         return bool(self.config.get("email") and self.config.get("password"))
+
+    def sender_address(self) -> str:
+        """Email del remitente (sin espacios), usado en el sobre SMTP."""
+        return self.config['email'].strip()
+
+    def _sender_header(self) -> str:
+        return f"{self.config.get('sender_name', 'Building Manager Pro')} <{self.config['email']}>"
+
+    def _connect(self) -> smtplib.SMTP:
+        """Abre la conexión SMTP con STARTTLS y login (credenciales sin espacios)."""
+        server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'], timeout=SMTP_TIMEOUT)
+        try:
+            server.starttls()
+            server.login(self.sender_address(), self.config['password'].strip())
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def build_message(self, recipient_email: str, subject: str, body: str) -> str:
+        """Mensaje de texto plano (sin adjuntos) listo para enviar."""
+        msg = MIMEMultipart()
+        msg['From'] = self._sender_header()
+        msg['To'] = recipient_email
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        return msg.as_string()
+
+    def build_receipt_message(self, recipient_email: str, recipient_name: str, pdf_path: str,
+                              payment_date: str, payment_amount: float) -> str:
+        """Mensaje del recibo de pago con el PDF adjunto (ver send_receipt_email)."""
+        # Crear mensaje
+        msg = MIMEMultipart()
+        msg['From'] = self._sender_header()
+        msg['To'] = recipient_email
+        msg['Subject'] = f"Recibo de Pago - {payment_date}"
+        
+        # Cuerpo del mensaje
+        body = f"""
+Estimado/a {recipient_name},
+
+Adjunto encontrará el recibo de pago correspondiente a la fecha {payment_date}.
+
+Detalles del pago:
+- Fecha: {payment_date}
+- Monto: ${payment_amount:,.0f}
+
+Este es un mensaje automático generado por Building Manager Pro.
+
+Saludos cordiales,
+{self.config.get('sender_name', 'Building Manager Pro')}
+            """
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        
+        # Adjuntar PDF
+        # Crear un nombre de archivo descriptivo y limpio
+        original_filename = os.path.basename(pdf_path)
+        
+        # Extraer información del nombre original si es posible
+        # Formato esperado: recibo_pago_Nombre_Apellido_DD-MM-YYYY.pdf
+        # MEJORA: Manejar mejor caracteres especiales como "ñ"
+        filename = None
+        if 'recibo_pago_' in original_filename:
+            try:
+                # Extraer partes del nombre
+                name_without_prefix = original_filename.replace('.pdf', '').replace('recibo_pago_', '')
+                parts = name_without_prefix.split('_')
+                if len(parts) >= 2:
+                    # Reconstruir nombre más legible
+                    name_parts = parts[:-1]  # Todo excepto la fecha
+                    date_part = parts[-1] if len(parts) > 1 else ''
+                    tenant_name = ' '.join(name_parts).title()
+                    # Crear nombre descriptivo: "Recibo de Pago - Nombre - Fecha.pdf"
+                    filename = f"Recibo de Pago - {tenant_name} - {date_part}.pdf"
+            except Exception:
+                # Si hay error, usar el nombre del recipiente (más confiable)
+                pass
+        
+        # Si no pudimos extraer, usar el nombre del recipiente que sabemos que es correcto
+        if not filename:
+            filename = f"Recibo de Pago - {recipient_name} - {payment_date.replace('/', '-')}.pdf"
+        
+        # Asegurar que tenga extensión .pdf
+        if not filename.lower().endswith('.pdf'):
+            filename = f"{filename}.pdf"
+        
+        # Limpiar caracteres problemáticos pero mantener legibilidad
+        # Reemplazar solo caracteres que pueden causar problemas en nombres de archivo
+        safe_filename = filename.replace(':', '-').replace('/', '-')
+        
+        with open(pdf_path, "rb") as attachment:
+            part = MIMEBase('application', 'pdf')
+            part.set_payload(attachment.read())
+            encoders.encode_base64(part)
+            
+            # Configurar headers correctamente usando el método de Python que maneja RFC 2231 automáticamente
+            # Content-Type: usar el parámetro 'name' con encoding automático
+            part.add_header('Content-Type', 'application/pdf', name=safe_filename)
+            
+            # Content-Disposition: usar el parámetro 'filename' como tupla (charset, language, value)
+            # Esto permite que Python maneje automáticamente el encoding RFC 2231
+            # Formato: ('utf-8', '', filename) donde '' es el idioma (vacío)
+            part.add_header('Content-Disposition', 'attachment', filename=('utf-8', '', safe_filename))
+            
+            msg.attach(part)
+        return msg.as_string()
+
+    def build_attachment_message(self, recipient_email: str, recipient_name: str,
+                                 subject: str, body: str, pdf_path: str) -> str:
+        """Mensaje con asunto y cuerpo dados y el PDF adjunto (ver send_email_with_attachment)."""
+        # Crear mensaje
+        msg = MIMEMultipart()
+        msg['From'] = self._sender_header()
+        msg['To'] = recipient_email
+        msg['Subject'] = subject
+        
+        # Cuerpo del mensaje
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        
+        # Adjuntar PDF - usar el nombre del recipiente directamente para evitar problemas con caracteres especiales
+        original_filename = os.path.basename(pdf_path)
+        
+        # Intentar extraer la fecha del nombre del archivo para usar en el nombre descriptivo
+        # Extraer información del nombre original si es posible
+        # Formato esperado: recibo_pago_Nombre_Apellido_DD-MM-YYYY.pdf
+        date_part = None
+        try:
+            import re
+            # Buscar la fecha en el formato DD-MM-YYYY
+            date_match = re.search(r'(\d{2}-\d{2}-\d{4})', original_filename)
+            if date_match:
+                date_part = date_match.group(1)
+        except Exception:
+            pass
+        
+        # SIEMPRE usar el recipient_name que se pasa como parámetro (es más confiable que parsear el archivo)
+        # Esto evita problemas con caracteres especiales como "ñ" que pueden estar mal codificados en el nombre del archivo
+        if date_part:
+            filename = f"Recibo de Pago - {recipient_name} - {date_part}.pdf"
+        else:
+            filename = f"Recibo de Pago - {recipient_name} - {datetime.now().strftime('%d-%m-%Y')}.pdf"
+        
+        # Asegurar que tenga extensión .pdf
+        if not filename.lower().endswith('.pdf'):
+            filename = f"{filename}.pdf"
+        
+        # Limpiar caracteres problemáticos pero mantener legibilidad
+        # Reemplazar solo caracteres que pueden causar problemas en nombres de archivo
+        safe_filename = filename.replace(':', '-').replace('/', '-')
+        
+        # Leer el archivo PDF - usar EXACTAMENTE la misma lógica que send_receipt_email
+        with open(pdf_path, "rb") as attachment:
+            part = MIMEBase('application', 'pdf')
+            part.set_payload(attachment.read())
+            encoders.encode_base64(part)
+            
+            # Configurar headers correctamente usando el método de Python que maneja RFC 2231 automáticamente
+            # Content-Type: usar el parámetro 'name' con encoding automático
+            part.add_header('Content-Type', 'application/pdf', name=safe_filename)
+            
+            # Content-Disposition: usar el parámetro 'filename' como tupla (charset, language, value)
+            # Esto permite que Python maneje automáticamente el encoding RFC 2231
+            # Formato: ('utf-8', '', filename) donde '' es el idioma (vacío)
+            part.add_header('Content-Disposition', 'attachment', filename=('utf-8', '', safe_filename))
+            
+            msg.attach(part)
+        return msg.as_string()
+
+    def open_session(self, connect: Optional[Callable[[], smtplib.SMTP]] = None) -> SmtpSession:
+        """
+        Sesión SMTP para enviar varios mensajes con una sola conexión autenticada.
+        connect reemplaza la conexión configurada (p. ej. un servidor SMTP local de prueba).
+        """
+        return SmtpSession(connect or self._connect)
+
+    def rate_limiter(self, max_per_minute: Optional[int] = None) -> SendRateLimiter:
+        """Limitador de envíos con max_per_minute (por defecto, el de la configuración)."""
+        if max_per_minute is None:
+            max_per_minute = int(self.config.get("max_per_minute", DEFAULT_MAX_PER_MINUTE))
+        return SendRateLimiter(max_per_minute)
     
     def send_receipt_email(self, recipient_email: str, recipient_name: str, 
                           pdf_path: str, payment_date: str, payment_amount: float) -> Tuple[bool, str]:
@@ -131,92 +402,12 @@ class EmailService:
             return False, f"El archivo PDF no existe: {pdf_path}"
         
         try:
-            # Crear mensaje
-            msg = MIMEMultipart()
-            msg['From'] = f"{self.config.get('sender_name', 'Building Manager Pro')} <{self.config['email']}>"
-            msg['To'] = recipient_email
-            msg['Subject'] = f"Recibo de Pago - {payment_date}"
-            
-            # Cuerpo del mensaje
-            body = f"""
-Estimado/a {recipient_name},
-
-Adjunto encontrará el recibo de pago correspondiente a la fecha {payment_date}.
-
-Detalles del pago:
-- Fecha: {payment_date}
-- Monto: ${payment_amount:,.0f}
-
-Este es un mensaje automático generado por Building Manager Pro.
-
-Saludos cordiales,
-{self.config.get('sender_name', 'Building Manager Pro')}
-            """
-            msg.attach(MIMEText(body, 'plain', 'utf-8'))
-            
-            # Adjuntar PDF
-            # Crear un nombre de archivo descriptivo y limpio
-            original_filename = os.path.basename(pdf_path)
-            
-            # Extraer información del nombre original si es posible
-            # Formato esperado: recibo_pago_Nombre_Apellido_DD-MM-YYYY.pdf
-            # MEJORA: Manejar mejor caracteres especiales como "ñ"
-            filename = None
-            if 'recibo_pago_' in original_filename:
-                try:
-                    # Extraer partes del nombre
-                    name_without_prefix = original_filename.replace('.pdf', '').replace('recibo_pago_', '')
-                    parts = name_without_prefix.split('_')
-                    if len(parts) >= 2:
-                        # Reconstruir nombre más legible
-                        name_parts = parts[:-1]  # Todo excepto la fecha
-                        date_part = parts[-1] if len(parts) > 1 else ''
-                        tenant_name = ' '.join(name_parts).title()
-                        # Crear nombre descriptivo: "Recibo de Pago - Nombre - Fecha.pdf"
-                        filename = f"Recibo de Pago - {tenant_name} - {date_part}.pdf"
-                except Exception:
-                    # Si hay error, usar el nombre del recipiente (más confiable)
-                    pass
-            
-            # Si no pudimos extraer, usar el nombre del recipiente que sabemos que es correcto
-            if not filename:
-                filename = f"Recibo de Pago - {recipient_name} - {payment_date.replace('/', '-')}.pdf"
-            
-            # Asegurar que tenga extensión .pdf
-            if not filename.lower().endswith('.pdf'):
-                filename = f"{filename}.pdf"
-            
-            # Limpiar caracteres problemáticos pero mantener legibilidad
-            # Reemplazar solo caracteres que pueden causar problemas en nombres de archivo
-            safe_filename = filename.replace(':', '-').replace('/', '-')
-            
-            with open(pdf_path, "rb") as attachment:
-                part = MIMEBase('application', 'pdf')
-                part.set_payload(attachment.read())
-                encoders.encode_base64(part)
-                
-                # Configurar headers correctamente usando el método de Python que maneja RFC 2231 automáticamente
-                # Content-Type: usar el parámetro 'name' con encoding automático
-                part.add_header('Content-Type', 'application/pdf', name=safe_filename)
-                
-                # Content-Disposition: usar el parámetro 'filename' como tupla (charset, language, value)
-                # Esto permite que Python maneje automáticamente el encoding RFC 2231
-                # Formato: ('utf-8', '', filename) donde '' es el idioma (vacío)
-                part.add_header('Content-Disposition', 'attachment', filename=('utf-8', '', safe_filename))
-                
-                msg.attach(part)
+            message = self.build_receipt_message(recipient_email, recipient_name, pdf_path,
+                                                 payment_date, payment_amount)
             
             # Conectar y enviar
-            server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'])
-            server.starttls()
-            
-            # Limpiar contraseña de espacios y caracteres especiales
-            email_clean = self.config['email'].strip()
-            password_clean = self.config['password'].strip()
-            
-            server.login(email_clean, password_clean)
-            text = msg.as_string()
-            server.sendmail(email_clean, recipient_email, text)
+            server = self._connect()
+            server.sendmail(self.sender_address(), recipient_email, message)
             server.quit()
             
             return True, "Recibo enviado exitosamente por email."
@@ -272,26 +463,10 @@ Saludos cordiales,
             return False, "El email no está configurado. Por favor configure las credenciales SMTP primero."
         
         try:
-            # Crear mensaje
-            msg = MIMEMultipart()
-            msg['From'] = f"{self.config.get('sender_name', 'Building Manager Pro')} <{self.config['email']}>"
-            msg['To'] = recipient_email
-            msg['Subject'] = subject
-            
-            # Cuerpo del mensaje
-            msg.attach(MIMEText(body, 'plain', 'utf-8'))
-            
             # Conectar y enviar
-            server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'])
-            server.starttls()
-            
-            # Limpiar credenciales de espacios
-            email_clean = self.config['email'].strip()
-            password_clean = self.config['password'].strip()
-            
-            server.login(email_clean, password_clean)
-            text = msg.as_string()
-            server.sendmail(email_clean, recipient_email, text)
+            server = self._connect()
+            server.sendmail(self.sender_address(), recipient_email,
+                            self.build_message(recipient_email, subject, body))
             server.quit()
             
             return True, "Email enviado exitosamente."
@@ -336,71 +511,11 @@ Saludos cordiales,
             return False, f"El archivo PDF no existe: {pdf_path}"
         
         try:
-            # Crear mensaje
-            msg = MIMEMultipart()
-            msg['From'] = f"{self.config.get('sender_name', 'Building Manager Pro')} <{self.config['email']}>"
-            msg['To'] = recipient_email
-            msg['Subject'] = subject
-            
-            # Cuerpo del mensaje
-            msg.attach(MIMEText(body, 'plain', 'utf-8'))
-            
-            # Adjuntar PDF - usar el nombre del recipiente directamente para evitar problemas con caracteres especiales
-            original_filename = os.path.basename(pdf_path)
-            
-            # Intentar extraer la fecha del nombre del archivo para usar en el nombre descriptivo
-            # Extraer información del nombre original si es posible
-            # Formato esperado: recibo_pago_Nombre_Apellido_DD-MM-YYYY.pdf
-            date_part = None
-            try:
-                import re
-                # Buscar la fecha en el formato DD-MM-YYYY
-                date_match = re.search(r'(\d{2}-\d{2}-\d{4})', original_filename)
-                if date_match:
-                    date_part = date_match.group(1)
-            except Exception:
-                pass
-            
-            # SIEMPRE usar el recipient_name que se pasa como parámetro (es más confiable que parsear el archivo)
-            # Esto evita problemas con caracteres especiales como "ñ" que pueden estar mal codificados en el nombre del archivo
-            if date_part:
-                filename = f"Recibo de Pago - {recipient_name} - {date_part}.pdf"
-            else:
-                filename = f"Recibo de Pago - {recipient_name} - {datetime.now().strftime('%d-%m-%Y')}.pdf"
-            
-            # Asegurar que tenga extensión .pdf
-            if not filename.lower().endswith('.pdf'):
-                filename = f"{filename}.pdf"
-            
-            # Limpiar caracteres problemáticos pero mantener legibilidad
-            # Reemplazar solo caracteres que pueden causar problemas en nombres de archivo
-            safe_filename = filename.replace(':', '-').replace('/', '-')
-            
-            # Leer el archivo PDF - usar EXACTAMENTE la misma lógica que send_receipt_email
-            with open(pdf_path, "rb") as attachment:
-                part = MIMEBase('application', 'pdf')
-                part.set_payload(attachment.read())
-                encoders.encode_base64(part)
-                
-                # Configurar headers correctamente usando el método de Python que maneja RFC 2231 automáticamente
-                # Content-Type: usar el parámetro 'name' con encoding automático
-                part.add_header('Content-Type', 'application/pdf', name=safe_filename)
-                
-                # Content-Disposition: usar el parámetro 'filename' como tupla (charset, language, value)
-                # Esto permite que Python maneje automáticamente el encoding RFC 2231
-                # Formato: ('utf-8', '', filename) donde '' es el idioma (vacío)
-                part.add_header('Content-Disposition', 'attachment', filename=('utf-8', '', safe_filename))
-                
-                msg.attach(part)
+            message = self.build_attachment_message(recipient_email, recipient_name, subject, body, pdf_path)
             
             # Conectar y enviar
-            server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'])
-            server.starttls()
-            email_clean = self.config['email'].strip()
-            password_clean = self.config['password'].strip()
-            server.login(email_clean, password_clean)
-            text = msg.as_string()
-            server.sendmail(email_clean, recipient_email, text)
+            server = self._connect()
+            server.sendmail(self.sender_address(), recipient_email, message)
             server.quit()
             
             return True, "Email enviado exitosamente."
@@ -423,4 +538,4 @@ Saludos cordiales,
             return False, f"Error inesperado: {str(e)}"
 
 # Instancia global del servicio
-email_service = EmailService()
+email_service = LazyService("email_service", EmailService)
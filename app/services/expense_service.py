@@ -4,10 +4,28 @@ Servicio para gestionar los gastos del edificio
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 from manager.app.paths_config import DATA_DIR, ensure_dirs
+from manager.app.storage import open_store
+from manager.app.services.accounting_service import accounting_service
+from manager.app.services.date_keys import (
+    EXPENSE_DATE_FIELDS, record_date_key, stamp_date_keys, stamp_stale, with_restamped
+)
+from manager.app.services.monthly_rollups import MonthlyRollup, to_amount
+from manager.app.services.records import ExpenseRecord, RecordCache, intern_fields
+from manager.app.services.service_registry import LazyService
+from manager.app.services.unit_of_work import current_unit_of_work
+
+
+def _rollup_rows(expense: Dict[str, Any]):
+    """Aporte de un gasto a los acumulados mensuales (ver monthly_rollups)."""
+    key = record_date_key(expense, "fecha")
+    if key:
+        dims = ("gasto", "salida", expense.get("categoria", ""), expense.get("subtipo", ""),
+                expense.get("apartamento"), None)
+        yield key[:7], dims, to_amount(expense.get("monto"))
 
 
 class ExpenseService:
@@ -17,6 +35,14 @@ class ExpenseService:
     
     def __init__(self):
         self._ensure_data_file()
+        self._store = open_store("expenses", self.DATA_FILE)
+        self._loaded_state = None
+        # Registros con la clave de fecha corregida al cargar, aún no guardados
+        self._restamped: List[Dict[str, Any]] = []
+        # Sumas y cantidades por mes/categoría/subtipo/apartamento
+        self._rollup = MonthlyRollup(_rollup_rows)
+        # Registros tipados de solo lectura (records())
+        self._records = RecordCache(ExpenseRecord)
         self._load_data()
     
     def _ensure_data_file(self):
@@ -28,21 +54,62 @@ class ExpenseService:
                 json.dump([], f, ensure_ascii=False, indent=2)
     
     def _load_data(self):
-        """Carga los datos de gastos desde el archivo JSON"""
+        """Carga los datos de gastos (sin releer el archivo si no cambió desde la última carga)"""
+        if self._store.is_fresh(self._loaded_state):
+            return
+        loaded_state = self._store.state()
         try:
-            with open(self.DATA_FILE, 'r', encoding='utf-8') as f:
-                self.expenses = json.load(f)
+            self.expenses = self._store.load()
+            self._loaded_state = loaded_state
+            intern_fields(self.expenses, ("categoria", "subtipo"))
+            self._stamp_loaded_date_keys()
         except (FileNotFoundError, json.JSONDecodeError):
             self.expenses = []
+        self._rollup.rebuild(self.expenses)
     
-    def _save_data(self):
-        """Guarda los datos de gastos en el archivo JSON"""
-        with open(self.DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(self.expenses, f, ensure_ascii=False, indent=2)
+    def _save_data(self, upserted: Optional[List[Dict[str, Any]]] = None, deleted: Optional[List[int]] = None):
+        """Guarda los datos de gastos (con upserted/deleted el backend escribe solo esos registros)"""
+        if upserted is None and deleted is None:
+            for expense in self.expenses:
+                stamp_date_keys(expense, EXPENSE_DATE_FIELDS)
+            self._records.invalidate()
+        else:
+            self._records.invalidate(upserted or [])
+        if not self._store.save(self.expenses, upserted=with_restamped(upserted, deleted, self._restamped),
+                                deleted=deleted):
+            raise IOError("No se pudo guardar gastos.json")
+        self._restamped = []
+        self._loaded_state = self._store.state()
+
+    def _stamp_loaded_date_keys(self):
+        """
+        Corrige en memoria la clave de fecha canónica de los gastos cargados (faltante o
+        desactualizada); se persiste con el próximo guardado.
+        """
+        self._restamped = stamp_stale(self.expenses, EXPENSE_DATE_FIELDS)
     
     def get_all_expenses(self) -> List[Dict[str, Any]]:
         """Obtiene todos los gastos"""
         return self.expenses.copy()
+
+    def data_version(self) -> Any:
+        """
+        Identifica el contenido y el orden de los gastos en memoria: cambia con cada carga o
+        guardado. None si aún no se cargaron.
+        """
+        if self._loaded_state is None:
+            return None
+        return (id(self), self._loaded_state)
+
+    def records(self) -> Tuple[ExpenseRecord, ...]:
+        """Gastos como registros tipados de solo lectura, en orden; se comparten sin copiar."""
+        self._load_data()
+        return self._records.records(self.expenses, self._loaded_state)
+
+    def monthly_rollup(self) -> MonthlyRollup:
+        """Acumulados mensuales de gastos (fuente "gasto"), al día con el archivo."""
+        self._load_data()
+        return self._rollup
     
     def filter_expenses(self, year: Optional[int] = None, month: Optional[int] = None, 
                        category: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -57,6 +124,13 @@ class ExpenseService:
         Returns:
             Lista de gastos que cumplen con los filtros
         """
+        if self._store.supports_query and year is not None and current_unit_of_work() is None:
+            # Filtro por fecha (YYYY-MM-DD) y categoría resuelto con los índices del backend.
+            # Dentro de una transacción los cambios aún no están en la tabla: se filtra la lista en memoria
+            prefix = f"{year:04d}-{month:02d}" if month is not None else f"{year:04d}-"
+            equals = {"categoria": category} if category is not None else {}
+            return self._store.select_prefix("fecha", prefix, **equals)
+        
         filtered = self.expenses.copy()
         
         if year is not None or month is not None:
@@ -69,23 +143,15 @@ class ExpenseService:
     
     def _matches_date(self, expense: Dict[str, Any], year: Optional[int], month: Optional[int]) -> bool:
         """Verifica si un gasto coincide con el año y mes especificados"""
-        fecha_str = expense.get("fecha", "")
-        if not fecha_str:
+        key = record_date_key(expense, "fecha")
+        if not key:
             return False
-        
-        try:
-            # La fecha está en formato "YYYY-MM-DD"
-            fecha = datetime.strptime(fecha_str, "%Y-%m-%d")
-            
-            if year is not None and fecha.year != year:
-                return False
-            
-            if month is not None and fecha.month != month:
-                return False
-            
-            return True
-        except (ValueError, TypeError):
+        # Clave canónica "YYYY-MM-DD": se compara el texto, sin parsear la fecha
+        if year is not None and key[:4] != f"{year:04d}":
+            return False
+        if month is not None and key[5:7] != f"{month:02d}":
             return False
+        return True
     
     def get_expense_by_id(self, expense_id: int) -> Optional[Dict[str, Any]]:
         """Obtiene un gasto por su ID"""
@@ -107,30 +173,41 @@ class ExpenseService:
             "descripcion": expense_data.get("descripcion", ""),
             "documento": expense_data.get("documento")
         }
+        stamp_date_keys(expense, EXPENSE_DATE_FIELDS)
+        accounting_service.ensure_period_open(expense["fecha"])
         self.expenses.append(expense)
-        self._save_data()
+        self._rollup.add(expense)
+        self._save_data(upserted=[expense])
         return expense.copy()
     
     def update_expense(self, expense_id: int, expense_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Actualiza un gasto existente"""
         for i, expense in enumerate(self.expenses):
             if expense.get("id") == expense_id:
+                accounting_service.ensure_period_open(expense.get("fecha"), expense_data.get("fecha"))
+                self._rollup.remove(expense)
                 for key, value in expense_data.items():
                     self.expenses[i][key] = value
-                self._save_data()
+                stamp_date_keys(expense, EXPENSE_DATE_FIELDS)
+                self._rollup.add(expense)
+                self._save_data(upserted=[self.expenses[i]])
                 return self.expenses[i].copy()
         return None
     
     def delete_expense(self, expense_id: int) -> bool:
         """Elimina un gasto"""
         initial_count = len(self.expenses)
+        removed = [e for e in self.expenses if e.get("id") == expense_id]
+        accounting_service.ensure_period_open(*(e.get("fecha") for e in removed))
         self.expenses = [e for e in self.expenses if e.get("id") != expense_id]
         
         if len(self.expenses) < initial_count:
-            self._save_data()
+            for expense in removed:
+                self._rollup.remove(expense)
+            self._save_data(deleted=[expense_id])
             return True
         
         return False
 
 # Instancia global del servicio
-expense_service = ExpenseService()
\ No newline at end of file
+expense_service = LazyService("expense_service", ExpenseService)
\ No newline at end of file
@@ -6,6 +6,7 @@ import urllib.error
 import os
 
 from manager.app.services.app_config_service import app_config_service
+from manager.app.services.service_registry import LazyService
 
 
 class LicenseService:
@@ -223,5 +224,5 @@ class LicenseService:
         return self.get_status()
 
 
-license_service = LicenseService()
+license_service = LazyService("license_service", LicenseService)
 
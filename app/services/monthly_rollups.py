@@ -0,0 +1,134 @@
+"""
+Acumulados mensuales (suma y cantidad) de pagos, gastos y asientos contables.
+
+Cada servicio mantiene un MonthlyRollup por clave
+(mes "YYYY-MM", fuente, dirección, categoría, subtipo, apartamento, método de pago).
+Se reconstruye al cargar los datos y se actualiza en cada alta, edición o baja, así
+los totales del dashboard, las tendencias y el estado de resultados se responden
+recorriendo meses en lugar de todos los registros.
+
+Uso:
+    payment_service.monthly_rollup().totals(month_from="2025-01", month_to="2025-12")  # (suma, cantidad)
+    expense_service.monthly_rollup().group_by("categoria", month_from="2025-03", month_to="2025-03")
+"""
+
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Dimensiones de la clave, además del mes
+ROLLUP_FIELDS = ("fuente", "direccion", "categoria", "subtipo", "apartamento", "metodo")
+_FIELD_INDEX = {field: i for i, field in enumerate(ROLLUP_FIELDS)}
+
+# (mes, dimensiones en el orden de ROLLUP_FIELDS, monto)
+Contribution = Tuple[str, Tuple[Any, ...], float]
+
+
+def month_of(fecha: Any) -> Optional[str]:
+    """
+    "YYYY-MM" de una fecha "DD/MM/YYYY" (admite día y mes sin cero inicial) o ISO
+    "YYYY-MM-DD"; None si la fecha no es válida.
+    """
+    text = str(fecha or "").strip()
+    try:
+        if "/" in text:
+            day, month, year = (int(part) for part in text.split("/"))
+            date(year, month, day)
+        else:
+            parsed = date.fromisoformat(text[:10])
+            year, month = parsed.year, parsed.month
+    except ValueError:
+        return None
+    return f"{year:04d}-{month:02d}"
+
+
+def to_amount(value: Any) -> float:
+    """Monto como float (0.0 si está vacío o no es numérico)."""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class MonthlyRollup:
+    """
+    Sumas y cantidades por mes y dimensiones. contributions(record) indica con qué
+    filas aporta un registro; el mismo registro debe producir las mismas filas al
+    quitarlo, por eso hay que llamar a remove() antes de modificarlo.
+    """
+
+    def __init__(self, contributions: Callable[[Dict[str, Any]], Iterable[Contribution]]):
+        self._contributions = contributions
+        # mes -> {dimensiones: [suma, cantidad]}
+        self._months: Dict[str, Dict[Tuple[Any, ...], List[float]]] = {}
+
+    def clear(self) -> None:
+        self._months = {}
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Recalcula los acumulados desde cero."""
+        self.clear()
+        for record in records:
+            self.add(record)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        for month, dims, amount in self._contributions(record):
+            cell = self._months.setdefault(month, {}).setdefault(dims, [0.0, 0])
+            cell[0] += amount
+            cell[1] += 1
+
+    def remove(self, record: Dict[str, Any]) -> None:
+        for month, dims, amount in self._contributions(record):
+            cells = self._months.get(month)
+            cell = cells.get(dims) if cells else None
+            if cell is None:
+                continue
+            cell[0] -= amount
+            cell[1] -= 1
+            if cell[1] <= 0:
+                # Sin registros: quitar la celda descarta el residuo de redondeo
+                del cells[dims]
+                if not cells:
+                    del self._months[month]
+
+    def months(self) -> List[str]:
+        """Meses con movimientos, en orden ascendente."""
+        return sorted(self._months)
+
+    def _cells(self, month_from: Optional[str], month_to: Optional[str], match: Dict[str, Any]):
+        conditions = [(_FIELD_INDEX[field], value) for field, value in match.items()]
+        for month in sorted(self._months):
+            if (month_from is not None and month < month_from) or (month_to is not None and month > month_to):
+                continue
+            for dims, cell in self._months[month].items():
+                if all(dims[i] == value for i, value in conditions):
+                    yield month, dims, cell
+
+    def by_month(self, month_from: Optional[str] = None, month_to: Optional[str] = None,
+                 **match: Any) -> Dict[str, Tuple[float, int]]:
+        """{mes: (suma, cantidad)} en orden ascendente; match filtra por dimensiones."""
+        result: Dict[str, List[float]] = {}
+        for month, _, cell in self._cells(month_from, month_to, match):
+            acc = result.setdefault(month, [0.0, 0])
+            acc[0] += cell[0]
+            acc[1] += cell[1]
+        return {month: (acc[0], int(acc[1])) for month, acc in result.items()}
+
+    def group_by(self, field: str, month_from: Optional[str] = None, month_to: Optional[str] = None,
+                 **match: Any) -> Dict[Any, Tuple[float, int]]:
+        """{valor de field: (suma, cantidad)} en el rango de meses."""
+        index = _FIELD_INDEX[field]
+        result: Dict[Any, List[float]] = {}
+        for _, dims, cell in self._cells(month_from, month_to, match):
+            acc = result.setdefault(dims[index], [0.0, 0])
+            acc[0] += cell[0]
+            acc[1] += cell[1]
+        return {key: (acc[0], int(acc[1])) for key, acc in result.items()}
+
+    def totals(self, month_from: Optional[str] = None, month_to: Optional[str] = None,
+               **match: Any) -> Tuple[float, int]:
+        """(suma, cantidad) en el rango de meses."""
+        total, count = 0.0, 0
+        for _, _, cell in self._cells(month_from, month_to, match):
+            total += cell[0]
+            count += cell[1]
+        return total, int(count)
@@ -1,16 +1,33 @@
 """
 Servicio para gestión de notificaciones a inquilinos
 Sistema escalable con plantillas y historial
+
+Campañas (p. ej. recordar el pago a todos los morosos): prepare_campaign arma los
+mensajes de antemano y send_campaign los envía por una sola sesión SMTP, respetando el
+límite de envíos por minuto y devolviendo el resultado de cada destinatario.
+
+Notificaciones individuales: send_notification no espera al servidor SMTP; deja el
+mensaje en la bandeja de salida (email_outbox), que lo envía en segundo plano con
+reintentos. El historial (notifications.json) se actualiza cuando el mensaje sale
+(record_sent); queue_notification devuelve además el id para consultar el estado.
 """
 import json
 import os
+import smtplib
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from manager.app.paths_config import DATA_DIR, DOCUMENTOS_INQUILINOS_DIR, ensure_dirs, get_tenant_document_folder_name
-from manager.app.services.email_service import email_service
+from manager.app.paths_config import DATA_DIR, ensure_dirs
+from manager.app.logger import logger
+from manager.app.services.email_service import SendRateLimiter, email_service
+from manager.app.services.email_outbox import email_outbox
 from manager.app.services.payment_service import payment_service
 from manager.app.services.apartment_service import apartment_service
+from manager.app.services.receipt_store import receipt_store
+from manager.app.services.date_keys import key_to_datetime, record_date_key
+from manager.app.storage import open_store
+from manager.app.services.service_registry import LazyService
 from datetime import datetime
 
 
@@ -98,6 +115,10 @@ Saludos cordiales,
     
     def __init__(self):
         self._ensure_data_file()
+        self._store = open_store("notifications", self.DATA_FILE)
+        self._loaded_state = None
+        # El despachador de la bandeja de salida agrega al historial desde su hilo
+        self._history_lock = threading.Lock()
         self._load_data()
     
     def _ensure_data_file(self):
@@ -109,17 +130,20 @@ Saludos cordiales,
                 json.dump([], f, ensure_ascii=False, indent=2)
     
     def _load_data(self):
-        """Carga los datos de notificaciones"""
+        """Carga los datos de notificaciones (sin releer si no cambiaron)"""
+        if self._store.is_fresh(self._loaded_state):
+            return
+        loaded_state = self._store.state()
         try:
-            with open(self.DATA_FILE, 'r', encoding='utf-8') as f:
-                self.notifications = json.load(f)
+            self.notifications = self._store.load()
+            self._loaded_state = loaded_state
         except (FileNotFoundError, json.JSONDecodeError):
             self.notifications = []
     
-    def _save_data(self):
-        """Guarda los datos de notificaciones"""
-        with open(self.DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(self.notifications, f, ensure_ascii=False, indent=2)
+    def _save_data(self, upserted: Optional[List[Dict[str, Any]]] = None):
+        """Guarda los datos de notificaciones (con upserted, solo esos registros si el backend lo permite)"""
+        if self._store.save(self.notifications, upserted=upserted):
+            self._loaded_state = self._store.state()
     
     def get_templates(self) -> Dict[str, Dict[str, str]]:
         """Obtiene todas las plantillas disponibles"""
@@ -136,6 +160,17 @@ Saludos cordiales,
             return [n for n in self.notifications if n.get("tenant_id") == tenant_id]
         return self.notifications.copy()
     
+    def record_sent(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Agrega al historial una notificación ya enviada (sent_at = ahora) y la devuelve."""
+        with self._history_lock:
+            self._load_data()
+            record = dict(record)
+            record["id"] = len(self.notifications) + 1
+            record["sent_at"] = datetime.now().isoformat()
+            self.notifications.append(record)
+            self._save_data(upserted=[record])
+        return record
+    
     def send_notification(
         self,
         tenant: Dict[str, Any],
@@ -147,64 +182,49 @@ Saludos cordiales,
         receipt_payment_id: Optional[int] = None
     ) -> Tuple[bool, str]:
         """
-        Envía una notificación al inquilino.
+        Envía una notificación al inquilino por la bandeja de salida (ver queue_notification).
 
         Si se pasa body_override, se usa como cuerpo del correo (permite editar el mensaje en la UI).
         """
+        success, message, _ = self.queue_notification(
+            tenant, template_key, custom_subject=custom_subject, custom_message=custom_message,
+            body_override=body_override, attach_receipt=attach_receipt,
+            receipt_payment_id=receipt_payment_id)
+        return success, message
+    
+    def queue_notification(
+        self,
+        tenant: Dict[str, Any],
+        template_key: str,
+        custom_subject: Optional[str] = None,
+        custom_message: Optional[str] = None,
+        body_override: Optional[str] = None,
+        attach_receipt: bool = False,
+        receipt_payment_id: Optional[int] = None
+    ) -> Tuple[bool, str, Optional[int]]:
+        """
+        Arma la notificación (y el recibo PDF si se adjunta) y la deja en la bandeja de
+        salida sin esperar al servidor SMTP. Devuelve (éxito, mensaje, id en la bandeja):
+        el estado del envío se consulta con email_outbox.get_status(id) y el historial se
+        guarda cuando el mensaje sale.
+        """
         # Verificar que el inquilino tenga email
         tenant_email = tenant.get("email", "").strip()
         if not tenant_email:
-            return False, "El inquilino no tiene un email registrado."
+            return False, "El inquilino no tiene un email registrado.", None
         
         # Verificar que el email esté configurado
         if not email_service.is_configured():
-            return False, "El sistema de email no está configurado. Por favor configure las credenciales SMTP primero."
+            return False, "El sistema de email no está configurado. Por favor configure las credenciales SMTP primero.", None
         
         # Obtener plantilla
         template = self.get_template(template_key)
         if not template:
-            return False, f"Plantilla '{template_key}' no encontrada."
+            return False, f"Plantilla '{template_key}' no encontrada.", None
         
         # Preparar datos para la plantilla
-        tenant_name = tenant.get("nombre", "Inquilino")
-        apartment_id = tenant.get("apartamento")
-        apartment_number = "N/A"
-        
-        if apartment_id:
-            try:
-                apt = apartment_service.get_apartment_by_id(int(apartment_id))
-                if apt and 'number' in apt:
-                    apartment_number = apt['number']
-            except Exception:
-                apartment_number = str(apartment_id)
-        
-        rent_amount = float(tenant.get("valor_arriendo", 0))
-        sender_name = email_service.config.get("sender_name", "Building Manager Pro")
-        
-        # Calcular información de pagos si es necesario
-        payment_service._load_data()
-        payments = payment_service.get_payments_by_tenant(tenant.get("id"))
-        
-        next_due_date = "N/A"
-        days_overdue = 0
-        
-        if payments:
-            try:
-                # Ordenar pagos por fecha
-                payments.sort(key=lambda x: datetime.strptime(x.get("fecha_pago", "01/01/1900"), "%d/%m/%Y"), reverse=True)
-                last_payment = payments[0]
-                last_payment_date = datetime.strptime(last_payment.get("fecha_pago", "01/01/1900"), "%d/%m/%Y")
-                
-                # Calcular próximo vencimiento (30 días después del último pago)
-                next_due = last_payment_date + timedelta(days=30)
-                next_due_date = next_due.strftime("%d/%m/%Y")
-                
-                # Calcular días de mora
-                today = datetime.now()
-                if today > next_due:
-                    days_overdue = (today - next_due).days
-            except Exception:
-                pass
+        context, payments = self._template_context(tenant)
+        tenant_name = context["tenant_name"]
         
         # Construir el mensaje (o usar cuerpo editado por el usuario)
         if body_override is not None and body_override.strip():
@@ -219,29 +239,22 @@ Saludos cordiales,
                     break
             
             if not payment:
-                return False, "No se encontró el pago especificado."
+                return False, "No se encontró el pago especificado.", None
             
             subject = template["subject"]
             body = template["template"].format(
                 tenant_name=tenant_name,
-                apartment_number=apartment_number,
-                sender_name=sender_name,
+                apartment_number=context["apartment_number"],
+                sender_name=context["sender_name"],
                 payment_date=payment.get("fecha_pago", ""),
                 payment_amount=float(payment.get("monto", 0)),
                 payment_method=payment.get("metodo", "N/A")
             )
         else:
             subject = template["subject"]
-            body = template["template"].format(
-                tenant_name=tenant_name,
-                apartment_number=apartment_number,
-                rent_amount=rent_amount,
-                sender_name=sender_name,
-                next_due_date=next_due_date,
-                days_overdue=days_overdue
-            )
+            body = template["template"].format(**context)
         
-        # Enviar email
+        # Encolar email
         try:
             # Si se debe adjuntar recibo
             pdf_path = None
@@ -254,68 +267,219 @@ Saludos cordiales,
                         break
                 
                 if payment:
-                    # Ruta del recibo en la carpeta del inquilino (documentos_inquilinos/{cedula}_{nombre}/)
-                    fecha = payment.get("fecha_pago", "").replace("/", "-")
-                    ensure_dirs()
-                    folder_name = get_tenant_document_folder_name(tenant)
-                    tenant_dir = DOCUMENTOS_INQUILINOS_DIR / folder_name
-                    tenant_dir.mkdir(parents=True, exist_ok=True)
-                    pdf_path = str(tenant_dir / f"recibo_{fecha}.pdf")
-                    
-                    # Si el PDF no existe, generarlo automáticamente
-                    if not os.path.exists(pdf_path):
-                        try:
-                            pdf_path = self._generate_receipt_pdf(payment, tenant, pdf_path)
-                        except Exception as e:
-                            return False, f"No se pudo generar el recibo PDF automáticamente.\n\nError: {str(e)}\n\nPor favor, genere el recibo manualmente usando 'Generar Recibo' antes de enviarlo por email."
-            
-            # Enviar email simple (sin adjunto) o con adjunto
-            if pdf_path and os.path.exists(pdf_path):
-                # Enviar email con adjunto usando método personalizado
-                success, message = email_service.send_email_with_attachment(
-                    recipient_email=tenant_email,
-                    recipient_name=tenant_name,
-                    subject=subject,
-                    body=body,
-                    pdf_path=pdf_path
-                )
-                if not success:
-                    return False, message
-            else:
-                # Enviar email simple sin adjunto
-                success, message = email_service.send_simple_email(
-                    recipient_email=tenant_email,
-                    recipient_name=tenant_name,
-                    subject=subject,
-                    body=body
-                )
-                if not success:
-                    return False, message
+                    # Recibo del pago en la carpeta del inquilino: se reutiliza si está al día
+                    try:
+                        pdf_path = receipt_store.get_receipt(payment, tenant)
+                    except Exception as e:
+                        return False, f"No se pudo generar el recibo PDF automáticamente.\n\nError: {str(e)}\n\nPor favor, genere el recibo manualmente usando 'Generar Recibo' antes de enviarlo por email.", None
             
-            # Guardar en historial
+            # Email simple (sin adjunto) o con adjunto; el PDF se lee al enviar
+            attached = bool(pdf_path and os.path.exists(pdf_path))
+            # Registro del historial: se guarda cuando el mensaje sale (record_sent)
             notification_record = {
-                "id": len(self.notifications) + 1,
                 "tenant_id": tenant.get("id"),
                 "tenant_name": tenant_name,
                 "tenant_email": tenant_email,
                 "template_key": template_key,
                 "subject": subject,
-                "sent_at": datetime.now().isoformat(),
-                "attached_receipt": attach_receipt and pdf_path is not None
+                "attached_receipt": attach_receipt and attached
             }
+            outbox_id = email_outbox.enqueue(
+                "attachment" if attached else "simple",
+                recipient_email=tenant_email,
+                recipient_name=tenant_name,
+                subject=subject,
+                body=body,
+                pdf_path=pdf_path if attached else None,
+                notification=notification_record
+            )
             
-            self.notifications.append(notification_record)
-            self._save_data()
-            
-            return True, "Notificación enviada exitosamente."
+            return True, "Notificación en la bandeja de salida; se enviará en segundo plano.", outbox_id
             
         except Exception as e:
-            return False, f"Error al enviar notificación: {str(e)}"
+            return False, f"Error al preparar la notificación: {str(e)}", None
     
-    def _generate_receipt_pdf(self, payment: Dict[str, Any], tenant: Dict[str, Any], filepath: str) -> str:
-        """Genera el PDF del recibo de pago (diseño profesional unificado)."""
-        from manager.app.receipt_pdf import generate_payment_receipt_pdf
-        return generate_payment_receipt_pdf(payment, tenant, filepath)
+    def _template_context(self, tenant: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Datos de las plantillas para un inquilino (nombre, apartamento, arriendo, remitente,
+        próximo vencimiento y días de mora) y sus pagos, del más reciente al más antiguo.
+        """
+        apartment_id = tenant.get("apartamento")
+        apartment_number = "N/A"
+        
+        if apartment_id:
+            try:
+                apt = apartment_service.get_apartment_by_id(int(apartment_id))
+                if apt and 'number' in apt:
+                    apartment_number = apt['number']
+            except Exception:
+                apartment_number = str(apartment_id)
+        
+        # Calcular información de pagos si es necesario
+        payment_service._load_data()
+        payments = payment_service.get_payments_by_tenant(tenant.get("id"))
+        
+        next_due_date = "N/A"
+        days_overdue = 0
+        
+        if payments:
+            try:
+                # Ordenar pagos por fecha (clave canónica YYYY-MM-DD)
+                payments.sort(key=lambda x: record_date_key(x, "fecha_pago") or "1900-01-01", reverse=True)
+                last_payment = payments[0]
+                last_payment_date = key_to_datetime(record_date_key(last_payment, "fecha_pago") or "1900-01-01")
+                
+                # Calcular próximo vencimiento (30 días después del último pago)
+                next_due = last_payment_date + timedelta(days=30)
+                next_due_date = next_due.strftime("%d/%m/%Y")
+                
+                # Calcular días de mora
+                today = datetime.now()
+                if today > next_due:
+                    days_overdue = (today - next_due).days
+            except Exception:
+                pass
+        
+        context = {
+            "tenant_name": tenant.get("nombre", "Inquilino"),
+            "apartment_number": apartment_number,
+            "rent_amount": float(tenant.get("valor_arriendo", 0)),
+            "sender_name": email_service.config.get("sender_name", "Building Manager Pro"),
+            "next_due_date": next_due_date,
+            "days_overdue": days_overdue,
+        }
+        return context, payments
+
+    def prepare_campaign(self, tenants: Iterable[Dict[str, Any]], template_key: str) -> List[Dict[str, Any]]:
+        """
+        Arma de antemano los mensajes de una campaña (una entrada por inquilino, en orden).
+        Cada entrada tiene tenant_id, tenant_name, email, subject y body; si el mensaje no
+        se puede enviar (sin email, error al armarlo) tiene "error" en lugar de subject/body.
+        Lee los servicios: llamar desde el hilo de la interfaz.
+        """
+        template = self.get_template(template_key)
+        if not template:
+            raise ValueError(f"Plantilla '{template_key}' no encontrada.")
+        if template_key == "payment_received":
+            raise ValueError("La plantilla de pago recibido requiere un pago puntual; no se usa en campañas.")
+        messages = []
+        for tenant in tenants:
+            entry = {
+                "tenant_id": tenant.get("id"),
+                "tenant_name": tenant.get("nombre", "Inquilino"),
+                "email": (tenant.get("email") or "").strip(),
+            }
+            if not entry["email"]:
+                entry["error"] = "El inquilino no tiene un email registrado."
+            else:
+                try:
+                    context, _ = self._template_context(tenant)
+                    entry["subject"] = template["subject"]
+                    entry["body"] = template["template"].format(**context)
+                except Exception as e:
+                    entry["error"] = f"No se pudo armar el mensaje: {str(e)}"
+            messages.append(entry)
+        return messages
+
+    def send_campaign(
+        self,
+        messages: List[Dict[str, Any]],
+        template_key: str,
+        connect: Optional[Callable[[], smtplib.SMTP]] = None,
+        rate_limiter: Optional[SendRateLimiter] = None,
+        progress: Optional[Callable[[float, Optional[str]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Envía los mensajes de prepare_campaign por una sola sesión SMTP autenticada (se
+        reconecta si el servidor la cierra) con el límite de envíos por minuto de la
+        configuración. Devuelve por destinatario tenant_id, tenant_name, email, success y
+        message, y guarda los envíos exitosos en el historial con una sola escritura.
+
+        Puede tardar (espera entre envíos): conviene ejecutarlo fuera del hilo de la
+        interfaz. connect reemplaza la conexión configurada (p. ej. un SMTP local de prueba).
+        """
+        results = []
+        sent_records = []
+        total = len(messages)
+
+        def result(entry, success, message):
+            results.append({key: entry[key] for key in ("tenant_id", "tenant_name", "email")})
+            results[-1].update(success=success, message=message)
+
+        if connect is None and not email_service.is_configured():
+            for entry in messages:
+                result(entry, False, "El sistema de email no está configurado. Por favor configure las credenciales SMTP primero.")
+            return results
+
+        limiter = rate_limiter or email_service.rate_limiter()
+        sender = email_service.sender_address()
+        auth_error = None
+        with email_service.open_session(connect) as session:
+            for done, entry in enumerate(messages, start=1):
+                if progress:
+                    progress((done - 1) / total, f"Enviando {done} de {total}...")
+                if "error" in entry:
+                    result(entry, False, entry["error"])
+                    continue
+                if auth_error is not None:
+                    # Con credenciales rechazadas no se reintenta en cada destinatario
+                    result(entry, False, auth_error)
+                    continue
+                limiter.wait()
+                try:
+                    session.send(sender, entry["email"],
+                                 email_service.build_message(entry["email"], entry["subject"], entry["body"]))
+                except smtplib.SMTPAuthenticationError as e:
+                    auth_error = f"Error de autenticación SMTP. Detalles técnicos: {str(e)}"
+                    result(entry, False, auth_error)
+                    continue
+                except smtplib.SMTPRecipientsRefused:
+                    result(entry, False, "El servidor rechazó la dirección de email del destinatario.")
+                    continue
+                except (smtplib.SMTPException, OSError) as e:
+                    result(entry, False, f"Error SMTP: {str(e)}")
+                    continue
+                result(entry, True, "Notificación enviada exitosamente.")
+                sent_records.append({
+                    "tenant_id": entry["tenant_id"],
+                    "tenant_name": entry["tenant_name"],
+                    "tenant_email": entry["email"],
+                    "template_key": template_key,
+                    "subject": entry["subject"],
+                    "sent_at": datetime.now().isoformat(),
+                    "attached_receipt": False
+                })
+
+        if sent_records:
+            with self._history_lock:
+                self._load_data()
+                for record in sent_records:
+                    record["id"] = len(self.notifications) + 1
+                    self.notifications.append(record)
+                self._save_data(upserted=sent_records)
+        if progress:
+            progress(1.0, None)
+        logger.info("Campaña %s: %d de %d enviados", template_key, len(sent_records), total)
+        return results
+
+    def remind_tenants_in_arrears(
+        self,
+        statuses: Iterable[str] = ("moroso",),
+        connect: Optional[Callable[[], smtplib.SMTP]] = None,
+        rate_limiter: Optional[SendRateLimiter] = None,
+        progress: Optional[Callable[[float, Optional[str]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Envía el recordatorio de pago (payment_reminder) a los inquilinos con estado_pago en
+        statuses. Arma y envía en el mismo hilo; desde la interfaz conviene llamar a
+        prepare_campaign en el hilo de Tk y a send_campaign en segundo plano.
+        """
+        from manager.app.services.tenant_service import tenant_service
+        statuses = set(statuses)
+        tenants = [t for t in tenant_service.get_all_tenants() if t.get("estado_pago") in statuses]
+        messages = self.prepare_campaign(tenants, "payment_reminder")
+        return self.send_campaign(messages, "payment_reminder", connect=connect,
+                                  rate_limiter=rate_limiter, progress=progress)
 
 # Instancia global del servicio
-notification_service = NotificationService()
+notification_service = LazyService("notification_service", NotificationService)
@@ -1,12 +1,33 @@
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 from manager.app.paths_config import DATA_DIR, ensure_dirs
 from manager.app.logger import logger
-from manager.app.persistence import save_json_atomic
+from manager.app.services.accounting_service import accounting_service
+from manager.app.services.date_keys import (
+    PAYMENT_DATE_FIELDS, record_date_key, stamp_date_keys, stamp_stale, with_restamped
+)
+from manager.app.services.monthly_rollups import MonthlyRollup, to_amount
+from manager.app.services.records import PaymentRecord, RecordCache, intern_fields
+from manager.app.services.service_registry import LazyService
+from manager.app.services.unit_of_work import transaction
+from manager.app.storage import open_store
+
+
+def _month_key(payment: Dict[str, Any]) -> Optional[str]:
+    """Mes "YYYY-MM" de fecha_pago (de su clave canónica); None si la fecha no es válida."""
+    key = record_date_key(payment, "fecha_pago")
+    return key[:7] if key else None
+
+
+def _rollup_rows(payment: Dict[str, Any]):
+    """Aporte de un pago a los acumulados mensuales (ver monthly_rollups)."""
+    key = record_date_key(payment, "fecha_pago" if payment.get("fecha_pago") else "fecha")
+    if key:
+        yield key[:7], ("pago", "entrada", "", "", None, payment.get("metodo")), to_amount(payment.get("monto"))
 
 
 class PaymentService:
@@ -14,6 +35,18 @@ class PaymentService:
 
     def __init__(self):
         self._ensure_data_file()
+        self._store = open_store("payments", self.DATA_FILE)
+        self._loaded_state = None
+        # Registros con la clave de fecha corregida al cargar, aún no guardados
+        self._restamped: List[Dict[str, Any]] = []
+        # Índices en memoria: id -> pago, id_inquilino -> pagos, "YYYY-MM" -> pagos
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._by_tenant: Dict[Any, List[Dict[str, Any]]] = {}
+        self._by_month: Dict[str, List[Dict[str, Any]]] = {}
+        # Sumas y cantidades por mes/método, al día con cada alta, edición o baja
+        self._rollup = MonthlyRollup(_rollup_rows)
+        # Registros tipados de solo lectura (records())
+        self._records = RecordCache(PaymentRecord)
         self._load_data()
 
     def _ensure_data_file(self):
@@ -24,11 +57,17 @@ class PaymentService:
                 json.dump([], f, ensure_ascii=False, indent=2)
 
     def _load_data(self):
+        """Carga los pagos; si el archivo no cambió desde la última carga no se vuelve a leer."""
+        if self._store.is_fresh(self._loaded_state):
+            return
+        loaded_state = self._store.state()
         try:
-            with open(self.DATA_FILE, 'r', encoding='utf-8') as f:
-                self.payments = json.load(f)
+            self.payments = self._store.load()
             if not isinstance(self.payments, list):
                 self.payments = []
+            self._loaded_state = loaded_state
+            intern_fields(self.payments, ("metodo",))
+            self._stamp_loaded_date_keys()
         except FileNotFoundError:
             self.payments = []
         except json.JSONDecodeError:
@@ -39,65 +78,171 @@ class PaymentService:
             except Exception as e:
                 logger.warning("No se pudo renombrar archivo corrupto: %s", e)
             self.payments = []
+        self._rebuild_indexes()
 
-    def _save_data(self):
-        if not save_json_atomic(self.DATA_FILE, self.payments, ensure_ascii=False, indent=2):
+    def _save_data(self, upserted: Optional[List[Dict[str, Any]]] = None, deleted: Optional[List[int]] = None):
+        """Persiste los pagos. Con upserted/deleted el backend puede escribir solo esos registros."""
+        if upserted is None and deleted is None:
+            for payment in self.payments:
+                stamp_date_keys(payment, PAYMENT_DATE_FIELDS)
+            self._records.invalidate()
+        else:
+            self._records.invalidate(upserted or [])
+        if not self._store.save(self.payments, upserted=with_restamped(upserted, deleted, self._restamped),
+                                deleted=deleted):
             raise IOError("No se pudo guardar payments.json")
+        self._restamped = []
+        self._loaded_state = self._store.state()
+        if upserted is None and deleted is None:
+            # Guardado completo: la lista pudo modificarse desde fuera, reconstruir índices
+            self._rebuild_indexes()
+
+    def _stamp_loaded_date_keys(self):
+        """
+        Corrige en memoria la clave de fecha canónica de los pagos cargados (faltante o
+        desactualizada); se persiste con el próximo guardado.
+        """
+        self._restamped = stamp_stale(self.payments, PAYMENT_DATE_FIELDS)
+
+    def _rebuild_indexes(self):
+        """Reconstruye los índices en memoria a partir de self.payments."""
+        self._by_id = {}
+        self._by_tenant = {}
+        self._by_month = {}
+        self._rollup.clear()
+        for payment in self.payments:
+            self._index_payment(payment)
+
+    def _index_payment(self, payment: Dict[str, Any]):
+        """Agrega un pago a los índices (al final de cada grupo, como en self.payments)."""
+        self._by_id[payment.get("id")] = payment
+        self._by_tenant.setdefault(payment.get("id_inquilino"), []).append(payment)
+        month = _month_key(payment)
+        if month:
+            self._by_month.setdefault(month, []).append(payment)
+        self._rollup.add(payment)
+
+    def _unindex_payment(self, payment: Dict[str, Any]):
+        """Quita un pago de los índices."""
+        self._by_id.pop(payment.get("id"), None)
+        self._rollup.remove(payment)
+        for index, key in ((self._by_tenant, payment.get("id_inquilino")),
+                           (self._by_month, _month_key(payment))):
+            group = index.get(key)
+            if group is None:
+                continue
+            group[:] = [p for p in group if p is not payment]
+            if not group:
+                del index[key]
 
     def get_all_payments(self) -> List[Dict[str, Any]]:
         return self.payments.copy()
 
+    def get_payment_by_id(self, payment_id: int) -> Optional[Dict[str, Any]]:
+        """Obtiene un pago por ID usando el índice en memoria."""
+        self._load_data()
+        payment = self._by_id.get(payment_id)
+        return payment.copy() if payment else None
+
     def get_payments_by_tenant(self, tenant_id: int) -> List[Dict[str, Any]]:
-        # Asegurar que los datos estén actualizados
+        """Pagos de un inquilino, en el orden de registro (índice por id_inquilino)."""
+        # Asegurar que los datos estén actualizados (no relee si el archivo no cambió)
+        self._load_data()
+        return list(self._by_tenant.get(tenant_id, []))
+
+    def get_payments_by_month(self, year: int, month: int) -> List[Dict[str, Any]]:
+        """Pagos cuya fecha_pago cae en el mes indicado (índice por "YYYY-MM")."""
+        self._load_data()
+        return list(self._by_month.get(f"{int(year):04d}-{int(month):02d}", []))
+
+    def data_version(self) -> Any:
+        """
+        Identifica el contenido y el orden de los pagos en memoria: cambia con cada carga o
+        guardado. None si aún no se cargaron.
+        """
+        if self._loaded_state is None:
+            return None
+        return (id(self), self._loaded_state)
+
+    def records(self) -> Tuple[PaymentRecord, ...]:
+        """Pagos como registros tipados de solo lectura, en orden; se comparten sin copiar."""
+        self._load_data()
+        return self._records.records(self.payments, self._loaded_state)
+
+    def monthly_rollup(self) -> MonthlyRollup:
+        """Acumulados mensuales de pagos (fuente "pago"), al día con el archivo."""
         self._load_data()
-        return [p for p in self.payments if p.get("id_inquilino") == tenant_id]
+        return self._rollup
 
     def add_payment(self, payment_data: Dict[str, Any]) -> Dict[str, Any]:
-        new_id = max([p.get("id", 0) for p in self.payments], default=0) + 1
-        payment = {
-            "id": new_id,
-            "id_inquilino": payment_data.get("id_inquilino"),
-            "nombre_inquilino": payment_data.get("nombre_inquilino", ""),
-            "fecha_pago": payment_data.get("fecha_pago", datetime.now().strftime("%d/%m/%Y")),
-            "monto": float(payment_data.get("monto", 0)),
-            "metodo": payment_data.get("metodo", "Efectivo"),
-            "observaciones": payment_data.get("observaciones", ""),
-            "creado_en": datetime.now().isoformat(),
-            "actualizado_en": datetime.now().isoformat()
-        }
-        self.payments.append(payment)
-        self._save_data()
-        
-        # Actualizar automáticamente el estado del inquilino DESPUÉS de guardar
-        tenant_id = payment_data.get("id_inquilino")
-        if tenant_id:
-            try:
-                from manager.app.services.tenant_service import tenant_service
-                # Recargar datos de inquilinos para asegurar datos actualizados
-                tenant_service._load_data()
-                # Recargar datos de pagos en este servicio para asegurar consistencia
-                self._load_data()
-                # Actualizar el estado del inquilino específico (esto también recarga pagos)
-                tenant_service.update_payment_status(tenant_id)
-            except Exception as e:
-                logger.exception("Error al actualizar estado de pago: %s", e)
-        
-        return payment.copy()
+        return self.post_payments([payment_data])[0]
+
+    def post_payments(self, payments_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Registra uno o varios pagos (p. ej. los arriendos de todo un mes) y actualiza el
+        estado de pago de los inquilinos afectados a partir de los pagos en memoria.
+        Se escribe una vez payments.json y, si algún estado cambió, una vez tenants.json.
+        """
+        now = datetime.now()
+        next_id = max([p.get("id", 0) for p in self.payments], default=0) + 1
+        created = []
+        for offset, payment_data in enumerate(payments_data):
+            created.append({
+                "id": next_id + offset,
+                "id_inquilino": payment_data.get("id_inquilino"),
+                "nombre_inquilino": payment_data.get("nombre_inquilino", ""),
+                "fecha_pago": payment_data.get("fecha_pago", now.strftime("%d/%m/%Y")),
+                "monto": float(payment_data.get("monto", 0)),
+                "metodo": payment_data.get("metodo", "Efectivo"),
+                "observaciones": payment_data.get("observaciones", ""),
+                "creado_en": now.isoformat(),
+                "actualizado_en": now.isoformat()
+            })
+            stamp_date_keys(created[-1], PAYMENT_DATE_FIELDS)
+        if not created:
+            return []
+        accounting_service.ensure_period_open(*(p["fecha_pago"] for p in created))
+
+        with transaction():
+            self.payments.extend(created)
+            for payment in created:
+                self._index_payment(payment)
+            self._save_data(upserted=created)
+
+            # Actualizar el estado de los inquilinos afectados en la misma confirmación
+            tenant_ids = list(dict.fromkeys(p["id_inquilino"] for p in created if p["id_inquilino"]))
+            if tenant_ids:
+                try:
+                    from manager.app.services.tenant_service import tenant_service
+                    tenant_service.refresh_payment_statuses(tenant_ids)
+                except Exception as e:
+                    logger.exception("Error al actualizar estado de pago: %s", e)
+
+        return [payment.copy() for payment in created]
 
     def update_payment(self, payment_id: int, payment_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         for i, payment in enumerate(self.payments):
             if payment.get("id") == payment_id:
+                accounting_service.ensure_period_open(payment.get("fecha_pago"), payment_data.get("fecha_pago"))
+                old_keys = (payment.get("id_inquilino"), _month_key(payment))
+                self._rollup.remove(payment)
                 for key, value in payment_data.items():
                     self.payments[i][key] = value
                 self.payments[i]["actualizado_en"] = datetime.now().isoformat()
-                self._save_data()
+                stamp_date_keys(payment, PAYMENT_DATE_FIELDS)
+                if old_keys != (payment.get("id_inquilino"), _month_key(payment)):
+                    # Cambió una clave indexada: reconstruir para conservar el orden de registro
+                    self._rebuild_indexes()
+                else:
+                    self._rollup.add(payment)
+                self._save_data(upserted=[self.payments[i]])
                 
                 # Actualizar automáticamente el estado del inquilino
                 tenant_id = payment_data.get("id_inquilino")
                 if tenant_id:
                     try:
                         from manager.app.services.tenant_service import tenant_service
-                        tenant_service.update_payment_status(tenant_id)
+                        tenant_service.refresh_payment_statuses([tenant_id])
                         logger.info("Estado de pago actualizado para inquilino ID: %s", tenant_id)
                     except Exception as e:
                         logger.warning("Error al actualizar estado de pago: %s", e)
@@ -108,21 +253,32 @@ class PaymentService:
     def delete_payment(self, payment_id: int) -> bool:
         # Obtener el inquilino antes de eliminar el pago
         tenant_id = None
-        for payment in self.payments:
-            if payment.get("id") == payment_id:
-                tenant_id = payment.get("id_inquilino")
-                break
+        payment = self._by_id.get(payment_id)
+        if payment is not None:
+            accounting_service.ensure_period_open(payment.get("fecha_pago"))
+            tenant_id = payment.get("id_inquilino")
         
         initial_count = len(self.payments)
         self.payments = [p for p in self.payments if p.get("id") != payment_id]
         if len(self.payments) < initial_count:
-            self._save_data()
+            if payment is not None and initial_count - len(self.payments) == 1:
+                self._unindex_payment(payment)
+            else:
+                self._rebuild_indexes()
+            self._save_data(deleted=[payment_id])
+            
+            # El recibo del pago eliminado sale del índice (y su PDF se borra)
+            try:
+                from manager.app.services.receipt_store import receipt_store
+                receipt_store.forget([payment_id])
+            except Exception as e:
+                logger.warning("No se pudo quitar el recibo del pago %s: %s", payment_id, e)
             
             # Actualizar automáticamente el estado del inquilino después de eliminar el pago
             if tenant_id:
                 try:
                     from manager.app.services.tenant_service import tenant_service
-                    tenant_service.update_payment_status(tenant_id)
+                    tenant_service.refresh_payment_statuses([tenant_id])
                 except Exception as e:
                     logger.warning("Error al actualizar estado de pago: %s", e)
             
@@ -130,4 +286,4 @@ class PaymentService:
         return False 
 
 # Instancia global del servicio
-payment_service = PaymentService() 
\ No newline at end of file
+payment_service = LazyService("payment_service", PaymentService)
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""
+Recibos de pago en PDF generados a demanda, uno por pago (índice en receipts.json).
+
+Cada pago tiene su recibo en la carpeta del inquilino, con el id del pago en el nombre
+para que dos pagos de la misma fecha no se pisen:
+    documentos_inquilinos/{cedula}_{nombre}/recibo_{dd-mm-aaaa}_{id}.pdf
+
+El índice guarda, por id de pago, la ruta del PDF y el hash de los textos que se dibujan
+en él (receipt_pdf.receipt_fields y RECEIPT_LAYOUT_VERSION). get_receipt() devuelve el
+PDF ya generado mientras el hash coincida y el archivo exista; si el pago se editó
+(PaymentService.update_payment), cambiaron los datos del inquilino o el archivo se borró,
+lo genera de nuevo en ese momento. La fecha "Emitido" del PDF es la de su generación.
+
+Si el recibo de un pago cambia de ruta, o el pago se elimina (forget), el PDF anterior se
+borra; si un email pendiente de la bandeja de salida lo adjunta, queda en "retired_paths"
+del índice hasta que el email sale o falla (release, lo llama email_outbox).
+
+Uso:
+    pdf_path = receipt_store.get_receipt(payment, tenant)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from manager.app.paths_config import DATA_DIR, DOCUMENTOS_INQUILINOS_DIR, ensure_dirs, get_tenant_document_folder_name
+from manager.app.logger import logger
+from manager.app.receipt_pdf import RECEIPT_LAYOUT_VERSION, generate_payment_receipt_pdf, receipt_fields
+from manager.app.services.service_registry import LazyService
+from manager.app.storage import open_store
+
+
+def receipt_path(tenant: Dict[str, Any], payment: Dict[str, Any]) -> str:
+    """Ruta del recibo de payment en la carpeta del inquilino."""
+    fecha = (payment.get("fecha_pago") or "").replace("/", "-")
+    return str(DOCUMENTOS_INQUILINOS_DIR / get_tenant_document_folder_name(tenant)
+               / f"recibo_{fecha}_{payment.get('id')}.pdf")
+
+
+def receipt_digest(fields: Dict[str, str]) -> str:
+    """Hash de los textos del recibo (receipt_fields) y de la versión del diseño."""
+    data = json.dumps([RECEIPT_LAYOUT_VERSION, fields], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ReceiptStore:
+    """Índice de los recibos generados: id de pago -> ruta y hash del contenido."""
+
+    DATA_FILE = DATA_DIR / "receipts.json"
+
+    def __init__(self):
+        self._ensure_data_file()
+        self._store = open_store("receipts", self.DATA_FILE)
+        self._loaded_state = None
+        # Protege el índice: la interfaz y los lotes en segundo plano registran recibos
+        self._lock = threading.RLock()
+        self._by_payment: Dict[Any, Dict[str, Any]] = {}
+        # PDF reemplazados que un email pendiente adjunta: ruta -> id de pago
+        self._retired: Dict[str, Any] = {}
+        self._load_data()
+
+    def _ensure_data_file(self):
+        ensure_dirs()
+        if not self.DATA_FILE.exists():
+            self.DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.DATA_FILE, 'w', encoding='utf-8') as f:
+                json.dump([], f, ensure_ascii=False, indent=2)
+
+    def _load_data(self):
+        """Carga el índice (sin releer si el archivo no cambió)."""
+        with self._lock:
+            if self._store.is_fresh(self._loaded_state):
+                return
+            loaded_state = self._store.state()
+            try:
+                self.entries = self._store.load()
+                if not isinstance(self.entries, list):
+                    self.entries = []
+                self._loaded_state = loaded_state
+            except (FileNotFoundError, json.JSONDecodeError):
+                logger.warning("No se pudo leer el índice de recibos: %s", self.DATA_FILE)
+                self.entries = []
+            self._by_payment = {e.get("id"): e for e in self.entries}
+            self._retired = {path: e.get("id") for e in self.entries for path in e.get("retired_paths") or ()}
+
+    def _save_data(self, upserted: Optional[List[Dict[str, Any]]] = None,
+                   deleted: Optional[List[int]] = None):
+        with self._lock:
+            if self._store.save(self.entries, upserted=upserted, deleted=deleted):
+                self._loaded_state = self._store.state()
+            else:
+                logger.warning("No se pudo guardar el índice de recibos")
+
+    def current_path(self, payment_id: Any, digest: str) -> Optional[str]:
+        """Ruta del recibo de payment_id si se generó con digest y el archivo existe."""
+        with self._lock:
+            self._load_data()
+            entry = self._by_payment.get(payment_id)
+        if entry is None or entry.get("digest") != digest:
+            return None
+        path = entry.get("path")
+        return path if path and os.path.exists(path) else None
+
+    def get_receipt(self, payment: Dict[str, Any], tenant: Dict[str, Any],
+                    apartment: Optional[str] = None, logo_path: Optional[str] = None) -> str:
+        """
+        Ruta del recibo PDF de payment: el ya generado si está al día; si no, lo genera.
+        Si la generación falla se propaga la excepción (p. ej. PermissionError si el PDF
+        está abierto en otro programa).
+
+        :param apartment: número de apartamento ya resuelto (si no, se consulta apartment_service)
+        :param logo_path: como en generate_payment_receipt_pdf
+        """
+        payment_id = payment.get("id")
+        if payment_id is None:
+            raise ValueError("El pago no tiene id: regístrelo antes de generar el recibo.")
+        fields = receipt_fields(payment, tenant, apartment)
+        digest = receipt_digest(fields)
+        path = self.current_path(payment_id, digest)
+        if path:
+            return path
+        path = receipt_path(tenant, payment)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        generate_payment_receipt_pdf(payment, tenant, path, logo_path=logo_path, apartment=fields["apartamento"])
+        self.record([(payment_id, tenant.get("id"), path, digest)])
+        return path
+
+    def record(self, generated: Iterable[Tuple[Any, Any, str, str]]) -> None:
+        """
+        Registra recibos ya generados como (id de pago, id de inquilino, ruta, hash), p. ej.
+        los de un lote (reporting.receipt_batch). Si el recibo de un pago cambió de ruta
+        (otra fecha u otra carpeta), se borra el PDF anterior (ver _settle).
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._load_data()
+            changed = []
+            for payment_id, tenant_id, path, digest in generated:
+                entry = self._by_payment.get(payment_id)
+                if entry is None:
+                    entry = {"id": payment_id}
+                    self.entries.append(entry)
+                    self._by_payment[payment_id] = entry
+                elif entry.get("path") and entry["path"] != path:
+                    self._retire(entry, entry["path"])
+                self._unretire(entry, path)
+                entry.update({"tenant_id": tenant_id, "path": path, "digest": digest, "generated_at": now})
+                changed.append(entry)
+            self._settle(changed)
+
+    def forget(self, payment_ids: Iterable[Any]) -> None:
+        """Quita del índice los recibos de pagos eliminados y borra sus PDF (ver _settle)."""
+        with self._lock:
+            self._load_data()
+            changed = []
+            for payment_id in payment_ids:
+                entry = self._by_payment.get(payment_id)
+                if entry is None:
+                    continue
+                if entry.get("path"):
+                    self._retire(entry, entry["path"])
+                entry.update({"path": None, "digest": None})
+                changed.append(entry)
+            self._settle(changed)
+
+    def release(self, pdf_path: str) -> None:
+        """Un email que adjuntaba pdf_path ya salió o falló: borra el PDF si era un recibo reemplazado."""
+        with self._lock:
+            self._load_data()
+            entry = self._by_payment.get(self._retired.get(pdf_path))
+            if entry is not None:
+                self._settle([entry])
+
+    def _retire(self, entry: Dict[str, Any], path: str) -> None:
+        entry["retired_paths"] = list(entry.get("retired_paths") or ()) + [path]
+        self._retired[path] = entry.get("id")
+
+    def _unretire(self, entry: Dict[str, Any], path: str) -> None:
+        """path vuelve a ser el recibo vigente (p. ej. se restauró la fecha del pago): no se borra."""
+        if path in (entry.get("retired_paths") or ()):
+            entry["retired_paths"] = [p for p in entry["retired_paths"] if p != path]
+            self._retired.pop(path, None)
+
+    def _settle(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Borra los PDF reemplazados de entries que ningún email pendiente adjunta, quita del
+        índice los pagos eliminados sin PDF pendientes y guarda los cambios.
+        """
+        if not entries:
+            return
+        from manager.app.services.email_outbox import email_outbox
+        upserted, deleted = [], []
+        for entry in entries:
+            kept = []
+            for path in entry.get("retired_paths") or ():
+                if email_outbox.references(path):
+                    kept.append(path)
+                    continue
+                self._retired.pop(path, None)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            if kept:
+                entry["retired_paths"] = kept
+            else:
+                entry.pop("retired_paths", None)
+            if entry.get("path") is None and not kept:
+                deleted.append(entry.get("id"))
+            else:
+                upserted.append(entry)
+        if deleted:
+            gone = set(deleted)
+            self.entries = [e for e in self.entries if e.get("id") not in gone]
+            for payment_id in deleted:
+                self._by_payment.pop(payment_id, None)
+        self._save_data(upserted=upserted, deleted=deleted)
+
+# Instancia global del servicio
+receipt_store = LazyService("receipt_store", ReceiptStore)
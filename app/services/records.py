@@ -0,0 +1,244 @@
+"""
+Registros tipados y compactos (solo lectura) de inquilinos, pagos, gastos y apartamentos.
+
+Los servicios guardan y editan diccionarios (el formato de los archivos JSON). Para leer
+muchos registros, como al tomar la instantánea de un reporte, cada servicio ofrece
+records(): una tupla de registros con __slots__, inmutables, que se comparte sin copiar
+mientras los datos no cambien. Tras un alta o edición solo se vuelven a armar los
+registros modificados (RecordCache).
+
+Al armar un registro se normalizan los tipos: montos y arriendo como float, ids como int
+(si vienen como texto numérico) y los valores de estado_pago, metodo, categoria, subtipo,
+unit_type y status se internan (una sola cadena por valor distinto). Un valor que no se puede
+convertir se conserva tal cual.
+
+Los registros se comportan como un Mapping (get, [], in, keys, items, dict(...)): las
+funciones que reciben diccionarios los aceptan sin cambios. copy() devuelve un dict
+editable. En código nuevo conviene leer atributos (payment.monto), que es más rápido; un
+campo ausente en el diccionario de origen vale MISSING.
+
+Uso:
+    for payment in payment_service.records():
+        total += payment.monto
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Valor de los campos ausentes en el diccionario de origen
+MISSING = object()
+
+# Campos con pocos valores distintos (estados, métodos, categorías, tipos de unidad)
+INTERNED_FIELDS = ("estado_pago", "metodo", "categoria", "subtipo", "unit_type", "status")
+
+
+def intern_value(value: Any) -> Any:
+    """La cadena internada (compartida) si value es texto; cualquier otro valor tal cual."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def intern_fields(records: Iterable[Dict[str, Any]], fields: Sequence[str] = INTERNED_FIELDS) -> None:
+    """Interna en el lugar los valores de fields de cada registro (al cargar un archivo)."""
+    for record in records:
+        for field in fields:
+            value = record.get(field)
+            if type(value) is str:
+                record[field] = sys.intern(value)
+
+
+def to_int(value: Any) -> Any:
+    """int para ids guardados como número o texto numérico; otro valor tal cual."""
+    if type(value) is int:
+        return value
+    if type(value) is str and value.strip().isdigit():
+        return int(value)
+    return value
+
+
+def to_float(value: Any) -> Any:
+    """float para montos numéricos o texto numérico; otro valor (p. ej. "") tal cual."""
+    if type(value) is float:
+        return value
+    if isinstance(value, (int, str)) and not isinstance(value, bool):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+class Record(Mapping):
+    """
+    Base de los registros tipados. Cada subclase declara sus campos conocidos en
+    __slots__ y la conversión de algunos en COERCE; los campos desconocidos se guardan
+    en _extra (None si no hay). Un campo ausente en el diccionario guarda MISSING, así
+    get() y "in" responden igual que sobre el diccionario original.
+    """
+
+    __slots__ = ("_extra",)
+    COERCE: Dict[str, Callable[[Any], Any]] = {}
+    _fields: frozenset = frozenset()
+    _plan: Tuple[Tuple[str, Callable[[Any, Any], None], Optional[Callable[[Any], Any]]], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        names = cls.__dict__.get("__slots__", ())
+        cls._fields = frozenset(names)
+        # Asignación directa al slot (evita __setattr__, que impide modificar el registro)
+        cls._plan = tuple((name, cls.__dict__[name].__set__, cls.COERCE.get(name)) for name in names)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        record = object.__new__(cls)
+        get = data.get
+        present = 0
+        for name, setter, coerce in cls._plan:
+            value = get(name, MISSING)
+            if value is not MISSING:
+                present += 1
+                if coerce is not None:
+                    value = coerce(value)
+            setter(record, value)
+        extra = None
+        if present != len(data):
+            fields = cls._fields
+            extra = {key: value for key, value in data.items() if key not in fields}
+        Record._extra.__set__(record, extra)
+        return record
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} es de solo lectura")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} es de solo lectura")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            value = getattr(self, key)
+            if value is MISSING:
+                raise KeyError(key)
+            return value
+        extra = self._extra
+        if extra is None:
+            raise KeyError(key)
+        return extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._fields:
+            value = getattr(self, key)
+            return default if value is MISSING else value
+        extra = self._extra
+        return extra.get(key, default) if extra is not None else default
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._fields:
+            return getattr(self, key) is not MISSING
+        extra = self._extra
+        return extra is not None and key in extra
+
+    def __iter__(self) -> Iterator[str]:
+        for name in type(self).__slots__:
+            if getattr(self, name) is not MISSING:
+                yield name
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        # Como un dict: falso solo si no tiene campos (sin contar todos, como haría __len__)
+        for _ in self:
+            return True
+        return False
+
+    def copy(self) -> Dict[str, Any]:
+        """Diccionario editable con los mismos campos (como dict.copy)."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.copy()!r})"
+
+    def __reduce__(self):
+        return type(self).from_dict, (self.copy(),)
+
+
+class TenantRecord(Record):
+    """Inquilino (tenants.json)."""
+
+    __slots__ = ("id", "nombre", "numero_documento", "telefono", "email", "direccion",
+                 "apartamento", "valor_arriendo", "deposito", "fecha_ingreso", "fecha_ingreso_iso",
+                 "estado_pago", "fecha_desactivacion", "motivo_desactivacion",
+                 "contacto_emergencia_nombre", "contacto_emergencia_telefono",
+                 "created_at", "updated_at")
+    COERCE = {"id": to_int, "apartamento": to_int, "valor_arriendo": to_float, "deposito": to_float,
+              "estado_pago": intern_value}
+
+
+class PaymentRecord(Record):
+    """Pago (payments.json)."""
+
+    __slots__ = ("id", "id_inquilino", "nombre_inquilino", "fecha_pago", "fecha_pago_iso", "monto",
+                 "metodo", "observaciones", "creado_en", "actualizado_en")
+    COERCE = {"id": to_int, "id_inquilino": to_int, "monto": to_float, "metodo": intern_value}
+
+
+class ExpenseRecord(Record):
+    """Gasto (gastos.json). apartamento es el número de la unidad o "---"/"General": no se convierte."""
+
+    __slots__ = ("id", "fecha", "fecha_iso", "categoria", "subtipo", "apartamento", "monto",
+                 "descripcion", "documento")
+    COERCE = {"id": to_int, "monto": to_float, "categoria": intern_value, "subtipo": intern_value}
+
+
+class ApartmentRecord(Record):
+    """Apartamento o unidad (apartments.json)."""
+
+    __slots__ = ("id", "building_id", "number", "unit_type", "status", "floor", "base_rent",
+                 "created_at", "updated_at")
+    COERCE = {"id": to_int, "building_id": to_int, "base_rent": to_float,
+              "unit_type": intern_value, "status": intern_value}
+
+
+class RecordCache:
+    """
+    Registros tipados de la lista de un servicio. Reutiliza el registro de cada
+    diccionario mientras no cambie: el servicio llama a invalidate() con los
+    diccionarios modificados (o sin argumentos tras un guardado completo).
+    """
+
+    def __init__(self, record_type: type):
+        self._record_type = record_type
+        # id(dict) -> registro. _dicts mantiene vivos esos diccionarios: mientras estén en
+        # el caché ningún otro objeto puede tener el mismo id
+        self._by_dict: Dict[int, Record] = {}
+        self._dicts: List[Dict[str, Any]] = []
+        self._version: Any = None
+        self._records: Tuple[Record, ...] = ()
+
+    def invalidate(self, changed: Optional[Iterable[Dict[str, Any]]] = None) -> None:
+        """Descarta los registros de changed (de todos si es None)."""
+        self._version = None
+        if changed is None:
+            self._by_dict = {}
+            self._dicts = []
+            return
+        for data in changed:
+            self._by_dict.pop(id(data), None)
+
+    def records(self, dicts: Sequence[Dict[str, Any]], version: Any) -> Tuple[Record, ...]:
+        """Registros de dicts (en su orden) para la versión de datos version."""
+        if version is not None and version == self._version:
+            return self._records
+        from_dict = self._record_type.from_dict
+        cached = self._by_dict.get
+        records = []
+        for data in dicts:
+            record = cached(id(data))
+            records.append(record if record is not None else from_dict(data))
+        self._dicts = list(dicts)
+        self._by_dict = dict(zip(map(id, self._dicts), records))
+        self._records = tuple(records)
+        self._version = version
+        return self._records
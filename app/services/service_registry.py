@@ -0,0 +1,91 @@
+"""
+Registro de servicios con inicialización diferida para Building Manager Pro.
+
+Los módulos de servicio exponen su singleton como un LazyService: importar el
+módulo no construye el servicio (ni lee sus JSON); la instancia real se crea en
+el primer acceso a un atributo. Así importar vistas y ventanas no dispara la
+carga de datos antes de que se necesiten.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from manager.app.logger import logger
+
+# Proxies registrados por nombre (en orden de declaración)
+_registry: Dict[str, "LazyService"] = {}
+
+
+class LazyService:
+    """Proxy que construye el servicio real en el primer uso y le delega todo acceso."""
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_instance", None)
+        object.__setattr__(self, "_lazy_lock", threading.RLock())
+        object.__setattr__(self, "_lazy_init_ms", None)
+        _registry[name] = self
+
+    def _lazy_get(self) -> Any:
+        """Devuelve la instancia real, creándola si aún no existe (seguro entre hilos)."""
+        instance = object.__getattribute__(self, "_lazy_instance")
+        if instance is not None:
+            return instance
+        with object.__getattribute__(self, "_lazy_lock"):
+            instance = object.__getattribute__(self, "_lazy_instance")
+            if instance is None:
+                start = time.perf_counter()
+                instance = object.__getattribute__(self, "_lazy_factory")()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                object.__setattr__(self, "_lazy_instance", instance)
+                object.__setattr__(self, "_lazy_init_ms", elapsed_ms)
+                logger.debug("Servicio %s inicializado en %.1f ms",
+                             object.__getattribute__(self, "_lazy_name"), elapsed_ms)
+        return instance
+
+    @property
+    def is_initialized(self) -> bool:
+        return object.__getattribute__(self, "_lazy_instance") is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        # Los nombres especiales (__bases__, __wrapped__...) los consultan issubclass,
+        # inspect o pytest sobre cualquier objeto: no deben construir el servicio
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+        return getattr(self._lazy_get(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._lazy_get(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._lazy_get(), attr)
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, "_lazy_name")
+        state = "inicializado" if self.is_initialized else "pendiente"
+        return f"<LazyService {name} ({state})>"
+
+
+def get_service(name: str) -> Any:
+    """Devuelve la instancia real del servicio registrado con ese nombre."""
+    return _registry[name]._lazy_get()
+
+
+def get_initialized_instances() -> List[Any]:
+    """Instancias reales de los servicios ya construidos (sin construir los pendientes)."""
+    return [
+        object.__getattribute__(proxy, "_lazy_instance")
+        for proxy in _registry.values()
+        if proxy.is_initialized
+    ]
+
+
+def get_initialized_services() -> List[Dict[str, Any]]:
+    """Servicios ya construidos con su tiempo de inicialización en ms."""
+    return [
+        {"name": name, "init_ms": object.__getattribute__(proxy, "_lazy_init_ms")}
+        for name, proxy in _registry.items()
+        if proxy.is_initialized
+    ]
@@ -0,0 +1,182 @@
+"""
+Índice de búsqueda incremental de inquilinos.
+Normaliza (minúsculas, sin tildes) nombre, documento, teléfono y email, y mantiene
+trigramas -> ids para responder búsquedas por subcadena sin recorrer a todos los
+inquilinos. El número de apartamento se resuelve aparte (ver set_apartment_numbers)
+para que renombrar un apartamento no obligue a reindexar inquilinos.
+
+Uso:
+    session = tenant_service.search_session()
+    ids = session.search("pér")    # ids de inquilinos que contienen "per"
+    ids = session.search("pére")   # refina el resultado anterior, no vuelve a buscar en todo
+"""
+
+import unicodedata
+from typing import Any, Dict, Iterable, Optional, Set
+
+# Campos del inquilino que se indexan como texto
+SEARCH_FIELDS = ("nombre", "numero_documento", "telefono", "email")
+NGRAM_SIZE = 3
+# Separador entre campos: evita coincidencias que crucen de un campo a otro
+_FIELD_SEPARATOR = "\x00"
+
+
+def normalize_text(value: Any) -> str:
+    """Texto en minúsculas y sin tildes/diacríticos ('Pérez' -> 'perez')."""
+    text = str(value or "").casefold()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class TenantSearchIndex:
+    """Índice en memoria: texto normalizado y trigramas por inquilino, más apartamento."""
+
+    def __init__(self):
+        self.built = False
+        # Se incrementa con cada cambio; las sesiones lo usan para saber si su caché sigue vigente
+        self.version = 0
+        self._docs: Dict[Any, str] = {}
+        self._grams: Dict[str, Set[Any]] = {}
+        self._apartment_of: Dict[Any, str] = {}
+        self._ids_by_apartment: Dict[str, Set[Any]] = {}
+        self._apartment_numbers: Dict[str, str] = {}
+        self._apartment_numbers_version: Any = None
+
+    def clear(self) -> None:
+        """Vacía el índice; se reconstruye con build() en la próxima búsqueda."""
+        self.built = False
+        self.version += 1
+        self._docs = {}
+        self._grams = {}
+        self._apartment_of = {}
+        self._ids_by_apartment = {}
+
+    def build(self, tenants: Iterable[Dict[str, Any]]) -> None:
+        self.clear()
+        for tenant in tenants:
+            self._add(tenant)
+        self.built = True
+
+    def update(self, tenant: Dict[str, Any]) -> None:
+        """Agrega o reindexa un inquilino (no hace nada si el índice aún no se construyó)."""
+        if not self.built:
+            return
+        self._remove(tenant.get("id"))
+        self._add(tenant)
+        self.version += 1
+
+    def remove(self, tenant_id: Any) -> None:
+        if not self.built:
+            return
+        self._remove(tenant_id)
+        self.version += 1
+
+    def set_apartment_numbers(self, version: Any, numbers: Dict[str, Any]) -> None:
+        """Números de apartamento por id (str). version identifica el estado de los apartamentos."""
+        if version is not None and version == self._apartment_numbers_version:
+            return
+        self._apartment_numbers = {key: normalize_text(number) for key, number in numbers.items()}
+        self._apartment_numbers_version = version
+        self.version += 1
+
+    def apartment_numbers_current(self, version: Any) -> bool:
+        return version is not None and version == self._apartment_numbers_version
+
+    def _add(self, tenant: Dict[str, Any]) -> None:
+        tenant_id = tenant.get("id")
+        doc = _FIELD_SEPARATOR.join(normalize_text(tenant.get(field)) for field in SEARCH_FIELDS)
+        self._docs[tenant_id] = doc
+        for gram in _ngrams(doc):
+            self._grams.setdefault(gram, set()).add(tenant_id)
+        apartment = tenant.get("apartamento")
+        if apartment is not None and str(apartment).strip() != "":
+            key = str(apartment).strip()
+            self._apartment_of[tenant_id] = key
+            self._ids_by_apartment.setdefault(key, set()).add(tenant_id)
+
+    def _remove(self, tenant_id: Any) -> None:
+        doc = self._docs.pop(tenant_id, None)
+        if doc is not None:
+            for gram in _ngrams(doc):
+                ids = self._grams.get(gram)
+                if ids is not None:
+                    ids.discard(tenant_id)
+                    if not ids:
+                        del self._grams[gram]
+        key = self._apartment_of.pop(tenant_id, None)
+        if key is not None:
+            ids = self._ids_by_apartment.get(key)
+            if ids is not None:
+                ids.discard(tenant_id)
+                if not ids:
+                    del self._ids_by_apartment[key]
+
+    def _matches(self, tenant_id: Any, query: str) -> bool:
+        if query in self._docs.get(tenant_id, ""):
+            return True
+        key = self._apartment_of.get(tenant_id)
+        return key is not None and query in self._apartment_numbers.get(key, "")
+
+    def search(self, query: str, within: Optional[Set[Any]] = None) -> Set[Any]:
+        """
+        Ids de inquilinos cuyo nombre, documento, teléfono, email o número de apartamento
+        contiene query (ya normalizada). Con within solo se verifican esos candidatos.
+        """
+        if within is not None:
+            return {tenant_id for tenant_id in within if self._matches(tenant_id, query)}
+        if len(query) >= NGRAM_SIZE:
+            postings = []
+            for gram in _ngrams(query):
+                ids = self._grams.get(gram)
+                if not ids:
+                    postings = None
+                    break
+                postings.append(ids)
+            result: Set[Any] = set()
+            if postings:
+                postings.sort(key=len)
+                candidates = set(postings[0]).intersection(*postings[1:])
+                docs = self._docs
+                result = {tenant_id for tenant_id in candidates if query in docs[tenant_id]}
+        else:
+            result = {tenant_id for tenant_id, doc in self._docs.items() if query in doc}
+        for key, number in self._apartment_numbers.items():
+            if query in number:
+                result.update(self._ids_by_apartment.get(key, ()))
+        return result
+
+
+class SearchSession:
+    """
+    Búsqueda incremental para un cuadro de texto: si la consulta nueva extiende la
+    anterior, solo se verifican los resultados anteriores en lugar de todo el índice.
+    """
+
+    def __init__(self, index: TenantSearchIndex, prepare=None):
+        self._index = index
+        # prepare() deja el índice construido y al día antes de buscar
+        self._prepare = prepare
+        self._last_query: Optional[str] = None
+        self._last_result: Set[Any] = set()
+        self._last_version = None
+
+    def search(self, text: str) -> Set[Any]:
+        if self._prepare is not None:
+            self._prepare()
+        query = normalize_text(text.strip())
+        index = self._index
+        within = None
+        if (self._last_query is not None and self._last_version == index.version
+                and query.startswith(self._last_query)):
+            if query == self._last_query:
+                return set(self._last_result)
+            within = self._last_result
+        result = index.search(query, within)
+        self._last_query, self._last_result, self._last_version = query, result, index.version
+        return set(result)
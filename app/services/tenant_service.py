@@ -5,28 +5,210 @@ Incluye lógica de mora integral: períodos mensuales desde fecha_ingreso (día
 aplicación de pagos a períodos y cálculo de días/meses en mora por montos.
 """
 
+import calendar
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from datetime import datetime
 
-from dateutil.relativedelta import relativedelta
-
 from manager.app.paths_config import DATA_DIR, ensure_dirs
 from manager.app.logger import logger
-from manager.app.persistence import save_json_atomic
+from manager.app.services.date_keys import (
+    TENANT_DATE_FIELDS,
+    key_to_datetime,
+    record_date_key,
+    stamp_date_keys,
+    stamp_stale,
+    with_restamped,
+)
+from manager.app.services.records import RecordCache, TenantRecord, intern_fields
+from manager.app.services.service_registry import LazyService
+from manager.app.services.tenant_search import SearchSession, TenantSearchIndex
+from manager.app.storage import open_store
 
 # Formato de fecha usado en la app (ingreso, pagos)
 DATE_FMT = "%d/%m/%Y"
 
 
+def _add_months(dt: datetime, months: int) -> datetime:
+    """
+    Suma meses a una fecha con el mismo recorte de día que relativedelta(months=n):
+    si el día no existe en el mes destino se usa el último día (31/01 + 1 mes = 28/02 o 29/02).
+    """
+    total = dt.year * 12 + (dt.month - 1) + months
+    year, month = divmod(total, 12)
+    month += 1
+    day = min(dt.day, calendar.monthrange(year, month)[1])
+    return dt.replace(year=year, month=month, day=day)
+
+
+def _count_due_periods(fecha_ingreso: datetime, hoy: datetime) -> int:
+    """
+    Número de períodos n >= 0 con fecha_ingreso + n meses <= hoy, en tiempo constante.
+    Equivale a contar mes a mes, pero solo evalúa el mes de hoy (y el anterior si el
+    vencimiento de este mes aún no llegó), sin depender de la antigüedad del inquilino.
+    """
+    months = (hoy.year - fecha_ingreso.year) * 12 + (hoy.month - fecha_ingreso.month)
+    if months < 0:
+        return 0
+    last_due = months if _add_months(fecha_ingreso, months) <= hoy else months - 1
+    return max(0, last_due + 1)
+
+
+def parse_fecha(fecha_str: str) -> Optional[datetime]:
+    """Parsea fecha en formato DD/MM/YYYY. Retorna datetime a las 00:00:00 o None."""
+    if not fecha_str or not isinstance(fecha_str, str):
+        return None
+    s = fecha_str.strip()
+    try:
+        return datetime.strptime(s, DATE_FMT)
+    except ValueError:
+        try:
+            return datetime.fromisoformat(s.replace("Z", "+00:00"))
+        except Exception:
+            return None
+
+
+def compute_arrears_info(tenant: Dict[str, Any], payments: List[Dict[str, Any]],
+                         hoy: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Calcula mora integral: períodos mensuales desde fecha_ingreso (día de pago),
+    aplicación de pagos por monto y estado/días en mora.
+    - Día de pago = día del mes de fecha_ingreso.
+    - Pago por anticipado: el período 0 (primer mes de ocupación) vence en fecha_ingreso.
+    - Período n vence en fecha_ingreso + n meses (n=0,1,2,...).
+    - Pagos se aplican a períodos más antiguos primero (por monto total).
+    - Al día solo cuando total_pagado >= total esperado de períodos vencidos.
+    Función pura (no consulta servicios): hoy se puede fijar para reportes y pruebas.
+    """
+    if hoy is None:
+        hoy = datetime.now()
+    hoy = hoy.replace(hour=0, minute=0, second=0, microsecond=0)
+    fecha_ingreso = key_to_datetime(record_date_key(tenant, "fecha_ingreso"))
+    valor_arriendo = float(tenant.get("valor_arriendo") or 0)
+
+    result = {
+        "estado_pago": "al_dia",
+        "dias_mora": 0,
+        "dias_del_periodo_actual": 0,
+        "meses_mora": 0,
+        "periods_due": 0,
+        "periods_covered": 0,
+        "total_expected": 0.0,
+        "total_paid": 0.0,
+        "amount_pending": 0.0,  # total_expected + mes actual si ya estamos en ese período (pago por mes completo)
+        "first_unpaid_due_date": None,
+    }
+
+    if not fecha_ingreso:
+        result["estado_pago"] = "moroso"
+        return result
+
+    # Períodos vencidos: período 0 vence en fecha_ingreso (pago por anticipado), luego +1 mes cada uno
+    # Contamos todo período con due_n <= hoy
+    periods_due = _count_due_periods(fecha_ingreso, hoy)
+    result["periods_due"] = periods_due
+    result["total_expected"] = round(periods_due * valor_arriendo, 2)
+
+    total_paid = sum(float(p.get("monto") or 0) for p in payments)
+    result["total_paid"] = round(total_paid, 2)
+
+    if valor_arriendo <= 0:
+        result["periods_covered"] = periods_due if total_paid >= result["total_expected"] else 0
+    else:
+        result["periods_covered"] = min(periods_due, int(total_paid / valor_arriendo))
+    periods_in_arrears = max(0, periods_due - result["periods_covered"])
+    result["meses_mora"] = periods_in_arrears
+
+    # Fecha de vencimiento del primer período impago (índice 0-based = periods_covered)
+    first_unpaid_period = result["periods_covered"]
+    first_unpaid_due = _add_months(fecha_ingreso, first_unpaid_period)
+    result["first_unpaid_due_date"] = first_unpaid_due
+
+    if first_unpaid_due < hoy:
+        result["dias_mora"] = (hoy - first_unpaid_due).days
+
+    # Días del período actual (para formato "X meses y Y días"): días desde el inicio del
+    # último período vencido (el "mes actual" en mora), no desde el primer período impago.
+    if periods_in_arrears > 0:
+        # Inicio del período actual = vencimiento del último período que ya venció (periods_due - 1)
+        inicio_periodo_actual = _add_months(fecha_ingreso, periods_due - 1)
+        if hoy >= inicio_periodo_actual:
+            result["dias_del_periodo_actual"] = (hoy - inicio_periodo_actual).days
+
+    # Monto pendiente: total esperado de los períodos ya vencidos (total_expected ya incluye
+    # el período actual si hoy >= su fecha de vencimiento; no sumar mes extra).
+    result["amount_pending"] = result["total_expected"]
+
+    # Estado: al día solo si lo pagado cubre todos los períodos vencidos.
+    # Gracia de 5 días: si solo hay 1 período impago y estamos dentro de 5 días
+    # desde su vencimiento, mostrar "pendiente_pago" (no "moroso") como apoyo visual.
+    if periods_due == 0:
+        dias_desde_ingreso = (hoy - fecha_ingreso).days
+        result["estado_pago"] = "pendiente_registro" if dias_desde_ingreso <= 5 else "al_dia"
+    elif total_paid >= result["total_expected"]:
+        result["estado_pago"] = "al_dia"
+    elif periods_in_arrears > 0:
+        dias_desde_vencimiento = (hoy - first_unpaid_due).days
+        if (
+            periods_in_arrears == 1
+            and hoy >= first_unpaid_due
+            and 0 <= dias_desde_vencimiento <= 5
+        ):
+            result["estado_pago"] = "pendiente_pago"
+            result["dias_mora"] = 0
+            result["dias_del_periodo_actual"] = 0
+        else:
+            result["estado_pago"] = "moroso"
+    else:
+        result["estado_pago"] = "al_dia"
+
+    return result
+
+
+def compute_payment_state(tenant: Dict[str, Any], payments: List[Dict[str, Any]],
+                          hoy: Optional[datetime] = None) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    (estado_pago, información de mora) que recalculate_all_payment_statuses asignaría al
+    inquilino: los desactivados manualmente conservan "inactivo" (sin información de
+    mora); el resto sale de la mora integral. Si el cálculo falla, ("moroso", None).
+    """
+    if tenant.get('fecha_desactivacion') or tenant.get('motivo_desactivacion'):
+        if tenant.get('estado_pago', 'al_dia') == 'inactivo':
+            return 'inactivo', None
+    try:
+        arrears = compute_arrears_info(tenant, payments, hoy)
+        return arrears["estado_pago"], arrears
+    except Exception as e:
+        logger.warning("Error al calcular estado de pago: %s", e)
+        return "moroso", None
+
+
+def compute_payment_status(tenant: Dict[str, Any], payments: List[Dict[str, Any]],
+                           hoy: Optional[datetime] = None) -> str:
+    """Estado de pago que recalculate_all_payment_statuses asignaría al inquilino."""
+    return compute_payment_state(tenant, payments, hoy)[0]
+
+
 class TenantService:
     """Servicio para gestión de inquilinos"""
     
     def __init__(self):
         self.data_file = str(DATA_DIR / "tenants.json")
         self._ensure_data_directory()
+        self._store = open_store("tenants", self.data_file)
+        self._loaded_state = None
+        # Registros con la clave de fecha corregida al cargar, aún no guardados
+        self._restamped: List[Dict[str, Any]] = []
+        # Índices en memoria: id -> inquilino, apartamento -> inquilino activo
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._active_by_apartment: Dict[str, List[Dict[str, Any]]] = {}
+        self._apartment_of: Dict[int, str] = {}
+        # Índice de búsqueda por texto; se construye en la primera búsqueda
+        self._search_index = TenantSearchIndex()
+        # Registros tipados de solo lectura (records())
+        self._records = RecordCache(TenantRecord)
         self._load_data()
     
     def _ensure_data_directory(self):
@@ -40,12 +222,20 @@ class TenantService:
                 json.dump([], f, ensure_ascii=False, indent=2)
     
     def _load_data(self):
-        """Carga datos desde el archivo JSON. Si está corrupto, renombra a .bak y arranca con lista vacía."""
+        """
+        Carga datos desde el archivo JSON. Si está corrupto, renombra a .bak y arranca con lista vacía.
+        Si el archivo no cambió desde la última carga (ni hubo escrituras), no se vuelve a leer.
+        """
+        if self._store.is_fresh(self._loaded_state):
+            return
+        loaded_state = self._store.state()
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                self.tenants = json.load(f)
+            self.tenants = self._store.load()
             if not isinstance(self.tenants, list):
                 self.tenants = []
+            self._loaded_state = loaded_state
+            intern_fields(self.tenants, ("estado_pago",))
+            self._stamp_loaded_date_keys()
         except FileNotFoundError:
             self.tenants = []
         except json.JSONDecodeError:
@@ -56,22 +246,98 @@ class TenantService:
             except Exception as e:
                 logger.warning("No se pudo renombrar archivo corrupto: %s", e)
             self.tenants = []
+        self._rebuild_indexes()
     
-    def _save_data(self):
-        """Guarda datos al archivo JSON (escritura atómica)."""
-        if not save_json_atomic(self.data_file, self.tenants, ensure_ascii=False, indent=2):
+    def _save_data(self, upserted: Optional[List[Dict[str, Any]]] = None, deleted: Optional[List[int]] = None):
+        """
+        Guarda datos (escritura atómica en JSON). Con upserted/deleted el backend
+        puede persistir solo los registros afectados.
+        """
+        if upserted is None and deleted is None:
+            # Guardado completo: la lista pudo modificarse desde fuera, reconstruir índices
+            for tenant in self.tenants:
+                stamp_date_keys(tenant, TENANT_DATE_FIELDS)
+            self._rebuild_indexes()
+            self._records.invalidate()
+        else:
+            self._records.invalidate(upserted or [])
+            for tenant in upserted or []:
+                stamp_date_keys(tenant, TENANT_DATE_FIELDS)
+                self._index_tenant(tenant)
+            for tenant_id in deleted or []:
+                self._by_id.pop(tenant_id, None)
+                self._unindex_apartment(tenant_id)
+                self._search_index.remove(tenant_id)
+        if not self._store.save(self.tenants, upserted=with_restamped(upserted, deleted, self._restamped),
+                                deleted=deleted):
             raise IOError("No se pudo guardar tenants.json")
+        self._restamped = []
+        self._loaded_state = self._store.state()
+    
+    def _stamp_loaded_date_keys(self):
+        """
+        Corrige en memoria la clave de fecha canónica de los inquilinos cargados (faltante o
+        desactualizada); se persiste con el próximo guardado.
+        """
+        self._restamped = stamp_stale(self.tenants, TENANT_DATE_FIELDS)
+
+    @staticmethod
+    def _apartment_key(apartment: Any) -> Optional[str]:
+        """Normaliza el id de apartamento (int o str) a la clave del índice."""
+        if apartment is None or str(apartment).strip() == "":
+            return None
+        return str(apartment).strip()
+    
+    def _rebuild_indexes(self):
+        """Reconstruye los índices en memoria a partir de self.tenants."""
+        self._by_id = {}
+        self._active_by_apartment = {}
+        self._apartment_of = {}
+        self._search_index.clear()
+        for tenant in self.tenants:
+            self._index_tenant(tenant)
+    
+    def _index_tenant(self, tenant: Dict[str, Any]):
+        """Agrega o reubica un inquilino en los índices (id y apartamento si está activo)."""
+        tenant_id = tenant.get("id")
+        self._by_id[tenant_id] = tenant
+        self._search_index.update(tenant)
+        self._unindex_apartment(tenant_id)
+        key = self._apartment_key(tenant.get("apartamento"))
+        if key is None or tenant.get("estado_pago") == "inactivo":
+            return
+        self._active_by_apartment.setdefault(key, []).append(tenant)
+        self._apartment_of[tenant_id] = key
+    
+    def _unindex_apartment(self, tenant_id: int):
+        """Quita un inquilino del índice por apartamento."""
+        key = self._apartment_of.pop(tenant_id, None)
+        if key is None:
+            return
+        group = [t for t in self._active_by_apartment.get(key, []) if t.get("id") != tenant_id]
+        if group:
+            self._active_by_apartment[key] = group
+        else:
+            self._active_by_apartment.pop(key, None)
     
     def get_all_tenants(self) -> List[Dict[str, Any]]:
         """Obtiene todos los inquilinos"""
         return self.tenants.copy()
     
+    def records(self) -> Tuple[TenantRecord, ...]:
+        """Inquilinos como registros tipados de solo lectura, en orden; se comparten sin copiar."""
+        self._load_data()
+        return self._records.records(self.tenants, self._loaded_state)
+
     def get_tenant_by_id(self, tenant_id: int) -> Optional[Dict[str, Any]]:
         """Obtiene un inquilino por ID"""
-        for tenant in self.tenants:
-            if tenant.get("id") == tenant_id:
-                return tenant.copy()
-        return None
+        tenant = self._by_id.get(tenant_id)
+        return tenant.copy() if tenant else None
+    
+    def get_active_tenant_by_apartment(self, apartment_id: Any) -> Optional[Dict[str, Any]]:
+        """Obtiene el inquilino activo (estado_pago distinto de "inactivo") de un apartamento"""
+        tenants = self._active_by_apartment.get(self._apartment_key(apartment_id))
+        return tenants[0].copy() if tenants else None
     
     def create_tenant(self, tenant_data: Dict[str, Any]) -> Dict[str, Any]:
         """Crea un nuevo inquilino"""
@@ -111,7 +377,7 @@ class TenantService:
             self.tenants.append(tenant)
             
             # Guardar cambios
-            self._save_data()
+            self._save_data(upserted=[tenant])
             
             return tenant.copy()
             
@@ -128,7 +394,7 @@ class TenantService:
                     for key, value in tenant_data.items():
                         self.tenants[i][key] = value
                     self.tenants[i]["updated_at"] = datetime.now().isoformat()
-                    self._save_data()
+                    self._save_data(upserted=[self.tenants[i]])
                     return self.tenants[i].copy()
             return None
         except Exception as e:
@@ -141,7 +407,7 @@ class TenantService:
         self.tenants = [t for t in self.tenants if t.get("id") != tenant_id]
         
         if len(self.tenants) < initial_count:
-            self._save_data()
+            self._save_data(deleted=[tenant_id])
             return True
         
         return False
@@ -168,6 +434,27 @@ class TenantService:
         
         return results
     
+    def _prepare_search_index(self):
+        """Construye el índice de búsqueda si hace falta y refresca los números de apartamento."""
+        self._load_data()
+        if not self._search_index.built:
+            self._search_index.build(self.tenants)
+        from manager.app.services.apartment_service import apartment_service
+        apartments_state = apartment_service._loaded_state
+        if not self._search_index.apartment_numbers_current(apartments_state):
+            self._search_index.set_apartment_numbers(
+                apartments_state,
+                {str(apt.get("id")): apt.get("number", "") for apt in apartment_service.apartments},
+            )
+
+    def search_session(self) -> SearchSession:
+        """
+        Sesión de búsqueda incremental (una por cuadro de búsqueda). session.search(texto)
+        retorna los ids de inquilinos cuyo nombre, documento, teléfono, email o número de
+        apartamento contiene el texto, sin distinguir mayúsculas ni tildes.
+        """
+        return SearchSession(self._search_index, prepare=self._prepare_search_index)
+
     def get_statistics(self) -> Dict[str, int]:
         """Obtiene estadísticas de inquilinos"""
         total = len(self.tenants)
@@ -187,115 +474,11 @@ class TenantService:
     @staticmethod
     def _parse_fecha(fecha_str: str) -> Optional[datetime]:
         """Parsea fecha en formato DD/MM/YYYY. Retorna datetime a las 00:00:00 o None."""
-        if not fecha_str or not isinstance(fecha_str, str):
-            return None
-        s = fecha_str.strip()
-        try:
-            return datetime.strptime(s, DATE_FMT)
-        except ValueError:
-            try:
-                return datetime.fromisoformat(s.replace("Z", "+00:00"))
-            except Exception:
-                return None
+        return parse_fecha(fecha_str)
 
     def _get_arrears_info(self, tenant: Dict[str, Any], payments: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """
-        Calcula mora integral: períodos mensuales desde fecha_ingreso (día de pago),
-        aplicación de pagos por monto y estado/días en mora.
-        - Día de pago = día del mes de fecha_ingreso.
-        - Pago por anticipado: el período 0 (primer mes de ocupación) vence en fecha_ingreso.
-        - Período n vence en fecha_ingreso + n meses (n=0,1,2,...).
-        - Pagos se aplican a períodos más antiguos primero (por monto total).
-        - Al día solo cuando total_pagado >= total esperado de períodos vencidos.
-        """
-        hoy = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        fecha_ingreso = self._parse_fecha(tenant.get("fecha_ingreso", "") or "")
-        valor_arriendo = float(tenant.get("valor_arriendo") or 0)
-
-        result = {
-            "estado_pago": "al_dia",
-            "dias_mora": 0,
-            "dias_del_periodo_actual": 0,
-            "meses_mora": 0,
-            "periods_due": 0,
-            "periods_covered": 0,
-            "total_expected": 0.0,
-            "total_paid": 0.0,
-            "amount_pending": 0.0,  # total_expected + mes actual si ya estamos en ese período (pago por mes completo)
-            "first_unpaid_due_date": None,
-        }
-
-        if not fecha_ingreso:
-            result["estado_pago"] = "moroso"
-            return result
-
-        # Períodos vencidos: período 0 vence en fecha_ingreso (pago por anticipado), luego +1 mes cada uno
-        # Contamos todo período con due_n <= hoy
-        n = 0
-        periods_due = 0
-        while True:
-            due_n = fecha_ingreso + relativedelta(months=n)
-            if due_n > hoy:
-                break
-            periods_due += 1
-            n += 1
-        result["periods_due"] = periods_due
-        result["total_expected"] = round(periods_due * valor_arriendo, 2)
-
-        total_paid = sum(float(p.get("monto") or 0) for p in payments)
-        result["total_paid"] = round(total_paid, 2)
-
-        if valor_arriendo <= 0:
-            result["periods_covered"] = periods_due if total_paid >= result["total_expected"] else 0
-        else:
-            result["periods_covered"] = min(periods_due, int(total_paid / valor_arriendo))
-        periods_in_arrears = max(0, periods_due - result["periods_covered"])
-        result["meses_mora"] = periods_in_arrears
-
-        # Fecha de vencimiento del primer período impago (índice 0-based = periods_covered)
-        first_unpaid_period = result["periods_covered"]
-        first_unpaid_due = fecha_ingreso + relativedelta(months=first_unpaid_period)
-        result["first_unpaid_due_date"] = first_unpaid_due
-
-        if first_unpaid_due < hoy:
-            result["dias_mora"] = (hoy - first_unpaid_due).days
-
-        # Días del período actual (para formato "X meses y Y días"): días desde el inicio del
-        # último período vencido (el "mes actual" en mora), no desde el primer período impago.
-        if periods_in_arrears > 0:
-            # Inicio del período actual = vencimiento del último período que ya venció (periods_due - 1)
-            inicio_periodo_actual = fecha_ingreso + relativedelta(months=periods_due - 1)
-            if hoy >= inicio_periodo_actual:
-                result["dias_del_periodo_actual"] = (hoy - inicio_periodo_actual).days
-
-        # Monto pendiente: total esperado de los períodos ya vencidos (total_expected ya incluye
-        # el período actual si hoy >= su fecha de vencimiento; no sumar mes extra).
-        result["amount_pending"] = result["total_expected"]
-
-        # Estado: al día solo si lo pagado cubre todos los períodos vencidos.
-        # Gracia de 5 días: si solo hay 1 período impago y estamos dentro de 5 días
-        # desde su vencimiento, mostrar "pendiente_pago" (no "moroso") como apoyo visual.
-        if periods_due == 0:
-            dias_desde_ingreso = (hoy - fecha_ingreso).days
-            result["estado_pago"] = "pendiente_registro" if dias_desde_ingreso <= 5 else "al_dia"
-        elif total_paid >= result["total_expected"]:
-            result["estado_pago"] = "al_dia"
-        elif periods_in_arrears > 0:
-            dias_desde_vencimiento = (hoy - first_unpaid_due).days
-            if (
-                periods_in_arrears == 1
-                and hoy >= first_unpaid_due
-                and 0 <= dias_desde_vencimiento <= 5
-            ):
-                result["estado_pago"] = "pendiente_pago"
-                result["dias_mora"] = 0
-                result["dias_del_periodo_actual"] = 0
-            else:
-                result["estado_pago"] = "moroso"
-        else:
-            result["estado_pago"] = "al_dia"
-
-        return result
+        """Mora integral del inquilino (ver compute_arrears_info)."""
+        return compute_arrears_info(tenant, payments)
 
     def get_arrears_info(self, tenant_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -314,6 +497,37 @@ class TenantService:
             logger.warning("Error al obtener información de mora: %s", e)
             return None
 
+    @staticmethod
+    def _group_payments_by_tenant(payments: Iterable[Dict[str, Any]]) -> Dict[Any, List[Dict[str, Any]]]:
+        """Agrupa los pagos por id_inquilino en una sola pasada."""
+        grouped: Dict[Any, List[Dict[str, Any]]] = {}
+        for p in payments:
+            grouped.setdefault(p.get("id_inquilino"), []).append(p)
+        return grouped
+
+    def get_arrears_info_bulk(self, tenant_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Información de mora integral para varios inquilinos a la vez (todos si tenant_ids es None).
+        Carga los pagos una sola vez y los agrupa por inquilino, en lugar de una recarga
+        y un recorrido de pagos por cada inquilino. Retorna {tenant_id: info} con el mismo
+        formato que get_arrears_info; los IDs inexistentes no aparecen en el resultado.
+        """
+        try:
+            from manager.app.services.payment_service import payment_service
+            payment_service._load_data()
+            payments_by_tenant = self._group_payments_by_tenant(payment_service.get_all_payments())
+            wanted = set(tenant_ids) if tenant_ids is not None else None
+            result: Dict[int, Dict[str, Any]] = {}
+            for tenant in self.tenants:
+                tenant_id = tenant.get("id")
+                if wanted is not None and tenant_id not in wanted:
+                    continue
+                result[tenant_id] = self._get_arrears_info(tenant, payments_by_tenant.get(tenant_id, []))
+            return result
+        except Exception as e:
+            logger.warning("Error al obtener información de mora en bloque: %s", e)
+            return {}
+
     def get_dias_mora(self, tenant_id: int) -> int:
         """Retorna los días en mora (integral) para el inquilino. 0 si no aplica o error."""
         info = self.get_arrears_info(tenant_id)
@@ -344,7 +558,7 @@ class TenantService:
                 if tenant.get("id") == tenant_id:
                     self.tenants[i]["estado_pago"] = new_status
                     self.tenants[i]["updated_at"] = datetime.now().isoformat()
-                    self._save_data()
+                    self._save_data(upserted=[self.tenants[i]])
                     return True
             
             return False
@@ -352,6 +566,29 @@ class TenantService:
             logger.warning("Error al actualizar estado de pago: %s", e)
             return False
     
+    def refresh_payment_statuses(self, tenant_ids: Iterable[int]) -> int:
+        """
+        Recalcula estado_pago de los inquilinos dados con los pagos ya indexados en memoria
+        y guarda solo los que cambian, en una escritura. Retorna cuántos cambiaron.
+        """
+        from manager.app.services.payment_service import payment_service
+        self._load_data()
+        now = datetime.now().isoformat()
+        changed = []
+        for tenant_id in tenant_ids:
+            tenant = self._by_id.get(tenant_id)
+            if tenant is None:
+                continue
+            payments = payment_service.get_payments_by_tenant(tenant_id)
+            new_status = self._get_arrears_info(tenant, payments)["estado_pago"]
+            if tenant.get("estado_pago") != new_status:
+                tenant["estado_pago"] = new_status
+                tenant["updated_at"] = now
+                changed.append(tenant)
+        if changed:
+            self._save_data(upserted=changed)
+        return len(changed)
+
     def recalculate_all_payment_statuses(self) -> Dict[str, int]:
         """Recalcula el estado de pago de todos los inquilinos, excepto los desactivados manualmente"""
         try:
@@ -361,8 +598,11 @@ class TenantService:
             
             # Recargar datos de inquilinos también
             self._load_data()
+
+            # Una sola pasada sobre los pagos para todos los inquilinos
+            payments_by_tenant = self._group_payments_by_tenant(payment_service.get_all_payments())
             
-            updated_count = 0
+            updated_tenants = []
             status_changes = {
                 'al_dia': 0,
                 'pendiente_registro': 0,
@@ -373,27 +613,23 @@ class TenantService:
             
             for tenant in self.tenants:
                 old_status = tenant.get('estado_pago', 'al_dia')
-                
-                # NO recalcular estado si el inquilino fue desactivado manualmente
-                # (tiene fecha_desactivacion o motivo_desactivacion)
-                if tenant.get('fecha_desactivacion') or tenant.get('motivo_desactivacion'):
-                    # Mantener el estado inactivo y no recalcular
-                    if old_status == 'inactivo':
-                        status_changes['inactivo'] += 1
-                        continue
-                
-                # Recalcular estado solo para inquilinos no desactivados manualmente
-                new_status = self.calculate_payment_status(tenant.get('id'))
-                
+
+                # Los desactivados manualmente (fecha_desactivacion o motivo_desactivacion)
+                # conservan "inactivo"; el resto se recalcula con la mora integral
+                new_status = compute_payment_status(tenant, payments_by_tenant.get(tenant.get('id'), []))
+                if new_status == 'inactivo':
+                    status_changes['inactivo'] += 1
+                    continue
+
                 if old_status != new_status:
                     tenant['estado_pago'] = new_status
                     tenant['updated_at'] = datetime.now().isoformat()
-                    updated_count += 1
+                    updated_tenants.append(tenant)
                 
                 status_changes[new_status] += 1
             
-            if updated_count > 0:
-                self._save_data()
+            if updated_tenants:
+                self._save_data(upserted=updated_tenants)
             
             return status_changes
             
@@ -402,4 +638,4 @@ class TenantService:
             return {}
 
 # Instancia global del servicio
-tenant_service = TenantService() 
\ No newline at end of file
+tenant_service = LazyService("tenant_service", TenantService)
\ No newline at end of file
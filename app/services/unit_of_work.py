@@ -0,0 +1,132 @@
+"""
+Unidad de trabajo para cambios que tocan varios registros o servicios.
+
+    from manager.app import services
+    with services.transaction():
+        building_service.create_building_from_wizard(...)
+        tenant_service.update_tenant(...)
+
+Dentro del bloque, RecordStore.save no escribe: acumula los cambios por almacén y al
+salir sin error se hace una sola escritura por archivo (o tabla). Si el bloque lanza
+una excepción no se escribe nada y los servicios afectados recargan su estado desde
+disco, que sigue siendo el anterior a la transacción. Las transacciones anidadas se
+unen a la exterior. Es por hilo: otros hilos siguen escribiendo directamente.
+
+La confirmación no es atómica entre archivos: si falla la escritura de uno no se
+intentan los siguientes, pero los ya escritos quedan; los servicios se recargan para
+reflejar lo que hay en disco.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from manager.app.logger import logger
+
+_local = threading.local()
+
+
+class _PendingSave:
+    """Cambios acumulados de un almacén: último estado de la lista y upserts/bajas por id."""
+
+    def __init__(self, store):
+        self.store = store
+        self.records: List[Dict[str, Any]] = []
+        self.full = False
+        self.upserted: Dict[Any, Dict[str, Any]] = {}
+        self.deleted: Dict[Any, None] = {}
+
+    def add(self, records, upserted, deleted) -> None:
+        self.records = records
+        if upserted is None and deleted is None:
+            self.full = True
+            return
+        for record in upserted or []:
+            record_id = record.get("id")
+            if record_id is None:
+                self.full = True
+                continue
+            self.deleted.pop(record_id, None)
+            self.upserted[record_id] = record
+        for record_id in deleted or []:
+            self.upserted.pop(record_id, None)
+            self.deleted[record_id] = None
+
+    def flush(self) -> bool:
+        if self.full:
+            return self.store.flush(self.records)
+        return self.store.flush(self.records, list(self.upserted.values()), list(self.deleted))
+
+
+class UnitOfWork:
+    """Escrituras diferidas de una transacción (ver transaction())."""
+
+    def __init__(self):
+        self._saves: Dict[int, _PendingSave] = {}
+        # clave -> (escribir, deshacer) para persistencias que no pasan por RecordStore
+        self._writers: Dict[str, tuple] = {}
+
+    def buffer_save(self, store, records, upserted=None, deleted=None) -> None:
+        pending = self._saves.get(id(store))
+        if pending is None:
+            pending = self._saves[id(store)] = _PendingSave(store)
+        pending.add(records, upserted, deleted)
+
+    def defer(self, key: str, write: Callable[[], Any], rollback: Optional[Callable[[], Any]] = None) -> None:
+        """Programa write() una sola vez al confirmar; rollback() recarga el estado si se deshace."""
+        self._writers[key] = (write, rollback)
+
+    def commit(self) -> None:
+        """Escribe cada almacén pendiente y luego las persistencias diferidas; se detiene en el primer fallo."""
+        steps = [(p.store.name, p.flush) for p in self._saves.values()]
+        steps += [(key, write) for key, (write, _) in self._writers.items()]
+        for name, write in steps:
+            if write() is False:
+                self.rollback()
+                raise IOError(f"No se pudieron guardar los cambios de: {name}")
+
+    def rollback(self) -> None:
+        """Descarta lo pendiente y hace que los servicios afectados relean su estado de disco."""
+        stores = [p.store for p in self._saves.values()]
+        for store in stores:
+            store.generation += 1
+        from manager.app.services.service_registry import get_initialized_instances
+        for service in get_initialized_instances():
+            # Un servicio con varios almacenes (p. ej. contabilidad) los expone en _stores
+            owned = [getattr(service, "_store", None)] + list(getattr(service, "_stores", {}).values())
+            if any(store in stores for store in owned if store is not None):
+                reload = getattr(service, "reload_data", None) or getattr(service, "_load_data", None)
+                if reload is not None:
+                    reload()
+        for _, rollback in self._writers.values():
+            if rollback is not None:
+                rollback()
+        self._saves = {}
+        self._writers = {}
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    """Unidad de trabajo activa en este hilo, o None fuera de una transacción."""
+    return getattr(_local, "unit_of_work", None)
+
+
+@contextmanager
+def transaction() -> Iterator[UnitOfWork]:
+    """Agrupa los cambios del bloque en una escritura por archivo al salir (ver módulo)."""
+    outer = current_unit_of_work()
+    if outer is not None:
+        yield outer
+        return
+    uow = UnitOfWork()
+    _local.unit_of_work = uow
+    try:
+        yield uow
+    except BaseException:
+        _local.unit_of_work = None
+        try:
+            uow.rollback()
+        except Exception as e:
+            logger.warning("No se pudo recargar el estado tras deshacer la transacción: %s", e)
+        raise
+    _local.unit_of_work = None
+    uow.commit()
@@ -12,6 +12,7 @@ from pathlib import Path
 
 from manager.app.paths_config import DATA_DIR, ensure_dirs
 from manager.app.logger import logger
+from manager.app.services.service_registry import LazyService
 from manager.app.persistence import save_json_atomic
 
 
@@ -430,4 +431,4 @@ class UserService:
 
 
 # Instancia global del servicio
-user_service = UserService()
+user_service = LazyService("user_service", UserService)
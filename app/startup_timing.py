@@ -0,0 +1,45 @@
+"""
+Medición del arranque de Building Manager Pro.
+
+Registra hitos (importación de módulos, login visible, ventana principal visible)
+relativos al inicio del proceso y los reporta en el log al terminar el arranque,
+junto con los servicios que ya fue necesario inicializar.
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+from manager.app.logger import logger
+
+# Referencia: momento en que se importa este módulo (lo primero que hace main.py)
+_START = time.perf_counter()
+
+_marks: List[Tuple[str, float]] = []
+_reported = False
+
+
+def mark(label: str) -> float:
+    """Registra un hito del arranque; devuelve los ms transcurridos desde el inicio."""
+    elapsed_ms = (time.perf_counter() - _START) * 1000
+    _marks.append((label, elapsed_ms))
+    return elapsed_ms
+
+
+def get_marks() -> Dict[str, float]:
+    """Hitos registrados (etiqueta -> ms desde el inicio)."""
+    return dict(_marks)
+
+
+def report() -> str:
+    """Escribe en el log el reporte de tiempos de arranque (solo la primera vez) y lo devuelve."""
+    global _reported
+    from manager.app.services.service_registry import get_initialized_services
+
+    parts = [f"{label}: {ms:.0f} ms" for label, ms in _marks]
+    services = get_initialized_services()
+    services_text = ", ".join(f"{s['name']} ({s['init_ms']:.0f} ms)" for s in services) or "ninguno"
+    text = f"Arranque — {'; '.join(parts)}. Servicios inicializados: {services_text}"
+    if not _reported:
+        _reported = True
+        logger.info(text)
+    return text
@@ -0,0 +1,755 @@
+"""
+Backends de almacenamiento para los servicios de datos de Building Manager Pro.
+
+Cada servicio conserva su lista de registros en memoria y delega la persistencia
+en un RecordStore:
+- JsonRecordStore: un archivo JSON con la lista completa (comportamiento histórico).
+- SqliteRecordStore: base SQLite embebida (modo WAL), una fila por registro.
+  Las altas/ediciones/bajas se aplican como upsert/delete de una sola fila y las
+  lecturas filtradas se resuelven con índices (select).
+
+El backend se elige en app_config.json: {"storage": {"backend": "json" | "sqlite"}}.
+Con backend JSON, las entidades marcadas con "journal" (pagos y gastos) usan
+JournaledJsonRecordStore: los cambios se agregan a una bitácora en lugar de reescribir
+el archivo completo ({"storage": {"journal": false}} vuelve al JSON simple).
+Los archivos JSON siguen siendo el formato de intercambio: import_json/export_json
+permiten migrar entre backends y los backups siempre guardan JSON.
+
+Caché de carga: cada almacén expone state() = (generación de escrituras en este
+proceso, firma del medio persistido). Los servicios guardan el state() de su última
+carga y, mientras no cambie, _load_data() se resuelve con un stat() sin volver a
+parsear el archivo (ver get_cache_stats).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from manager.app.paths_config import DATA_DIR, ensure_dirs
+from manager.app.logger import logger
+from manager.app.persistence import save_json_atomic
+from manager.app.services.unit_of_work import current_unit_of_work
+
+SQLITE_DB_FILE = DATA_DIR / "building_manager.db"
+
+# Tamaño de la bitácora a partir del cual se compacta en segundo plano
+JOURNAL_COMPACT_BYTES = 512 * 1024
+
+BACKEND_JSON = "json"
+BACKEND_SQLITE = "sqlite"
+
+# Catálogo de entidades: archivo JSON de intercambio, sección (si el JSON es un dict
+# de listas), sangría del JSON, campos indexados en SQLite y si usa bitácora con JSON.
+ENTITIES: Dict[str, Dict[str, Any]] = {
+    "tenants": {
+        "json_file": "tenants.json",
+        "index_fields": ("apartamento", "estado_pago"),
+    },
+    "payments": {
+        "json_file": "payments.json",
+        "index_fields": ("id_inquilino", "fecha_pago"),
+        "journal": True,
+    },
+    "expenses": {
+        "json_file": "gastos.json",
+        "index_fields": ("fecha", "apartamento", "categoria"),
+        "journal": True,
+    },
+    "apartments": {
+        "json_file": "apartments.json",
+        "indent": 4,
+        "index_fields": ("building_id", "number"),
+    },
+    "accounting_apertura": {
+        "json_file": "accounting.json",
+        "section": "apertura",
+        "index_fields": ("fecha",),
+    },
+    "accounting_manual": {
+        "json_file": "accounting.json",
+        "section": "manual",
+        "index_fields": ("fecha", "id_inquilino"),
+    },
+    "accounting_cierres": {
+        "json_file": "accounting.json",
+        "section": "cierres",
+        "index_fields": ("periodo",),
+    },
+    "notifications": {
+        "json_file": "notifications.json",
+        "index_fields": ("tenant_id",),
+    },
+    "outbox": {
+        "json_file": "email_outbox.json",
+        "index_fields": ("status",),
+    },
+    "receipts": {
+        "json_file": "receipts.json",
+        "index_fields": ("tenant_id",),
+    },
+}
+
+
+def get_backend_name() -> str:
+    """Backend configurado en app_config.json (por defecto JSON)."""
+    try:
+        from manager.app.services.app_config_service import app_config_service
+        backend = app_config_service.get_storage_backend()
+    except Exception as e:
+        logger.debug("No se pudo leer el backend de almacenamiento: %s", e)
+        backend = BACKEND_JSON
+    return backend if backend in (BACKEND_JSON, BACKEND_SQLITE) else BACKEND_JSON
+
+
+def journal_enabled() -> bool:
+    """Si las entidades con bitácora la usan con backend JSON (por defecto sí)."""
+    try:
+        from manager.app.services.app_config_service import app_config_service
+        return app_config_service.get_storage_journal_enabled()
+    except Exception as e:
+        logger.debug("No se pudo leer la configuración de bitácora: %s", e)
+        return True
+
+
+class RecordStore:
+    """
+    Interfaz común de almacenamiento para una colección de registros (dicts con 'id').
+
+    save(records, upserted, deleted): si se indican upserted/deleted, el backend puede
+    aplicar solo esos cambios; sin ellos se reescribe la colección completa. Dentro de
+    services.transaction() los cambios se acumulan y se escriben con flush() al confirmar.
+    """
+
+    supports_query = False
+
+    def __init__(self, name: str, json_path: Path, section: Optional[str] = None, indent: int = 2):
+        self.name = name
+        self.json_path = Path(json_path)
+        self.section = section
+        self.indent = indent
+        # Contador de escrituras hechas en este proceso (invalida las cargas de otras
+        # instancias del mismo servicio aunque la firma del archivo no cambie).
+        self.generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # firma anterior -> firma con el mismo contenido (escrituras propias sin cambio de datos)
+        self._equivalent: Dict[Any, Any] = {}
+
+    def load(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def save(
+        self,
+        records: List[Dict[str, Any]],
+        upserted: Optional[Iterable[Dict[str, Any]]] = None,
+        deleted: Optional[Iterable[Any]] = None,
+    ) -> bool:
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.buffer_save(self, records, upserted, deleted)
+            self.generation += 1
+            return True
+        ok = self._write(records, upserted, deleted)
+        self.generation += 1
+        return ok
+
+    def flush(
+        self,
+        records: List[Dict[str, Any]],
+        upserted: Optional[Iterable[Dict[str, Any]]] = None,
+        deleted: Optional[Iterable[Any]] = None,
+    ) -> bool:
+        """
+        Escribe los cambios acumulados por una transacción. La generación ya se avanzó
+        al acumularlos: la firma nueva se registra como equivalente para que los servicios
+        que guardaron dentro de la transacción no vuelvan a leer el archivo.
+        """
+        before = self.signature()
+        ok = self._write(records, upserted, deleted)
+        if ok:
+            self._record_equivalent(before, self.signature())
+        return ok
+
+    def _write(self, records, upserted, deleted) -> bool:
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Caché de carga
+    # ------------------------------------------------------------------
+
+    def signature(self) -> Any:
+        """Firma del medio persistido; cambia cuando otro proceso o una restauración lo modifica."""
+        try:
+            st = os.stat(self.json_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def state(self) -> tuple:
+        """Estado a recordar tras una carga o un guardado."""
+        return (self.generation, self.signature())
+
+    def is_fresh(self, loaded_state: Optional[tuple]) -> bool:
+        """True si los datos cargados con loaded_state siguen vigentes (cuenta aciertos/fallos)."""
+        if loaded_state is not None:
+            equivalent = self._equivalent.get(loaded_state[1])
+            if equivalent is not None:
+                loaded_state = (loaded_state[0], equivalent)
+        fresh = loaded_state is not None and loaded_state == self.state()
+        if fresh:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+        return fresh
+
+    def _record_equivalent(self, before: Any, after: Any) -> None:
+        """Registra que la firma after tiene el mismo contenido que before (y sus anteriores)."""
+        if before == after:
+            return
+        for old, new in list(self._equivalent.items()):
+            if new == before:
+                self._equivalent[old] = after
+        self._equivalent[before] = after
+        while len(self._equivalent) > 8:
+            self._equivalent.pop(next(iter(self._equivalent)))
+
+    def select(self, **equals: Any) -> List[Dict[str, Any]]:
+        """Registros cuyos campos coinciden exactamente con los indicados."""
+        return [r for r in self.load() if all(r.get(k) == v for k, v in equals.items())]
+
+    # ------------------------------------------------------------------
+    # Intercambio JSON (migración y backups)
+    # ------------------------------------------------------------------
+
+    def read_json_records(self, path: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """Lee los registros de la colección desde su archivo JSON de intercambio."""
+        with open(path or self.json_path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        if self.section:
+            doc = doc.get(self.section, []) if isinstance(doc, dict) else []
+        return doc if isinstance(doc, list) else []
+
+    def write_json_records(self, records: List[Dict[str, Any]], path: Optional[Path] = None) -> bool:
+        """Escribe la colección en su archivo JSON (respetando las otras secciones del documento)."""
+        path = Path(path or self.json_path)
+        if not self.section:
+            return save_json_atomic(path, records, ensure_ascii=False, indent=self.indent)
+        doc: Dict[str, Any] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            if isinstance(loaded, dict):
+                doc = loaded
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        doc[self.section] = records
+        return save_json_atomic(path, doc, ensure_ascii=False, indent=self.indent)
+
+    def import_json(self, path: Optional[Path] = None) -> int:
+        """Reemplaza el contenido del almacén con el del JSON. Devuelve el número de registros."""
+        records = self.read_json_records(path)
+        if not self.save(records):
+            raise IOError(f"No se pudo importar {self.name}")
+        return len(records)
+
+    def export_json(self, path: Optional[Path] = None) -> bool:
+        """Vuelca el contenido del almacén al archivo JSON indicado (o al de intercambio)."""
+        return self.write_json_records(self.load(), path)
+
+
+class JsonRecordStore(RecordStore):
+    """Almacén en un archivo JSON: cada guardado reescribe el archivo completo (atómico)."""
+
+    def load(self) -> List[Dict[str, Any]]:
+        return self.read_json_records()
+
+    def _write(self, records, upserted, deleted) -> bool:
+        return self.write_json_records(records)
+
+    def import_json(self, path: Optional[Path] = None) -> int:
+        # El propio JSON es el almacén: solo hay que copiar si viene de otra ruta.
+        if path is None or Path(path) == self.json_path:
+            return len(self.read_json_records())
+        return super().import_json(path)
+
+    def export_json(self, path: Optional[Path] = None) -> bool:
+        if path is None or Path(path) == self.json_path:
+            return True
+        return super().export_json(path)
+
+
+class JournaledJsonRecordStore(JsonRecordStore):
+    """
+    JSON con bitácora de cambios. Las altas/ediciones/bajas se agregan como líneas JSON
+    {"op", "id", "fields", "ts"} a <archivo>.journal (con fsync), así que guardar cuesta
+    lo que mide el registro y no todo el historial. Al cargar se aplica la bitácora sobre
+    el JSON (snapshot); si el proceso muere a mitad de una línea, esa línea se descarta.
+
+    Cuando la bitácora supera compact_bytes se compacta en segundo plano: se rota a
+    <archivo>.journal.compacting, se escribe un snapshot nuevo y se borra la rotada.
+    Cada bitácora empieza con una línea {"op": "base", "snapshots": [...]} con la firma
+    (mtime, tamaño) de los snapshots sobre los que aplica: si el JSON se reemplaza por
+    otro (guardado completo, restauración de backup) las bitácoras viejas se ignoran.
+    Las operaciones son idempotentes (upsert del registro completo, delete por id).
+    """
+
+    def __init__(self, name, json_path, section=None, indent=2, compact_bytes: int = JOURNAL_COMPACT_BYTES):
+        super().__init__(name, json_path, section, indent)
+        self.journal_path = self.json_path.with_name(self.json_path.name + ".journal")
+        self.compacting_path = self.json_path.with_name(self.json_path.name + ".journal.compacting")
+        self.compact_bytes = compact_bytes
+        self._lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+        # Cambia con cada guardado completo: invalida una compactación en curso
+        self._epoch = 0
+
+    # ------------------------------------------------------------------
+    # Firmas
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[List[int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def signature(self) -> Any:
+        stats = (self._stat(self.json_path), self._stat(self.journal_path), self._stat(self.compacting_path))
+        return tuple(tuple(s) if s else None for s in stats)
+
+    # ------------------------------------------------------------------
+    # Carga
+    # ------------------------------------------------------------------
+
+    def _read_journal(self, path: Path, snapshot_stat: Optional[List[int]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Entradas de la bitácora si aplica al snapshot actual; None si no existe o es vieja.
+        Una última línea incompleta (escritura interrumpida) se descarta y se recorta.
+        """
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        lines = data.split(b"\n")
+        tail = lines.pop()
+        if tail and path == self.journal_path:
+            logger.warning("Bitácora %s con una línea incompleta al final; se descarta.", path.name)
+            with open(path, "r+b") as f:
+                f.truncate(len(data) - len(tail))
+        entries: List[Dict[str, Any]] = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                logger.warning("Línea inválida en la bitácora %s; se omite.", path.name)
+        if not entries or entries[0].get("op") != "base" or snapshot_stat not in entries[0].get("snapshots", []):
+            return None
+        return entries[1:]
+
+    def load(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            snapshot_stat = self._stat(self.json_path)
+            records = self.read_json_records() if snapshot_stat is not None else []
+            pending = []
+            for path in (self.compacting_path, self.journal_path):
+                entries = self._read_journal(path, snapshot_stat)
+                if entries is None and path == self.journal_path and path.exists():
+                    # Bitácora de un snapshot anterior: ya no aplica y no se debe seguir usando
+                    self._unlink(path)
+                pending.extend(entries or [])
+            if snapshot_stat is None and not pending:
+                raise FileNotFoundError(self.json_path)
+        return self._replay(records, pending)
+
+    @staticmethod
+    def _replay(records: List[Dict[str, Any]], entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Aplica las entradas (upsert/delete por id) conservando el orden de los registros."""
+        result: List[Optional[Dict[str, Any]]] = list(records)
+        positions = {r.get("id"): i for i, r in enumerate(result)}
+        for entry in entries:
+            op = entry.get("op")
+            record_id = entry.get("id")
+            if op == "upsert":
+                pos = positions.get(record_id)
+                if pos is None:
+                    positions[record_id] = len(result)
+                    result.append(entry.get("fields"))
+                else:
+                    result[pos] = entry.get("fields")
+            elif op == "delete":
+                pos = positions.pop(record_id, None)
+                if pos is not None:
+                    result[pos] = None
+        return [r for r in result if r is not None]
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _line(entry: Dict[str, Any]) -> bytes:
+        return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def _write(self, records, upserted, deleted) -> bool:
+        upserted = list(upserted) if upserted is not None else None
+        deleted = list(deleted) if deleted is not None else None
+        if (upserted is None and deleted is None) or any(r.get("id") is None for r in upserted or []):
+            return self._write_snapshot(records)
+        ts = datetime.now().isoformat()
+        lines = [self._line({"op": "delete", "id": d, "ts": ts}) for d in deleted or []]
+        lines += [self._line({"op": "upsert", "id": r.get("id"), "fields": r, "ts": ts}) for r in upserted or []]
+        with self._lock:
+            try:
+                with open(self.journal_path, "ab") as f:
+                    if f.tell() == 0:
+                        f.write(self._line({"op": "base", "snapshots": [self._stat(self.json_path)]}))
+                    f.write(b"".join(lines))
+                    f.flush()
+                    os.fsync(f.fileno())
+                    size = f.tell()
+            except OSError as e:
+                logger.exception("Error al escribir la bitácora de %s: %s", self.name, e)
+                return False
+            if size >= self.compact_bytes:
+                self._start_compaction()
+        return True
+
+    def _write_snapshot(self, records: List[Dict[str, Any]]) -> bool:
+        """Guardado completo: JSON nuevo y bitácoras descartadas (ya no aplican a este snapshot)."""
+        with self._lock:
+            self._epoch += 1
+            if not self.write_json_records(records):
+                return False
+            self._unlink(self.journal_path)
+            self._unlink(self.compacting_path)
+            return True
+
+    # ------------------------------------------------------------------
+    # Compactación
+    # ------------------------------------------------------------------
+
+    def _start_compaction(self) -> None:
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+            self._compaction = threading.Thread(
+                target=self._compact, name=f"compact-{self.name}", daemon=True
+            )
+            self._compaction.start()
+
+    def compact(self) -> bool:
+        """Compacta ahora (esperando una compactación en curso). Usado antes de los backups."""
+        with self._lock:
+            running = self._compaction
+        if running is not None and running.is_alive():
+            running.join()
+        if not self.journal_path.exists() and not self.compacting_path.exists():
+            return True
+        return self._compact()
+
+    def _compact(self) -> bool:
+        try:
+            with self._lock:
+                epoch = self._epoch
+                before = self.signature()
+                if not self.compacting_path.exists() and self.journal_path.exists():
+                    os.replace(self.journal_path, self.compacting_path)
+                self._record_equivalent(before, self.signature())
+                snapshot_stat = self._stat(self.json_path)
+                records = self.read_json_records() if snapshot_stat is not None else []
+                entries = self._read_journal(self.compacting_path, snapshot_stat) or []
+            # Lo costoso (aplicar y serializar) ocurre fuera del candado: las escrituras siguen
+            records = self._replay(records, entries)
+            tmp_path = self.json_path.with_name(self.json_path.name + ".compact")
+            if not save_json_atomic(tmp_path, records, ensure_ascii=False, indent=self.indent):
+                return False
+            new_stat = self._stat(tmp_path)
+            with self._lock:
+                if epoch != self._epoch:
+                    # Hubo un guardado completo mientras tanto: este snapshot ya es viejo
+                    self._unlink(tmp_path)
+                    return False
+                before = self.signature()
+                # La bitácora escrita durante la compactación debe valer para ambos snapshots
+                # hasta que el nuevo reemplace al anterior (os.replace conserva mtime y tamaño)
+                live = self._read_journal(self.journal_path, snapshot_stat)
+                if live:
+                    rebased = self.journal_path.with_name(self.journal_path.name + ".tmp")
+                    with open(rebased, "wb") as f:
+                        f.write(self._line({"op": "base", "snapshots": [snapshot_stat, new_stat]}))
+                        f.write(b"".join(self._line(e) for e in live))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(rebased, self.journal_path)
+                else:
+                    self._unlink(self.journal_path)
+                os.replace(tmp_path, self.json_path)
+                self._unlink(self.compacting_path)
+                self._record_equivalent(before, self.signature())
+            logger.info("Bitácora de %s compactada (%d registros).", self.name, len(records))
+            return True
+        except (OSError, ValueError) as e:
+            logger.exception("Error al compactar la bitácora de %s: %s", self.name, e)
+            return False
+
+
+class SqliteRecordStore(RecordStore):
+    """
+    Almacén en SQLite: una tabla por entidad con el registro serializado en 'data'
+    y columnas indexadas extraídas de los campos de consulta frecuentes.
+    """
+
+    supports_query = True
+
+    _connections: Dict[str, sqlite3.Connection] = {}
+    _lock = threading.RLock()
+
+    def __init__(self, name, json_path, section=None, indent=2,
+                 index_fields: Iterable[str] = (), db_path: Optional[Path] = None):
+        super().__init__(name, json_path, section, indent)
+        # La ruta por defecto se resuelve al abrir (no al definir la clase)
+        self.db_path = Path(db_path) if db_path is not None else SQLITE_DB_FILE
+        self.table = name
+        self.index_fields = tuple(index_fields)
+        self._ensure_schema()
+
+    @classmethod
+    def _connect(cls, db_path: Path) -> sqlite3.Connection:
+        key = str(db_path)
+        with cls._lock:
+            conn = cls._connections.get(key)
+            if conn is None:
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(key, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS _meta (key TEXT PRIMARY KEY, value TEXT)")
+                cls._connections[key] = conn
+            return conn
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._connect(self.db_path)
+
+    def _ensure_schema(self):
+        cols = "".join(f', "{c}"' for c in self.index_fields)
+        with self._lock:
+            conn = self._conn
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self.table}" ('
+                f"id INTEGER PRIMARY KEY, pos INTEGER NOT NULL, data TEXT NOT NULL{cols})"
+            )
+            for c in self.index_fields:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{self.table}_{c}" ON "{self.table}" ("{c}")')
+            migrated = conn.execute(
+                "SELECT value FROM _meta WHERE key = ?", (f"migrated:{self.table}",)
+            ).fetchone()
+        if not migrated:
+            self._migrate_from_json()
+
+    def _migrate_from_json(self):
+        """Primera apertura: importa el JSON existente (si lo hay) a la tabla."""
+        count = 0
+        if self.json_path.exists():
+            try:
+                count = self.import_json()
+            except (IOError, ValueError) as e:
+                logger.warning("No se pudo migrar %s a SQLite: %s", self.json_path, e)
+                return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO _meta (key, value) VALUES (?, ?)",
+                (f"migrated:{self.table}", str(count)),
+            )
+        logger.info("Colección %s migrada a SQLite (%d registros).", self.name, count)
+
+    def _row(self, record: Dict[str, Any], pos: int) -> tuple:
+        values = []
+        for c in self.index_fields:
+            v = record.get(c)
+            values.append(v if v is None or isinstance(v, (int, float, str)) else str(v))
+        return (record.get("id"), pos, json.dumps(record, ensure_ascii=False), *values)
+
+    def _insert_sql(self, upsert: bool) -> str:
+        cols = ", ".join(["id", "pos", "data"] + [f'"{c}"' for c in self.index_fields])
+        marks = ", ".join("?" * (3 + len(self.index_fields)))
+        sql = f'INSERT INTO "{self.table}" ({cols}) VALUES ({marks})'
+        if upsert:
+            updates = ", ".join(["data = excluded.data"] + [f'"{c}" = excluded."{c}"' for c in self.index_fields])
+            sql += f" ON CONFLICT(id) DO UPDATE SET {updates}"
+        return sql
+
+    def load(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(f'SELECT data FROM "{self.table}" ORDER BY pos').fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def signature(self) -> Any:
+        # data_version cambia cuando otra conexión (otro proceso) confirma cambios en la base
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _write(self, records, upserted, deleted) -> bool:
+        upserted = list(upserted) if upserted is not None else None
+        deleted = list(deleted) if deleted is not None else None
+        full = (upserted is None and deleted is None) or any(r.get("id") is None for r in upserted or [])
+        try:
+            with self._lock:
+                conn = self._conn
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    if full:
+                        conn.execute(f'DELETE FROM "{self.table}"')
+                        conn.executemany(self._insert_sql(upsert=True),
+                                         [self._row(r, i) for i, r in enumerate(records)])
+                    else:
+                        if deleted:
+                            conn.executemany(f'DELETE FROM "{self.table}" WHERE id = ?',
+                                             [(d,) for d in deleted])
+                        if upserted:
+                            next_pos = conn.execute(
+                                f'SELECT COALESCE(MAX(pos), -1) + 1 FROM "{self.table}"'
+                            ).fetchone()[0]
+                            conn.executemany(self._insert_sql(upsert=True),
+                                             [self._row(r, next_pos + i) for i, r in enumerate(upserted)])
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            return True
+        except sqlite3.Error as e:
+            logger.exception("Error al guardar %s en SQLite: %s", self.name, e)
+            return False
+
+    def select(self, **equals: Any) -> List[Dict[str, Any]]:
+        """Consulta con filtros de igualdad resueltos en SQL (sobre columnas indexadas)."""
+        unindexed = {k: v for k, v in equals.items() if k not in self.index_fields and k != "id"}
+        indexed = {k: v for k, v in equals.items() if k not in unindexed}
+        where = " AND ".join(f'"{k}" = ?' for k in indexed) or "1"
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT data FROM "{self.table}" WHERE {where} ORDER BY pos', tuple(indexed.values())
+            ).fetchall()
+        records = [json.loads(r[0]) for r in rows]
+        if unindexed:
+            records = [r for r in records if all(r.get(k) == v for k, v in unindexed.items())]
+        return records
+
+    def select_prefix(self, field: str, prefix: str, **equals: Any) -> List[Dict[str, Any]]:
+        """Registros cuyo campo indexado empieza por prefix (p. ej. fecha 'YYYY-MM')."""
+        if field not in self.index_fields:
+            return [r for r in self.select(**equals) if str(r.get(field) or "").startswith(prefix)]
+        params: List[Any] = [prefix, prefix + "\uffff"]
+        where = f'"{field}" >= ? AND "{field}" < ?'
+        for k, v in equals.items():
+            where += f' AND "{k}" = ?'
+            params.append(v)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT data FROM "{self.table}" WHERE {where} ORDER BY pos', tuple(params)
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+
+# Almacenes abiertos por (nombre, ruta JSON): instancias distintas del mismo servicio
+# comparten almacén (y conexión SQLite).
+_stores: Dict[tuple, RecordStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(name: str, json_path: Optional[Union[Path, str]] = None) -> RecordStore:
+    """Devuelve el almacén de la entidad con el backend configurado."""
+    spec = ENTITIES[name]
+    path = Path(json_path) if json_path else DATA_DIR / spec["json_file"]
+    backend = get_backend_name()
+    key = (name, str(path), backend)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            ensure_dirs()
+            kwargs = {"section": spec.get("section"), "indent": spec.get("indent", 2)}
+            if backend == BACKEND_SQLITE:
+                store = SqliteRecordStore(name, path, index_fields=spec.get("index_fields", ()), **kwargs)
+            elif spec.get("journal") and journal_enabled():
+                store = JournaledJsonRecordStore(name, path, **kwargs)
+            else:
+                store = JsonRecordStore(name, path, **kwargs)
+            _stores[key] = store
+    return store
+
+
+def export_documents() -> Dict[str, Any]:
+    """
+    Documentos JSON de todas las entidades, agrupados por nombre de archivo, cuando el
+    backend no es JSON (para incluirlos en backups). Con backend JSON devuelve {}.
+    """
+    if get_backend_name() == BACKEND_JSON:
+        return {}
+    docs: Dict[str, Any] = {}
+    for name, spec in ENTITIES.items():
+        store = open_store(name)
+        records = store.load()
+        if store.section:
+            docs.setdefault(spec["json_file"], {})[store.section] = records
+        else:
+            docs[spec["json_file"]] = records
+    return docs
+
+
+def compact_journals() -> None:
+    """Compacta las bitácoras para que los JSON de data/ estén completos (p. ej. antes de un backup)."""
+    if get_backend_name() != BACKEND_JSON:
+        return
+    for name, spec in ENTITIES.items():
+        if not spec.get("journal"):
+            continue
+        store = open_store(name)
+        if isinstance(store, JournaledJsonRecordStore) and not store.compact():
+            logger.warning("No se pudo compactar la bitácora de %s antes del backup.", store.name)
+
+
+def import_json_files() -> Dict[str, int]:
+    """
+    Vuelve a importar los JSON de intercambio en el backend activo (p. ej. tras restaurar
+    un backup). Con backend JSON no hace nada.
+    """
+    counts: Dict[str, int] = {}
+    if get_backend_name() == BACKEND_JSON:
+        return counts
+    for name in ENTITIES:
+        store = open_store(name)
+        if store.json_path.exists():
+            try:
+                counts[name] = store.import_json()
+            except (IOError, ValueError) as e:
+                logger.warning("No se pudo importar %s: %s", store.json_path, e)
+    return counts
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Aciertos/fallos de la caché de carga por almacén abierto (diagnóstico)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    stats: Dict[str, Dict[str, int]] = {}
+    for store in stores:
+        entry = stats.setdefault(store.name, {"hits": 0, "misses": 0, "writes": 0})
+        entry["hits"] += store.cache_hits
+        entry["misses"] += store.cache_misses
+        entry["writes"] += store.generation
+    return stats
@@ -0,0 +1,147 @@
+"""
+Ejecución de reportes en segundo plano desde las vistas.
+Uso:
+    from manager.app.ui.components.report_job_runner import ReportJobRunner
+    self._report_runner = ReportJobRunner(self)
+    self._report_runner.run(build_period_report, snapshot, selection,
+                            on_done=lambda text: self._show_report_window(title, text, "payment_period"))
+
+El reporte corre en report_executor; si tarda más de SHOW_DELAY_MS aparece un diálogo
+con barra de progreso y botón Cancelar. Los callbacks se llaman en el hilo de Tk.
+"""
+
+import time
+import tkinter as tk
+from tkinter import messagebox, ttk
+from typing import Any, Callable, Optional
+
+from manager.app.logger import logger
+from manager.app.reporting.jobs import ReportJob, report_executor
+from manager.app.reporting.snapshot import NoReportData
+
+# Los reportes rápidos terminan sin mostrar el diálogo de progreso
+SHOW_DELAY_MS = 300
+
+
+class _ProgressDialog:
+    """Ventana modal pequeña con el progreso del reporte y botón Cancelar."""
+
+    def __init__(self, parent: tk.Widget, on_cancel: Callable[[], None], color: str):
+        top = parent.winfo_toplevel()
+        # Devolver el foco modal a quien lo tenía (p. ej. la ventana de selección de período)
+        self._previous_grab = top.grab_current()
+        self.window = tk.Toplevel(top)
+        self.window.title("Generando reporte")
+        self.window.geometry("360x130")
+        self.window.resizable(False, False)
+        self.window.transient(top)
+        self.window.protocol("WM_DELETE_WINDOW", on_cancel)
+
+        content = tk.Frame(self.window, padx=20, pady=14)
+        content.pack(fill="both", expand=True)
+        self._label = tk.Label(content, text="Generando reporte...", font=("Segoe UI", 10), anchor="w")
+        self._label.pack(fill="x")
+        self._bar = ttk.Progressbar(content, mode="determinate", maximum=100)
+        self._bar.pack(fill="x", pady=(8, 10))
+        tk.Button(
+            content,
+            text="Cancelar",
+            font=("Segoe UI", 9, "bold"),
+            bg=color,
+            fg="white",
+            relief="flat",
+            padx=16,
+            pady=4,
+            cursor="hand2",
+            command=on_cancel
+        ).pack()
+        self.window.grab_set()
+
+    def update(self, fraction: float, message: str) -> None:
+        self._bar["value"] = fraction * 100
+        if message:
+            self._label.config(text=message)
+
+    def close(self) -> None:
+        try:
+            self.window.grab_release()
+            self.window.destroy()
+        except tk.TclError:
+            pass
+        previous = self._previous_grab
+        try:
+            if previous is not None and previous.winfo_exists():
+                previous.grab_set()
+        except tk.TclError:
+            pass
+
+
+class ReportJobRunner:
+    """Envía reportes de una vista al ejecutor (uno a la vez) y muestra el resultado."""
+
+    def __init__(self, parent: tk.Widget, color: str = "#2563eb"):
+        self._parent = parent
+        self._color = color
+        self._job: Optional[ReportJob] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._job is not None and not self._job.done
+
+    def run(self, builder: Callable[..., str], *args: Any,
+            on_done: Callable[[str], None],
+            on_no_data: Optional[Callable[[str], None]] = None,
+            error_message: str = "Error al generar el reporte") -> Optional[ReportJob]:
+        """
+        Ejecuta builder(*args) en segundo plano. on_done recibe el texto del reporte;
+        on_no_data el mensaje de NoReportData (por defecto se muestra "Sin datos").
+        Retorna None si ya hay un reporte en curso.
+        """
+        if self.busy:
+            return None
+        job = report_executor.submit(getattr(builder, "__name__", "reporte"), builder, *args)
+        self._job = job
+        started = time.monotonic()
+        dialog: Optional[_ProgressDialog] = None
+
+        def close_dialog():
+            nonlocal dialog
+            if dialog is not None:
+                dialog.close()
+                dialog = None
+
+        def cancel():
+            job.cancel()
+            close_dialog()
+
+        def on_progress(fraction, message):
+            nonlocal dialog
+            if job.cancelled:
+                return
+            if dialog is None and (time.monotonic() - started) * 1000 >= SHOW_DELAY_MS:
+                dialog = _ProgressDialog(self._parent, cancel, self._color)
+            if dialog is not None:
+                dialog.update(fraction, message)
+
+        def done(content):
+            close_dialog()
+            on_done(content)
+
+        def error(exc):
+            close_dialog()
+            if isinstance(exc, NoReportData):
+                if on_no_data:
+                    on_no_data(str(exc))
+                else:
+                    messagebox.showinfo("Sin datos", str(exc))
+                return
+            logger.error("%s: %s", error_message, exc)
+            messagebox.showerror("Error", f"{error_message}: {str(exc)}")
+
+        report_executor.deliver(self._parent, job, done, on_error=error,
+                                on_progress=on_progress, on_cancelled=close_dialog)
+        return job
+
+    def cancel(self) -> None:
+        if self._job is not None:
+            self._job.cancel()
@@ -1,7 +1,13 @@
+import heapq
 import tkinter as tk
 from tkinter import ttk
 from manager.app.ui.components.theme_manager import theme_manager, Spacing
 from manager.app.services.apartment_service import apartment_service
+from manager.app.services.tenant_service import tenant_service
+
+# Espera (ms) tras la última pulsación antes de buscar
+SEARCH_DEBOUNCE_MS = 150
+MAX_SUGGESTIONS = 10
 
 class TenantAutocompleteEntry(tk.Frame):
     """Campo de búsqueda con autocomplete profesional para inquilinos"""
@@ -16,6 +22,11 @@ class TenantAutocompleteEntry(tk.Frame):
         self.width = width
         self.entry_pady = entry_pady
         self.entry_font = entry_font
+        # Búsqueda incremental sobre el índice del servicio; ids -> posición en self.tenants
+        self._search = tenant_service.search_session()
+        self._search_after_id = None
+        self._positions = {}
+        self._positions_for = None
         self._build(placeholder)
 
     def _build(self, placeholder):
@@ -68,6 +79,14 @@ class TenantAutocompleteEntry(tk.Frame):
             self.entry.configure(fg="#6b7280")
 
     def _on_keyrelease(self, event=None):
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._update_suggestions)
+
+    def _update_suggestions(self):
+        self._search_after_id = None
+        if not self.entry.winfo_exists():
+            return
         value = self.var.get().strip().lower()
         if not value or value == self.placeholder.lower():
             self._hide_suggestions()
@@ -79,28 +98,16 @@ class TenantAutocompleteEntry(tk.Frame):
             self._hide_suggestions()
 
     def _search_tenants(self, value):
-        results = []
-        for t in self.tenants:
-            # Buscar por número real de apartamento
-            apt_number = None
-            apt_id = t.get("apartamento")
-            if apt_id is not None:
-                try:
-                    apt = apartment_service.get_apartment_by_id(int(apt_id))
-                    if apt and 'number' in apt:
-                        apt_number = str(apt['number']).lower()
-                except Exception:
-                    pass
-            if (
-                value in str(t.get("nombre") or "").lower() or
-                value in str(t.get("numero_documento") or "").lower() or
-                value in str(t.get("apartamento") or "").lower() or
-                value in str(t.get("email") or "").lower() or
-                value in str(t.get("telefono") or "").lower() or
-                (apt_number and value in apt_number)
-            ):
-                results.append(t)
-        return results[:10]  # Máximo 10 sugerencias
+        """Primeros MAX_SUGGESTIONS inquilinos (en el orden de self.tenants) que coinciden con value."""
+        if self._positions_for is not self.tenants:
+            self._positions = {}
+            for i, t in enumerate(self.tenants):
+                self._positions.setdefault(t.get("id"), i)
+            self._positions_for = self.tenants
+        positions = self._positions
+        matching_ids = self._search.search(value)
+        first = heapq.nsmallest(MAX_SUGGESTIONS, (positions[i] for i in matching_ids if i in positions))
+        return [self.tenants[i] for i in first]
 
     def _show_suggestions(self, matches):
         if self.suggestions:
@@ -0,0 +1,174 @@
+"""
+Lista virtualizada sobre un Canvas: solo existen los widgets de las filas visibles
+(más un margen) y se reciclan al hacer scroll o al cambiar los elementos.
+Uso:
+    vlist = VirtualList(parent, bg="#e0f2fe")
+    vlist.register_kind("row", height=92, factory=crear_fila, updater=actualizar_fila)
+    vlist.set_items([("row", tenant), ...])
+
+factory(parent) crea el widget de un tipo de elemento; updater(widget, data, index)
+lo reconfigura para mostrar otro elemento. Cada tipo tiene altura fija, lo que permite
+calcular la región visible sin medir widgets.
+"""
+
+import tkinter as tk
+from bisect import bisect_right
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Filas extra creadas por encima y por debajo del área visible
+BUFFER_ROWS = 4
+
+
+class VirtualList(tk.Frame):
+    """Canvas con scroll que materializa solo los elementos visibles y recicla sus widgets."""
+
+    def __init__(self, parent: tk.Widget, bg: str, buffer_rows: int = BUFFER_ROWS):
+        super().__init__(parent, bg=bg)
+        self._bg = bg
+        self._buffer_rows = buffer_rows
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, yscrollincrement=20)
+        self._scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self._scrollbar.pack(side="right", fill="y")
+
+        self._kinds: Dict[str, Tuple[int, Callable[[tk.Widget], tk.Widget], Callable[[tk.Widget, Any, int], None]]] = {}
+        self._items: List[Tuple[str, Any]] = []
+        self._offsets: List[int] = []
+        self._total_height = 0
+        # index -> (kind, widget, window_id) de los elementos materializados
+        self._active: Dict[int, Tuple[str, tk.Widget, int]] = {}
+        # Widgets libres por tipo, con su ventana del canvas oculta
+        self._pool: Dict[str, List[Tuple[tk.Widget, int]]] = {}
+        self._message_label: Optional[tk.Label] = None
+        self._message_window: Optional[int] = None
+
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+
+        def _on_mousewheel(event):
+            try:
+                if self.canvas.winfo_exists():
+                    self._yview("scroll", int(-1 * (event.delta / 120)), "units")
+            except tk.TclError:
+                pass
+        self.canvas.bind("<Enter>", lambda e: self.canvas.bind_all("<MouseWheel>", _on_mousewheel))
+        self.canvas.bind("<Leave>", lambda e: self.canvas.unbind_all("<MouseWheel>"))
+
+    def register_kind(self, kind: str, height: int,
+                      factory: Callable[[tk.Widget], tk.Widget],
+                      updater: Callable[[tk.Widget, Any, int], None]) -> None:
+        """Registra un tipo de elemento con su altura fija y cómo crear/actualizar su widget."""
+        self._kinds[kind] = (height, factory, updater)
+        self._pool.setdefault(kind, [])
+
+    @property
+    def item_count(self) -> int:
+        return len(self._items)
+
+    def set_items(self, items: Sequence[Tuple[str, Any]], keep_position: bool = False) -> None:
+        """Reemplaza los elementos de la lista. Los widgets existentes se reciclan."""
+        self._hide_message()
+        self._items = list(items)
+        self._offsets = []
+        y = 0
+        for kind, _ in self._items:
+            self._offsets.append(y)
+            y += self._kinds[kind][0]
+        self._total_height = y
+        self._release_all()
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), self._total_height))
+        if not keep_position:
+            self.canvas.yview_moveto(0)
+        self._render()
+
+    def show_message(self, text: str, fg: str = "#666666") -> None:
+        """Vacía la lista y muestra un mensaje centrado (estado vacío)."""
+        self._items = []
+        self._offsets = []
+        self._total_height = 0
+        self._release_all()
+        self.canvas.configure(scrollregion=(0, 0, 0, 0))
+        self.canvas.yview_moveto(0)
+        if self._message_label is None:
+            self._message_label = tk.Label(self.canvas, font=("Segoe UI", 11), bg=self._bg, justify="center")
+            self._message_window = self.canvas.create_window(0, 40, window=self._message_label, anchor="n")
+        self._message_label.configure(text=text, fg=fg)
+        self.canvas.coords(self._message_window, max(self.canvas.winfo_width() // 2, 1), 40)
+        self.canvas.itemconfigure(self._message_window, state="normal")
+
+    def visible_range(self) -> Tuple[int, int]:
+        """Rango [inicio, fin) de índices que deben existir (visibles más el margen)."""
+        if not self._items:
+            return 0, 0
+        top = int(self.canvas.canvasy(0))
+        bottom = top + max(self.canvas.winfo_height(), 1)
+        return visible_slice(self._offsets, self._total_height, top, bottom, self._buffer_rows)
+
+    def _hide_message(self) -> None:
+        if self._message_window is not None:
+            self.canvas.itemconfigure(self._message_window, state="hidden")
+
+    def _release(self, index: int) -> None:
+        kind, widget, window = self._active.pop(index)
+        self.canvas.itemconfigure(window, state="hidden")
+        self._pool[kind].append((widget, window))
+
+    def _release_all(self) -> None:
+        for index in list(self._active):
+            self._release(index)
+
+    def _acquire(self, kind: str) -> Tuple[tk.Widget, int]:
+        pool = self._pool[kind]
+        if pool:
+            return pool.pop()
+        widget = self._kinds[kind][1](self.canvas)
+        window = self.canvas.create_window(0, 0, window=widget, anchor="nw", state="hidden")
+        return widget, window
+
+    def _render(self) -> None:
+        """Materializa los elementos del rango visible y recicla los que salieron de él."""
+        start, end = self.visible_range()
+        for index in [i for i in self._active if i < start or i >= end]:
+            self._release(index)
+        width = self.canvas.winfo_width()
+        for index in range(start, end):
+            if index in self._active:
+                continue
+            kind, data = self._items[index]
+            widget, window = self._acquire(kind)
+            self._kinds[kind][2](widget, data, index)
+            self.canvas.coords(window, 0, self._offsets[index])
+            self.canvas.itemconfigure(window, width=width, height=self._kinds[kind][0], state="normal")
+            self._active[index] = (kind, widget, window)
+
+    def _yview(self, *args) -> None:
+        self.canvas.yview(*args)
+        self._render()
+
+    def _on_yscroll(self, first, last) -> None:
+        self._scrollbar.set(first, last)
+        self._render()
+
+    def _on_canvas_configure(self, event) -> None:
+        for _, _, window in self._active.values():
+            self.canvas.itemconfigure(window, width=event.width)
+        if self._message_window is not None:
+            self.canvas.coords(self._message_window, event.width // 2, 40)
+        self.canvas.configure(scrollregion=(0, 0, event.width, self._total_height))
+        self._render()
+
+
+def visible_slice(offsets: Sequence[int], total_height: int, top: int, bottom: int,
+                  buffer_rows: int = BUFFER_ROWS) -> Tuple[int, int]:
+    """
+    Índices [inicio, fin) de los elementos que intersectan [top, bottom) más buffer_rows
+    a cada lado. offsets son las posiciones y de inicio de cada elemento, en orden.
+    """
+    count = len(offsets)
+    if not count:
+        return 0, 0
+    top = max(0, min(top, total_height))
+    first = max(bisect_right(offsets, top) - 1, 0)
+    last = bisect_right(offsets, max(bottom - 1, top))
+    return max(first - buffer_rows, 0), min(last + buffer_rows, count)
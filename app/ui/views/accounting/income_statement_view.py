@@ -162,10 +162,21 @@ class IncomeStatementView(tk.Frame):
             bg="#475569", fg="white", relief="flat", padx=10, pady=3,
             cursor="hand2", command=lambda: self._export("txt"),
         )
-        btn_txt.pack(fill="x")
+        btn_txt.pack(fill="x", pady=(0, 3))
         btn_txt.bind("<Enter>", lambda e: btn_txt.config(bg="#334155"))
         btn_txt.bind("<Leave>", lambda e: btn_txt.config(bg="#475569"))
 
+        # Cierre del mes seleccionado (el texto cambia a "Reabrir" si ya está cerrado)
+        self._btn_close = tk.Button(
+            btn_col, text="🔒 Cerrar mes",
+            font=("Segoe UI", 9),
+            bg="#475569", fg="white", relief="flat", padx=10, pady=3,
+            cursor="hand2", command=self._toggle_period_close,
+        )
+        self._btn_close.pack(fill="x")
+        self._btn_close.bind("<Enter>", lambda e: self._btn_close.config(bg="#334155"))
+        self._btn_close.bind("<Leave>", lambda e: self._btn_close.config(bg="#475569"))
+
         # ── Panel de resultados (sin scroll) ────────────────────────────
         self._results_frame = tk.Frame(self, bg=bg)
         self._results_frame.pack(fill="both", expand=True, padx=Spacing.LG, pady=(4, 4))
@@ -233,6 +244,7 @@ class IncomeStatementView(tk.Frame):
             self._last_data = data
             self._last_period_label = period_label
             self._render_results(data, period_label)
+            self._update_close_button()
         except Exception as exc:
             logger.exception("Error al generar estado de resultados: %s", exc)
             messagebox.showerror("Error", f"No se pudo generar el estado de resultados:\n{exc}")
@@ -270,6 +282,16 @@ class IncomeStatementView(tk.Frame):
             bg=bg, fg=theme["text_primary"],
         ).pack(anchor="w", pady=(0, 4))
 
+        cerrados = data.get("periodos_cerrados") or []
+        if cerrados:
+            meses = ", ".join(f"{p[5:7]}/{p[:4]}" for p in cerrados)
+            tk.Label(
+                self._results_frame,
+                text=f"🔒 Incluye meses cerrados (saldos del cierre): {meses}",
+                font=("Segoe UI", 8), bg=bg,
+                fg=theme.get("text_secondary", "#6b7280"), anchor="w",
+            ).pack(fill="x", pady=(0, 4))
+
         # Todo en una sola columna (izquierda → abajo)
         col = tk.Frame(self._results_frame, bg=bg)
         col.pack(fill="both", expand=True)
@@ -316,6 +338,59 @@ class IncomeStatementView(tk.Frame):
                 anchor="w",
             ).pack(fill="x", pady=(4, 0))
 
+    # ------------------------------------------------------------------
+    # Cierre de mes
+    # ------------------------------------------------------------------
+
+    def _selected_month(self):
+        """Mes seleccionado como "YYYY-MM", o None si el período no es un mes específico."""
+        if self._period_type.get() != "specific_month":
+            return None
+        mes_nombre = self._mes_var.get()
+        anio_str = self._anio_var.get()
+        if not mes_nombre or not anio_str:
+            return None
+        return f"{int(anio_str):04d}-{MESES.index(mes_nombre) + 1:02d}"
+
+    def _update_close_button(self):
+        period = self._selected_month()
+        closed = period is not None and self.presenter.is_period_closed(period)
+        self._btn_close.config(text="🔓 Reabrir mes" if closed else "🔒 Cerrar mes")
+
+    def _toggle_period_close(self):
+        period = self._selected_month()
+        if period is None:
+            messagebox.showinfo("Cierre de mes", "Seleccione un mes específico para cerrarlo o reabrirlo.")
+            return
+        mes_label = f"{self._mes_var.get()} {self._anio_var.get()}"
+        try:
+            if self.presenter.is_period_closed(period):
+                if not messagebox.askyesno(
+                    "Reabrir mes",
+                    f"¿Reabrir {mes_label}?\n\n"
+                    "También se reabrirán los meses cerrados posteriores y sus movimientos "
+                    "podrán volver a editarse.",
+                ):
+                    return
+                self.presenter.reopen_period(period)
+            else:
+                if not messagebox.askyesno(
+                    "Cerrar mes",
+                    f"¿Cerrar {mes_label}?\n\n"
+                    "Sus saldos quedarán guardados y no se podrán registrar, editar ni eliminar "
+                    "pagos, gastos o asientos de ese mes hasta reabrirlo.",
+                ):
+                    return
+                self.presenter.close_period(period)
+        except ValueError as exc:
+            messagebox.showwarning("Cierre de mes", str(exc))
+            return
+        except Exception as exc:
+            logger.exception("Error al actualizar el cierre de %s: %s", period, exc)
+            messagebox.showerror("Error", f"No se pudo actualizar el cierre del mes:\n{exc}")
+            return
+        self._generate()
+
     # ------------------------------------------------------------------
     # Exportación
     # ------------------------------------------------------------------
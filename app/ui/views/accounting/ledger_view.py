@@ -234,7 +234,7 @@ class LedgerView(tk.Frame):
     def _build_table(self, parent):
         """Construye el Treeview con scrollbar vertical."""
         bg = self._bg
-        columns = ("fecha", "tipo", "descripcion", "referencia", "monto", "direccion")
+        columns = ("fecha", "tipo", "descripcion", "referencia", "monto", "direccion", "saldo")
 
         self._tree = ttk.Treeview(
             parent,
@@ -251,6 +251,7 @@ class LedgerView(tk.Frame):
             ("referencia",  "Referencia",  160),
             ("monto",       "Monto",       110),
             ("direccion",   "Dirección",    90),
+            ("saldo",       "Saldo",       120),
         ]
         for col_id, heading, width in col_config:
             self._tree.heading(col_id, text=heading)
@@ -369,7 +370,7 @@ class LedgerView(tk.Frame):
         if not movements:
             self._tree.insert(
                 "", "end",
-                values=("", "", "No hay movimientos para el período seleccionado.", "", "", ""),
+                values=("", "", "No hay movimientos para el período seleccionado.", "", "", "", ""),
             )
             return
 
@@ -415,6 +416,7 @@ class LedgerView(tk.Frame):
                     mov.get("referencia", ""),
                     monto_fmt,
                     direccion.capitalize(),
+                    f"${mov.get('saldo', 0):,.2f}",
                 ),
                 tags=(tag,),
             )
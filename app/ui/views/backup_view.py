@@ -382,7 +382,14 @@ class BackupView(tk.Frame):
         if len(filename) > 35:
             filename = filename[:32] + "..."
         tk.Label(main_row, text=filename, font=("Segoe UI", 9, "bold"), fg="#333", bg=card_bg, anchor="w").pack(side="left", padx=(0, 6))
-        tk.Label(main_row, text=f"{backup_info.get('size_mb', 0):.2f} MB", font=("Segoe UI", 8), fg="#666", bg=card_bg).pack(side="left", padx=(0, 6))
+        if backup_info.get("backup_type") == "incremental":
+            # Snapshot incremental: contenido nuevo frente a contenido compartido con backups previos
+            new_mb = backup_info.get("new_bytes", 0) / (1024 * 1024)
+            shared_mb = backup_info.get("shared_bytes", 0) / (1024 * 1024)
+            size_text = f"Incremental: {new_mb:.2f} MB nuevos / {shared_mb:.2f} MB compartidos"
+        else:
+            size_text = f"{backup_info.get('size_mb', 0):.2f} MB"
+        tk.Label(main_row, text=size_text, font=("Segoe UI", 8), fg="#666", bg=card_bg).pack(side="left", padx=(0, 6))
         try:
             created_date = datetime.fromisoformat(backup_info["created"])
             date_str = created_date.strftime("%d/%m/%Y %H:%M")
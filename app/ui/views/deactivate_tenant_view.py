@@ -13,6 +13,8 @@ from manager.app.ui.components.tenant_autocomplete import TenantAutocompleteEntr
 from manager.app.ui.components.modern_widgets import create_rounded_button, get_module_colors
 from manager.app.services.tenant_service import tenant_service
 from manager.app.services.apartment_service import apartment_service
+from manager.app.services import transaction
+from manager.app.logger import logger
 
 class DeactivateTenantView(tk.Frame):
     """Vista para desactivar un inquilino"""
@@ -934,26 +936,32 @@ class DeactivateTenantView(tk.Frame):
             return
         
         try:
-            # Actualizar estado del inquilino a inactivo
-            tenant_service.update_tenant(tenant_id, {
-                "estado_pago": "inactivo",
-                "motivo_desactivacion": motivo,
-                "fecha_desactivacion": datetime.now().isoformat()
-            })
-            
-            # Marcar apartamento como disponible si existe
-            if apt_id is not None:
-                # Asegurar que apt_id sea un entero
-                try:
-                    apt_id_int = int(apt_id) if isinstance(apt_id, str) else apt_id
-                    apt = apartment_service.get_apartment_by_id(apt_id_int)
+            # Inquilino y apartamento se guardan juntos (o ninguno): si algo no se
+            # guarda se lanza la excepción dentro del with y transaction() deshace ambos
+            with transaction():
+                # Actualizar estado del inquilino a inactivo
+                updated = tenant_service.update_tenant(tenant_id, {
+                    "estado_pago": "inactivo",
+                    "motivo_desactivacion": motivo,
+                    "fecha_desactivacion": datetime.now().isoformat()
+                })
+                if updated is None:
+                    raise RuntimeError("No se pudo guardar el inquilino.")
+                
+                # Marcar apartamento como disponible si existe
+                if apt_id is not None:
+                    try:
+                        apt_id_int = int(apt_id)
+                    except (ValueError, TypeError) as e:
+                        apt_id_int = None
+                        logger.warning("ID de apartamento inválido %s: %s", apt_id, e)
+                    apt = apartment_service.get_apartment_by_id(apt_id_int) if apt_id_int is not None else None
                     if apt:
-                        apartment_service.update_apartment(apt_id_int, {"status": "Disponible"})
-                        print(f"✅ Apartamento {apt.get('number', apt_id_int)} marcado como Disponible")
-                    else:
-                        print(f"⚠️ No se encontró apartamento con ID: {apt_id_int}")
-                except (ValueError, TypeError) as e:
-                    print(f"⚠️ Error al procesar ID de apartamento {apt_id}: {str(e)}")
+                        if apartment_service.update_apartment(apt_id_int, {"status": "Disponible"}) is None:
+                            raise RuntimeError("No se pudo marcar el apartamento como disponible.")
+                        logger.info("Apartamento %s marcado como Disponible", apt.get('number', apt_id_int))
+                    elif apt_id_int is not None:
+                        logger.warning("No se encontró apartamento con ID: %s", apt_id_int)
             
             if sys.platform == "win32":
                 try:
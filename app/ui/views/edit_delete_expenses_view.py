@@ -14,6 +14,8 @@ from manager.app.ui.components.modern_widgets import ModernButton, create_rounde
 from manager.app.services.expense_service import ExpenseService
 from manager.app.services.apartment_service import apartment_service
 from manager.app.services.tenant_service import TenantService
+from manager.app.services.accounting_service import ClosedPeriodError
+from manager.app.services.date_keys import key_to_display, record_date_key
 from manager.app.logger import logger
 
 # Importar RegisterExpenseView para acceder a EXPENSE_CATEGORIES
@@ -46,7 +48,7 @@ class EditDeleteExpensesView(tk.Frame):
         self.search_text = ""
         self._updating_filters = False
 
-        apartment_service._load_data()
+        apartment_service.reload_data()
         self.apartments = apartment_service.get_all_apartments()
         self.tenants = self.tenant_service.get_all_tenants()
 
@@ -382,17 +384,19 @@ class EditDeleteExpensesView(tk.Frame):
         if self.filter_apartment:
             expenses = [e for e in expenses if str(e.get("apartamento", "")) == str(self.filter_apartment)]
         if self.filter_year is not None or self.filter_month is not None:
+            # Se compara la clave canónica YYYY-MM-DD del gasto, sin parsear la fecha
+            year_prefix = f"{self.filter_year:04d}" if self.filter_year is not None else None
+            month_part = f"{self.filter_month:02d}" if self.filter_month is not None else None
             filtered = []
             for e in expenses:
-                try:
-                    fecha = datetime.strptime(e.get("fecha", ""), "%Y-%m-%d")
-                    if self.filter_year is not None and fecha.year != self.filter_year:
-                        continue
-                    if self.filter_month is not None and fecha.month != self.filter_month:
-                        continue
-                    filtered.append(e)
-                except Exception:
+                key = record_date_key(e, "fecha")
+                if key is None:
+                    continue
+                if year_prefix is not None and key[:4] != year_prefix:
                     continue
+                if month_part is not None and key[5:7] != month_part:
+                    continue
+                filtered.append(e)
             expenses = filtered
 
         expenses.sort(key=lambda x: (x.get("fecha", ""), x.get("id", 0)), reverse=True)
@@ -443,11 +447,8 @@ class EditDeleteExpensesView(tk.Frame):
             ))
         else:
             for idx, expense in enumerate(expenses):
-                fecha_str = expense.get("fecha", "")
-                try:
-                    fecha_display = datetime.strptime(fecha_str, "%Y-%m-%d").strftime("%d/%m/%Y")
-                except Exception:
-                    fecha_display = fecha_str
+                key = record_date_key(expense, "fecha")
+                fecha_display = key_to_display(key) if key else expense.get("fecha", "")
                 apt = expense.get("apartamento", "---")
                 apt_display = "General" if apt == "---" else apt
                 desc = expense.get("descripcion", "")
@@ -537,19 +538,11 @@ class EditDeleteExpensesView(tk.Frame):
     def _delete_expense(self, expense: Dict[str, Any]):
         """Elimina un gasto"""
         # Confirmar eliminación
-        fecha_str = expense.get("fecha", "")
+        key = record_date_key(expense, "fecha")
+        fecha_display = key_to_display(key) if key else expense.get("fecha", "")
         categoria = expense.get("categoria", "")
         monto = expense.get("monto", 0)
         
-        try:
-            if fecha_str:
-                fecha_obj = datetime.strptime(fecha_str, "%Y-%m-%d")
-                fecha_display = fecha_obj.strftime("%d/%m/%Y")
-            else:
-                fecha_display = fecha_str
-        except:
-            fecha_display = fecha_str
-        
         confirm_msg = (
             f"¿Seguro que deseas eliminar este gasto?\n\n"
             f"Fecha: {fecha_display}\n"
@@ -560,7 +553,11 @@ class EditDeleteExpensesView(tk.Frame):
         if messagebox.askyesno("Eliminar gasto", confirm_msg):
             if not self.winfo_exists():
                 return
-            success = self.expense_service.delete_expense(expense.get('id'))
+            try:
+                success = self.expense_service.delete_expense(expense.get('id'))
+            except ClosedPeriodError as exc:
+                messagebox.showwarning("Período cerrado", str(exc))
+                return
             
             if success:
                 try:
@@ -11,6 +11,7 @@ from manager.app.ui.components.tenant_autocomplete import TenantAutocompleteEntr
 from manager.app.services.payment_service import payment_service
 from manager.app.services.tenant_service import tenant_service
 from manager.app.services.apartment_service import apartment_service
+from manager.app.services.accounting_service import ClosedPeriodError
 from manager.app.logger import logger
 from manager.app.ui.views.register_expense_view import DatePickerWidget
 
@@ -337,7 +338,11 @@ class EditDeletePaymentsView(tk.Frame):
         data['monto'] = monto
         data['metodo'] = metodo
         data['observaciones'] = obs
-        self.payment_service.update_payment(self.editing_payment['id'], data)
+        try:
+            self.payment_service.update_payment(self.editing_payment['id'], data)
+        except ClosedPeriodError as exc:
+            messagebox.showwarning("Período cerrado", str(exc))
+            return
         if sys.platform == "win32":
             winsound.MessageBeep(winsound.MB_ICONASTERISK)
 
@@ -368,7 +373,11 @@ class EditDeletePaymentsView(tk.Frame):
         if messagebox.askyesno("Eliminar pago", "¿Seguro que deseas eliminar este pago?"):
             if not self.winfo_exists():
                 return
-            success = self.payment_service.delete_payment(payment['id'])
+            try:
+                success = self.payment_service.delete_payment(payment['id'])
+            except ClosedPeriodError as exc:
+                messagebox.showwarning("Período cerrado", str(exc))
+                return
             if success:
                 try:
                     import winsound
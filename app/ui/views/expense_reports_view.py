@@ -18,6 +18,14 @@ from manager.app.services.expense_service import ExpenseService
 from manager.app.services.apartment_service import apartment_service
 from manager.app.paths_config import EXPORTS_DIR, ensure_dirs
 from manager.app.ui.views.register_expense_view import DatePickerWidget
+from manager.app.reporting.expense_reports import (
+    build_apartment_report,
+    build_category_and_subtype_report,
+    build_year_comparison_report,
+)
+from manager.app.reporting.periods import build_period_selection, period_label
+from manager.app.reporting.snapshot import ReportSnapshot
+from manager.app.ui.components.report_job_runner import ReportJobRunner
 
 # Rojo más oscuro del módulo para iconos, títulos y botones (contraste)
 DARK_RED = "#991b1b"
@@ -36,6 +44,8 @@ class ExpenseReportsView(tk.Frame):
         self.on_back = on_back
         self.on_navigate_to_dashboard = on_navigate_to_dashboard
         self.expense_service = ExpenseService()
+        # Los reportes se generan en segundo plano (ver app/reporting)
+        self._report_runner = ReportJobRunner(self, color="#dc2626")
         
         self._reload_all_data()
         
@@ -45,7 +55,7 @@ class ExpenseReportsView(tk.Frame):
         """Recarga todos los datos necesarios para los reportes"""
         try:
             self.expense_service._load_data()
-            apartment_service._load_data()
+            apartment_service.reload_data()
         except Exception as e:
             print(f"Error al recargar datos: {e}")
     
@@ -355,87 +365,33 @@ class ExpenseReportsView(tk.Frame):
         period_window.after(50, period_window.focus_force)
         return period_window, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
     
-    def _filter_expenses_by_period(self, expenses, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry):
-        """Filtra gastos según el período seleccionado y retorna (filtered_expenses, period_name)"""
-        filtered = []
-        period_name = ""
-        months = [
-            "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
-            "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
-        ]
-        
-        period = period_type.get()
-        
-        if period == "current_month":
-            now = datetime.now()
-            filtered = [e for e in expenses if self._is_this_month(e.get('fecha', ''))]
-            period_name = f"{months[now.month - 1]} {now.year}"
-            
-        elif period == "current_year":
-            filtered = [e for e in expenses if self._is_this_year(e.get('fecha', ''))]
-            period_name = f"{datetime.now().year}"
-            
-        elif period == "specific_month":
-            # Obtener año y mes seleccionados
-            selected_year = year_combo.get()
-            selected_month = month_combo.get()
-            
-            if not selected_year or not selected_month:
-                return None, None
-            
-            # Convertir mes a número
-            month_num = months.index(selected_month) + 1
-            year_num = int(selected_year)
-            
-            # Filtrar gastos del mes y año seleccionados
-            for expense in expenses:
-                try:
-                    date_str = expense.get('fecha', '')
-                    if date_str:
-                        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                        if date_obj.year == year_num and date_obj.month == month_num:
-                            filtered.append(expense)
-                except Exception:
-                    pass
-            
-            period_name = f"{selected_month} {selected_year}"
-            
-        elif period == "specific_year":
-            # Obtener año seleccionado
-            selected_year = year_only_combo.get()
-            
-            if not selected_year:
-                return None, None
-            
-            year_num = int(selected_year)
-            
-            # Filtrar gastos del año seleccionado (todos los meses)
-            for expense in expenses:
-                try:
-                    date_str = expense.get('fecha', '')
-                    if date_str:
-                        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                        if date_obj.year == year_num:
-                            filtered.append(expense)
-                except Exception:
-                    pass
-            
-            period_name = f"Año {selected_year}"
-            
-        else:  # custom
-            date_from = date_from_entry.get().strip()
-            date_to = date_to_entry.get().strip()
-            if not date_from or not date_to:
-                return None, None
-            try:
-                date_from_obj = datetime.strptime(date_from, "%d/%m/%Y")
-                date_to_obj = datetime.strptime(date_to, "%d/%m/%Y")
-                filtered = [e for e in expenses if self._is_in_range(e.get('fecha', ''), date_from_obj, date_to_obj)]
-                period_name = f"{date_from} a {date_to}"
-            except ValueError:
-                return None, None
-        
-        return filtered, period_name
+    def _read_period_selection(self, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry):
+        """Lee la ventana de período; retorna la selección o None si faltan campos."""
+        return build_period_selection(
+            period_type.get(),
+            year=year_combo.get(),
+            month_name=month_combo.get(),
+            year_only=year_only_combo.get(),
+            date_from=date_from_entry.get(),
+            date_to=date_to_entry.get(),
+        )
+
+    def _take_snapshot(self) -> ReportSnapshot:
+        """Gastos y apartamentos (registros de solo lectura) para reportes en segundo plano."""
+        return ReportSnapshot(
+            expenses=self.expense_service.records(),
+            apartments=apartment_service.records(),
+            versions={"expenses": self.expense_service.data_version()},
+        )
+
+    def _run_report(self, builder, *args, title, report_type, error_message, selection_window):
+        """Genera el reporte en segundo plano; la ventana de selección se cierra al mostrarlo."""
+        def on_done(content):
+            if selection_window.winfo_exists():
+                selection_window.destroy()
+            self._show_report_window(title, content, report_type)
+
+        self._report_runner.run(builder, *args, on_done=on_done, error_message=error_message)
     
     def _generate_apartment_report(self):
         """Genera reporte de gastos por apartamento"""
@@ -611,51 +567,22 @@ class ExpenseReportsView(tk.Frame):
             button_frame.pack(fill="x", pady=(6, 8))
 
             def generate_wrapper():
-                # Filtrar por período
-                filtered, period_name = self._filter_expenses_by_period(
-                    expenses, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
+                selection = self._read_period_selection(
+                    period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
                 )
                 
-                if filtered is None:
+                if selection is None:
                     messagebox.showerror("Error", "Por favor complete todos los campos requeridos.")
                     return
                 
-                if not filtered:
-                    messagebox.showinfo("Sin datos", f"No hay gastos registrados para el período seleccionado.")
-                    return
-                
-                # Filtrar por apartamento si se seleccionó uno específico
-                selected_apartment = None
-                if apartment_type.get() == "specific":
-                    selected_apartment = apartment_combo.get()
-                    if selected_apartment and selected_apartment != "Todos":
-                        filtered = [e for e in filtered if e.get('apartamento', '---') == selected_apartment]
-                
-                if not filtered:
-                    messagebox.showinfo("Sin datos", f"No hay gastos registrados para los criterios seleccionados.")
-                    return
-                
-                # Agrupar por apartamento
-                apt_expenses = {}
-                for expense in filtered:
-                    apt = expense.get('apartamento', 'General')
-                    if apt == '---':
-                        apt = 'General'
-                    if apt not in apt_expenses:
-                        apt_expenses[apt] = {
-                            'count': 0,
-                            'total': 0,
-                            'expenses': []
-                        }
-                    apt_expenses[apt]['count'] += 1
-                    apt_expenses[apt]['total'] += float(expense.get('monto', 0))
-                    apt_expenses[apt]['expenses'].append(expense)
-                
-                period_window.destroy()
-                self._show_report_window(
-                    f"Reporte por Apartamento - {period_name}",
-                    self._format_apartment_report(apt_expenses, period_name, selected_apartment),
-                    "apartment"
+                selected_apartment = apartment_combo.get() if apartment_type.get() == "specific" else None
+                snapshot = self._take_snapshot()
+                self._run_report(
+                    build_apartment_report, snapshot, selection, selected_apartment,
+                    title=f"Reporte por Apartamento - {period_label(selection, snapshot.now)}",
+                    report_type="apartment",
+                    error_message="Error al generar reporte por apartamento",
+                    selection_window=period_window,
                 )
             
             tk.Button(
@@ -686,42 +613,19 @@ class ExpenseReportsView(tk.Frame):
                 return
 
             def on_generate(period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry, period_window):
-                filtered, period_name = self._filter_expenses_by_period(
-                    expenses, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
+                selection = self._read_period_selection(
+                    period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
                 )
-                if filtered is None:
+                if selection is None:
                     messagebox.showerror("Error", "Por favor complete todos los campos requeridos.")
                     return
-                if not filtered:
-                    messagebox.showinfo("Sin datos", f"No hay gastos registrados para el período seleccionado.")
-                    return
-                # Agrupar por categoría
-                categories_dict = {}
-                for expense in filtered:
-                    category = expense.get('categoria', 'Sin categoría')
-                    if category not in categories_dict:
-                        categories_dict[category] = {'count': 0, 'total': 0, 'expenses': []}
-                    categories_dict[category]['count'] += 1
-                    categories_dict[category]['total'] += float(expense.get('monto', 0))
-                    categories_dict[category]['expenses'].append(expense)
-                # Agrupar por categoría y subtipo
-                subtype_dict = {}
-                for expense in filtered:
-                    category = expense.get('categoria', 'Sin categoría')
-                    subtype = expense.get('subtipo', 'Sin subtipo')
-                    key = f"{category} - {subtype}"
-                    if key not in subtype_dict:
-                        subtype_dict[key] = {
-                            'category': category, 'subtype': subtype, 'count': 0, 'total': 0, 'expenses': []
-                        }
-                    subtype_dict[key]['count'] += 1
-                    subtype_dict[key]['total'] += float(expense.get('monto', 0))
-                    subtype_dict[key]['expenses'].append(expense)
-                period_window.destroy()
-                self._show_report_window(
-                    f"Reporte por Categoría y Subtipo - {period_name}",
-                    self._format_category_and_subtype_report(categories_dict, subtype_dict, len(filtered), period_name),
-                    "category_subtype"
+                snapshot = self._take_snapshot()
+                self._run_report(
+                    build_category_and_subtype_report, snapshot, selection,
+                    title=f"Reporte por Categoría y Subtipo - {period_label(selection, snapshot.now)}",
+                    report_type="category_subtype",
+                    error_message="Error al generar reporte",
+                    selection_window=period_window,
                 )
 
             self._create_period_selection_window("Seleccionar Período - Categoría y Subtipo", on_generate, button_color="#dc2626")
@@ -786,19 +690,12 @@ class ExpenseReportsView(tk.Frame):
                     messagebox.showerror("Error", "Por favor seleccione años diferentes.")
                     return
                 
-                # Filtrar gastos por año
-                year1_expenses = [e for e in expenses if self._is_year(e.get('fecha', ''), int(year1))]
-                year2_expenses = [e for e in expenses if self._is_year(e.get('fecha', ''), int(year2))]
-                
-                if not year1_expenses and not year2_expenses:
-                    messagebox.showinfo("Sin datos", "No hay gastos registrados para los años seleccionados.")
-                    return
-                
-                year_window.destroy()
-                self._show_report_window(
-                    f"Comparativa Anual - {year1} vs {year2}",
-                    self._format_year_comparison_report(year1, year2, year1_expenses, year2_expenses),
-                    "year_comparison"
+                self._run_report(
+                    build_year_comparison_report, self._take_snapshot(), year1, year2,
+                    title=f"Comparativa Anual - {year1} vs {year2}",
+                    report_type="year_comparison",
+                    error_message="Error al generar reporte comparativo",
+                    selection_window=year_window,
                 )
             
             button_frame = tk.Frame(year_window)
@@ -821,159 +718,6 @@ class ExpenseReportsView(tk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Error al generar reporte comparativo: {str(e)}")
     
-    # ==================== FORMATO DE REPORTES ====================
-    
-    def _format_category_and_subtype_report(self, categories_dict, subtype_dict, total_expenses, period_name=None):
-        """Formatea el reporte combinado por categoría y por subtipo"""
-        report = []
-        report.append("=" * 60)
-        report.append("REPORTE DE GASTOS POR CATEGORÍA Y SUBTIPO")
-        if period_name:
-            report.append(f"Período: {period_name}")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        total_general = sum(c['total'] for c in categories_dict.values())
-        report.append("RESUMEN GENERAL:")
-        report.append(f"  • Total de gastos: {total_expenses}")
-        report.append(f"  • Total gastado: ${total_general:,.2f}")
-        report.append("")
-        report.append("ANÁLISIS POR SUBTIPO:")
-        report.append("-" * 60)
-        total_sub = sum(s['total'] for s in subtype_dict.values())
-        # Agrupar subtipos por categoría para mostrar cada grupo junto
-        by_category = {}
-        for key, data in subtype_dict.items():
-            cat = data['category']
-            if cat not in by_category:
-                by_category[cat] = []
-            by_category[cat].append((key, data))
-        # Orden de categorías por total descendente; dentro de cada una, subtipos por total descendente
-        category_order = sorted(categories_dict.items(), key=lambda x: x[1]['total'], reverse=True)
-        for category, _ in category_order:
-            if category not in by_category:
-                continue
-            items = sorted(by_category[category], key=lambda x: x[1]['total'], reverse=True)
-            for key, data in items:
-                percentage = (data['total'] / total_sub * 100) if total_sub else 0
-                report.append(f"Categoría: {data['category']}")
-                report.append(f"Subtipo: {data['subtype']}")
-                report.append(f"  • Cantidad de gastos: {data['count']}")
-                report.append(f"  • Total gastado: ${data['total']:,.2f}")
-                report.append(f"  • Porcentaje del total: {percentage:.2f}%")
-                report.append("")
-        return "\n".join(report)
-
-    def _format_apartment_report(self, apt_expenses, period_name=None, selected_apartment=None):
-        """Formatea el reporte de gastos por apartamento"""
-        report = []
-        report.append("=" * 60)
-        report.append("REPORTE DE GASTOS POR APARTAMENTO")
-        if period_name:
-            report.append(f"Período: {period_name}")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        if selected_apartment:
-            report.append(f"APARTAMENTO SELECCIONADO: {selected_apartment}")
-            report.append("")
-        report.append(f"Total de apartamentos con gastos: {len(apt_expenses)}")
-        report.append("")
-        report.append("DETALLE POR APARTAMENTO:")
-        report.append("-" * 60)
-        
-        # Ordenar por número de apartamento
-        def sort_key(item):
-            apt_num = item[0]
-            if apt_num == 'General':
-                return 'ZZZ'  # General al final
-            try:
-                return f"{int(apt_num):04d}"  # Ordenar numéricamente
-            except:
-                return apt_num
-        
-        sorted_apts = sorted(apt_expenses.items(), key=sort_key)
-        
-        for apt_num, data in sorted_apts:
-            label = self._get_unit_report_label(apt_num)
-            report.append(f"{label}:")
-            report.append(f"  • Total de gastos: {data['count']}")
-            report.append(f"  • Total gastado: ${data['total']:,.2f}")
-            report.append("")
-            report.append("  Historial de gastos:")
-            # Ordenar gastos por fecha
-            sorted_expenses = sorted(data['expenses'], key=lambda x: x.get('fecha', ''), reverse=True)
-            for expense in sorted_expenses[:5]:  # Mostrar últimos 5
-                fecha_str = expense.get('fecha', '')
-                try:
-                    fecha_obj = datetime.strptime(fecha_str, "%Y-%m-%d")
-                    fecha_display = fecha_obj.strftime("%d/%m/%Y")
-                except:
-                    fecha_display = fecha_str
-                report.append(f"    - {fecha_display}: ${float(expense.get('monto', 0)):,.2f} ({expense.get('categoria', 'N/A')})")
-            if len(sorted_expenses) > 5:
-                report.append(f"    ... y {len(sorted_expenses) - 5} gasto(s) más")
-            report.append("")
-        
-        return "\n".join(report)
-
-    def _get_unit_report_label(self, apt_num):
-        """Devuelve la etiqueta correcta para el reporte: 'Local 1', 'Apartamento 2', 'Apartamento General', etc."""
-        if apt_num == "General" or not apt_num:
-            return "Apartamento General"
-        apartments = apartment_service.get_all_apartments()
-        for apt in apartments:
-            if str(apt.get("number", "")) == str(apt_num):
-                unit_type = apt.get("unit_type", "Apartamento Estándar")
-                number = apt.get("number", apt_num)
-                if unit_type in ("Local Comercial", "Local comercial"):
-                    return f"Local {number}"
-                if unit_type == "Penthouse":
-                    return f"Penthouse {number}"
-                if unit_type in ("Depósito", "Bodega") or "Depósito" in str(unit_type) or "Bodega" in str(unit_type):
-                    return f"Depósito {number}"
-                return f"Apartamento {number}"
-        return f"Apartamento {apt_num}"
-    
-    def _format_year_comparison_report(self, year1, year2, year1_expenses, year2_expenses):
-        """Formatea el reporte comparativo anual"""
-        report = []
-        report.append("=" * 60)
-        report.append("COMPARATIVA ANUAL DE GASTOS")
-        report.append(f"{year1} vs {year2}")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        
-        total1 = sum(float(e.get('monto', 0)) for e in year1_expenses)
-        total2 = sum(float(e.get('monto', 0)) for e in year2_expenses)
-        
-        report.append(f"AÑO {year1}:")
-        report.append(f"  • Total de gastos: {len(year1_expenses)}")
-        report.append(f"  • Total gastado: ${total1:,.2f}")
-        report.append("")
-        
-        report.append(f"AÑO {year2}:")
-        report.append(f"  • Total de gastos: {len(year2_expenses)}")
-        report.append(f"  • Total gastado: ${total2:,.2f}")
-        report.append("")
-        
-        report.append("ANÁLISIS COMPARATIVO:")
-        report.append("-" * 60)
-        difference = total1 - total2
-        difference_percent = (difference / total2 * 100) if total2 > 0 else 0
-        report.append(f"  • Diferencia absoluta: ${difference:,.2f}")
-        report.append(f"  • Variación porcentual: {difference_percent:+.2f}%")
-        
-        if total1 > total2:
-            report.append(f"  • El año {year1} tuvo un {abs(difference_percent):.2f}% más de gastos que {year2}")
-        elif total1 < total2:
-            report.append(f"  • El año {year1} tuvo un {abs(difference_percent):.2f}% menos de gastos que {year2}")
-        else:
-            report.append(f"  • Ambos años tuvieron el mismo total de gastos")
-        
-        return "\n".join(report)
-    
     # ==================== VENTANA DE REPORTE ====================
     
     def _show_export_success_dialog(self, filepath: Path):
@@ -1080,39 +824,6 @@ class ExpenseReportsView(tk.Frame):
     
     # ==================== HELPERS ====================
     
-    def _is_this_month(self, date_str):
-        """Verifica si una fecha corresponde al mes actual"""
-        try:
-            date = datetime.strptime(date_str, "%Y-%m-%d")
-            now = datetime.now()
-            return date.year == now.year and date.month == now.month
-        except:
-            return False
-    
-    def _is_this_year(self, date_str):
-        """Verifica si una fecha corresponde al año actual"""
-        try:
-            date = datetime.strptime(date_str, "%Y-%m-%d")
-            return date.year == datetime.now().year
-        except:
-            return False
-    
-    def _is_year(self, date_str, year):
-        """Verifica si una fecha corresponde a un año específico"""
-        try:
-            date = datetime.strptime(date_str, "%Y-%m-%d")
-            return date.year == year
-        except:
-            return False
-    
-    def _is_in_range(self, date_str, date_from, date_to):
-        """Verifica si una fecha está en un rango"""
-        try:
-            date = datetime.strptime(date_str, "%Y-%m-%d")
-            return date_from <= date <= date_to
-        except:
-            return False
-    
     def _create_navigation_buttons(self, parent, on_back_command):
         """Crea los botones Volver y Dashboard con estilo consistente"""
         theme = theme_manager.themes[theme_manager.current_theme]
@@ -15,25 +15,7 @@ from manager.app.ui.components.theme_manager import theme_manager, Spacing
 from manager.app.ui.components.icons import Icons
 from manager.app.ui.components.modern_widgets import ModernButton, ModernCard, ModernSeparator, ModernMetricCard, DetailedMetricCard, create_rounded_button, get_module_colors
 from manager.app.services.tenant_service import tenant_service
-from manager.app.services.payment_service import payment_service
-from manager.app.services.expense_service import ExpenseService
 from manager.app.logger import logger
-from .payments_view import PaymentsView
-from .tenants_hub_view import TenantsHubView
-from .expenses_view import ExpensesView
-from .accounting.accounting_view import AccountingView
-from .apartment_management_view import ApartmentManagementView
-from .building_setup_view import BuildingSetupView
-from .apartment_form_view import ApartmentFormView
-from .apartments_list_view import ApartmentsListView
-from .building_management_view import BuildingManagementView
-from .settings_view import SettingsView
-from .administration_view import AdministrationView
-from .reports.occupancy_vacancy_report_view import OccupancyVacancyReportView
-from .backup_view import BackupView
-from .user_management_view import UserManagementView
-from .dashboard_view import DashboardView
-from .pending_payments_report_window import show_pending_payments_report
 from manager.app.app_controller import AppController
 from manager.app.presenters.dashboard_presenter import DashboardPresenter
 from manager.app.presenters.report_presenter import ReportPresenter
@@ -58,11 +40,21 @@ class MainWindow:
         self._dashboard_presenter = DashboardPresenter()
         self._report_presenter = ReportPresenter()
         self._create_layout()
+        # Primer backup automático en segundo plano, una vez visible la ventana
+        self.root.after(2000, self._start_auto_backup)
         if not self._owns_root:
             # Primero revisar licencia/demo y luego mostrar onboarding.
             self.root.after(150, self._check_license_status)
             self.root.after(350, self._maybe_show_onboarding)
     
+    def _start_auto_backup(self):
+        """Activa los backups automáticos; el primero se genera en un hilo en segundo plano."""
+        try:
+            from manager.app.services.backup_service import backup_service
+            backup_service.start_auto_backup(create_immediately=True)
+        except Exception as e:
+            logger.warning("No se pudieron activar los backups automáticos: %s", e)
+    
     def _get_current_user(self):
         """Obtiene el usuario actual del sistema (fallback cuando no se pasa desde login)."""
         user = self.user_service.get_user_by_username("admin")
@@ -1107,8 +1099,9 @@ class MainWindow:
                     )
     
     def _load_view(self, view_name: str):
-        """Carga una vista específica"""
+        """Carga una vista específica (el módulo de cada vista se importa en la primera navegación)"""
         if view_name == "dashboard":
+            from manager.app.ui.views.dashboard_view import DashboardView
             dashboard = DashboardView(
                 self.views_container,
                 presenter=self._dashboard_presenter,
@@ -1128,6 +1121,7 @@ class MainWindow:
                 logger.warning("Error al recargar datos de inquilinos: %s", e)
             self._create_tenants_view()
         elif view_name == "payments":
+            from manager.app.ui.views.payments_view import PaymentsView
             payments_view = PaymentsView(
                 self.views_container, 
                 on_back=lambda: self._navigate_to("dashboard"),
@@ -1135,9 +1129,11 @@ class MainWindow:
             )
             payments_view.pack(fill="both", expand=True)
         elif view_name == "expenses":
+            from manager.app.ui.views.expenses_view import ExpensesView
             expenses_view = ExpensesView(self.views_container, on_back=lambda: self._navigate_to("dashboard"))
             expenses_view.pack(fill="both", expand=True)
         elif view_name == "accounting":
+            from manager.app.ui.views.accounting.accounting_view import AccountingView
             accounting_view = AccountingView(
                 self.views_container,
                 on_back=lambda: self._navigate_to("dashboard"),
@@ -1145,17 +1141,20 @@ class MainWindow:
             )
             accounting_view.pack(fill="both", expand=True)
         elif view_name == "administration":
+            from manager.app.ui.views.administration_view import AdministrationView
             admin_view = AdministrationView(
                 self.views_container,
                 on_navigate=self._navigate_to,
             )
             admin_view.pack(fill="both", expand=True)
         elif view_name == "settings":
+            from manager.app.ui.views.settings_view import SettingsView
             settings_view = SettingsView(self.views_container, on_back=lambda: self._navigate_to("dashboard"))
             settings_view.pack(fill="both", expand=True)
     
     def _create_tenants_view(self):
         """Crea el hub de inquilinos con tabs de navegación."""
+        from manager.app.ui.views.tenants_hub_view import TenantsHubView
         hub = TenantsHubView(
             self.views_container,
             on_back=lambda: self._navigate_to("dashboard"),
@@ -1169,6 +1168,7 @@ class MainWindow:
     
     def _show_new_tenant_form(self):
         """Navega al módulo de Inquilinos y abre el tab de nuevo inquilino."""
+        from manager.app.ui.views.tenants_hub_view import TenantsHubView
         self._update_nav_buttons("tenants")
         self._page_title_text = "Inquilinos"
         self._draw_page_title()
@@ -1202,6 +1202,7 @@ class MainWindow:
                     "Sin datos", "No hay inquilinos con pagos pendientes."
                 )
                 return
+            from manager.app.ui.views.pending_payments_report_window import show_pending_payments_report
             show_pending_payments_report(
                 self.root, report_content, self._show_export_success_dialog
             )
@@ -1232,6 +1233,7 @@ class MainWindow:
 
     def _show_new_tenant_form(self):
         """Navega al módulo de Inquilinos y abre el tab de nuevo inquilino."""
+        from manager.app.ui.views.tenants_hub_view import TenantsHubView
         self._update_nav_buttons("tenants")
         self._page_title_text = "Inquilinos"
         self._draw_page_title()
@@ -1298,6 +1300,7 @@ class MainWindow:
         """Refresca las estadísticas del dashboard"""
         current_view = getattr(self, "_current_view", None)
         if current_view == "dashboard":
+            from manager.app.ui.views.dashboard_view import DashboardView
             for widget in self.views_container.winfo_children():
                 widget.destroy()
             dashboard = DashboardView(
@@ -1322,6 +1325,7 @@ class MainWindow:
         current_view = getattr(self, '_current_view', None)
         logger.debug("Refrescando vista de inquilinos desde vista: %s", current_view)
         try:
+            from manager.app.ui.views.tenants_hub_view import TenantsHubView
             for widget in self.views_container.winfo_children():
                 if isinstance(widget, TenantsHubView):
                     widget.refresh_list()
@@ -1347,6 +1351,7 @@ class MainWindow:
     
     def _show_register_payment_direct(self):
         """Navega al módulo de Ingresos y abre el tab de registro."""
+        from manager.app.ui.views.payments_view import PaymentsView
         self._update_nav_buttons("payments")
         self._page_title_text = "Ingresos"
         self._draw_page_title()
@@ -1362,6 +1367,7 @@ class MainWindow:
 
     def navigate_to_payments(self, tenant=None):
         """Navega al módulo de Ingresos, opcionalmente con un inquilino preseleccionado."""
+        from manager.app.ui.views.payments_view import PaymentsView
         self._update_nav_buttons("payments")
         self._page_title_text = "Ingresos"
         self._draw_page_title()
@@ -1378,6 +1384,7 @@ class MainWindow:
     
     def _show_register_expense_direct(self):
         """Navega a la vista de gastos y abre directamente el registro de gasto"""
+        from manager.app.ui.views.expenses_view import ExpensesView
         self._update_nav_buttons("expenses")
         self._page_title_text = "Gestión de Gastos"
         self._draw_page_title()
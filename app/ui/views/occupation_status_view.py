@@ -195,14 +195,11 @@ class OccupationStatusView(tk.Frame):
             tenant_name = "No asignado"
             tenant_rent = "0"
             
-            all_tenants = tenant_service.get_all_tenants()
             # Solo inquilinos activos (estado_pago != "inactivo") para mostrar el ocupante actual
-            active_tenants = [t for t in all_tenants if t.get('estado_pago') != 'inactivo']
-            for tenant in active_tenants:
-                if tenant.get('apartamento') == apartment_id:
-                    tenant_name = tenant.get('nombre', 'No asignado')
-                    tenant_rent = tenant.get('valor_arriendo', '0')
-                    break
+            tenant = tenant_service.get_active_tenant_by_apartment(apartment_id)
+            if tenant:
+                tenant_name = tenant.get('nombre', 'No asignado')
+                tenant_rent = tenant.get('valor_arriendo', '0')
             
             # Shorten name if too long
             if len(tenant_name) > 15:
@@ -7,7 +7,6 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
 import os
 import csv
 from pathlib import Path
@@ -19,6 +18,21 @@ from manager.app.ui.views.register_expense_view import DatePickerWidget
 from manager.app.services.payment_service import payment_service
 from manager.app.services.tenant_service import tenant_service
 from manager.app.services.apartment_service import apartment_service
+from manager.app.reporting.periods import build_period_selection
+from manager.app.reporting.payment_reports import (
+    build_apartment_payments_report,
+    build_collection_efficiency_report,
+    build_consolidated_income_report,
+    build_payment_method_report,
+    build_pending_payments_report,
+    build_period_report,
+    build_tenant_payments_report,
+    build_trends_report,
+    payments_period_label,
+)
+from manager.app.reporting.receipt_batch import generate_receipts, generate_statements
+from manager.app.reporting.snapshot import ReportSnapshot
+from manager.app.ui.components.report_job_runner import ReportJobRunner
 from manager.app.logger import logger
 
 
@@ -38,6 +52,8 @@ class PaymentReportsView(tk.Frame):
         self.configure(bg=self._content_bg)
         self.on_back = on_back
         self.on_navigate_to_dashboard = on_navigate_to_dashboard  # Callback para navegar al dashboard
+        # Los reportes se generan en segundo plano (ver app/reporting)
+        self._report_runner = ReportJobRunner(self, color="#22c55e")
         
         # Recargar datos antes de generar reportes
         self._reload_all_data()
@@ -49,7 +65,7 @@ class PaymentReportsView(tk.Frame):
         try:
             payment_service._load_data()
             tenant_service._load_data()
-            apartment_service._load_data()
+            apartment_service.reload_data()
         except Exception as e:
             logger.warning("Error al recargar datos: %s", e)
     
@@ -96,6 +112,12 @@ class PaymentReportsView(tk.Frame):
             ("🏢 Reporte por Apartamento",
              "Análisis de pagos agrupados por apartamento.",
              self._generate_apartment_payments_report),
+            ("🧾 Recibos por Período",
+             "Genera los recibos PDF de los pagos de un período en la carpeta de cada inquilino.",
+             self._generate_period_receipts),
+            ("📄 Estados de Cuenta",
+             "Genera el estado de cuenta PDF de cada inquilino activo en su carpeta.",
+             self._generate_account_statements),
         ]
         
         # Colocar cards en grid 4 columnas (2 filas de 4 cards)
@@ -367,114 +389,68 @@ class PaymentReportsView(tk.Frame):
         period_window.after(50, period_window.focus_force)
         return period_window, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
     
-    def _filter_payments_by_period(self, payments, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry):
-        """Filtra pagos según el período seleccionado y retorna (filtered_payments, period_name)"""
-        filtered = []
-        period_name = ""
-        months = [
-            "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
-            "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
-        ]
-        
-        period = period_type.get()
-        
-        if period == "current_month":
-            now = datetime.now()
-            filtered = [p for p in payments if self._is_this_month(p.get('fecha_pago', ''))]
-            period_name = f"{now.strftime('%B %Y')}"
-            
-        elif period == "current_year":
-            filtered = [p for p in payments if self._is_this_year(p.get('fecha_pago', ''))]
-            period_name = f"{datetime.now().year}"
-            
-        elif period == "specific_month":
-            # Obtener año y mes seleccionados
-            selected_year = year_combo.get()
-            selected_month = month_combo.get()
-            
-            if not selected_year or not selected_month:
-                return None, None
-            
-            # Convertir mes a número
-            month_num = months.index(selected_month) + 1
-            year_num = int(selected_year)
-            
-            # Filtrar pagos del mes y año seleccionados
-            for payment in payments:
-                try:
-                    date_str = payment.get('fecha_pago', '')
-                    if date_str:
-                        date_obj = datetime.strptime(date_str, "%d/%m/%Y")
-                        if date_obj.year == year_num and date_obj.month == month_num:
-                            filtered.append(payment)
-                except Exception:
-                    pass
-            
-            period_name = f"{selected_month} {selected_year}"
-            
-        elif period == "specific_year":
-            # Obtener año seleccionado
-            selected_year = year_only_combo.get()
-            
-            if not selected_year:
-                return None, None
-            
-            year_num = int(selected_year)
-            
-            # Filtrar pagos del año seleccionado (todos los meses)
-            for payment in payments:
-                try:
-                    date_str = payment.get('fecha_pago', '')
-                    if date_str:
-                        date_obj = datetime.strptime(date_str, "%d/%m/%Y")
-                        if date_obj.year == year_num:
-                            filtered.append(payment)
-                except Exception:
-                    pass
-            
-            period_name = f"Año {selected_year}"
-            
-        else:  # custom
-            date_from = date_from_entry.get().strip()
-            date_to = date_to_entry.get().strip()
-            if not date_from or not date_to:
-                return None, None
-            try:
-                date_from_obj = datetime.strptime(date_from, "%d/%m/%Y")
-                date_to_obj = datetime.strptime(date_to, "%d/%m/%Y")
-                filtered = [p for p in payments if self._is_in_range(p.get('fecha_pago', ''), date_from_obj, date_to_obj)]
-                period_name = f"{date_from} a {date_to}"
-            except ValueError:
-                return None, None
-        
-        return filtered, period_name
+    def _read_period_selection(self, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry):
+        """Lee la ventana de período; retorna la selección o None si faltan campos."""
+        return build_period_selection(
+            period_type.get(),
+            year=year_combo.get(),
+            month_name=month_combo.get(),
+            year_only=year_only_combo.get(),
+            date_from=date_from_entry.get(),
+            date_to=date_to_entry.get(),
+        )
+
+    def _take_snapshot(self) -> ReportSnapshot:
+        """Pagos, inquilinos y apartamentos (registros de solo lectura) para reportes en segundo plano."""
+        return ReportSnapshot(
+            payments=payment_service.records(),
+            tenants=tenant_service.records(),
+            apartments=apartment_service.records(),
+            versions={"payments": payment_service.data_version()},
+        )
+
+    def _run_report(self, builder, *args, title, report_type, error_message, selection_window=None):
+        """
+        Genera el reporte en segundo plano y lo muestra al terminar. La ventana de
+        selección (si la hay) se cierra al mostrar el reporte o el aviso de sin datos.
+        """
+        def close_selection():
+            if selection_window is not None and selection_window.winfo_exists():
+                selection_window.destroy()
+
+        def on_done(content):
+            close_selection()
+            self._show_report_window(title, content, report_type)
+
+        def on_no_data(message):
+            close_selection()
+            messagebox.showinfo("Sin datos", message)
+
+        self._report_runner.run(builder, *args, on_done=on_done, on_no_data=on_no_data,
+                                error_message=error_message)
     
     def _generate_period_report(self):
         """Genera reporte de pagos por período"""
         try:
             self._reload_all_data()
             
-            payments = payment_service.get_all_payments()
-            
             def on_generate(period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry, period_window):
-                filtered, period_name = self._filter_payments_by_period(
-                    payments, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
+                selection = self._read_period_selection(
+                    period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
                 )
                 
-                if filtered is None:
+                if selection is None:
                     messagebox.showerror("Error", "Por favor complete todos los campos requeridos.")
                     return
                 
-                if not filtered:
-                    messagebox.showinfo("Sin datos", f"No hay pagos registrados para el período seleccionado.")
-                    period_window.destroy()
-                    return
-                
-                period_window.destroy()
-                self._show_report_window(
-                    f"Reporte de Pagos - {period_name}",
-                    self._format_period_report(filtered, period_name),
-                    "payment_period"
+                snapshot = self._take_snapshot()
+                period_name = payments_period_label(selection, snapshot.now)
+                self._run_report(
+                    build_period_report, snapshot, selection,
+                    title=f"Reporte de Pagos - {period_name}",
+                    report_type="payment_period",
+                    error_message="Error al generar reporte por período",
+                    selection_window=period_window,
                 )
             
             self._create_period_selection_window("Seleccionar Período", on_generate)
@@ -531,18 +507,12 @@ class PaymentReportsView(tk.Frame):
                 selected_display = tenant_listbox.get(selection[0])
                 selected_tenant = tenant_dict[selected_display]
                 
-                payments = payment_service.get_payments_by_tenant(selected_tenant.get('id'))
-                
-                if not payments:
-                    messagebox.showinfo("Sin datos", f"No hay pagos registrados para {selected_tenant.get('nombre', 'N/A')}.")
-                    tenant_window.destroy()
-                    return
-                
-                tenant_window.destroy()
-                self._show_report_window(
-                    f"Reporte de Pagos - {selected_tenant.get('nombre', 'N/A')}",
-                    self._format_tenant_payments_report(selected_tenant, payments),
-                    "tenant_payments"
+                self._run_report(
+                    build_tenant_payments_report, self._take_snapshot(), selected_tenant.get('id'),
+                    title=f"Reporte de Pagos - {selected_tenant.get('nombre', 'N/A')}",
+                    report_type="tenant_payments",
+                    error_message="Error al generar reporte por inquilino",
+                    selection_window=tenant_window,
                 )
             
             button_frame = tk.Frame(tenant_window)
@@ -570,45 +540,27 @@ class PaymentReportsView(tk.Frame):
         try:
             self._reload_all_data()
             
-            payments = payment_service.get_all_payments()
-            
-            if not payments:
+            if not payment_service.get_all_payments():
                 messagebox.showinfo("Sin datos", "No hay pagos registrados para generar el reporte.")
                 return
             
             def on_generate(period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry, period_window):
-                filtered, period_name = self._filter_payments_by_period(
-                    payments, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
+                selection = self._read_period_selection(
+                    period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
                 )
                 
-                if filtered is None:
+                if selection is None:
                     messagebox.showerror("Error", "Por favor complete todos los campos requeridos.")
                     return
                 
-                if not filtered:
-                    messagebox.showinfo("Sin datos", f"No hay pagos registrados para el período seleccionado.")
-                    period_window.destroy()
-                    return
-                
-                # Agrupar por método
-                methods_dict = {}
-                for payment in filtered:
-                    method = payment.get('metodo', 'No especificado')
-                    if method not in methods_dict:
-                        methods_dict[method] = {
-                            'count': 0,
-                            'total': 0,
-                            'payments': []
-                        }
-                    methods_dict[method]['count'] += 1
-                    methods_dict[method]['total'] += float(payment.get('monto', 0))
-                    methods_dict[method]['payments'].append(payment)
-                
-                period_window.destroy()
-                self._show_report_window(
-                    f"Reporte por Método de Pago - {period_name}",
-                    self._format_payment_method_report(methods_dict, len(filtered), period_name),
-                    "payment_method"
+                snapshot = self._take_snapshot()
+                period_name = payments_period_label(selection, snapshot.now)
+                self._run_report(
+                    build_payment_method_report, snapshot, selection,
+                    title=f"Reporte por Método de Pago - {period_name}",
+                    report_type="payment_method",
+                    error_message="Error al generar reporte por método",
+                    selection_window=period_window,
                 )
             
             self._create_period_selection_window("Seleccionar Período - Método de Pago", on_generate, button_color="#16a34a")
@@ -616,29 +568,85 @@ class PaymentReportsView(tk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Error al generar reporte por método: {str(e)}")
     
-    def _generate_pending_payments_report(self):
-        """Genera reporte de pagos pendientes"""
+    def _run_document_batch(self, generator, *args, error_message, selection_window=None):
+        """Genera documentos PDF en lote (en segundo plano) y muestra el resumen al terminar."""
+        def close_selection():
+            if selection_window is not None and selection_window.winfo_exists():
+                selection_window.destroy()
+
+        def on_done(summary):
+            close_selection()
+            from manager.app.paths_config import DOCUMENTOS_INQUILINOS_DIR
+            message = (f"Se generaron {summary['generated']} documentos en {summary['elapsed']:.1f} s "
+                       f"en la carpeta de cada inquilino:\n{DOCUMENTOS_INQUILINOS_DIR}")
+            if summary.get("reused"):
+                message += f"\n\n{summary['reused']} recibos ya estaban generados y al día."
+            if summary.get("skipped"):
+                message += f"\n\nOmitidos {summary['skipped']} pagos sin inquilino registrado."
+            if summary["failed"]:
+                path, error = summary["failed"][0]
+                message += f"\n\nNo se pudieron generar {len(summary['failed'])} documentos.\n{os.path.basename(path)}: {error}"
+                messagebox.showwarning("Documentos generados", message)
+            else:
+                messagebox.showinfo("✅ Documentos generados", message)
+
+        def on_no_data(message):
+            close_selection()
+            messagebox.showinfo("Sin datos", message)
+
+        self._report_runner.run(generator, *args, on_done=on_done, on_no_data=on_no_data,
+                                error_message=error_message)
+    
+    def _generate_period_receipts(self):
+        """Genera los recibos PDF de todos los pagos de un período (en lote, en procesos aparte)"""
         try:
             self._reload_all_data()
             
-            tenants = tenant_service.get_all_tenants()
-            tenant_service.recalculate_all_payment_statuses()
-            tenant_service._load_data()
-            tenants = tenant_service.get_all_tenants()
+            def on_generate(period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry, period_window):
+                selection = self._read_period_selection(
+                    period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
+                )
+                
+                if selection is None:
+                    messagebox.showerror("Error", "Por favor complete todos los campos requeridos.")
+                    return
+                
+                self._run_document_batch(
+                    generate_receipts, self._take_snapshot(), selection,
+                    error_message="Error al generar los recibos",
+                    selection_window=period_window,
+                )
             
-            pending_tenants = [
-                t for t in tenants
-                if t.get('estado_pago') in ('pendiente_registro', 'pendiente_pago', 'moroso')
-            ]
+            self._create_period_selection_window("Seleccionar Período - Recibos", on_generate, button_color="#16a34a")
             
-            if not pending_tenants:
-                messagebox.showinfo("Sin datos", "No hay inquilinos con pagos pendientes.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al generar los recibos: {str(e)}")
+    
+    def _generate_account_statements(self):
+        """Genera el estado de cuenta PDF de cada inquilino activo (en lote, en procesos aparte)"""
+        try:
+            self._reload_all_data()
+            if not messagebox.askyesno(
+                    "Estados de Cuenta",
+                    "¿Desea generar el estado de cuenta de todos los inquilinos activos?\n\n"
+                    "Cada PDF se guarda en la carpeta de documentos del inquilino."):
                 return
-            
-            self._show_report_window(
-                "Reporte de Pagos Pendientes",
-                self._format_pending_payments_report(pending_tenants),
-                "pending_payments"
+            self._run_document_batch(
+                generate_statements, self._take_snapshot(),
+                error_message="Error al generar los estados de cuenta",
+            )
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al generar los estados de cuenta: {str(e)}")
+    
+    def _generate_pending_payments_report(self):
+        """Genera reporte de pagos pendientes (estados de mora calculados sobre la instantánea)"""
+        try:
+            self._reload_all_data()
+            self._run_report(
+                build_pending_payments_report, self._take_snapshot(),
+                title="Reporte de Pagos Pendientes",
+                report_type="pending_payments",
+                error_message="Error al generar reporte de pendientes",
             )
         except Exception as e:
             messagebox.showerror("Error", f"Error al generar reporte de pendientes: {str(e)}")
@@ -648,54 +656,27 @@ class PaymentReportsView(tk.Frame):
         try:
             self._reload_all_data()
             
-            payments = payment_service.get_all_payments()
-            
-            if not payments:
+            if not payment_service.get_all_payments():
                 messagebox.showinfo("Sin datos", "No hay pagos registrados para generar el reporte.")
                 return
             
             def on_generate(period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry, period_window):
-                filtered, period_name = self._filter_payments_by_period(
-                    payments, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
+                selection = self._read_period_selection(
+                    period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
                 )
                 
-                if filtered is None:
+                if selection is None:
                     messagebox.showerror("Error", "Por favor complete todos los campos requeridos.")
                     return
                 
-                if not filtered:
-                    messagebox.showinfo("Sin datos", f"No hay pagos registrados para el período seleccionado.")
-                    period_window.destroy()
-                    return
-                
-                total_income = sum(float(p.get('monto', 0)) for p in filtered)
-                
-                # Filtrar por período para comparativas
-                now = datetime.now()
-                this_month = [p for p in filtered if self._is_this_month(p.get('fecha_pago', ''))]
-                this_year = [p for p in filtered if self._is_this_year(p.get('fecha_pago', ''))]
-                
-                monthly_income = sum(float(p.get('monto', 0)) for p in this_month)
-                yearly_income = sum(float(p.get('monto', 0)) for p in this_year)
-                
-                # Calcular promedios
-                avg_payment = total_income / len(filtered) if filtered else 0
-                avg_monthly = monthly_income if this_month else 0
-                
-                # Proyección anual basada en el mes actual
-                if this_month:
-                    projected_yearly = monthly_income * 12
-                else:
-                    projected_yearly = 0
-                
-                period_window.destroy()
-                self._show_report_window(
-                    f"Reporte de Ingresos Consolidado - {period_name}",
-                    self._format_consolidated_income_report(
-                        total_income, monthly_income, yearly_income, len(filtered),
-                        avg_payment, avg_monthly, projected_yearly, this_month, this_year, period_name
-                    ),
-                    "consolidated_income"
+                snapshot = self._take_snapshot()
+                period_name = payments_period_label(selection, snapshot.now)
+                self._run_report(
+                    build_consolidated_income_report, snapshot, selection,
+                    title=f"Reporte de Ingresos Consolidado - {period_name}",
+                    report_type="consolidated_income",
+                    error_message="Error al generar reporte consolidado",
+                    selection_window=period_window,
                 )
             
             self._create_period_selection_window("Seleccionar Período - Ingresos Consolidado", on_generate, button_color="#166534")
@@ -891,29 +872,19 @@ class PaymentReportsView(tk.Frame):
         try:
             self._reload_all_data()
             
-            payments = payment_service.get_all_payments()
-            tenants = tenant_service.get_all_tenants()
-            apartments = apartment_service.get_all_apartments()
-            
-            if not payments:
+            if not payment_service.get_all_payments():
                 messagebox.showinfo("Sin datos", "No hay pagos registrados para generar el reporte.")
                 return
             
             def on_generate(apartment_type, apartment_combo, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry, period_window):
-                # Filtrar por período
-                filtered, period_name = self._filter_payments_by_period(
-                    payments, period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
+                selection = self._read_period_selection(
+                    period_type, year_combo, month_combo, year_only_combo, date_from_entry, date_to_entry
                 )
                 
-                if filtered is None:
+                if selection is None:
                     messagebox.showerror("Error", "Por favor complete todos los campos requeridos.")
                     return
                 
-                if not filtered:
-                    messagebox.showinfo("Sin datos", f"No hay pagos registrados para el período seleccionado.")
-                    period_window.destroy()
-                    return
-                
                 # Filtrar por apartamento si se seleccionó uno específico
                 selected_apartment = None
                 if apartment_type.get() == "specific":
@@ -921,47 +892,15 @@ class PaymentReportsView(tk.Frame):
                     if selected_apt_number and selected_apt_number != "Todos" and selected_apt_number != "No hay apartamentos":
                         selected_apartment = selected_apt_number
                 
-                # Agrupar pagos por apartamento
-                apt_payments = {}
-                for payment in filtered:
-                    tenant_id = payment.get('id_inquilino')
-                    tenant = next((t for t in tenants if t.get('id') == tenant_id), None)
-                    if tenant:
-                        apt_id = tenant.get('apartamento')
-                        if apt_id:
-                            try:
-                                apt = apartment_service.get_apartment_by_id(int(apt_id))
-                                if apt:
-                                    apt_num = apt.get('number', str(apt_id))
-                                    
-                                    # Si se seleccionó un apartamento específico, filtrar
-                                    if selected_apartment and apt_num != selected_apartment:
-                                        continue
-                                    
-                                    if apt_num not in apt_payments:
-                                        apt_payments[apt_num] = {
-                                            'payments': [],
-                                            'total': 0,
-                                            'count': 0,
-                                            'apartment': apt
-                                        }
-                                    apt_payments[apt_num]['payments'].append(payment)
-                                    apt_payments[apt_num]['total'] += float(payment.get('monto', 0))
-                                    apt_payments[apt_num]['count'] += 1
-                            except Exception:
-                                pass
-                
-                if not apt_payments:
-                    messagebox.showinfo("Sin datos", f"No hay pagos registrados para el apartamento y período seleccionados.")
-                    period_window.destroy()
-                    return
-                
+                snapshot = self._take_snapshot()
+                period_name = payments_period_label(selection, snapshot.now)
                 apartment_label = f" - {selected_apartment}" if selected_apartment else ""
-                period_window.destroy()
-                self._show_report_window(
-                    f"Reporte de Pagos por Apartamento{apartment_label} - {period_name}",
-                    self._format_apartment_payments_report(apt_payments, period_name, selected_apartment),
-                    "apartment_payments"
+                self._run_report(
+                    build_apartment_payments_report, snapshot, selection, selected_apartment,
+                    title=f"Reporte de Pagos por Apartamento{apartment_label} - {period_name}",
+                    report_type="apartment_payments",
+                    error_message="Error al generar reporte por apartamento",
+                    selection_window=period_window,
                 )
             
             self._create_apartment_period_selection_window("Seleccionar Apartamento y Período", on_generate, button_color="#22c55e")
@@ -973,41 +912,13 @@ class PaymentReportsView(tk.Frame):
         """Genera análisis de tendencias de pagos"""
         try:
             self._reload_all_data()
-            
-            payments = payment_service.get_all_payments()
-            
-            if not payments:
-                messagebox.showinfo("Sin datos", "No hay suficientes pagos para analizar tendencias.")
-                return
-            
-            # Agrupar por mes
-            monthly_data = {}
-            for payment in payments:
-                try:
-                    date_str = payment.get('fecha_pago', '')
-                    if date_str:
-                        date_obj = datetime.strptime(date_str, "%d/%m/%Y")
-                        month_key = date_obj.strftime("%Y-%m")
-                        month_name = date_obj.strftime("%B %Y")
-                        
-                        if month_key not in monthly_data:
-                            monthly_data[month_key] = {
-                                'name': month_name,
-                                'total': 0,
-                                'count': 0
-                            }
-                        monthly_data[month_key]['total'] += float(payment.get('monto', 0))
-                        monthly_data[month_key]['count'] += 1
-                except Exception:
-                    pass
-            
-            # Ordenar por fecha
-            sorted_months = sorted(monthly_data.items())
-            
-            self._show_report_window(
-                "Análisis de Tendencias de Pagos",
-                self._format_trends_report(sorted_months, payments),
-                "payment_trends"
+            # Solo necesita totales por mes: se toman de los acumulados, sin copiar los pagos
+            snapshot = ReportSnapshot(payment_months=payment_service.monthly_rollup().by_month())
+            self._run_report(
+                build_trends_report, snapshot,
+                title="Análisis de Tendencias de Pagos",
+                report_type="payment_trends",
+                error_message="Error al generar reporte de tendencias",
             )
         except Exception as e:
             messagebox.showerror("Error", f"Error al generar reporte de tendencias: {str(e)}")
@@ -1016,420 +927,15 @@ class PaymentReportsView(tk.Frame):
         """Genera reporte de eficiencia de cobro"""
         try:
             self._reload_all_data()
-            
-            tenants = tenant_service.get_all_tenants()
-            payments = payment_service.get_all_payments()
-            
-            if not tenants:
-                messagebox.showinfo("Sin datos", "No hay inquilinos registrados.")
-                return
-            
-            # Calcular eficiencia por inquilino
-            tenant_efficiency = []
-            for tenant in tenants:
-                tenant_payments = [p for p in payments if p.get('id_inquilino') == tenant.get('id')]
-                expected_rent = float(tenant.get('valor_arriendo', 0))
-                
-                if expected_rent > 0:
-                    # Calcular pagos esperados (asumiendo 12 meses)
-                    months_active = 12  # Simplificado, se puede mejorar calculando meses reales
-                    expected_total = expected_rent * months_active
-                    received_total = sum(float(p.get('monto', 0)) for p in tenant_payments)
-                    efficiency = (received_total / expected_total * 100) if expected_total > 0 else 0
-                    
-                    tenant_efficiency.append({
-                        'tenant': tenant,
-                        'expected': expected_total,
-                        'received': received_total,
-                        'efficiency': efficiency,
-                        'payment_count': len(tenant_payments)
-                    })
-            
-            self._show_report_window(
-                "Reporte de Eficiencia de Cobro",
-                self._format_collection_efficiency_report(tenant_efficiency, tenants),
-                "collection_efficiency"
+            self._run_report(
+                build_collection_efficiency_report, self._take_snapshot(),
+                title="Reporte de Eficiencia de Cobro",
+                report_type="collection_efficiency",
+                error_message="Error al generar reporte de eficiencia",
             )
         except Exception as e:
             messagebox.showerror("Error", f"Error al generar reporte de eficiencia: {str(e)}")
     
-    # ==================== FORMATEADORES DE REPORTES ====================
-    
-    def _format_period_report(self, payments, period_name):
-        """Formatea el reporte por período"""
-        report = []
-        report.append("=" * 60)
-        report.append(f"REPORTE DE PAGOS - {period_name.upper()}")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        report.append("RESUMEN:")
-        report.append(f"  • Total de pagos: {len(payments)}")
-        report.append(f"  • Total recaudado: ${sum(float(p.get('monto', 0)) for p in payments):,.2f}")
-        report.append("")
-        report.append("DETALLE DE PAGOS:")
-        report.append("-" * 60)
-        
-        # Ordenar por fecha
-        payments_sorted = sorted(payments, key=lambda x: self._parse_date(x.get('fecha_pago', '01/01/1900')), reverse=True)
-        
-        for payment in payments_sorted:
-            tenant_name = payment.get('nombre_inquilino', 'N/A')
-            apt_num = self._get_apartment_number_from_payment(payment)
-            report.append(f"Fecha: {payment.get('fecha_pago', 'N/A')}")
-            report.append(f"  • Inquilino: {tenant_name} (Apt. {apt_num})")
-            report.append(f"  • Monto: ${float(payment.get('monto', 0)):,.2f}")
-            report.append(f"  • Método: {payment.get('metodo', 'N/A')}")
-            if payment.get('observaciones'):
-                report.append(f"  • Observaciones: {payment.get('observaciones')}")
-            report.append("")
-        
-        return "\n".join(report)
-    
-    def _format_tenant_payments_report(self, tenant, payments):
-        """Formatea el reporte de pagos por inquilino"""
-        report = []
-        report.append("=" * 60)
-        report.append(f"REPORTE DE PAGOS - {tenant.get('nombre', 'N/A').upper()}")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        report.append("INFORMACIÓN DEL INQUILINO:")
-        report.append(f"  • Nombre: {tenant.get('nombre', 'N/A')}")
-        report.append(f"  • Apartamento: {self._get_apartment_number(tenant)}")
-        report.append(f"  • Documento: {tenant.get('numero_documento', 'N/A')}")
-        report.append(f"  • Valor de arriendo: ${float(tenant.get('valor_arriendo', 0)):,.2f}")
-        report.append("")
-        report.append("RESUMEN DE PAGOS:")
-        total_paid = sum(float(p.get('monto', 0)) for p in payments)
-        report.append(f"  • Total de pagos registrados: {len(payments)}")
-        report.append(f"  • Total pagado: ${total_paid:,.2f}")
-        report.append("")
-        report.append("HISTORIAL DE PAGOS:")
-        report.append("-" * 60)
-        
-        # Ordenar por fecha (más reciente primero)
-        payments_sorted = sorted(payments, key=lambda x: self._parse_date(x.get('fecha_pago', '01/01/1900')), reverse=True)
-        
-        for idx, payment in enumerate(payments_sorted, 1):
-            report.append(f"Pago #{idx}:")
-            report.append(f"  • Fecha: {payment.get('fecha_pago', 'N/A')}")
-            report.append(f"  • Monto: ${float(payment.get('monto', 0)):,.2f}")
-            report.append(f"  • Método: {payment.get('metodo', 'N/A')}")
-            if payment.get('observaciones'):
-                report.append(f"  • Observaciones: {payment.get('observaciones')}")
-            report.append("")
-        
-        return "\n".join(report)
-    
-    def _format_payment_method_report(self, methods_dict, total_payments, period_name=None):
-        """Formatea el reporte por método de pago"""
-        report = []
-        report.append("=" * 60)
-        report.append("REPORTE POR MÉTODO DE PAGO")
-        if period_name:
-            report.append(f"Período: {period_name}")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        report.append("RESUMEN GENERAL:")
-        report.append(f"  • Total de pagos: {total_payments}")
-        report.append(f"  • Total recaudado: ${sum(m['total'] for m in methods_dict.values()):,.2f}")
-        report.append("")
-        report.append("ANÁLISIS POR MÉTODO:")
-        report.append("-" * 60)
-        
-        # Ordenar por total (mayor a menor)
-        sorted_methods = sorted(methods_dict.items(), key=lambda x: x[1]['total'], reverse=True)
-        
-        for method, data in sorted_methods:
-            percentage = (data['total'] / sum(m['total'] for m in methods_dict.values()) * 100) if methods_dict else 0
-            report.append(f"Método: {method}")
-            report.append(f"  • Cantidad de pagos: {data['count']}")
-            report.append(f"  • Total recaudado: ${data['total']:,.2f}")
-            report.append(f"  • Porcentaje del total: {percentage:.2f}%")
-            report.append("")
-        
-        return "\n".join(report)
-    
-    def _parse_fecha_for_report(self, fecha_str):
-        """Parsea fecha como en tenant_service: DD/MM/YYYY o ISO."""
-        if not fecha_str or not isinstance(fecha_str, str):
-            return None
-        s = (fecha_str or "").strip()
-        try:
-            return datetime.strptime(s, "%d/%m/%Y").replace(hour=0, minute=0, second=0, microsecond=0)
-        except ValueError:
-            try:
-                return datetime.fromisoformat(s.replace("Z", "+00:00")).replace(hour=0, minute=0, second=0, microsecond=0)
-            except Exception:
-                return None
-
-    def _compute_arrears_for_report(self, tenant, payments):
-        """Calcula mora para el reporte con la misma lógica que tenant_service (períodos desde fecha_ingreso)."""
-        try:
-            fecha_ingreso = self._parse_fecha_for_report(tenant.get("fecha_ingreso"))
-            if not fecha_ingreso:
-                return None
-            valor_arriendo = float(tenant.get("valor_arriendo") or 0)
-            hoy = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-            n = 0
-            periods_due = 0
-            while True:
-                due_n = fecha_ingreso + relativedelta(months=n)
-                if due_n > hoy:
-                    break
-                periods_due += 1
-                n += 1
-            total_expected = round(periods_due * valor_arriendo, 2)
-            total_paid = round(sum(float(p.get("monto") or 0) for p in payments), 2)
-            if valor_arriendo <= 0:
-                periods_covered = periods_due if total_paid >= total_expected else 0
-            else:
-                periods_covered = min(periods_due, int(total_paid / valor_arriendo))
-            periods_in_arrears = max(0, periods_due - periods_covered)
-
-            if periods_in_arrears <= 0:
-                return None
-            inicio_periodo_actual = fecha_ingreso + relativedelta(months=periods_due - 1)
-            dias_del_periodo = (hoy - inicio_periodo_actual).days if hoy >= inicio_periodo_actual else 0
-            current_period_due = fecha_ingreso + relativedelta(months=periods_due - 1)
-            return {
-                "meses_mora": periods_in_arrears,
-                "dias_del_periodo_actual": max(0, dias_del_periodo),
-                "current_period_due": current_period_due,
-                "total_expected": total_expected,
-                "total_paid": total_paid,
-            }
-        except Exception:
-            return None
-
-    def _format_pending_payments_report(self, pending_tenants):
-        """Formatea el reporte de pagos pendientes con lógica de mora integral (calculada aquí para garantizar consistencia)."""
-        self._reload_all_data()
-        payment_service._load_data()
-
-        report = []
-        report.append("=" * 60)
-        report.append("REPORTE DE PAGOS PENDIENTES")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        report.append("RESUMEN:")
-        report.append(f"  • Inquilinos con pagos pendientes: {len(pending_tenants)}")
-        report.append("")
-        report.append("DETALLE DE INQUILINOS:")
-        report.append("-" * 60)
-
-        for tenant in pending_tenants:
-            estado = tenant.get('estado_pago', 'N/A')
-            if estado == 'moroso':
-                estado_text = 'En Mora'
-            elif estado == 'pendiente_pago':
-                estado_text = 'Pendiente de pago'
-            else:
-                estado_text = 'Pendiente Registro'
-
-            report.append(f"Inquilino: {tenant.get('nombre', 'N/A')}")
-            report.append(f"  • Apartamento: {self._get_apartment_number(tenant)}")
-            report.append(f"  • Documento: {tenant.get('numero_documento', 'N/A')}")
-            report.append(f"  • Teléfono: {tenant.get('telefono', 'N/A')}")
-            report.append(f"  • Estado: {estado_text}")
-            report.append(f"  • Valor de arriendo: ${float(tenant.get('valor_arriendo', 0)):,.2f}")
-
-            raw_id = tenant.get('id')
-            tenant_id = int(raw_id) if raw_id is not None else None
-            # Usar get_arrears_info del servicio (misma lógica que lista/detalles); si falla, calcular aquí
-            arrears = tenant_service.get_arrears_info(tenant_id) if tenant_id is not None else None
-            if not arrears or arrears.get("estado_pago") not in ("moroso", "pendiente_pago", "pendiente_registro"):
-                payments = payment_service.get_payments_by_tenant(tenant_id) if tenant_id is not None else []
-                arrears = self._compute_arrears_for_report(tenant, payments) if tenant_id is not None else None
-                if arrears:
-                    arrears["current_period_due"] = arrears.get("current_period_due")
-            else:
-                first_unpaid = arrears.get("first_unpaid_due_date")
-                meses_mora = int(arrears.get("meses_mora", 0) or 0)
-                if first_unpaid and meses_mora >= 1:
-                    arrears["current_period_due"] = first_unpaid + relativedelta(months=meses_mora - 1)
-                else:
-                    arrears["current_period_due"] = first_unpaid
-
-            if arrears and (arrears.get("meses_mora", 0) or arrears.get("dias_del_periodo_actual", 0) or arrears.get("total_expected", 0)):
-                current_due = arrears.get("current_period_due")
-                if current_due and hasattr(current_due, "strftime"):
-                    report.append(f"  • Fecha de pago (vencimiento): {current_due.strftime('%d/%m/%Y')}")
-                meses_mora = int(arrears.get("meses_mora", 0) or 0)
-                dias_del_periodo = int(arrears.get("dias_del_periodo_actual", 0) or 0)
-                if meses_mora == 1:
-                    mora_texto = f"{dias_del_periodo} día{'s' if dias_del_periodo != 1 else ''}"
-                else:
-                    meses_completos = meses_mora - 1
-                    partes = []
-                    if meses_completos > 0:
-                        partes.append(f"{meses_completos} mes{'es' if meses_completos != 1 else ''}")
-                    if dias_del_periodo > 0:
-                        partes.append(f"{dias_del_periodo} día{'s' if dias_del_periodo != 1 else ''}")
-                    mora_texto = " y ".join(partes) if partes else "0"
-                report.append(f"  • Días en mora: {mora_texto}")
-                pending = float(arrears.get("amount_pending", arrears.get("total_expected", 0)) or 0)
-                paid = float(arrears.get("total_paid", 0) or 0)
-                report.append(f"  • Monto total en mora: ${max(0.0, pending - paid):,.2f}")
-
-            report.append("")
-
-        return "\n".join(report)
-    
-    def _format_consolidated_income_report(self, total, monthly, yearly, count, avg_payment, avg_monthly, projected, this_month, this_year, period_name=None):
-        """Formatea el reporte de ingresos consolidado"""
-        report = []
-        report.append("=" * 60)
-        report.append("REPORTE DE INGRESOS CONSOLIDADO")
-        if period_name:
-            report.append(f"Período: {period_name}")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        if period_name:
-            report.append(f"PERÍODO SELECCIONADO: {period_name}")
-            report.append("")
-        report.append("RESUMEN FINANCIERO:")
-        report.append(f"  • Ingresos totales (histórico): ${total:,.2f}")
-        report.append(f"  • Ingresos del mes actual: ${monthly:,.2f}")
-        report.append(f"  • Ingresos del año actual: ${yearly:,.2f}")
-        report.append(f"  • Total de pagos procesados: {count}")
-        report.append("")
-        report.append("ESTADÍSTICAS:")
-        report.append(f"  • Promedio por pago: ${avg_payment:,.2f}")
-        report.append(f"  • Promedio mensual (mes actual): ${avg_monthly:,.2f}")
-        if projected > 0:
-            report.append(f"  • Proyección anual (basada en mes actual): ${projected:,.2f}")
-        report.append("")
-        report.append("DETALLE POR PERÍODO:")
-        report.append("-" * 60)
-        report.append(f"  • Pagos en el mes actual: {len(this_month)}")
-        report.append(f"  • Pagos en el año actual: {len(this_year)}")
-        
-        return "\n".join(report)
-    
-    def _format_apartment_payments_report(self, apt_payments, period_name=None, selected_apartment=None):
-        """Formatea el reporte de pagos por apartamento"""
-        report = []
-        report.append("=" * 60)
-        report.append("REPORTE DE PAGOS POR APARTAMENTO")
-        if period_name:
-            report.append(f"Período: {period_name}")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        if selected_apartment:
-            report.append(f"APARTAMENTO SELECCIONADO: {selected_apartment}")
-            report.append("")
-        report.append(f"Total de apartamentos con pagos: {len(apt_payments)}")
-        report.append("")
-        report.append("DETALLE POR APARTAMENTO:")
-        report.append("-" * 60)
-        
-        # Ordenar por número de apartamento
-        sorted_apts = sorted(apt_payments.items(), key=lambda x: x[0])
-
-        for i, (apt_num, data) in enumerate(sorted_apts):
-            if i > 0:
-                report.append("")
-                report.append("-" * 60)
-                report.append("")
-            apt = data.get("apartment", {})
-            unit_label = self._get_apartment_display_name(apt) if apt else f"Apartamento {apt_num}"
-            report.append(f"{unit_label}:")
-            report.append(f"  • Total de pagos: {data['count']}")
-            report.append(f"  • Total recaudado: ${data['total']:,.2f}")
-            report.append("")
-            report.append("  Historial de pagos:")
-            # Ordenar pagos por fecha
-            sorted_payments = sorted(data['payments'], key=lambda x: self._parse_date(x.get('fecha_pago', '01/01/1900')), reverse=True)
-            for payment in sorted_payments[:5]:  # Mostrar últimos 5
-                report.append(f"    - {payment.get('fecha_pago', 'N/A')}: ${float(payment.get('monto', 0)):,.2f} ({payment.get('metodo', 'N/A')})")
-            if len(sorted_payments) > 5:
-                report.append(f"    ... y {len(sorted_payments) - 5} pago(s) más")
-            report.append("")
-
-        return "\n".join(report)
-    
-    def _format_trends_report(self, monthly_data, all_payments):
-        """Formatea el reporte de tendencias"""
-        report = []
-        report.append("=" * 60)
-        report.append("ANÁLISIS DE TENDENCIAS DE PAGOS")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        report.append("EVOLUCIÓN MENSUAL:")
-        report.append("-" * 60)
-        
-        if not monthly_data:
-            report.append("No hay datos suficientes para analizar tendencias.")
-            return "\n".join(report)
-        
-        for month_key, data in monthly_data:
-            report.append(f"{data['name']}:")
-            report.append(f"  • Total recaudado: ${data['total']:,.2f}")
-            report.append(f"  • Cantidad de pagos: {data['count']}")
-            report.append(f"  • Promedio por pago: ${data['total']/data['count']:,.2f}" if data['count'] > 0 else "  • Promedio por pago: $0.00")
-            report.append("")
-        
-        # Análisis comparativo
-        if len(monthly_data) >= 2:
-            report.append("ANÁLISIS COMPARATIVO:")
-            report.append("-" * 60)
-            current_month = monthly_data[-1][1]
-            previous_month = monthly_data[-2][1] if len(monthly_data) >= 2 else None
-            
-            if previous_month:
-                change = current_month['total'] - previous_month['total']
-                change_percent = (change / previous_month['total'] * 100) if previous_month['total'] > 0 else 0
-                report.append(f"Variación respecto al mes anterior: ${change:,.2f} ({change_percent:+.2f}%)")
-        
-        return "\n".join(report)
-    
-    def _format_collection_efficiency_report(self, tenant_efficiency, all_tenants):
-        """Formatea el reporte de eficiencia de cobro"""
-        report = []
-        report.append("=" * 60)
-        report.append("REPORTE DE EFICIENCIA DE COBRO")
-        report.append("=" * 60)
-        report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        report.append("")
-        report.append("RESUMEN:")
-        report.append(f"  • Total de inquilinos: {len(all_tenants)}")
-        report.append(f"  • Inquilinos analizados: {len(tenant_efficiency)}")
-        report.append("")
-        
-        if not tenant_efficiency:
-            report.append("No hay datos suficientes para calcular eficiencia.")
-            return "\n".join(report)
-        
-        # Calcular eficiencia promedio
-        avg_efficiency = sum(t['efficiency'] for t in tenant_efficiency) / len(tenant_efficiency)
-        report.append(f"  • Eficiencia promedio: {avg_efficiency:.2f}%")
-        report.append("")
-        report.append("DETALLE POR INQUILINO:")
-        report.append("-" * 60)
-        
-        # Ordenar por eficiencia (mayor a menor)
-        sorted_tenants = sorted(tenant_efficiency, key=lambda x: x['efficiency'], reverse=True)
-        
-        for data in sorted_tenants:
-            tenant = data['tenant']
-            report.append(f"Inquilino: {tenant.get('nombre', 'N/A')}")
-            report.append(f"  • Apartamento: {self._get_apartment_number(tenant)}")
-            report.append(f"  • Esperado: ${data['expected']:,.2f}")
-            report.append(f"  • Recibido: ${data['received']:,.2f}")
-            report.append(f"  • Eficiencia: {data['efficiency']:.2f}%")
-            report.append(f"  • Pagos registrados: {data['payment_count']}")
-            report.append("")
-        
-        return "\n".join(report)
-    
     # ==================== VENTANA DE VISUALIZACIÓN ====================
     
     def _show_report_window(self, title, content, report_type):
@@ -1567,22 +1073,6 @@ class PaymentReportsView(tk.Frame):
     
     # ==================== HELPERS ====================
     
-    def _get_apartment_display_name(self, apt):
-        """Devuelve el nombre de la unidad para el reporte: Apto, Local, Penthouse, Depósito, etc."""
-        if not apt:
-            return "Unidad"
-        unit_type = apt.get("unit_type", "Apartamento Estándar")
-        unit_number = apt.get("number", "N/A")
-        if unit_type == "Local Comercial" or unit_type == "Local comercial":
-            return f"Local: {unit_number}"
-        if unit_type == "Penthouse":
-            return f"Penthouse: {unit_number}"
-        if unit_type == "Depósito" or "Depósito" in str(unit_type) or "Bodega" in str(unit_type):
-            return f"Depósito: {unit_number}"
-        if unit_type == "Apartamento Estándar" or unit_type == "Apartamento Estandar":
-            return f"Apto: {unit_number}"
-        return f"{unit_type}: {unit_number}"
-
     def _get_apartment_number(self, tenant):
         """Obtiene el número del apartamento de un inquilino"""
         apt_id = tenant.get('apartamento', None)
@@ -1595,47 +1085,6 @@ class PaymentReportsView(tk.Frame):
                 pass
         return str(apt_id) if apt_id else 'N/A'
     
-    def _get_apartment_number_from_payment(self, payment):
-        """Obtiene el número del apartamento desde un pago"""
-        tenant_id = payment.get('id_inquilino')
-        tenants = tenant_service.get_all_tenants()
-        tenant = next((t for t in tenants if t.get('id') == tenant_id), None)
-        if tenant:
-            return self._get_apartment_number(tenant)
-        return 'N/A'
-    
-    def _is_this_month(self, date_str):
-        """Verifica si una fecha corresponde al mes actual"""
-        try:
-            date = datetime.strptime(date_str, "%d/%m/%Y")
-            now = datetime.now()
-            return date.year == now.year and date.month == now.month
-        except:
-            return False
-    
-    def _is_this_year(self, date_str):
-        """Verifica si una fecha corresponde al año actual"""
-        try:
-            date = datetime.strptime(date_str, "%d/%m/%Y")
-            return date.year == datetime.now().year
-        except:
-            return False
-    
-    def _is_in_range(self, date_str, date_from, date_to):
-        """Verifica si una fecha está en un rango"""
-        try:
-            date = datetime.strptime(date_str, "%d/%m/%Y")
-            return date_from <= date <= date_to
-        except:
-            return False
-    
-    def _parse_date(self, date_str):
-        """Parsea una fecha en formato DD/MM/YYYY"""
-        try:
-            return datetime.strptime(date_str, "%d/%m/%Y")
-        except:
-            return datetime(1900, 1, 1)
-    
     def _create_navigation_buttons(self, parent, on_back_command):
         """Crea los botones Volver y Dashboard con estilo consistente"""
         theme = theme_manager.themes[theme_manager.current_theme]
@@ -27,6 +27,7 @@ from manager.app.services.payment_service import payment_service
 from manager.app.services.tenant_service import tenant_service
 from manager.app.services.apartment_service import apartment_service
 from manager.app.services.building_service import building_service
+from manager.app.services.accounting_service import ClosedPeriodError
 from manager.app.ui.views.register_expense_view import DatePickerWidget
 from manager.app.logger import logger
 
@@ -526,8 +527,12 @@ class _RegisterPaymentTab(tk.Frame):
                 messagebox.showwarning("Advertencia", "Ya existe un pago con la misma fecha y monto para este inquilino.")
                 return
 
-        payment_service.add_payment(data)
-        self._generate_receipt(data)
+        try:
+            payment = payment_service.add_payment(data)
+        except ClosedPeriodError as exc:
+            messagebox.showwarning("Período cerrado", str(exc))
+            return
+        self._generate_receipt(payment)
 
         if sys.platform == "win32":
             try:
@@ -547,17 +552,10 @@ class _RegisterPaymentTab(tk.Frame):
         self.obs_var.set("")
 
     def _generate_receipt(self, pago):
+        """Genera el recibo del pago recién registrado (queda en el índice de recibos)."""
         try:
-            from manager.app.paths_config import DOCUMENTOS_INQUILINOS_DIR, ensure_dirs, get_tenant_document_folder_name
-            from manager.app.receipt_pdf import generate_payment_receipt_pdf
-            ensure_dirs()
-            tenant = self.selected_tenant or {}
-            folder_name = get_tenant_document_folder_name(tenant)
-            tenant_dir = DOCUMENTOS_INQUILINOS_DIR / folder_name
-            tenant_dir.mkdir(parents=True, exist_ok=True)
-            fecha = pago.get("fecha_pago", "").replace("/", "-")
-            filepath = str(tenant_dir / f"recibo_{fecha}.pdf")
-            generate_payment_receipt_pdf(pago, tenant, filepath)
+            from manager.app.services.receipt_store import receipt_store
+            receipt_store.get_receipt(pago, self.selected_tenant or {})
         except Exception as exc:
             logger.warning("Error al generar recibo PDF: %s", exc)
 
@@ -695,10 +693,14 @@ class PaymentModal(tk.Toplevel):
             "metodo": self._metodo_var.get(),
             "observaciones": self._obs_var.get(),
         }
-        if self.payment:
-            self.payment_service.update_payment(self.payment["id"], data)
-        else:
-            self.payment_service.add_payment(data)
+        try:
+            if self.payment:
+                self.payment_service.update_payment(self.payment["id"], data)
+            else:
+                self.payment_service.add_payment(data)
+        except ClosedPeriodError as exc:
+            messagebox.showwarning("Período cerrado", str(exc), parent=self)
+            return
         if sys.platform == "win32":
             try:
                 winsound.MessageBeep(winsound.MB_ICONASTERISK)
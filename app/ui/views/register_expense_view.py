@@ -439,7 +439,7 @@ class RegisterExpenseView(tk.Frame):
         self.compact_mode = compact  # Modo compacto para edición
         
         # Recargar apartamentos
-        apartment_service._load_data()
+        apartment_service.reload_data()
         self.apartments = apartment_service.get_all_apartments()
         
         self._create_layout()
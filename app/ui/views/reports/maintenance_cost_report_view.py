@@ -119,6 +119,16 @@ class MaintenanceCostReportView(tk.Frame):
         selected_apt = self.apartment_var.get()
         selected_category = self.category_var.get()
         
+        # Unidad seleccionada, buscada una sola vez (no por cada grupo de gastos)
+        selected_label = None
+        if selected_apt not in ("Todos", "General"):
+            # Extraer número del apartamento del formato "Apto: 101"
+            apt_number = selected_apt.split(":")[-1].strip()
+            apt_obj = next((a for a in apartment_service.get_all_apartments()
+                            if str(a.get('number')) == apt_number), None)
+            if apt_obj:
+                selected_label = f"{apt_obj.get('unit_type', 'Apto')}: {apt_obj.get('number', '')}"
+        
         # Filtrar datos
         filtered_data = {}
         for apt, expenses in self.apartment_expenses.items():
@@ -128,11 +138,7 @@ class MaintenanceCostReportView(tk.Frame):
                 if selected_apt == "General" and apt != "General":
                     continue
                 elif selected_apt != "General":
-                    # Extraer número del apartamento del formato "Apto: 101"
-                    apt_number = selected_apt.split(":")[-1].strip()
-                    apt_obj = next((a for a in apartment_service.get_all_apartments() 
-                                  if str(a.get('number')) == apt_number), None)
-                    if not apt_obj or apt != f"{apt_obj.get('unit_type', 'Apto')}: {apt_obj.get('number', '')}":
+                    if not selected_label or apt != selected_label:
                         continue
             
             if selected_category != "Todos":
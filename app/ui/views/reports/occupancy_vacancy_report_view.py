@@ -13,6 +13,7 @@ from manager.app.ui.components.theme_manager import theme_manager, Spacing
 from manager.app.ui.components.modern_widgets import create_rounded_button, get_module_colors
 from manager.app.services.apartment_service import apartment_service
 from manager.app.services.tenant_service import tenant_service
+from manager.app.services.date_keys import key_to_datetime, record_date_key
 
 class OccupancyVacancyReportView(tk.Frame):
     """Vista de reporte de ocupación y vacancia. Acepta module_context para colores: 'reportes' (naranja) o 'administración' (morado)."""
@@ -110,13 +111,9 @@ class OccupancyVacancyReportView(tk.Frame):
             if status == "Disponible" and tenant:
                 # Si hay un inquilino pero el apartamento está disponible, 
                 # podría ser que el inquilino se fue recientemente
-                fecha_ingreso = tenant.get("fecha_ingreso", "")
-                if fecha_ingreso:
-                    try:
-                        fecha_ingreso_dt = datetime.strptime(fecha_ingreso, "%d/%m/%Y")
-                        vacancy_days = (datetime.now() - fecha_ingreso_dt).days
-                    except:
-                        pass
+                fecha_ingreso_dt = key_to_datetime(record_date_key(tenant, "fecha_ingreso"))
+                if fecha_ingreso_dt is not None:
+                    vacancy_days = (datetime.now() - fecha_ingreso_dt).days
             
             unit_type = apt.get('unit_type', 'Apartamento Estándar')
             unit_number = apt.get('number', 'N/A')
@@ -12,6 +12,7 @@ from manager.app.ui.components.theme_manager import theme_manager, Spacing
 from manager.app.ui.components.modern_widgets import create_rounded_button, get_module_colors
 from manager.app.services.apartment_service import apartment_service
 from manager.app.services.tenant_service import tenant_service
+from manager.app.services.date_keys import key_to_datetime, record_date_key
 from manager.app.services.payment_service import payment_service
 
 class OccupationHistoryReportView(tk.Frame):
@@ -82,7 +83,6 @@ class OccupationHistoryReportView(tk.Frame):
         """Carga y procesa los datos históricos"""
         apartments = apartment_service.get_all_apartments()
         tenants = tenant_service.get_all_tenants()
-        payments = payment_service.get_all_payments()
         
         # Preparar datos para filtros
         apartment_names = ["Todos"] + [
@@ -100,16 +100,18 @@ class OccupationHistoryReportView(tk.Frame):
             if apt_id:
                 apt_to_tenant[str(apt_id)] = tenant
         
-        # Agrupar pagos por apartamento para calcular rotación (solo de inquilinos activos)
+        # Agrupar pagos por apartamento para calcular rotación (solo de inquilinos activos),
+        # usando el índice de pagos por inquilino
         apt_payments = defaultdict(list)
-        for payment in payments:
-            tenant_id = payment.get("id_inquilino")
-            if tenant_id:
-                tenant = next((t for t in active_tenants if t.get("id") == tenant_id), None)
-                if tenant:
-                    apt_id = str(tenant.get("apartamento", ""))
-                    if apt_id:
-                        apt_payments[apt_id].append(payment)
+        seen_tenant_ids = set()
+        for tenant in active_tenants:
+            tenant_id = tenant.get("id")
+            if not tenant_id or tenant_id in seen_tenant_ids:
+                continue
+            seen_tenant_ids.add(tenant_id)
+            apt_id = str(tenant.get("apartamento", ""))
+            if apt_id:
+                apt_payments[apt_id].extend(payment_service.get_payments_by_tenant(tenant_id))
         
         # Procesar datos por apartamento
         self.apartment_history = []
@@ -125,13 +127,9 @@ class OccupationHistoryReportView(tk.Frame):
             # Calcular tiempo de ocupación actual
             current_occupancy_days = None
             if tenant:
-                fecha_ingreso = tenant.get("fecha_ingreso", "")
-                if fecha_ingreso:
-                    try:
-                        fecha_ingreso_dt = datetime.strptime(fecha_ingreso, "%d/%m/%Y")
-                        current_occupancy_days = (datetime.now() - fecha_ingreso_dt).days
-                    except:
-                        pass
+                fecha_ingreso_dt = key_to_datetime(record_date_key(tenant, "fecha_ingreso"))
+                if fecha_ingreso_dt is not None:
+                    current_occupancy_days = (datetime.now() - fecha_ingreso_dt).days
             
             # Calcular rotación (número de pagos puede indicar rotación)
             # Si hay muchos pagos en diferentes períodos, podría indicar rotación
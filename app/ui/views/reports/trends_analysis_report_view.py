@@ -13,6 +13,7 @@ from manager.app.ui.components.modern_widgets import create_rounded_button, get_
 from manager.app.services.apartment_service import apartment_service
 from manager.app.services.tenant_service import tenant_service
 from manager.app.services.payment_service import payment_service
+from manager.app.services.date_keys import record_date_key
 
 class TrendsAnalysisReportView(tk.Frame):
     """Vista de reporte de análisis de tendencias"""
@@ -87,35 +88,20 @@ class TrendsAnalysisReportView(tk.Frame):
         """Carga y procesa los datos para análisis de tendencias"""
         apartments = apartment_service.get_all_apartments()
         tenants = tenant_service.get_all_tenants()
-        payments = payment_service.get_all_payments()
         
-        # Procesar pagos por mes
+        # Pagos por mes, desde los acumulados mensuales del servicio
         self.monthly_data = defaultdict(lambda: {"income": 0, "payments_count": 0})
         
-        for payment in payments:
-            fecha_pago = payment.get("fecha_pago", "")
-            if fecha_pago:
-                try:
-                    fecha_dt = datetime.strptime(fecha_pago, "%d/%m/%Y")
-                    month_key = fecha_dt.strftime("%Y-%m")
-                    monto = float(payment.get("monto", 0))
-                    self.monthly_data[month_key]["income"] += monto
-                    self.monthly_data[month_key]["payments_count"] += 1
-                except:
-                    pass
+        for month_key, (income, count) in payment_service.monthly_rollup().by_month().items():
+            self.monthly_data[month_key] = {"income": income, "payments_count": count}
         
         # Procesar ocupación por mes (basado en fecha de ingreso de inquilinos)
         self.monthly_occupancy = defaultdict(lambda: {"new_tenants": 0, "occupied": 0})
         
         for tenant in tenants:
-            fecha_ingreso = tenant.get("fecha_ingreso", "")
-            if fecha_ingreso:
-                try:
-                    fecha_dt = datetime.strptime(fecha_ingreso, "%d/%m/%Y")
-                    month_key = fecha_dt.strftime("%Y-%m")
-                    self.monthly_occupancy[month_key]["new_tenants"] += 1
-                except:
-                    pass
+            key = record_date_key(tenant, "fecha_ingreso")
+            if key is not None:
+                self.monthly_occupancy[key[:7]]["new_tenants"] += 1
         
         # Calcular ocupación actual por mes (aproximación)
         current_month = datetime.now().strftime("%Y-%m")
@@ -158,15 +144,14 @@ class TrendsAnalysisReportView(tk.Frame):
         else:
             start_date = datetime(2000, 1, 1)  # Todo el historial
         
-        # Filtrar datos mensuales
-        filtered_monthly_data = {}
-        for month_key, data in self.monthly_data.items():
-            try:
-                month_date = datetime.strptime(month_key, "%Y-%m")
-                if month_date >= start_date:
-                    filtered_monthly_data[month_key] = data
-            except:
-                pass
+        # Filtrar datos mensuales: meses cuyo día 1 no es anterior a start_date (las
+        # claves "YYYY-MM" se comparan como texto)
+        start_month = start_date.strftime("%Y-%m")
+        include_start = start_date == datetime(start_date.year, start_date.month, 1)
+        filtered_monthly_data = {
+            month_key: data for month_key, data in self.monthly_data.items()
+            if month_key > start_month or (include_start and month_key == start_month)
+        }
         
         # Calcular tendencias
         self._calculate_trends(filtered_monthly_data)
@@ -36,6 +36,7 @@ class SettingsView(tk.Frame):
         self.auto_backup_var = tk.BooleanVar(value=self.backup_config.get("auto_backup_enabled", True))
         self.backup_interval_var = tk.IntVar(value=self.backup_config.get("interval_hours", 6))
         self.max_backups_var = tk.IntVar(value=self.backup_config.get("max_backups", 10))
+        self.backup_incremental_var = tk.BooleanVar(value=self.backup_config.get("incremental", False))
         self.auto_backup_password_var = tk.StringVar(value=self.backup_config.get("auto_backup_password", "") or "")
         self.cloud_folder_var = tk.StringVar(value=self.backup_config.get("cloud_folder", "") or "")
 
@@ -131,6 +132,11 @@ class SettingsView(tk.Frame):
             command=self._on_auto_backup_toggle
         )
         auto_backup_check.pack(anchor="w")
+        tk.Checkbutton(
+            auto_backup_frame, text="Backups incrementales (solo guarda archivos nuevos o modificados)",
+            variable=self.backup_incremental_var,
+            font=("Segoe UI", 10), fg=fg, bg=cb, activebackground=cb, activeforeground=fg, selectcolor=cb,
+        ).pack(anchor="w")
         interval_frame = tk.Frame(card_content, bg=cb)
         interval_frame.pack(fill="x", pady=(0, 4))
         tk.Label(interval_frame, text="Intervalo (horas):", font=("Segoe UI", 10, "bold"), bg=cb, fg=fg).pack(anchor="w", pady=(0, 2))
@@ -197,6 +203,7 @@ class SettingsView(tk.Frame):
         backup_config = {
             "auto_backup_enabled": self.auto_backup_var.get(),
             "interval_hours": self.backup_interval_var.get(),
+            "incremental": self.backup_incremental_var.get(),
             "max_backups": 5,
             "auto_backup_password": (self.auto_backup_password_var.get() or "").strip(),
             "cloud_folder": (self.cloud_folder_var.get() or "").strip(),
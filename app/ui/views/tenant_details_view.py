@@ -18,9 +18,13 @@ from ..components.modern_widgets import (
 from manager.app.services.apartment_service import apartment_service
 from manager.app.services.building_service import building_service
 from manager.app.services.payment_service import payment_service
+from manager.app.services.date_keys import key_to_datetime, record_date_key
 from manager.app.services.tenant_service import tenant_service
 from manager.app.services.email_service import email_service
+from manager.app.services.email_outbox import STATUS_FAILED, STATUS_SENT, email_outbox
 from manager.app.services.notification_service import notification_service
+from manager.app.services.receipt_store import receipt_store
+from manager.app.services import transaction
 from manager.app.paths_config import (
     DOCUMENTOS_INQUILINOS_DIR,
     ensure_dirs,
@@ -32,6 +36,9 @@ from manager.app.logger import logger
 class TenantDetailsView(tk.Frame):
     """Vista de detalles de inquilino"""
     
+    # Intervalo de consulta del estado de los emails en la bandeja de salida
+    OUTBOX_POLL_MS = 1000
+    
     def __init__(self, parent, tenant_data: Dict[str, Any], on_back: Callable = None, on_edit: Callable = None, on_register_payment: Callable = None, on_navigate_to_dashboard: Callable = None, read_only: bool = False, on_reactivate: Callable = None):
         super().__init__(parent, **theme_manager.get_style("frame"))
         
@@ -326,7 +333,7 @@ class TenantDetailsView(tk.Frame):
 
             if payments:
                 try:
-                    payments.sort(key=lambda x: datetime.strptime(x.get("fecha_pago", "01/01/1900"), "%d/%m/%Y"), reverse=True)
+                    payments.sort(key=lambda x: record_date_key(x, "fecha_pago") or "1900-01-01", reverse=True)
                     ultimo_pago = payments[0]
                     fecha_ultimo_pago_str = ultimo_pago.get("fecha_pago", "")
                     ultimo_pago_display = fecha_ultimo_pago_str if fecha_ultimo_pago_str else "No registrado"
@@ -669,7 +676,7 @@ class TenantDetailsView(tk.Frame):
         else:
             # Ordenar pagos por fecha (más reciente primero)
             try:
-                payments.sort(key=lambda x: datetime.strptime(x.get("fecha_pago", "01/01/1900"), "%d/%m/%Y"), reverse=True)
+                payments.sort(key=lambda x: record_date_key(x, "fecha_pago") or "1900-01-01", reverse=True)
             except Exception:
                 pass  # Si hay error al ordenar, mostrar en el orden original
             
@@ -1004,18 +1011,18 @@ class TenantDetailsView(tk.Frame):
                         f"Fecha de pago: {payment_date}\n"
                         f"Monto: ${payment_amount:,.0f}"):
                         
-                        success, msg = email_service.send_receipt_email(
+                        # Se envía en segundo plano (bandeja de salida); el aviso llega al salir
+                        outbox_id = email_outbox.enqueue(
+                            "receipt",
                             recipient_email=tenant_email,
                             recipient_name=tenant_name,
                             pdf_path=file_path,
                             payment_date=payment_date,
                             payment_amount=payment_amount
                         )
-                        
-                        if success:
-                            messagebox.showinfo("✅ Email enviado", f"El recibo ha sido enviado exitosamente a:\n{tenant_email}")
-                        else:
-                            messagebox.showerror("❌ Error al enviar", msg)
+                        self._follow_outbox_email(
+                            outbox_id, "✅ Email enviado",
+                            f"El recibo ha sido enviado exitosamente a:\n{tenant_email}")
                 
                 send_email_btn = tk.Button(
                     buttons_frame,
@@ -1157,14 +1164,25 @@ class TenantDetailsView(tk.Frame):
                 return
             try:
                 tenant_id = self.tenant_data.get("id")
-                tenant_service.update_tenant(tenant_id, {
-                    "estado_pago": "inactivo",
-                    "motivo_desactivacion": motivo,
-                    "fecha_desactivacion": datetime.now().isoformat()
-                })
-                apt_id = self.tenant_data.get("apartamento")
-                if apt_id is not None:
-                    apartment_service.update_apartment(apt_id, {"status": "Disponible"})
+                # Inquilino y apartamento se guardan juntos (o ninguno): si algo no se
+                # guarda se lanza la excepción dentro del with y transaction() deshace ambos
+                with transaction():
+                    updated = tenant_service.update_tenant(tenant_id, {
+                        "estado_pago": "inactivo",
+                        "motivo_desactivacion": motivo,
+                        "fecha_desactivacion": datetime.now().isoformat()
+                    })
+                    if updated is None:
+                        raise RuntimeError("No se pudo guardar el inquilino.")
+                    apt_id = self.tenant_data.get("apartamento")
+                    try:
+                        apt_id = int(apt_id) if apt_id is not None else None
+                    except (ValueError, TypeError):
+                        logger.warning("ID de apartamento inválido: %s", apt_id)
+                        apt_id = None
+                    if apt_id is not None and apartment_service.get_apartment_by_id(apt_id):
+                        if apartment_service.update_apartment(apt_id, {"status": "Disponible"}) is None:
+                            raise RuntimeError("No se pudo marcar el apartamento como disponible.")
                 if hasattr(self, 'on_data_change') and self.on_data_change:
                     self.on_data_change()
                 if self.on_back:
@@ -1302,7 +1320,7 @@ class TenantDetailsView(tk.Frame):
         
         # Ordenar pagos por fecha (más reciente primero)
         try:
-            payments.sort(key=lambda x: datetime.strptime(x.get("fecha_pago", "01/01/1900"), "%d/%m/%Y"), reverse=True)
+            payments.sort(key=lambda x: record_date_key(x, "fecha_pago") or "1900-01-01", reverse=True)
         except Exception:
             pass
         
@@ -1465,28 +1483,12 @@ class TenantDetailsView(tk.Frame):
             )
             return
         
-        # Construir la ruta esperada del recibo (carpeta del inquilino)
-        ensure_dirs()
-        folder_name = get_tenant_document_folder_name(self.tenant_data)
-        fecha_safe = payment_date.replace("/", "-")
-        pdf_path = str(DOCUMENTOS_INQUILINOS_DIR / folder_name / f"recibo_{fecha_safe}.pdf")
-        
-        # Verificar si el archivo existe
-        if not os.path.exists(pdf_path):
-            # Si no existe, ofrecer generarlo primero
-            response = messagebox.askyesno(
-                "Recibo no encontrado",
-                f"No se encontró el recibo del pago del {payment_date}.\n\n"
-                f"¿Desea generar el recibo ahora antes de enviarlo?"
-            )
-            if response:
-                self._generate_payment_receipt(payment, None)
-                # Verificar nuevamente si se generó
-                if not os.path.exists(pdf_path):
-                    messagebox.showerror("Error", "No se pudo generar el recibo. Por favor intente generar el recibo primero.")
-                    return
-            else:
-                return
+        # Recibo del pago (se genera solo si no existe o el pago cambió)
+        try:
+            pdf_path = receipt_store.get_receipt(payment, self.tenant_data)
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo generar el recibo: {str(e)}")
+            return
         
         # Confirmar envío
         confirm_msg = f"¿Desea enviar el recibo del pago del {payment_date} por email?\n\n"
@@ -1496,48 +1498,55 @@ class TenantDetailsView(tk.Frame):
         if not messagebox.askyesno("Confirmar envío", confirm_msg):
             return
         
-        # Enviar email
-        success, msg = email_service.send_receipt_email(
+        # Enviar email en segundo plano (bandeja de salida)
+        outbox_id = email_outbox.enqueue(
+            "receipt",
             recipient_email=tenant_email,
             recipient_name=tenant_name,
             pdf_path=pdf_path,
             payment_date=payment_date,
             payment_amount=payment_amount
         )
-        
-        if success:
-            messagebox.showinfo("✅ Email enviado", f"El recibo ha sido enviado exitosamente a:\n{tenant_email}")
-        else:
-            messagebox.showerror("❌ Error al enviar", msg)
+        self._follow_outbox_email(
+            outbox_id, "✅ Email enviado", f"El recibo ha sido enviado exitosamente a:\n{tenant_email}")
     
-    def _generate_payment_receipt(self, payment: Dict[str, Any], parent_window=None):
-        """Genera el recibo PDF de un pago específico (diseño profesional unificado)."""
-        import os
-        from manager.app.receipt_pdf import generate_payment_receipt_pdf
-
-        try:
-            tenant = self.tenant_data
-            ensure_dirs()
-            folder_name = get_tenant_document_folder_name(tenant)
-            tenant_dir = DOCUMENTOS_INQUILINOS_DIR / folder_name
-            tenant_dir.mkdir(parents=True, exist_ok=True)
-            fecha = payment.get("fecha_pago", "").replace("/", "-")
-            filepath = str(tenant_dir / f"recibo_{fecha}.pdf")
+    def _follow_outbox_email(self, outbox_id: int, sent_title: str, sent_message: str):
+        """
+        Consulta con after() el estado de un email de la bandeja de salida y avisa cuando
+        sale o se descarta. Si el primer intento falla avisa una vez que se reintentará.
+        """
+        warned = False
 
-            if os.path.exists(filepath):
-                try:
-                    test_file = open(filepath, 'r+b')
-                    test_file.close()
-                except (IOError, PermissionError):
-                    messagebox.showwarning(
-                        "Archivo en uso",
-                        f"El recibo ya existe y está abierto en otro programa.\n\n"
-                        f"Por favor, cierre el archivo:\n{filepath}\n\n"
-                        f"Luego intente generar el recibo nuevamente."
-                    )
-                    return
+        def poll():
+            nonlocal warned
+            if not self.winfo_exists():
+                return
+            status = email_outbox.get_status(outbox_id)
+            if status is None:
+                return
+            if status["status"] == STATUS_SENT:
+                messagebox.showinfo(sent_title, sent_message)
+                return
+            if status["status"] == STATUS_FAILED:
+                messagebox.showerror("❌ Error al enviar", status.get("last_error") or "No se pudo enviar el email.")
+                return
+            if status["attempts"] and not warned:
+                warned = True
+                messagebox.showwarning(
+                    "⏳ Envío pendiente",
+                    f"No se pudo enviar el email:\n{status.get('last_error')}\n\n"
+                    f"Queda en la bandeja de salida y se reintentará automáticamente.")
+            self.after(self.OUTBOX_POLL_MS, poll)
 
-            generate_payment_receipt_pdf(payment, tenant, filepath)
+        self.after(self.OUTBOX_POLL_MS, poll)
+    
+    def _generate_payment_receipt(self, payment: Dict[str, Any], parent_window=None):
+        """
+        Muestra el recibo PDF de un pago específico (diseño profesional unificado): se
+        reutiliza el ya generado si el pago no cambió.
+        """
+        try:
+            filepath = receipt_store.get_receipt(payment, self.tenant_data)
 
             if parent_window:
                 parent_window.destroy()
@@ -1549,6 +1558,14 @@ class TenantDetailsView(tk.Frame):
                 payment_data=payment
             )
 
+        except PermissionError as e:
+            # El recibo se está regenerando y el PDF anterior está abierto en otro programa
+            messagebox.showwarning(
+                "Archivo en uso",
+                f"El recibo ya existe y está abierto en otro programa.\n\n"
+                f"Por favor, cierre el archivo:\n{e.filename or ''}\n\n"
+                f"Luego intente generar el recibo nuevamente."
+            )
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo generar el recibo: {str(e)}")
             import traceback
@@ -1791,7 +1808,7 @@ class TenantDetailsView(tk.Frame):
                 if payments:
                     # Ordenar por fecha
                     try:
-                        payments.sort(key=lambda x: datetime.strptime(x.get("fecha_pago", "01/01/1900"), "%d/%m/%Y"), reverse=True)
+                        payments.sort(key=lambda x: record_date_key(x, "fecha_pago") or "1900-01-01", reverse=True)
                     except:
                         pass
                     
@@ -1837,7 +1854,7 @@ class TenantDetailsView(tk.Frame):
                 payments = payment_service.get_payments_by_tenant(tenant_id)
                 if payments:
                     try:
-                        payments.sort(key=lambda x: datetime.strptime(x.get("fecha_pago", "01/01/1900"), "%d/%m/%Y"), reverse=True)
+                        payments.sort(key=lambda x: record_date_key(x, "fecha_pago") or "1900-01-01", reverse=True)
                     except:
                         pass
                     
@@ -1859,8 +1876,8 @@ class TenantDetailsView(tk.Frame):
             if not messagebox.askyesno("Confirmar envío", confirm_msg):
                 return
             
-            # Enviar notificación (body_override = texto editado por el manager)
-            success, message = notification_service.send_notification(
+            # Encolar notificación (body_override = texto editado por el manager)
+            success, message, outbox_id = notification_service.queue_notification(
                 tenant=self.tenant_data,
                 template_key=selected_key,
                 body_override=body_text,
@@ -1869,8 +1886,10 @@ class TenantDetailsView(tk.Frame):
             )
             
             if success:
-                messagebox.showinfo("✅ Notificación enviada", f"La notificación ha sido enviada exitosamente a:\n{tenant_email}")
                 _notification_modal_cleanup()
+                self._follow_outbox_email(
+                    outbox_id, "✅ Notificación enviada",
+                    f"La notificación ha sido enviada exitosamente a:\n{tenant_email}")
             else:
                 messagebox.showerror("❌ Error al enviar", message)
         
@@ -1928,9 +1947,9 @@ class TenantDetailsView(tk.Frame):
         
         if payments:
             try:
-                payments.sort(key=lambda x: datetime.strptime(x.get("fecha_pago", "01/01/1900"), "%d/%m/%Y"), reverse=True)
+                payments.sort(key=lambda x: record_date_key(x, "fecha_pago") or "1900-01-01", reverse=True)
                 last_payment = payments[0]
-                last_payment_date = datetime.strptime(last_payment.get("fecha_pago", "01/01/1900"), "%d/%m/%Y")
+                last_payment_date = key_to_datetime(record_date_key(last_payment, "fecha_pago") or "1900-01-01")
                 next_due = last_payment_date + timedelta(days=30)
                 next_due_date = next_due.strftime("%d/%m/%Y")
                 today = datetime.now()
@@ -1973,7 +1992,7 @@ class TenantDetailsView(tk.Frame):
             payments = payment_service.get_payments_by_tenant(tenant_id)
             if payments:
                 try:
-                    payments.sort(key=lambda x: datetime.strptime(x.get("fecha_pago", "01/01/1900"), "%d/%m/%Y"), reverse=True)
+                    payments.sort(key=lambda x: record_date_key(x, "fecha_pago") or "1900-01-01", reverse=True)
                     tenant["ultimo_pago"] = payments[0].get("fecha_pago", "N/A")
                 except Exception:
                     tenant["ultimo_pago"] = "N/A"
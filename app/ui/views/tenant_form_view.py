@@ -1242,15 +1242,10 @@ Esto te permitirá:
                 'observaciones': f'Pago inicial - {tenant_data.get("nombre")} - Apartamento {apt_number}'
             }
             
-            # Registrar el pago usando el método correcto
+            # Registrar el pago (también recalcula el estado de pago del inquilino)
             success = payment_service.add_payment(payment_data)
             
             if success:
-                # Recalcular el estado de pago del inquilino después del pago
-                tenant_id = tenant_data.get('id')
-                if tenant_id:
-                    tenant_service.update_payment_status(tenant_id)
-                
                 messagebox.showinfo(
                     "✅ Pago Registrado",
                     f"Pago inicial registrado exitosamente para {tenant_data.get('nombre')}.\n\n"
@@ -16,6 +16,16 @@ from manager.app.ui.components.modern_widgets import create_rounded_button, get_
 from manager.app.services.tenant_service import tenant_service
 from manager.app.services.payment_service import payment_service
 from manager.app.services.apartment_service import apartment_service
+from manager.app.reporting.snapshot import ReportSnapshot
+from manager.app.reporting.tenant_reports import (
+    build_availability_report,
+    build_documents_report,
+    build_emergency_contacts_report,
+    build_financial_summary_report,
+    build_occupation_history_report,
+    build_tenants_consolidated_report,
+)
+from manager.app.ui.components.report_job_runner import ReportJobRunner
 from manager.app.logger import logger
 
 
@@ -26,6 +36,8 @@ class TenantManagementReportsView(tk.Frame):
         super().__init__(parent, **theme_manager.get_style("frame"))
         self.on_back = on_back
         self.on_navigate = on_navigate
+        # Los reportes se generan en segundo plano (ver app/reporting)
+        self._report_runner = ReportJobRunner(self, color="#2563eb")
         
         # Recargar datos antes de generar reportes
         self._reload_all_data()
@@ -37,7 +49,7 @@ class TenantManagementReportsView(tk.Frame):
         try:
             tenant_service._load_data()
             payment_service._load_data()
-            apartment_service._load_data()
+            apartment_service.reload_data()
         except Exception as e:
             logger.warning("Error al recargar datos: %s", e)
     
@@ -341,406 +353,49 @@ class TenantManagementReportsView(tk.Frame):
     
     # ==================== GENERADORES DE REPORTES ====================
     
-    def _generate_tenants_consolidated_report(self):
-        """Genera reporte consolidado de inquilinos (activos e inactivos)"""
+    def _take_snapshot(self) -> ReportSnapshot:
+        """Inquilinos, pagos y apartamentos (registros de solo lectura) para reportes en segundo plano."""
+        return ReportSnapshot(
+            payments=payment_service.records(),
+            tenants=tenant_service.records(),
+            apartments=apartment_service.records(),
+        )
+
+    def _run_report(self, builder, title, report_type):
+        """Recarga los datos y genera el reporte en segundo plano; lo muestra al terminar."""
         try:
             self._reload_all_data()
-            
-            tenants = tenant_service.get_all_tenants()
-            active = [t for t in tenants if t.get('estado_pago') != 'inactivo']
-            inactive = [t for t in tenants if t.get('estado_pago') == 'inactivo']
-            
-            report = []
-            report.append("=" * 60)
-            report.append("REPORTE DE INQUILINOS")
-            report.append("=" * 60)
-            report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            report.append("")
-            report.append(f"RESUMEN:")
-            report.append(f"  • Total de inquilinos: {len(tenants)}")
-            report.append(f"  • Inquilinos activos: {len(active)}")
-            report.append(f"  • Inquilinos inactivos: {len(inactive)}")
-            report.append("")
-            
-            # Función auxiliar para formatear un inquilino
-            def format_tenant(tenant):
-                status = tenant.get('estado_pago', 'N/A')
-                status_map = {
-                    'al_dia': 'Al Día',
-                    'pendiente_registro': 'Pendiente Registro',
-                    'moroso': 'En Mora',
-                    'inactivo': 'Inactivo'
-                }
-                status_text = status_map.get(status, status)
-                
-                # Obtener el número del apartamento
-                apartment_display = self._get_apartment_display(tenant)
-                
-                lines = []
-                lines.append(f"Nombre: {tenant.get('nombre', 'N/A')}")
-                lines.append(f"  • Apartamento: {apartment_display}")
-                lines.append(f"  • Documento: {tenant.get('numero_documento', 'N/A')}")
-                lines.append(f"  • Teléfono: {tenant.get('telefono', 'N/A')}")
-                lines.append(f"  • Estado: {status_text}")
-                lines.append(f"  • Arriendo: ${float(tenant.get('valor_arriendo', 0)):,.2f}")
-                
-                # Si está inactivo, agregar información de desactivación
-                if status == 'inactivo':
-                    motivo = tenant.get('motivo_desactivacion', 'N/A')
-                    fecha_desactivacion = tenant.get('fecha_desactivacion', 'N/A')
-                    if fecha_desactivacion != 'N/A':
-                        try:
-                            fecha_dt = datetime.fromisoformat(fecha_desactivacion)
-                            fecha_desactivacion = fecha_dt.strftime('%d/%m/%Y')
-                        except:
-                            pass
-                    lines.append(f"  • Motivo de desactivación: {motivo}")
-                    lines.append(f"  • Fecha de desactivación: {fecha_desactivacion}")
-                
-                lines.append("")
-                return "\n".join(lines)
-            
-            # SECCIÓN 1: INQUILINOS ACTIVOS
-            report.append("=" * 60)
-            report.append("INQUILINOS ACTIVOS")
-            report.append("=" * 60)
-            report.append("")
-            
-            if active:
-                for tenant in active:
-                    report.append(format_tenant(tenant))
-            else:
-                report.append("No hay inquilinos activos.")
-                report.append("")
-            
-            # SECCIÓN 2: INQUILINOS INACTIVOS
-            if inactive:
-                report.append("=" * 60)
-                report.append("INQUILINOS INACTIVOS")
-                report.append("=" * 60)
-                report.append("")
-                
-                for tenant in inactive:
-                    report.append(format_tenant(tenant))
-            
-            self._show_report_window(
-                "Reporte de Inquilinos",
-                "\n".join(report),
-                "tenants_consolidated"
+            self._report_runner.run(
+                builder, self._take_snapshot(),
+                on_done=lambda content: self._show_report_window(title, content, report_type),
+                error_message="Error al generar reporte",
             )
         except Exception as e:
             messagebox.showerror("Error", f"Error al generar reporte: {str(e)}")
+
+    def _generate_tenants_consolidated_report(self):
+        """Genera reporte consolidado de inquilinos (activos e inactivos)"""
+        self._run_report(build_tenants_consolidated_report, "Reporte de Inquilinos", "tenants_consolidated")
     
     def _generate_occupation_history_report(self):
         """Genera reporte de historial de ocupación"""
-        try:
-            self._reload_all_data()
-            
-            tenants = tenant_service.get_all_tenants()
-            apartments = apartment_service.get_all_apartments()
-            
-            report = []
-            report.append("=" * 70)
-            report.append("HISTORIAL DE OCUPACIÓN - GESTIÓN DE INQUILINOS")
-            report.append("=" * 70)
-            report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            report.append("")
-            
-            # Agrupar por apartamento
-            apt_tenants = {}
-            for tenant in tenants:
-                apt_id = tenant.get('apartamento')
-                if apt_id:
-                    if apt_id not in apt_tenants:
-                        apt_tenants[apt_id] = []
-                    apt_tenants[apt_id].append(tenant)
-            
-            for apt in apartments:
-                apt_id = apt.get('id')
-                apt_display = f"{apt.get('unit_type', 'Apto')}: {apt.get('number', 'N/A')}"
-                
-                report.append("=" * 70)
-                report.append(f"APARTAMENTO: {apt_display}")
-                report.append("=" * 70)
-                
-                if apt_id in apt_tenants:
-                    for tenant in apt_tenants[apt_id]:
-                        report.append(f"Inquilino: {tenant.get('nombre', 'N/A')}")
-                        fecha_ingreso = tenant.get('fecha_ingreso', 'N/A')
-                        if fecha_ingreso and fecha_ingreso != 'N/A':
-                            try:
-                                fecha_dt = datetime.fromisoformat(fecha_ingreso)
-                                fecha_ingreso = fecha_dt.strftime('%d/%m/%Y')
-                            except:
-                                pass
-                        report.append(f"  Fecha de ingreso: {fecha_ingreso}")
-                        
-                        if tenant.get('estado_pago') == 'inactivo':
-                            fecha_salida = tenant.get('fecha_desactivacion', 'N/A')
-                            if fecha_salida and fecha_salida != 'N/A':
-                                try:
-                                    fecha_dt = datetime.fromisoformat(fecha_salida)
-                                    fecha_salida = fecha_dt.strftime('%d/%m/%Y')
-                                except:
-                                    pass
-                            report.append(f"  Fecha de salida: {fecha_salida}")
-                            report.append(f"  Motivo: {tenant.get('motivo_desactivacion', 'N/A')}")
-                        else:
-                            report.append(f"  Estado: Activo")
-                        report.append("")
-                else:
-                    report.append("Estado: Disponible")
-                    report.append("")
-            
-            self._show_report_window(
-                "Historial de Ocupación",
-                "\n".join(report),
-                "occupation_history"
-            )
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al generar reporte: {str(e)}")
+        self._run_report(build_occupation_history_report, "Historial de Ocupación", "occupation_history")
     
     def _generate_documents_report(self):
         """Genera reporte de documentos de inquilinos"""
-        try:
-            self._reload_all_data()
-            
-            tenants = tenant_service.get_all_tenants()
-            active_tenants = [t for t in tenants if t.get('estado_pago') != 'inactivo']
-            
-            report = []
-            report.append("=" * 70)
-            report.append("REPORTE DE DOCUMENTOS - GESTIÓN DE INQUILINOS")
-            report.append("=" * 70)
-            report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            report.append("")
-            report.append(f"Total de inquilinos activos: {len(active_tenants)}")
-            report.append("")
-            
-            for tenant in active_tenants:
-                apt = self._get_apartment_display(tenant)
-                report.append(f"Inquilino: {tenant.get('nombre', 'N/A')} - {apt}")
-                report.append(f"  Documento de identidad: {tenant.get('numero_documento', 'N/A')}")
-                
-                # Verificar documentos
-                has_contract = tenant.get('contrato', '') != ''
-                has_ficha = tenant.get('ficha', '') != ''
-                
-                report.append(f"  Contrato: {'✓ Presente' if has_contract else '✗ No registrado'}")
-                report.append(f"  Ficha: {'✓ Presente' if has_ficha else '✗ No registrado'}")
-                
-                # Documentos adicionales
-                documentos = tenant.get('documentos', [])
-                if documentos:
-                    report.append(f"  Documentos adicionales: {len(documentos)}")
-                    for doc in documentos:
-                        report.append(f"    - {doc.get('tipo', 'N/A')}: {doc.get('archivo', 'N/A')}")
-                else:
-                    report.append(f"  Documentos adicionales: Ninguno")
-                
-                report.append("")
-            
-            self._show_report_window(
-                "Reporte de Documentos",
-                "\n".join(report),
-                "documents"
-            )
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al generar reporte: {str(e)}")
+        self._run_report(build_documents_report, "Reporte de Documentos", "documents")
     
     def _generate_emergency_contacts_report(self):
         """Genera reporte de contactos de emergencia"""
-        try:
-            self._reload_all_data()
-            
-            tenants = tenant_service.get_all_tenants()
-            active_tenants = [t for t in tenants if t.get('estado_pago') != 'inactivo']
-            
-            report = []
-            report.append("=" * 70)
-            report.append("CONTACTOS DE EMERGENCIA - GESTIÓN DE INQUILINOS")
-            report.append("=" * 70)
-            report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            report.append("")
-            report.append(f"Total de inquilinos activos: {len(active_tenants)}")
-            report.append("")
-            
-            for tenant in active_tenants:
-                apt = self._get_apartment_display(tenant)
-                report.append(f"Inquilino: {tenant.get('nombre', 'N/A')} - {apt}")
-                report.append(f"  Teléfono: {tenant.get('telefono', 'N/A')}")
-                report.append(f"  Email: {tenant.get('email', 'N/A')}")
-                
-                # Contacto de emergencia (campos planos y/o anidados)
-                contacto_emergencia = tenant.get('contacto_emergencia') or {}
-                nombre_ec = (contacto_emergencia.get('nombre') if isinstance(contacto_emergencia, dict) else None) or tenant.get('contacto_emergencia_nombre', '').strip()
-                telefono_ec = (contacto_emergencia.get('telefono') if isinstance(contacto_emergencia, dict) else None) or tenant.get('contacto_emergencia_telefono', '').strip()
-                relacion_ec = (contacto_emergencia.get('relacion') if isinstance(contacto_emergencia, dict) else None) or tenant.get('contacto_emergencia_parentesco', '').strip()
-                if nombre_ec or telefono_ec:
-                    report.append(f"  Contacto de Emergencia:")
-                    report.append(f"    Nombre: {nombre_ec or 'N/A'}")
-                    report.append(f"    Teléfono: {telefono_ec or 'N/A'}")
-                    if relacion_ec:
-                        report.append(f"    Relación: {relacion_ec}")
-                else:
-                    report.append(f"  Contacto de Emergencia: No registrado")
-                
-                report.append("")
-            
-            self._show_report_window(
-                "Contactos de Emergencia",
-                "\n".join(report),
-                "emergency_contacts"
-            )
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al generar reporte: {str(e)}")
+        self._run_report(build_emergency_contacts_report, "Contactos de Emergencia", "emergency_contacts")
     
     def _generate_financial_summary_report(self):
         """Genera reporte de resumen financiero por inquilino"""
-        try:
-            self._reload_all_data()
-            
-            tenants = tenant_service.get_all_tenants()
-            active_tenants = [t for t in tenants if t.get('estado_pago') != 'inactivo']
-            
-            report = []
-            report.append("=" * 70)
-            report.append("RESUMEN FINANCIERO POR INQUILINO - GESTIÓN DE INQUILINOS")
-            report.append("=" * 70)
-            report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            report.append("")
-            
-            total_arriendos = 0
-            total_pagado = 0
-            
-            for tenant in active_tenants:
-                apt = self._get_apartment_display(tenant)
-                arriendo = float(tenant.get('valor_arriendo', 0))
-                total_arriendos += arriendo
-                
-                report.append(f"Inquilino: {tenant.get('nombre', 'N/A')} - {apt}")
-                report.append(f"  Arriendo mensual: ${arriendo:,.2f}")
-                
-                # Calcular total pagado
-                payments = payment_service.get_payments_by_tenant(tenant.get('id'))
-                total_tenant_paid = sum(float(p.get('monto', 0)) for p in payments)
-                total_pagado += total_tenant_paid
-                
-                report.append(f"  Total pagado: ${total_tenant_paid:,.2f}")
-                report.append(f"  Número de pagos: {len(payments)}")
-                
-                if payments:
-                    last_payment = max(payments, key=lambda p: p.get('fecha', ''))
-                    report.append(f"  Último pago: {last_payment.get('fecha', 'N/A')} - ${float(last_payment.get('monto', 0)):,.2f}")
-                
-                report.append("")
-            
-            report.append("=" * 70)
-            report.append("RESUMEN GENERAL")
-            report.append("=" * 70)
-            report.append(f"Total de arriendos mensuales: ${total_arriendos:,.2f}")
-            report.append(f"Total pagado (histórico): ${total_pagado:,.2f}")
-            report.append(f"Inquilinos activos: {len(active_tenants)}")
-            
-            self._show_report_window(
-                "Resumen Financiero por Inquilino",
-                "\n".join(report),
-                "financial_summary"
-            )
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al generar reporte: {str(e)}")
+        self._run_report(build_financial_summary_report, "Resumen Financiero por Inquilino", "financial_summary")
     
     def _generate_availability_report(self):
         """Genera reporte de disponibilidad de apartamentos"""
-        try:
-            self._reload_all_data()
-            
-            apartments = apartment_service.get_all_apartments()
-            tenants = tenant_service.get_all_tenants()
-            
-            # Crear mapa de ocupación
-            occupied_apts = {}
-            for tenant in tenants:
-                if tenant.get('estado_pago') != 'inactivo':
-                    apt_id = tenant.get('apartamento')
-                    if apt_id:
-                        occupied_apts[apt_id] = tenant
-            
-            report = []
-            report.append("=" * 70)
-            report.append("DISPONIBILIDAD DE APARTAMENTOS - GESTIÓN DE INQUILINOS")
-            report.append("=" * 70)
-            report.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            report.append("")
-            
-            available = []
-            occupied = []
-            
-            for apt in apartments:
-                apt_id = apt.get('id')
-                apt_display = f"{apt.get('unit_type', 'Apto')}: {apt.get('number', 'N/A')}"
-                
-                if apt_id in occupied_apts:
-                    tenant = occupied_apts[apt_id]
-                    occupied.append((apt_display, tenant))
-                else:
-                    available.append(apt_display)
-            
-            report.append("=" * 70)
-            report.append("APARTAMENTOS DISPONIBLES")
-            report.append("=" * 70)
-            report.append(f"Total: {len(available)}")
-            report.append("")
-            for apt in available:
-                report.append(f"  • {apt}")
-            report.append("")
-            
-            report.append("=" * 70)
-            report.append("APARTAMENTOS OCUPADOS")
-            report.append("=" * 70)
-            report.append(f"Total: {len(occupied)}")
-            report.append("")
-            for apt_display, tenant in occupied:
-                report.append(f"  • {apt_display}")
-                report.append(f"    Inquilino: {tenant.get('nombre', 'N/A')}")
-                fecha_ingreso = tenant.get('fecha_ingreso', 'N/A')
-                if fecha_ingreso and fecha_ingreso != 'N/A':
-                    try:
-                        fecha_dt = datetime.fromisoformat(fecha_ingreso)
-                        fecha_ingreso = fecha_dt.strftime('%d/%m/%Y')
-                    except:
-                        pass
-                report.append(f"    Fecha de ingreso: {fecha_ingreso}")
-                report.append("")
-            
-            self._show_report_window(
-                "Disponibilidad de Apartamentos",
-                "\n".join(report),
-                "availability"
-            )
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al generar reporte: {str(e)}")
-    
-    def _get_apartment_display(self, tenant):
-        """Obtiene la representación del apartamento de un inquilino"""
-        apartment_id = tenant.get('apartamento', None)
-        if apartment_id is not None:
-            try:
-                apartment_id_int = int(apartment_id)
-                apt = apartment_service.get_apartment_by_id(apartment_id_int) if hasattr(apartment_service, 'get_apartment_by_id') else None
-                if not apt:
-                    all_apts = apartment_service.get_all_apartments()
-                    apt = next((a for a in all_apts if a.get('id') == apartment_id_int), None)
-                if apt:
-                    apt_number = apt.get('number', 'N/A')
-                    apt_type = apt.get('unit_type', 'Apartamento Estándar')
-                    if apt_type == "Apartamento Estándar":
-                        return f"Apto: {apt_number}"
-                    else:
-                        return f"{apt_type}: {apt_number}"
-            except:
-                pass
-        return "Sin apartamento asignado"
+        self._run_report(build_availability_report, "Disponibilidad de Apartamentos", "availability")
     
     def _reset_report_cards_appearance(self):
         """Restaura el color normal de los cards (por si el hover quedó pegado al cerrar la ventana del reporte)."""
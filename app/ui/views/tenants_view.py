@@ -21,9 +21,50 @@ from manager.app.services.apartment_service import apartment_service
 from manager.app.services.payment_service import payment_service
 from manager.app.services.building_service import building_service
 from manager.app.ui.components.modern_widgets import create_rounded_button, get_module_colors, bind_combobox_dropdown_on_click
+from manager.app.ui.components.tenant_autocomplete import SEARCH_DEBOUNCE_MS
+from manager.app.ui.components.virtual_list import VirtualList
 from manager.app.presenters.tenant_presenter import TenantPresenter
 from manager.app.logger import logger
 
+# Alturas fijas (px) de los elementos de la lista virtualizada
+GROUP_HEADER_HEIGHT = 34
+TENANT_ROW_HEIGHT = 96
+
+# Grupos en el orden en que se muestran: primero en mora, luego pendiente, al día e inactivos
+TENANT_GROUPS = (
+    ("moroso", "⚠️ EN MORA", "#ff9800"),
+    ("pendiente", "⏰ PENDIENTE DE PAGO", "#ffc107"),
+    ("al_dia", "✅ AL DÍA", "#2563eb"),
+    ("inactivo", "❌ INACTIVOS", "#f44336"),
+)
+
+
+def build_tenant_list_items(tenants):
+    """
+    Elementos de la lista virtualizada: un título por grupo de estado seguido de sus
+    inquilinos, como ("group", (título, color, cantidad)) y ("tenant", (inquilino, color, es_par)).
+    """
+    groups = {key: [] for key, _, _ in TENANT_GROUPS}
+    for tenant in tenants:
+        estado = tenant.get('estado_pago', 'al_dia')
+        if estado == 'inactivo':
+            groups['inactivo'].append(tenant)
+        elif estado == 'moroso':
+            groups['moroso'].append(tenant)
+        elif estado in ('pendiente_registro', 'pendiente_pago'):
+            groups['pendiente'].append(tenant)
+        else:
+            groups['al_dia'].append(tenant)
+    items = []
+    for key, title, color in TENANT_GROUPS:
+        group = groups[key]
+        if not group:
+            continue
+        items.append(("group", (title, color, len(group))))
+        items.extend(("tenant", (tenant, color, i % 2 == 0)) for i, tenant in enumerate(group))
+    return items
+
+
 class TenantsView(tk.Frame):
     """Vista principal del módulo de inquilinos con diseño simplificado"""
     
@@ -44,8 +85,13 @@ class TenantsView(tk.Frame):
         self.current_view = "list"
         self.selected_tenant = None
 
-        # Almacenar referencia del scrollable_frame para refrescar lista
-        self.scrollable_frame = None
+        # Lista virtualizada de inquilinos (se crea con el panel de lista)
+        self.tenant_list = None
+        # Mora precalculada y textos por fila; se recalculan una vez por recarga de inquilinos
+        self._arrears_by_id = {}
+        self._row_cache = None
+        # Búsqueda pendiente (after id) mientras el usuario sigue escribiendo
+        self._search_after_id = None
 
         # Abrir directamente la vista de lista/detalles (sin menú de 3 cards)
         self._show_tenants_list()
@@ -309,56 +355,38 @@ class TenantsView(tk.Frame):
             fg=header_text_light  # Azul claro para texto secundario
         )
         self.counter_label.pack(side="left", padx=5)
-        self.scroll_frame = tk.Frame(panel, bg=panel_bg)
-        self.scroll_frame.pack(fill="both", expand=True, padx=8, pady=6)
-        self.canvas = tk.Canvas(self.scroll_frame, bg=panel_bg, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(self.scroll_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = tk.Frame(self.canvas, bg=panel_bg)
-        # Guardar referencia del scrollable_frame como atributo de instancia para acceso externo
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
-        def _on_mousewheel(event):
-            try:
-                if self.canvas.winfo_exists():
-                    self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-            except Exception:
-                pass
-        def _bind_to_mousewheel(event):
-            self.canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        def _unbind_from_mousewheel(event):
-            self.canvas.unbind_all("<MouseWheel>")
-        self.canvas.bind('<Enter>', _bind_to_mousewheel)
-        self.canvas.bind('<Leave>', _unbind_from_mousewheel)
-        self.canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # Lista virtualizada: solo se crean las filas visibles y se reciclan al hacer scroll
+        self.tenant_list = VirtualList(panel, bg=panel_bg)
+        self.tenant_list.pack(fill="both", expand=True, padx=8, pady=6)
+        self.tenant_list.register_kind("group", GROUP_HEADER_HEIGHT, self._create_group_header, self._update_group_header)
+        self.tenant_list.register_kind("tenant", TENANT_ROW_HEIGHT, self._create_tenant_row, self._update_tenant_row)
         return panel
     
     def _load_and_display_tenants(self):
         """Carga y muestra todos los inquilinos (excluyendo inactivos por defecto)."""
         try:
             self.all_tenants = self.presenter.load_tenants()
+            self._refresh_row_data()
             self._apply_filters()
         except Exception as e:
             logger.warning("Error al cargar inquilinos: %s", e)
             self.all_tenants = []
             self._display_tenants([])
+
+    def _refresh_row_data(self):
+        """
+        Recalcula la mora de todos los inquilinos en una sola carga de pagos y vacía
+        la caché de textos por fila. Se llama una vez por recarga, no en cada búsqueda.
+        """
+        self._arrears_by_id = tenant_service.get_arrears_info_bulk()
+        self._row_cache = {}
     
     def _show_empty_state(self):
         """Muestra mensaje cuando no hay inquilinos que coincidan con los filtros"""
         self.counter_label.config(text="(0 inquilinos)")
-        msg = tk.Label(
-            self.scrollable_frame,
-            text="No hay inquilinos que coincidan con los filtros.\nPrueba ajustar o limpiar los criterios de búsqueda.",
-            font=("Segoe UI", 11),
-            bg="#e0f2fe",  # Azul claro para mantener tonalidad azul
-            fg="#666666",
-            justify="center"
+        self.tenant_list.show_message(
+            "No hay inquilinos que coincidan con los filtros.\nPrueba ajustar o limpiar los criterios de búsqueda."
         )
-        msg.pack(pady=40, padx=20)
         if hasattr(self, 'results_indicator'):
             all_tenants = getattr(self, 'all_tenants', [])
             total_active = len([t for t in all_tenants if t.get('estado_pago') != 'inactivo'])
@@ -369,45 +397,11 @@ class TenantsView(tk.Frame):
 
     def _display_tenants(self, tenants):
         """Muestra los inquilinos agrupados por estado"""
-        # Limpiar contenido anterior
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        
         if not tenants:
             self._show_empty_state()
             return
         
-        # Agrupar por estado (real)
-        active_tenants = []
-        pending_tenants = []
-        overdue_tenants = []
-        inactive_tenants = []
-        
-        for tenant in tenants:
-            estado = tenant.get('estado_pago', 'al_dia')
-            if estado == 'inactivo':
-                inactive_tenants.append(tenant)
-            elif estado == 'moroso':
-                overdue_tenants.append(tenant)
-            elif estado in ('pendiente_registro', 'pendiente_pago'):
-                pending_tenants.append(tenant)
-            else:
-                active_tenants.append(tenant)
-        
-        # Mostrar grupos: primero en mora, luego pendiente de registro, después al día, por último inactivos
-        current_row = 0
-
-        if overdue_tenants:
-            current_row = self._display_group("⚠️ EN MORA", overdue_tenants, "#ff9800", current_row)
-
-        if pending_tenants:
-            current_row = self._display_group("⏰ PENDIENTE DE PAGO", pending_tenants, "#ffc107", current_row)
-
-        if active_tenants:
-            current_row = self._display_group("✅ AL DÍA", active_tenants, "#2563eb", current_row)
-
-        if inactive_tenants:
-            current_row = self._display_group("❌ INACTIVOS", inactive_tenants, "#f44336", current_row)
+        self.tenant_list.set_items(build_tenant_list_items(tenants))
         
         # Actualizar contador
         total = len(tenants)
@@ -427,35 +421,20 @@ class TenantsView(tk.Frame):
                     text=f"🔍 Resultados: {total} de {total_active} inquilinos",
                     fg="#1976d2"
                 )
-        
-        # Forzar actualización del scroll
-        self.scrollable_frame.update_idletasks()
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        
-        # Forzar actualización completa de Tkinter
-        self.update_idletasks()
-        self.update()
     
-    def _display_group(self, title, tenants, color, start_row):
-        """Muestra un grupo de inquilinos"""
-        # Separador y título del grupo
-        separator = tk.Frame(self.scrollable_frame, bg=color, height=2)
-        separator.pack(fill="x", pady=(4, 0))
-        
-        group_title = tk.Label(
-            self.scrollable_frame,
-            text=f"{title} ({len(tenants)})",
-            font=("Segoe UI", 11, "bold"),
-            bg="#e0f2fe",
-            fg=color
-        )
-        group_title.pack(anchor="w", pady=(2, 3))
-        
-        # Inquilinos del grupo
-        for i, tenant in enumerate(tenants):
-            self._create_tenant_row(tenant, color, i % 2 == 0)
-        
-        return start_row + len(tenants)
+    def _create_group_header(self, parent):
+        """Crea el widget reutilizable de título de grupo (separador + etiqueta)."""
+        frame = tk.Frame(parent, bg="#e0f2fe")
+        frame.separator = tk.Frame(frame, height=2)
+        frame.separator.pack(fill="x", pady=(4, 0))
+        frame.title = tk.Label(frame, font=("Segoe UI", 11, "bold"), bg="#e0f2fe")
+        frame.title.pack(anchor="w", pady=(2, 3))
+        return frame
+
+    def _update_group_header(self, frame, data, index):
+        title, color, count = data
+        frame.separator.configure(bg=color)
+        frame.title.configure(text=f"{title} ({count})", fg=color)
     
     def _get_dias_mora(self, tenant):
         """Días en mora integral (desde primer período impago). Usa lógica del servicio."""
@@ -463,43 +442,42 @@ class TenantsView(tk.Frame):
             tenant_id = tenant.get("id")
             if not tenant_id:
                 return 0
+            info = self._arrears_by_id.get(tenant_id)
+            if info is not None:
+                return info.get("dias_mora", 0)
             return tenant_service.get_dias_mora(tenant_id)
         except Exception:
             return 0
 
-    def _create_tenant_row(self, tenant, status_color, is_even):
-        """Crea una fila para un inquilino con información completa y clic"""
-        bg_color = "#ffffff" if is_even else "#f8f9fa"
-        row_frame = tk.Frame(self.scrollable_frame, bg=bg_color, relief="solid", bd=1)
-        row_frame.pack(fill="x", pady=0)
-        content = tk.Frame(row_frame, bg=bg_color)
-        content.pack(fill="x", padx=10, pady=4)
-        name = tenant.get('nombre', 'Sin nombre')
-        apartment_id = tenant.get('apartamento', None)
-        apartment_display = 'N/A'
-        if apartment_id is not None:
-            try:
-                apartment_id_int = int(apartment_id)
-            except Exception:
-                apartment_id_int = apartment_id
-            apt = apartment_service.get_apartment_by_id(apartment_id_int) if hasattr(apartment_service, 'get_apartment_by_id') else None
-            if not apt:
-                all_apts = apartment_service.get_all_apartments()
-                apt = next((a for a in all_apts if a.get('id') == apartment_id_int), None)
-            if apt:
-                building = None
-                if hasattr(building_service, 'get_building_by_id'):
-                    building = building_service.get_building_by_id(apt.get('building_id'))
-                else:
-                    all_buildings = building_service.get_all_buildings()
-                    building = next((b for b in all_buildings if b.get('id') == apt.get('building_id')), None)
-                building_name = building.get('name') if building else ''
-                tipo = apt.get('unit_type', 'Apartamento Estándar')
-                numero = apt.get('number', '')
-                if building_name:
-                    apartment_display = f"{building_name} - {tipo} {numero}" if tipo != 'Apartamento Estándar' else f"{building_name} - {numero}"
-                else:
-                    apartment_display = f"{tipo} {numero}" if tipo != 'Apartamento Estándar' else str(numero)
+    def _get_apartment_display(self, apartment_id):
+        """Texto del apartamento para la fila: 'Edificio - Tipo Número' o 'N/A'."""
+        if apartment_id is None:
+            return 'N/A'
+        try:
+            apartment_id_int = int(apartment_id)
+        except Exception:
+            apartment_id_int = apartment_id
+        apt = apartment_service.get_apartment_by_id(apartment_id_int)
+        if not apt:
+            return 'N/A'
+        building = building_service.get_building_by_id(apt.get('building_id'))
+        building_name = building.get('name') if building else ''
+        tipo = apt.get('unit_type', 'Apartamento Estándar')
+        numero = apt.get('number', '')
+        if building_name:
+            return f"{building_name} - {tipo} {numero}" if tipo != 'Apartamento Estándar' else f"{building_name} - {numero}"
+        return f"{tipo} {numero}" if tipo != 'Apartamento Estándar' else str(numero)
+
+    def _get_row_data(self, tenant):
+        """Textos de la fila del inquilino; se calculan la primera vez que la fila se muestra."""
+        cache = self._row_cache
+        if cache is None:
+            self._refresh_row_data()
+            cache = self._row_cache
+        tenant_id = tenant.get("id")
+        cached = cache.get(tenant_id)
+        if cached is not None and cached["tenant"] is tenant:
+            return cached
         valor_arriendo = tenant.get('valor_arriendo', 0)
         if valor_arriendo is not None and valor_arriendo != "":
             try:
@@ -518,7 +496,7 @@ class TenantsView(tk.Frame):
             'inactivo': 'Inactivo'
         }.get(estado_pago, 'Al día')
         if estado_pago == 'moroso':
-            info = tenant_service.get_arrears_info(tenant.get("id")) or {}
+            info = self._arrears_by_id.get(tenant_id) or {}
             meses_mora = info.get("meses_mora", 0)
             dias_del_periodo = info.get("dias_del_periodo_actual", 0)
             if meses_mora > 0 or dias_del_periodo > 0:
@@ -544,56 +522,42 @@ class TenantsView(tk.Frame):
                 dia_pago = int(fecha_ingreso.split('/')[0])
             except Exception:
                 dia_pago = None
+        apartment_display = self._get_apartment_display(tenant.get('apartamento', None))
+        row = {
+            "tenant": tenant,
+            "name": f"👤 {tenant.get('nombre', 'Sin nombre')}",
+            "details": f"🏠 Apto: {apartment_display} | 💰 Arriendo: {valor_arriendo_display} | 📞 Teléfono: {tenant.get('telefono', 'No registrado')}",
+            "dia_pago": f"📅 Día de pago: {dia_pago} de cada mes" if dia_pago else None,
+            "estado": f"  ● {estado_texto}" if dia_pago else f"● {estado_texto}",
+            # Si el inquilino tiene pagos, Eliminar se deshabilita
+            "has_payments": bool(tenant_id and payment_service.get_payments_by_tenant(tenant_id)),
+        }
+        cache[tenant_id] = row
+        return row
 
-        main_info = tk.Label(
-            content,
-            text=f"👤 {name}",
-            font=("Segoe UI", 11, "bold"),
-            bg=bg_color,
-            anchor="w"
-        )
+    def _create_tenant_row(self, parent):
+        """Crea el widget reutilizable de una fila de inquilino (se reconfigura al reciclarse)."""
+        row_frame = tk.Frame(parent, relief="solid", bd=1)
+        row_frame.tenant = None
+        content = tk.Frame(row_frame)
+        content.pack(fill="x", padx=10, pady=4)
+        main_info = tk.Label(content, font=("Segoe UI", 11, "bold"), anchor="w")
         main_info.pack(anchor="w", pady=(0, 0))
-        details = tk.Label(
-            content,
-            text=f"🏠 Apto: {apartment_display} | 💰 Arriendo: {valor_arriendo_display} | 📞 Teléfono: {tenant.get('telefono', 'No registrado')}",
-            font=("Segoe UI", 9),
-            bg=bg_color,
-            anchor="w"
-        )
+        details = tk.Label(content, font=("Segoe UI", 9), anchor="w")
         details.pack(anchor="w", pady=(1, 0))
         # Línea única: Día de pago + Estado (Al día / En mora)
-        payment_line = tk.Frame(content, bg=bg_color)
+        payment_line = tk.Frame(content)
         payment_line.pack(anchor="w", pady=(1, 0))
-        dia_pago_label = None
-        if dia_pago:
-            dia_pago_label = tk.Label(
-                payment_line,
-                text=f"📅 Día de pago: {dia_pago} de cada mes",
-                font=("Segoe UI", 9),
-                bg=bg_color,
-                fg="#1976d2",
-                anchor="w"
-            )
-            dia_pago_label.pack(side="left")
-        estado_label = tk.Label(
-            payment_line,
-            text=f"  ● {estado_texto}" if dia_pago else f"● {estado_texto}",
-            font=("Segoe UI", 9, "bold"),
-            fg=status_color,
-            bg=bg_color
-        )
+        dia_pago_label = tk.Label(payment_line, font=("Segoe UI", 9), fg="#1976d2", anchor="w")
+        estado_label = tk.Label(payment_line, font=("Segoe UI", 9, "bold"))
         estado_label.pack(side="left")
         
         # Frame para botones de acción
-        actions_frame = tk.Frame(content, bg=bg_color)
+        actions_frame = tk.Frame(content)
         actions_frame.pack(anchor="w", pady=(2, 0))
         
-        # Comprobar si el inquilino tiene pagos: si tiene, Eliminar se deshabilita
-        tenant_id = tenant.get("id")
-        has_payments = bool(tenant_id and len(payment_service.get_payments_by_tenant(tenant_id)) > 0)
-        
         # Botón Registrar Pago
-        deactivate_btn = tk.Button(
+        register_btn = tk.Button(
             actions_frame,
             text="� Registrar Pago",
             font=("Segoe UI", 8),
@@ -603,50 +567,61 @@ class TenantsView(tk.Frame):
             padx=8,
             pady=2,
             cursor="hand2",
-            command=lambda t=tenant: self.on_register_payment(t)
+            command=lambda: row_frame.tenant and self.on_register_payment(row_frame.tenant)
         )
-        deactivate_btn.pack(side="left", padx=(0, 6))
+        register_btn.pack(side="left", padx=(0, 6))
         
         # Botón de eliminar (deshabilitado si tiene al menos un pago registrado)
         delete_btn = tk.Button(
             actions_frame,
             text="🗑️ Eliminar",
             font=("Segoe UI", 8),
-            bg="#dc2626",
-            fg="white",
             relief="flat",
             padx=8,
             pady=2,
-            cursor="hand2" if not has_payments else "arrow",
-            state="normal" if not has_payments else "disabled",
-            command=lambda t=tenant: self._confirm_delete_tenant(t)
+            command=lambda: row_frame.tenant and self._confirm_delete_tenant(row_frame.tenant)
         )
         delete_btn.pack(side="left")
-        if has_payments:
-            delete_btn.configure(fg="#9ca3af", bg="#d1d5db")
-        
-        # Hacer clic en el card para ver detalles - MEJORADO: toda el área es clickeable
-        def on_card_click(event, t=tenant):
-            # Verificar que el clic no fue en los botones de acción o su frame
-            clicked_widget = event.widget
-            if clicked_widget in (delete_btn, deactivate_btn, actions_frame):
-                return
-            try:
-                parent = clicked_widget.winfo_parent()
-                if parent == str(delete_btn) or parent == str(deactivate_btn) or parent == str(actions_frame):
-                    return
-            except:
-                pass
-            self._show_tenant_details(t)
         
-        # Bind a TODO el card y TODOS sus hijos para hacer toda el área clickeable
-        all_clickable_widgets = [row_frame, content, main_info, details, payment_line, estado_label]
-        if dia_pago_label is not None:
-            all_clickable_widgets.append(dia_pago_label)
+        # Hacer clic en el card para ver detalles: toda el área es clickeable salvo los botones
+        def on_card_click(event):
+            if row_frame.tenant is not None:
+                self._show_tenant_details(row_frame.tenant)
         
-        for widget in all_clickable_widgets:
+        clickable = [row_frame, content, main_info, details, payment_line, dia_pago_label, estado_label]
+        for widget in clickable:
             widget.bind("<Button-1>", on_card_click)
             widget.configure(cursor="hand2")
+        row_frame.widgets = {
+            "content": content, "main_info": main_info, "details": details,
+            "payment_line": payment_line, "dia_pago": dia_pago_label, "estado": estado_label,
+            "actions": actions_frame, "delete": delete_btn,
+        }
+        return row_frame
+
+    def _update_tenant_row(self, row_frame, data, index):
+        """Muestra en row_frame el inquilino data = (tenant, color de estado, es_par)."""
+        tenant, status_color, is_even = data
+        row = self._get_row_data(tenant)
+        w = row_frame.widgets
+        bg_color = "#ffffff" if is_even else "#f8f9fa"
+        row_frame.tenant = tenant
+        for key in ("content", "main_info", "details", "payment_line", "dia_pago", "estado", "actions"):
+            w[key].configure(bg=bg_color)
+        row_frame.configure(bg=bg_color)
+        w["main_info"].configure(text=row["name"])
+        w["details"].configure(text=row["details"])
+        if row["dia_pago"]:
+            w["dia_pago"].configure(text=row["dia_pago"])
+            if not w["dia_pago"].winfo_manager():
+                w["dia_pago"].pack(side="left", before=w["estado"])
+        elif w["dia_pago"].winfo_manager():
+            w["dia_pago"].pack_forget()
+        w["estado"].configure(text=row["estado"], fg=status_color)
+        if row["has_payments"]:
+            w["delete"].configure(state="disabled", cursor="arrow", fg="#9ca3af", bg="#d1d5db")
+        else:
+            w["delete"].configure(state="normal", cursor="hand2", fg="white", bg="#dc2626")
     
     def _show_tenant_details(self, tenant):
         """Muestra los detalles de un inquilino"""
@@ -814,8 +789,15 @@ class TenantsView(tk.Frame):
         }
 
     def _on_search_change(self, event=None):
-        """Búsqueda en tiempo real"""
-        self._apply_filters()
+        """Búsqueda en tiempo real: filtra cuando el usuario deja de escribir SEARCH_DEBOUNCE_MS"""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._run_pending_search)
+
+    def _run_pending_search(self):
+        self._search_after_id = None
+        if self.current_view == "list" and self.tenant_list is not None and self.tenant_list.winfo_exists():
+            self._apply_filters()
 
     def _on_filter_change(self, event=None):
         """Aplicar filtros cuando cambian los combos"""
@@ -0,0 +1,239 @@
+"""
+Configuración común de los tests.
+
+Los servicios guardan sus datos en rutas fijas (paths_config.DATA_DIR y las rutas
+derivadas: DATA_FILE / CONFIG_FILE de cada servicio, DATA_DIR de los módulos...).
+isolated_data_dir las traslada a tmp_path en cada test y deja los singletons
+(LazyService) sin construir, así ningún test lee ni escribe la carpeta data/ del
+proyecto; data_dir_unchanged lo comprueba al final de la sesión. Los tests pueden
+además apuntar un servicio a otro archivo y usar replace_service para que el
+singleton apunte a esa instancia.
+
+smtp_server es un servidor SMTP local en un hilo (sin TLS ni login): se pasa
+smtp_server.connect como connect a open_session, send_campaign o email_outbox.start.
+"""
+
+import importlib
+import pkgutil
+import smtplib
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+# El paquete es la carpeta del proyecto (manager): su padre va en sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from manager.app import paths_config, reporting, services, storage  # noqa: E402
+from manager.app.services import service_registry  # noqa: E402
+
+# Carpetas escribibles bajo paths_config.BASE_PATH (datos, respaldos, documentos, exportes)
+WRITABLE_DIRS = {
+    Path(d).relative_to(paths_config.BASE_PATH).parts[0]
+    for d in (paths_config.DATA_DIR, paths_config.BACKUPS_DIR, paths_config.GASTOS_DOCS_DIR,
+              paths_config.EXPORTS_DIR)
+}
+
+
+def _data_modules() -> List:
+    """Módulos que guardan rutas de datos (se importan todos para poder trasladarlas)."""
+    modules = [paths_config, storage]
+    for package in (services, reporting):
+        for info in pkgutil.iter_modules(package.__path__):
+            modules.append(importlib.import_module(f"{package.__name__}.{info.name}"))
+    return modules
+
+
+def _rebased(value, base: Path):
+    """value (Path o str) trasladado de una carpeta escribible de BASE_PATH a base; None si no es una."""
+    if not isinstance(value, (Path, str)) or not value:
+        return None
+    try:
+        relative = Path(value).relative_to(paths_config.BASE_PATH)
+    except ValueError:
+        return None
+    if not relative.parts or relative.parts[0] not in WRITABLE_DIRS:
+        return None
+    moved = base / relative
+    return moved if isinstance(value, Path) else str(moved)
+
+
+def _snapshot(folder: Path) -> Dict[str, Tuple[int, int]]:
+    """Archivos de folder con su tamaño y fecha de modificación."""
+    if not folder.exists():
+        return {}
+    return {str(p.relative_to(folder)): (p.stat().st_size, p.stat().st_mtime_ns)
+            for p in folder.rglob("*") if p.is_file()}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def data_dir_unchanged():
+    """Al terminar la sesión, la carpeta data/ del proyecto debe estar igual que al empezar."""
+    folder = paths_config.DATA_DIR
+    before = _snapshot(folder)
+    yield
+    assert _snapshot(folder) == before, f"Los tests modificaron {folder}"
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_dir(tmp_path, monkeypatch):
+    """
+    Traslada a tmp_path las rutas de datos de paths_config y de los módulos de servicios
+    y reportes (módulo y clases) y deja los singletons sin construir durante el test.
+    """
+    base = tmp_path / "app"
+    for module in _data_modules():
+        owners = [module] + [obj for obj in vars(module).values()
+                             if isinstance(obj, type) and obj.__module__ == module.__name__]
+        for owner in owners:
+            for name, value in list(vars(owner).items()):
+                if name.isupper():
+                    moved = _rebased(value, base)
+                    if moved is not None:
+                        monkeypatch.setattr(owner, name, moved)
+    saved = {name: object.__getattribute__(proxy, "_lazy_instance")
+             for name, proxy in service_registry._registry.items()}
+    for proxy in service_registry._registry.values():
+        object.__setattr__(proxy, "_lazy_instance", None)
+    yield base / "data"
+    for name, proxy in service_registry._registry.items():
+        object.__setattr__(proxy, "_lazy_instance", saved.get(name))
+
+
+@pytest.fixture(autouse=True)
+def json_storage(monkeypatch):
+    """Backend JSON con bitácora, sin leer app_config.json."""
+    monkeypatch.setattr(storage, "get_backend_name", lambda: storage.BACKEND_JSON)
+    monkeypatch.setattr(storage, "journal_enabled", lambda: True)
+
+
+@pytest.fixture
+def replace_service():
+    """Instala una instancia en el singleton de un servicio; al terminar restaura la anterior."""
+    saved = []
+
+    def replace(proxy, instance):
+        saved.append((proxy, object.__getattribute__(proxy, "_lazy_instance")))
+        object.__setattr__(proxy, "_lazy_instance", instance)
+        return instance
+
+    yield replace
+    for proxy, instance in reversed(saved):
+        object.__setattr__(proxy, "_lazy_instance", instance)
+
+
+@pytest.fixture
+def email_config(tmp_path, monkeypatch, replace_service):
+    """EmailService con configuración en tmp_path (sin credenciales) instalado en email_service."""
+    from manager.app.services.email_service import EmailService, email_service
+
+    monkeypatch.setattr(EmailService, "CONFIG_FILE", tmp_path / "email_config.json")
+    return replace_service(email_service, EmailService())
+
+
+class FakeSmtpServer:
+    """
+    Servidor SMTP mínimo en 127.0.0.1 (un hilo por conexión). Guarda los mensajes
+    aceptados en messages como (remitente, destinatarios, datos). Con disconnect_every = N
+    cierra la conexión (sin responder a QUIT) tras aceptar N mensajes en ella; los
+    destinatarios en refuse se rechazan con 550.
+    """
+
+    def __init__(self):
+        self.messages: List[Tuple[str, List[str], str]] = []
+        self.connections = 0
+        self.disconnect_every = 0
+        self.refuse = set()
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                fake._session(self.rfile, self.wfile)
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-smtp", daemon=True)
+
+    def start(self) -> "FakeSmtpServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def connect(self) -> smtplib.SMTP:
+        return smtplib.SMTP(self.host, self.port, timeout=5)
+
+    def recipients(self) -> List[str]:
+        with self._lock:
+            return [to for _, rcpts, _ in self.messages for to in rcpts]
+
+    @staticmethod
+    def _address(command: str) -> str:
+        return command.split(":", 1)[1].strip().split(" ")[0].strip("<>")
+
+    def _session(self, rfile, wfile) -> None:
+        def reply(line: str) -> None:
+            wfile.write((line + "\r\n").encode("ascii"))
+            wfile.flush()
+
+        with self._lock:
+            self.connections += 1
+        reply("220 fake-smtp ESMTP")
+        accepted = 0
+        mail_from, rcpts = None, []
+        while True:
+            line = rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                reply("250 fake-smtp")
+            elif verb == "MAIL":
+                mail_from, rcpts = self._address(command), []
+                reply("250 OK")
+            elif verb == "RCPT":
+                address = self._address(command)
+                if address in self.refuse:
+                    reply("550 5.1.1 Mailbox unavailable")
+                else:
+                    rcpts.append(address)
+                    reply("250 OK")
+            elif verb == "DATA":
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    line = rfile.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    data.append(line)
+                with self._lock:
+                    self.messages.append((mail_from, rcpts, b"".join(data).decode("utf-8", "replace")))
+                reply("250 OK")
+                accepted += 1
+                if self.disconnect_every and accepted >= self.disconnect_every:
+                    return
+            elif verb in ("RSET", "NOOP"):
+                if verb == "RSET":
+                    mail_from, rcpts = None, []
+                reply("250 OK")
+            elif verb == "QUIT":
+                reply("221 Bye")
+                return
+            else:
+                reply("502 Command not implemented")
+
+
+@pytest.fixture
+def smtp_server():
+    """Servidor SMTP local de prueba (ver FakeSmtpServer)."""
+    server = FakeSmtpServer().start()
+    yield server
+    server.stop()
@@ -0,0 +1,107 @@
+"""
+Tests del recibo PDF: la plantilla del proceso (ReceiptTemplate) usa internos de reportlab
+(imagen ya codificada, form del marco), así que el recibo se compara píxel a píxel con el
+dibujado directo (canvas.drawImage y el marco dibujado en cada recibo). Requiere pypdfium2
+para rasterizar; al subir la versión de reportlab (requirements.txt) deben pasar.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from manager.app import receipt_pdf
+
+pdfium = pytest.importorskip("pypdfium2")
+Image = pytest.importorskip("PIL.Image")
+
+PAYMENT = {"id": 1, "nombre_inquilino": "Ana Pérez", "fecha_pago": "05/03/2025", "monto": 1500000,
+           "metodo": "Transferencia", "observaciones": "Marzo"}
+TENANT = {"id": 1, "nombre": "Ana Pérez", "apartamento": "3", "numero_documento": "123"}
+
+
+class DirectTemplate:
+    """Dibuja todo en cada recibo, sin las partes preparadas de ReceiptTemplate."""
+
+    def __init__(self, logo_path=None):
+        from reportlab.lib.pagesizes import letter
+        self.pagesize = letter
+        self._logo = receipt_pdf.load_logo(receipt_pdf.resolve_logo_path(logo_path))
+        self.has_logo = self._logo is not None
+
+    def draw_frame(self, c):
+        receipt_pdf._draw_receipt_frame(c, *c._pagesize, self.has_logo)
+
+    def draw_logo(self, c, x, y, w, h):
+        if self._logo is None:
+            return False
+        c.drawImage(self._logo, x, y, width=w, height=h, mask="auto")
+        return True
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 3, 6, 10, 30)
+
+
+@pytest.fixture(autouse=True)
+def fixed_issue_date(monkeypatch):
+    """La fecha "Emitido" no cambia entre los dos recibos comparados."""
+    monkeypatch.setattr(receipt_pdf, "datetime", FixedDatetime)
+
+
+@pytest.fixture
+def logo(tmp_path):
+    """PNG con transparencia (usa la máscara suave del logo)."""
+    image = Image.new("RGBA", (120, 100), (0, 0, 0, 0))
+    for x in range(120):
+        for y in range(100):
+            if (x - 60) ** 2 + (y - 50) ** 2 < 45 ** 2:
+                image.putpixel((x, y), (30 + x, 80, 200 - y, 255 if x > 40 else 128))
+    path = tmp_path / "logo.png"
+    image.save(path)
+    return str(path)
+
+
+def render(path):
+    pdf = pdfium.PdfDocument(path)
+    try:
+        assert len(pdf) == 1
+        return pdf[0].render(scale=2).to_pil().convert("RGB")
+    finally:
+        pdf.close()
+
+
+def receipts(tmp_path, monkeypatch, logo_path):
+    """Rutas del recibo con la plantilla y dibujado directo."""
+    cached = str(tmp_path / "plantilla.pdf")
+    receipt_pdf.generate_payment_receipt_pdf(PAYMENT, TENANT, cached, logo_path=logo_path, apartment="301")
+    # Segundo recibo con la misma plantilla: las copias de la imagen y el form no se comparten
+    receipt_pdf.generate_payment_receipt_pdf(PAYMENT, TENANT, cached, logo_path=logo_path, apartment="301")
+    direct = str(tmp_path / "directo.pdf")
+    with monkeypatch.context() as patch:
+        patch.setattr(receipt_pdf, "receipt_template", DirectTemplate)
+        receipt_pdf.generate_payment_receipt_pdf(PAYMENT, TENANT, direct, logo_path=logo_path, apartment="301")
+    return cached, direct
+
+
+class TestReceiptTemplate:
+
+    def test_without_logo_matches_direct_drawing(self, tmp_path, monkeypatch):
+        cached, direct = receipts(tmp_path, monkeypatch, "")
+
+        assert not receipt_pdf.receipt_template("").has_logo
+        assert render(cached).tobytes() == render(direct).tobytes()
+
+    def test_with_logo_matches_direct_drawing(self, tmp_path, monkeypatch, logo):
+        cached, direct = receipts(tmp_path, monkeypatch, logo)
+
+        assert receipt_pdf.receipt_template(logo).has_logo
+        assert render(cached).tobytes() == render(direct).tobytes()
+
+    def test_template_is_rebuilt_when_the_logo_changes(self, tmp_path, logo):
+        first = receipt_pdf.receipt_template(logo)
+        assert receipt_pdf.receipt_template(logo) is first
+
+        Image.new("RGB", (60, 40), (200, 10, 10)).save(logo)
+        assert receipt_pdf.receipt_template(logo) is not first
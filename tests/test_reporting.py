@@ -0,0 +1,218 @@
+"""
+Tests de reportes sin interfaz: funciones build_* sobre una ReportSnapshot con fecha fija
+y cancelación de trabajos en ReportJobExecutor (deliver con un widget falso).
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from manager.app.reporting import queries
+from manager.app.reporting.jobs import (
+    STATUS_CANCELLED, STATUS_DONE, JobCancelled, ReportJobExecutor
+)
+from manager.app.reporting.payment_reports import build_pending_payments_report, build_period_report
+from manager.app.reporting.snapshot import NoReportData, ReportSnapshot
+from manager.app.services.tenant_service import compute_payment_status
+
+NOW = datetime(2025, 3, 20, 9, 0)
+
+TENANTS = [
+    {"id": 1, "nombre": "Ana Pérez", "apartamento": "1", "fecha_ingreso": "01/01/2025", "valor_arriendo": 1000},
+    {"id": 2, "nombre": "Luis Gómez", "apartamento": "2", "fecha_ingreso": "10/01/2025", "valor_arriendo": 1000},
+    {"id": 3, "nombre": "Marta Ruiz", "apartamento": "3", "fecha_ingreso": "16/02/2025", "valor_arriendo": 1000},
+    {"id": 4, "nombre": "Sin Pagos", "fecha_ingreso": "01/01/2025", "valor_arriendo": 1000,
+     "estado_pago": "inactivo", "fecha_desactivacion": "01/02/2025"},
+]
+APARTMENTS = [{"id": 1, "number": "101"}, {"id": 2, "number": "102"}, {"id": 3, "number": "103"}]
+
+
+def pay(tenant_id, fecha, monto=1000):
+    return {"id_inquilino": tenant_id, "nombre_inquilino": TENANTS[tenant_id - 1]["nombre"],
+            "fecha_pago": fecha, "monto": monto, "metodo": "Efectivo"}
+
+
+PAYMENTS = [pay(1, "01/01/2025"), pay(1, "01/02/2025"), pay(1, "01/03/2025"),
+            pay(2, "10/01/2025"), pay(3, "16/02/2025")]
+
+
+def snapshot(tenants=TENANTS, payments=PAYMENTS):
+    return ReportSnapshot(payments=payments, tenants=tenants, apartments=APARTMENTS, now=NOW)
+
+
+class TestTenantPaymentStatus:
+
+    def test_matches_the_service_rule(self):
+        snap = snapshot()
+        for tenant in TENANTS:
+            status, _ = queries.tenant_payment_status(snap, tenant)
+            payments = [p for p in PAYMENTS if p["id_inquilino"] == tenant["id"]]
+            assert status == compute_payment_status(tenant, payments, NOW)
+
+    def test_tenants_with_arrears_reports_each_tenant(self):
+        calls = []
+        pending = queries.tenants_with_arrears(snapshot(), on_tenant=lambda done, total: calls.append((done, total)))
+
+        assert [(t["id"], status) for t, status, _ in pending] == [(2, "moroso"), (3, "pendiente_pago")]
+        assert calls == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+
+class TestPendingPaymentsReport:
+
+    def test_lists_tenants_in_arrears(self):
+        progress = []
+        report = build_pending_payments_report(snapshot(), progress=lambda f, m: progress.append((f, m)))
+
+        assert "Inquilinos con pagos pendientes: 2" in report
+        assert "Fecha de generación: 20/03/2025 09:00" in report
+        assert "Ana Pérez" not in report
+        assert "Sin Pagos" not in report
+        luis = report.split("Inquilino: Luis Gómez")[1].split("Inquilino:")[0]
+        assert "Apartamento: 102" in luis
+        assert "Estado: En Mora" in luis
+        assert "Fecha de pago (vencimiento): 10/03/2025" in luis
+        assert "Días en mora: 1 mes y 10 días" in luis
+        assert "Monto total en mora: $2,000.00" in luis
+        assert "Estado: Pendiente de pago" in report.split("Inquilino: Marta Ruiz")[1]
+        assert progress[-1] == (1.0, "Calculando mora...")
+
+    def test_no_pending_tenants(self):
+        with pytest.raises(NoReportData):
+            build_pending_payments_report(snapshot(tenants=TENANTS[:1]))
+
+
+class TestPeriodReport:
+
+    def test_current_month(self):
+        report = build_period_report(snapshot(), {"type": "current_month"})
+
+        assert "Total de pagos: 1" in report
+        assert "Total recaudado: $1,000.00" in report
+        assert "Inquilino: Ana Pérez (Apt. 101)" in report
+
+    def test_period_without_payments(self):
+        with pytest.raises(NoReportData):
+            build_period_report(snapshot(payments=[]), {"type": "current_month"})
+
+
+def wait_done(job, timeout=5.0):
+    """Espera a que el callback de fin del future fije el estado del trabajo."""
+    deadline = time.monotonic() + timeout
+    while not job.done:
+        assert time.monotonic() < deadline, f"el trabajo {job.name} no terminó"
+        time.sleep(0.01)
+
+
+class FakeWidget:
+    """Widget con after() manual: cada test ejecuta los sondeos pendientes."""
+
+    def __init__(self):
+        self.exists = True
+        self.pending = []
+
+    def winfo_exists(self):
+        return self.exists
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def run_pending(self):
+        pending, self.pending = self.pending, []
+        for callback in pending:
+            callback()
+
+
+@pytest.fixture
+def executor():
+    instance = ReportJobExecutor(max_workers=1)
+    yield instance
+    instance.shutdown(wait=True)
+
+
+def until_cancelled(started, progress):
+    """Trabajo que informa progreso hasta que lo cancelan."""
+    started.set()
+    while True:
+        progress(0.5, "trabajando")
+        time.sleep(0.005)
+
+
+class TestReportJobCancellation:
+
+    def test_running_job_stops_at_next_progress(self, executor):
+        started = threading.Event()
+        job = executor.submit("largo", until_cancelled, started)
+        assert started.wait(5)
+
+        job.cancel()
+        wait_done(job)
+
+        assert job.status == STATUS_CANCELLED
+        assert job.result is None
+        assert isinstance(job._future.exception(), JobCancelled)
+
+    def test_queued_job_never_runs(self, executor):
+        release = threading.Event()
+        ran = []
+        blocker = executor.submit("bloqueo", lambda progress: release.wait(5))
+        queued = executor.submit("en cola", lambda progress: ran.append(1))
+
+        queued.cancel()
+        release.set()
+        wait_done(blocker)
+        wait_done(queued)
+
+        assert blocker.status == STATUS_DONE
+        assert queued.status == STATUS_CANCELLED
+        assert ran == []
+
+    def test_result_after_cancel_is_discarded(self, executor):
+        started, release = threading.Event(), threading.Event()
+
+        def ignores_progress(progress):
+            started.set()
+            release.wait(5)
+            return "tarde"
+
+        job = executor.submit("sin progreso", ignores_progress)
+        assert started.wait(5)
+        job.cancel()
+        release.set()
+        wait_done(job)
+
+        assert job.status == STATUS_CANCELLED
+        assert job.result is None
+
+    def test_deliver_cancels_when_widget_is_destroyed(self, executor):
+        started = threading.Event()
+        job = executor.submit("largo", until_cancelled, started)
+        assert started.wait(5)
+        widget, cancelled, progress = FakeWidget(), [], []
+        executor.deliver(widget, job, on_done=pytest.fail, on_cancelled=lambda: cancelled.append(1),
+                         on_progress=lambda f, m: progress.append(m))
+
+        widget.run_pending()
+        assert len(progress) == 1
+        widget.exists = False
+        widget.run_pending()
+        wait_done(job)
+
+        assert job.status == STATUS_CANCELLED
+        assert widget.pending == []
+        assert cancelled == []
+
+    def test_deliver_reports_cancellation(self, executor):
+        started = threading.Event()
+        job = executor.submit("largo", until_cancelled, started)
+        assert started.wait(5)
+        widget, cancelled = FakeWidget(), []
+        executor.deliver(widget, job, on_done=pytest.fail, on_cancelled=lambda: cancelled.append(1))
+
+        job.cancel()
+        wait_done(job)
+        widget.run_pending()
+
+        assert cancelled == [1]
+        assert widget.pending == []
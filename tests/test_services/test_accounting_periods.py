@@ -0,0 +1,115 @@
+"""Tests del cierre y la reapertura de meses contables (AccountingService)."""
+
+from datetime import datetime
+
+import pytest
+
+from manager.app.services import accounting_service as accounting_module
+from manager.app.services import payment_service as payment_module
+from manager.app.services.accounting_service import AccountingService, ClosedPeriodError
+from manager.app.services.payment_service import PaymentService
+
+
+@pytest.fixture
+def accounting(replace_service):
+    """Contabilidad con asientos de enero y febrero de 2025 y un pago de febrero."""
+    service = replace_service(accounting_module.accounting_service, AccountingService())
+    payments = replace_service(payment_module.payment_service, PaymentService())
+    service.add_entry(manual_entry("15/01/2025", 500.0))
+    service.add_entry(manual_entry("10/02/2025", 200.0))
+    payments.add_payment({"id_inquilino": 1, "nombre_inquilino": "Inquilino", "fecha_pago": "05/02/2025",
+                          "monto": 1000.0})
+    return service
+
+
+def manual_entry(fecha, monto, direccion="entrada"):
+    return {"tipo": "manual", "fecha": fecha, "direccion": direccion, "tipo_ajuste": "ajuste", "monto": monto}
+
+
+class TestClosePeriod:
+
+    def test_closure_keeps_balances_and_previous_months_in_saldo(self, accounting):
+        closure = accounting.close_period("2025-02")
+
+        assert closure["ingresos_arriendo"] == 1000.0
+        assert closure["ajustes_netos"] == 200.0
+        assert closure["balance_neto"] == 1200.0
+        assert closure["saldo_acumulado"] == 1700.0
+        assert accounting.get_closure("2025-02")["saldo_acumulado"] == 1700.0
+
+    def test_next_closure_continues_the_saldo(self, accounting):
+        accounting.close_period("2025-02")
+        accounting.add_entry(manual_entry("03/03/2025", 50.0, direccion="salida"))
+
+        closure = accounting.close_period("2025-03")
+
+        assert closure["balance_neto"] == -50.0
+        assert closure["saldo_acumulado"] == 1650.0
+
+    def test_months_are_closed_in_order(self, accounting):
+        accounting.close_period("2025-02")
+        with pytest.raises(ValueError):
+            accounting.close_period("2025-04")
+        with pytest.raises(ValueError):
+            accounting.close_period("2025-02")
+
+    def test_current_month_cannot_be_closed(self, accounting):
+        with pytest.raises(ValueError):
+            accounting.close_period(datetime.now().strftime("%Y-%m"))
+
+
+class TestEnsurePeriodOpen:
+
+    def test_closed_month_is_rejected(self, accounting):
+        accounting.close_period("2025-02")
+        with pytest.raises(ClosedPeriodError):
+            accounting.add_entry(manual_entry("20/02/2025", 10.0))
+
+    def test_months_before_first_closure_are_rejected(self, accounting):
+        accounting.close_period("2025-02")
+
+        assert accounting.is_period_closed("2025-01")
+        assert accounting.is_period_closed("2024-12")
+        with pytest.raises(ClosedPeriodError):
+            accounting.add_entry(manual_entry("15/01/2025", 10.0))
+        with pytest.raises(ClosedPeriodError):
+            payment_module.payment_service.add_payment(
+                {"id_inquilino": 1, "nombre_inquilino": "Inquilino", "fecha_pago": "05/12/2024", "monto": 10.0})
+        assert accounting.get_closure("2025-02")["saldo_acumulado"] == 1700.0
+
+    def test_later_months_stay_open(self, accounting):
+        accounting.close_period("2025-02")
+
+        assert not accounting.is_period_closed("2025-03")
+        accounting.add_entry(manual_entry("01/03/2025", 10.0))
+        accounting.ensure_period_open("2025-03-01", "no es una fecha")
+
+
+class TestReopenPeriod:
+
+    def test_reopen_cancels_later_closures(self, accounting):
+        accounting.close_period("2025-02")
+        accounting.close_period("2025-03")
+
+        assert accounting.reopen_period("2025-02") == ["2025-02", "2025-03"]
+        assert accounting.get_closed_periods() == []
+        accounting.add_entry(manual_entry("20/02/2025", 10.0))
+
+    def test_reopen_month_before_first_closure_reopens_all(self, accounting):
+        accounting.close_period("2025-02")
+
+        assert accounting.reopen_period("2025-01") == ["2025-02"]
+        assert not accounting.is_period_closed("2025-01")
+
+    def test_reopen_open_month_fails(self, accounting):
+        accounting.close_period("2025-02")
+        with pytest.raises(ValueError):
+            accounting.reopen_period("2025-03")
+
+    def test_closures_survive_reload(self, accounting):
+        accounting.close_period("2025-02")
+        reloaded = AccountingService()
+
+        assert [c["periodo"] for c in reloaded.get_closed_periods()] == ["2025-02"]
+        with pytest.raises(ClosedPeriodError):
+            reloaded.ensure_period_open("31/01/2025")
@@ -0,0 +1,115 @@
+"""Tests de las claves de fecha canónicas y su corrección al cargar."""
+
+import json
+
+import pytest
+
+from manager.app.services import payment_service as payment_module
+from manager.app.services.date_keys import (
+    PAYMENT_DATE_FIELDS, date_key, record_date_key, stamp_date_keys, stamp_stale, with_restamped
+)
+from manager.app.services.payment_service import PaymentService
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("07/03/2025", "2025-03-07"),
+    ("7/3/2025", "2025-03-07"),
+    ("2025-03-07", "2025-03-07"),
+    ("2025-03-07T10:30:00", "2025-03-07"),
+    (" 29/02/2024 ", "2024-02-29"),
+    ("29/02/2025", None),
+    ("", None),
+    (None, None),
+    ("mañana", None),
+])
+def test_date_key(value, expected):
+    assert date_key(value) == expected
+
+
+class TestStampStale:
+
+    def test_adds_missing_keys(self):
+        records = [{"fecha_pago": "05/01/2025"}, {"fecha_pago": "06/01/2025", "fecha_pago_iso": "2025-01-06"}]
+
+        assert stamp_stale(records, PAYMENT_DATE_FIELDS) == [records[0]]
+        assert records[0]["fecha_pago_iso"] == "2025-01-05"
+
+    def test_fixes_keys_that_disagree_with_the_field(self):
+        # La fecha se editó a mano en el JSON sin tocar la clave
+        records = [{"fecha_pago": "15/02/2025", "fecha_pago_iso": "2025-01-15"},
+                   {"fecha_pago": "15/02/2025", "fecha_pago_iso": "no es fecha"},
+                   {"fecha_pago": "15/02/2025", "fecha_pago_iso": "2025-02-15"}]
+
+        assert stamp_stale(records, PAYMENT_DATE_FIELDS) == records[:2]
+        assert [r["fecha_pago_iso"] for r in records] == ["2025-02-15"] * 3
+
+    def test_drops_keys_of_invalid_dates(self):
+        records = [{"fecha_pago": "sin fecha", "fecha_pago_iso": "2025-01-15"}, {"fecha_pago": ""}]
+
+        assert stamp_stale(records, PAYMENT_DATE_FIELDS) == records[:1]
+        assert "fecha_pago_iso" not in records[0]
+        assert record_date_key(records[0], "fecha_pago") is None
+
+    def test_unhashable_values(self):
+        records = [{"fecha_pago": ["05/01/2025"], "fecha_pago_iso": "2025-01-05"}]
+
+        assert stamp_stale(records, PAYMENT_DATE_FIELDS) == records
+        assert "fecha_pago_iso" not in records[0]
+
+
+def test_stamp_date_keys_reports_changes():
+    record = {"fecha_pago": "05/01/2025"}
+    assert stamp_date_keys(record, PAYMENT_DATE_FIELDS)
+    assert not stamp_date_keys(record, PAYMENT_DATE_FIELDS)
+
+
+@pytest.fixture
+def stale_payments(tmp_path, monkeypatch, replace_service):
+    """Pagos con una clave desactualizada y otra faltante, cargados por PaymentService."""
+    data_file = tmp_path / "payments.json"
+    monkeypatch.setattr(PaymentService, "DATA_FILE", data_file)
+    stored = [
+        {"id": 1, "id_inquilino": 1, "fecha_pago": "10/03/2025", "fecha_pago_iso": "2025-02-10", "monto": 100.0},
+        {"id": 2, "id_inquilino": 1, "fecha_pago": "11/03/2025", "monto": 200.0},
+    ]
+    data_file.write_text(json.dumps(stored), encoding="utf-8")
+    return data_file, replace_service(payment_module.payment_service, PaymentService())
+
+
+def stored_keys():
+    return {p["id"]: p.get("fecha_pago_iso") for p in PaymentService().get_all_payments()}
+
+
+def test_payments_with_stale_keys_are_fixed_on_load_without_writing(stale_payments):
+    data_file, service = stale_payments
+    before = data_file.read_bytes()
+
+    assert [p["id"] for p in service.get_payments_by_month(2025, 3)] == [1, 2]
+    assert service.get_payments_by_month(2025, 2) == []
+    assert service.monthly_rollup().totals("2025-03", "2025-03") == (300, 2)
+    assert data_file.read_bytes() == before
+
+
+def test_fixed_keys_are_saved_with_the_next_save(stale_payments):
+    _, service = stale_payments
+    service.add_payment({"id_inquilino": 2, "fecha_pago": "01/04/2025", "monto": 50.0})
+
+    keys = stored_keys()
+    assert keys[1] == "2025-03-10"
+    assert keys[2] == "2025-03-11"
+
+
+def test_deleted_record_is_not_saved_again(stale_payments):
+    _, service = stale_payments
+    service.delete_payment(2)
+
+    keys = stored_keys()
+    assert keys == {1: "2025-03-10"}
+
+
+def test_with_restamped_only_extends_incremental_saves():
+    a, b, c = {"id": 1}, {"id": 2}, {"id": 3}
+    assert with_restamped(None, None, [a]) is None
+    assert with_restamped([b], None, []) == [b]
+    assert with_restamped([b], [3], [a, b, c]) == [b, a]
+    assert with_restamped(None, [1], [a, c]) == [c]
@@ -0,0 +1,83 @@
+"""
+Tests de _count_due_periods y _add_months contra el conteo mes a mes con relativedelta
+(la implementación anterior de TenantService._get_arrears_info).
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from manager.app.services.tenant_service import _add_months, _count_due_periods
+
+
+def count_due_periods_loop(fecha_ingreso: datetime, hoy: datetime) -> int:
+    """Conteo original: períodos n con fecha_ingreso + relativedelta(months=n) <= hoy."""
+    n = 0
+    while fecha_ingreso + relativedelta(months=n) <= hoy:
+        n += 1
+    return n
+
+
+def random_date(rng: random.Random, start: datetime, days: int) -> datetime:
+    return start + timedelta(days=rng.randrange(days))
+
+
+class TestAddMonths:
+
+    @pytest.mark.parametrize("day", [28, 29, 30, 31])
+    def test_clamps_like_relativedelta(self, day):
+        for year in (2023, 2024):
+            start = datetime(year, 1, day)
+            for months in range(-30, 30):
+                assert _add_months(start, months) == start + relativedelta(months=months)
+
+    def test_leap_day_start(self):
+        start = datetime(2024, 2, 29)
+        assert _add_months(start, 12) == datetime(2025, 2, 28)
+        assert _add_months(start, 48) == datetime(2028, 2, 29)
+        assert _add_months(start, 1) == datetime(2024, 3, 29)
+
+
+class TestCountDuePeriods:
+
+    def test_random_pairs_match_loop(self):
+        rng = random.Random(20240229)
+        for _ in range(5000):
+            fecha_ingreso = random_date(rng, datetime(2000, 1, 1), 365 * 25)
+            hoy = fecha_ingreso + timedelta(days=rng.randrange(-60, 365 * 6))
+            assert _count_due_periods(fecha_ingreso, hoy) == count_due_periods_loop(fecha_ingreso, hoy), \
+                (fecha_ingreso, hoy)
+
+    @pytest.mark.parametrize("day", [28, 29, 30, 31])
+    def test_month_end_starts_match_loop_every_day(self, day):
+        for month in (1, 2, 3, 8, 12):
+            try:
+                fecha_ingreso = datetime(2023, month, day)
+            except ValueError:
+                continue
+            for offset in range(-5, 800):
+                hoy = fecha_ingreso + timedelta(days=offset)
+                assert _count_due_periods(fecha_ingreso, hoy) == count_due_periods_loop(fecha_ingreso, hoy), \
+                    (fecha_ingreso, hoy)
+
+    def test_leap_day_start_matches_loop_every_day(self):
+        fecha_ingreso = datetime(2024, 2, 29)
+        for offset in range(0, 365 * 5):
+            hoy = fecha_ingreso + timedelta(days=offset)
+            assert _count_due_periods(fecha_ingreso, hoy) == count_due_periods_loop(fecha_ingreso, hoy), hoy
+
+    def test_time_of_day_matches_loop(self):
+        rng = random.Random(7)
+        for _ in range(1000):
+            fecha_ingreso = random_date(rng, datetime(2015, 1, 1), 365 * 5)
+            hoy = random_date(rng, fecha_ingreso, 365 * 3) + timedelta(seconds=rng.randrange(86400))
+            assert _count_due_periods(fecha_ingreso, hoy) == count_due_periods_loop(fecha_ingreso, hoy)
+
+    def test_basic_cases(self):
+        assert _count_due_periods(datetime(2025, 1, 31), datetime(2025, 1, 30)) == 0
+        assert _count_due_periods(datetime(2025, 1, 31), datetime(2025, 1, 31)) == 1
+        assert _count_due_periods(datetime(2025, 1, 31), datetime(2025, 2, 28)) == 2
+        assert _count_due_periods(datetime(2025, 1, 31), datetime(2025, 3, 30)) == 2
+        assert _count_due_periods(datetime(2025, 1, 31), datetime(2025, 3, 31)) == 3
@@ -0,0 +1,215 @@
+"""Tests de la bandeja de salida de emails y su despachador (con una conexión SMTP falsa)."""
+
+import smtplib
+import time
+
+import pytest
+
+from manager.app.services import email_outbox as outbox_module
+from manager.app.services.email_outbox import (
+    EmailOutbox, IDLE_WAIT_SECONDS, STATUS_FAILED, STATUS_PENDING, STATUS_SENT
+)
+
+
+class FakeSmtp:
+    """Conexión SMTP falsa: guarda los mensajes o lanza el error indicado por destinatario."""
+
+    def __init__(self, errors=None):
+        self.sent = []
+        self.errors = errors or {}
+        self.closed = False
+
+    def sendmail(self, from_addr, to_addr, message):
+        if to_addr in self.errors:
+            raise self.errors[to_addr]
+        self.sent.append((from_addr, to_addr, message))
+
+    def quit(self):
+        self.closed = True
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def outbox(tmp_path, monkeypatch, email_config, replace_service):
+    monkeypatch.setattr(EmailOutbox, "DATA_FILE", tmp_path / "email_outbox.json")
+    instance = replace_service(outbox_module.email_outbox, EmailOutbox())
+    # enqueue() no inicia el hilo: cada test despacha a mano o llama a start()
+    monkeypatch.setattr(instance, "start", lambda connect=None: None)
+    yield instance
+    instance.stop(timeout=2)
+
+
+@pytest.fixture
+def server():
+    return FakeSmtp()
+
+
+class TestDispatchDue:
+
+    def test_sends_pending_messages_over_one_connection(self, outbox, server):
+        connections = []
+
+        def connect():
+            connections.append(server)
+            return server
+
+        outbox._connect = connect
+        ids = [outbox.enqueue("simple", f"inq{i}@example.com", f"Inquilino {i}", "Aviso", "Texto")
+               for i in range(3)]
+
+        assert outbox.dispatch_due() == 3
+        assert len(connections) == 1
+        assert [to for _, to, _ in server.sent] == [f"inq{i}@example.com" for i in range(3)]
+        assert all(outbox.get_status(i)["status"] == STATUS_SENT for i in ids)
+        assert server.closed
+        assert outbox.pending_count() == 0
+
+    def test_transient_error_is_retried_later(self, outbox):
+        outbox._connect = lambda: FakeSmtp({"a@example.com": smtplib.SMTPDataError(451, b"Try later")})
+        outbox_id = outbox.enqueue("simple", "a@example.com", "A", "Aviso", "Texto")
+
+        assert outbox.dispatch_due() == 0
+        status = outbox.get_status(outbox_id)
+        assert status["status"] == STATUS_PENDING
+        assert status["attempts"] == 1
+        assert "451" in status["last_error"]
+        # Reprogramado: no vuelve a salir en el mismo momento
+        assert outbox.dispatch_due() == 0
+        assert outbox.get_status(outbox_id)["attempts"] == 1
+
+    def test_refused_recipient_fails_without_retry(self, outbox):
+        refused = smtplib.SMTPRecipientsRefused({"x@example.com": (550, b"No such user")})
+        outbox._connect = lambda: FakeSmtp({"x@example.com": refused})
+        outbox_id = outbox.enqueue("simple", "x@example.com", "X", "Aviso", "Texto")
+
+        outbox.dispatch_due()
+        assert outbox.get_status(outbox_id)["status"] == STATUS_FAILED
+
+    def test_malformed_entry_fails_and_the_rest_are_sent(self, outbox, server):
+        outbox._connect = lambda: server
+        bad = outbox.enqueue("receipt", "a@example.com", "A", pdf_path="recibo.pdf",
+                             payment_date="01/05/2025", payment_amount=100)
+        good = outbox.enqueue("simple", "b@example.com", "B", "Aviso", "Texto")
+        outbox.entries[0]["payment_amount"] = "cien"
+
+        assert outbox.dispatch_due() == 1
+        status = outbox.get_status(bad)
+        assert status["status"] == STATUS_FAILED
+        assert "No se pudo armar el mensaje" in status["last_error"]
+        assert outbox.get_status(good)["status"] == STATUS_SENT
+
+    def test_unexpected_send_error_does_not_leave_entry_sending(self, outbox):
+        outbox._connect = lambda: FakeSmtp({"a@example.com": RuntimeError("fallo inesperado")})
+        outbox_id = outbox.enqueue("simple", "a@example.com", "A", "Aviso", "Texto")
+
+        outbox.dispatch_due()
+        status = outbox.get_status(outbox_id)
+        assert status["status"] == STATUS_PENDING
+        assert status["attempts"] == 1
+
+    def test_entries_are_released_if_the_loop_fails(self, outbox, server, monkeypatch):
+        outbox._connect = lambda: server
+        outbox_id = outbox.enqueue("simple", "a@example.com", "A", "Aviso", "Texto")
+
+        def broken_finish(entry, status, error):
+            raise RuntimeError("disco lleno")
+
+        monkeypatch.setattr(outbox, "_finish", broken_finish)
+        with pytest.raises(RuntimeError):
+            outbox.dispatch_due()
+        assert outbox.get_status(outbox_id)["status"] == STATUS_PENDING
+
+    def test_unreachable_server_costs_one_attempt_per_round(self, outbox):
+        connections = []
+
+        def connect():
+            connections.append(1)
+            raise ConnectionRefusedError("Connection refused")
+
+        outbox._connect = connect
+        first, *rest = [outbox.enqueue("simple", f"inq{i}@example.com", f"Inquilino {i}", "Aviso", "Texto")
+                        for i in range(3)]
+
+        assert outbox.dispatch_due() == 0
+        assert len(connections) == 1
+        status = outbox.get_status(first)
+        assert status["status"] == STATUS_PENDING
+        assert status["attempts"] == 1
+        assert "No se pudo conectar" in status["last_error"]
+        for outbox_id in rest:
+            other = outbox.get_status(outbox_id)
+            assert other["status"] == STATUS_PENDING
+            assert other.get("attempts", 0) == 0
+            assert other["next_attempt_at"] == status["next_attempt_at"]
+        # Todos esperan el reintento del primero
+        assert outbox.dispatch_due() == 0
+        assert len(connections) == 1
+
+    def test_error_on_open_connection_only_retries_that_message(self, outbox, server):
+        server.errors["a@example.com"] = OSError("Connection reset by peer")
+        outbox._connect = lambda: server
+        failed = outbox.enqueue("simple", "a@example.com", "A", "Aviso", "Texto")
+        sent = outbox.enqueue("simple", "b@example.com", "B", "Aviso", "Texto")
+
+        assert outbox.dispatch_due() == 1
+        assert outbox.get_status(failed)["attempts"] == 1
+        assert outbox.get_status(sent)["status"] == STATUS_SENT
+
+    def test_nothing_is_sent_without_configuration(self, outbox):
+        outbox.enqueue("simple", "a@example.com", "A", "Aviso", "Texto")
+
+        assert outbox.dispatch_due() == 0
+        assert outbox.pending_count() == 1
+
+
+class TestDispatcherThread:
+
+    def test_waits_idle_while_email_is_not_configured(self, outbox, monkeypatch):
+        outbox.enqueue("simple", "a@example.com", "A", "Aviso", "Texto")
+        assert outbox._seconds_to_next() == IDLE_WAIT_SECONDS
+
+        calls = []
+        dispatch_due = outbox.dispatch_due
+        monkeypatch.setattr(outbox, "dispatch_due", lambda: calls.append(1) or dispatch_due())
+        monkeypatch.delattr(outbox, "start")
+        outbox._wake.clear()
+        outbox.start()
+        time.sleep(0.3)
+        assert len(calls) == 1
+
+    def test_saving_the_configuration_wakes_the_dispatcher(self, outbox, email_config, server, monkeypatch):
+        monkeypatch.delattr(outbox, "start")
+        # La conexión configurada se reemplaza por la falsa (no hay servidor real)
+        monkeypatch.setattr(email_config, "_connect", lambda: server)
+        outbox_id = outbox.enqueue("simple", "a@example.com", "A", "Aviso", "Texto")
+        time.sleep(0.1)
+        assert outbox.get_status(outbox_id)["status"] == STATUS_PENDING
+
+        assert email_config.save_config({"provider": "gmail", "email": "admin@example.com",
+                                         "password": "clave"})
+        assert wait_until(lambda: outbox.get_status(outbox_id)["status"] == STATUS_SENT)
+        assert server.sent[0][0] == "admin@example.com"
+
+    def test_start_with_connect_sends_in_background(self, outbox, server, monkeypatch):
+        monkeypatch.delattr(outbox, "start")
+        outbox_id = outbox.enqueue("simple", "a@example.com", "A", "Aviso", "Texto")
+        outbox.start(connect=lambda: server)
+
+        assert wait_until(lambda: outbox.get_status(outbox_id)["status"] == STATUS_SENT)
+        outbox.stop(timeout=2)
+        assert not outbox._thread.is_alive()
+
+
+def test_retry_delay_grows_exponentially_up_to_the_limit():
+    delays = [outbox_module.retry_delay(n) for n in range(1, 10)]
+    assert delays[:3] == [30, 60, 120]
+    assert delays[-1] == outbox_module.RETRY_MAX_SECONDS
+    assert delays == sorted(delays)
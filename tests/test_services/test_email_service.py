@@ -0,0 +1,112 @@
+"""Tests de SmtpSession (contra el servidor SMTP local de prueba) y de SendRateLimiter."""
+
+import smtplib
+
+import pytest
+
+from manager.app.services.email_service import SendRateLimiter, SmtpSession
+
+
+def message(to_addr: str, subject: str = "Aviso") -> str:
+    return f"From: admin@example.com\r\nTo: {to_addr}\r\nSubject: {subject}\r\n\r\nTexto\r\n"
+
+
+class TestSmtpSession:
+
+    def test_messages_share_one_connection(self, smtp_server):
+        recipients = [f"inq{i}@example.com" for i in range(5)]
+        with SmtpSession(smtp_server.connect) as session:
+            for to_addr in recipients:
+                session.send("admin@example.com", to_addr, message(to_addr))
+
+        assert session.connections == 1
+        assert smtp_server.connections == 1
+        assert smtp_server.recipients() == recipients
+
+    def test_connects_on_first_send(self, smtp_server):
+        with SmtpSession(smtp_server.connect) as session:
+            assert session.connections == 0
+        assert smtp_server.connections == 0
+
+    def test_reconnects_when_the_server_disconnects(self, smtp_server):
+        smtp_server.disconnect_every = 2
+        recipients = [f"inq{i}@example.com" for i in range(5)]
+        with SmtpSession(smtp_server.connect) as session:
+            for to_addr in recipients:
+                session.send("admin@example.com", to_addr, message(to_addr))
+
+        assert smtp_server.recipients() == recipients
+        assert session.connections == 3
+
+    def test_refused_recipient_raises_and_session_continues(self, smtp_server):
+        smtp_server.refuse.add("nadie@example.com")
+        with SmtpSession(smtp_server.connect) as session:
+            with pytest.raises(smtplib.SMTPRecipientsRefused) as excinfo:
+                session.send("admin@example.com", "nadie@example.com", message("nadie@example.com"))
+            session.send("admin@example.com", "inq@example.com", message("inq@example.com"))
+
+        assert excinfo.value.recipients["nadie@example.com"][0] == 550
+        assert smtp_server.recipients() == ["inq@example.com"]
+        assert session.connections == 1
+
+    def test_gives_up_after_one_reconnection(self):
+        attempts = []
+
+        class Closed:
+            def sendmail(self, *args):
+                raise smtplib.SMTPServerDisconnected("cerrada")
+
+        def connect():
+            attempts.append(1)
+            return Closed()
+
+        with pytest.raises(smtplib.SMTPServerDisconnected):
+            SmtpSession(connect).send("admin@example.com", "inq@example.com", message("inq@example.com"))
+        assert len(attempts) == 2
+
+
+class FakeClock:
+    """Reloj manual: sleep() avanza el tiempo en lugar de esperar."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+class TestSendRateLimiter:
+
+    def test_spaces_sends_by_max_per_minute(self):
+        clock = FakeClock()
+        limiter = SendRateLimiter(30, clock=clock, sleep=clock.sleep)
+        for _ in range(4):
+            limiter.wait()
+
+        assert clock.sleeps == [2.0, 2.0, 2.0]
+        assert clock.now == 1006.0
+
+    def test_only_waits_for_the_remaining_interval(self):
+        clock = FakeClock()
+        limiter = SendRateLimiter(60, clock=clock, sleep=clock.sleep)
+        limiter.wait()
+        clock.now += 0.25
+        limiter.wait()
+        clock.now += 5
+        limiter.wait()
+
+        assert clock.sleeps == [0.75]
+
+    @pytest.mark.parametrize("max_per_minute", [0, None, -1])
+    def test_no_limit(self, max_per_minute):
+        clock = FakeClock()
+        limiter = SendRateLimiter(max_per_minute, clock=clock, sleep=clock.sleep)
+        for _ in range(10):
+            limiter.wait()
+
+        assert clock.sleeps == []
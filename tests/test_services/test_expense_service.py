@@ -0,0 +1,55 @@
+"""Tests de filter_expenses con el backend SQLite, dentro y fuera de una transacción."""
+
+import pytest
+
+from manager.app import services, storage
+from manager.app.services import expense_service as expense_module
+from manager.app.services.expense_service import ExpenseService
+
+
+@pytest.fixture
+def expenses(monkeypatch, replace_service):
+    """ExpenseService sobre SQLite (base en el directorio de datos de la prueba)."""
+    monkeypatch.setattr(storage, "get_backend_name", lambda: storage.BACKEND_SQLITE)
+    service = replace_service(expense_module.expense_service, ExpenseService())
+    assert service._store.supports_query
+    yield service
+    connection = storage.SqliteRecordStore._connections.pop(str(service._store.db_path), None)
+    if connection is not None:
+        connection.close()
+
+
+def expense(fecha, categoria="Servicios", monto=100.0):
+    return {"fecha": fecha, "categoria": categoria, "monto": monto}
+
+
+def ids(records):
+    return [e["id"] for e in records]
+
+
+class TestFilterExpenses:
+
+    def test_uses_the_table_outside_a_transaction(self, expenses):
+        expenses.add_expense(expense("2025-03-05"))
+        expenses.add_expense(expense("2025-04-01"))
+        expenses.add_expense(expense("2025-03-20", categoria="Mantenimiento"))
+
+        assert ids(expenses.filter_expenses(2025, 3)) == [1, 3]
+        assert ids(expenses.filter_expenses(2025, 3, "Mantenimiento")) == [3]
+        assert ids(expenses.filter_expenses(2025)) == [1, 2, 3]
+
+    def test_sees_uncommitted_changes_inside_a_transaction(self, expenses):
+        expenses.add_expense(expense("2025-03-05"))
+        expenses.add_expense(expense("2025-03-06"))
+
+        with services.transaction():
+            expenses.add_expense(expense("2025-03-10"))
+            expenses.delete_expense(1)
+            expenses.update_expense(2, {"categoria": "Mantenimiento"})
+
+            assert ids(expenses.filter_expenses(2025, 3)) == [2, 3]
+            assert ids(expenses.filter_expenses(2025, 3, "Mantenimiento")) == [2]
+            assert ids(expenses._store.select_prefix("fecha", "2025-03")) == [1, 2]
+
+        assert ids(expenses.filter_expenses(2025, 3)) == [2, 3]
+        assert ids(expenses.filter_expenses(2025, 3, "Mantenimiento")) == [2]
@@ -0,0 +1,74 @@
+"""Tests de NotificationService.send_campaign contra el servidor SMTP local de prueba."""
+
+import pytest
+
+from manager.app.services import notification_service as notification_module
+from manager.app.services.email_service import SendRateLimiter
+from manager.app.services.notification_service import NotificationService
+
+
+@pytest.fixture
+def notifications(tmp_path, monkeypatch, email_config, replace_service):
+    monkeypatch.setattr(NotificationService, "DATA_FILE", tmp_path / "notifications.json")
+    email_config.config.update(email="admin@example.com", password="clave")
+    return replace_service(notification_module.notification_service, NotificationService())
+
+
+def campaign(count, **errors):
+    messages = []
+    for i in range(1, count + 1):
+        entry = {"tenant_id": i, "tenant_name": f"Inquilino {i}", "email": f"inq{i}@example.com",
+                 "subject": "Recordatorio de pago", "body": f"Estimado/a Inquilino {i}: su pago vence el día 5."}
+        if i in errors.get("without_email", ()):
+            entry = {key: entry[key] for key in ("tenant_id", "tenant_name")}
+            entry.update(email="", error="El inquilino no tiene un email registrado.")
+        messages.append(entry)
+    return messages
+
+
+def send(service, messages, smtp_server, progress=None):
+    return service.send_campaign(messages, "payment_reminder", connect=smtp_server.connect,
+                                 rate_limiter=SendRateLimiter(0), progress=progress)
+
+
+class TestSendCampaign:
+
+    def test_campaign_uses_one_session(self, notifications, smtp_server):
+        steps = []
+        results = send(notifications, campaign(6), smtp_server,
+                       progress=lambda fraction, text: steps.append(fraction))
+
+        assert all(r["success"] for r in results)
+        assert smtp_server.connections == 1
+        assert smtp_server.recipients() == [f"inq{i}@example.com" for i in range(1, 7)]
+        assert steps[0] == 0 and steps[-1] == 1.0
+        history = notifications.get_notification_history()
+        assert [h["tenant_id"] for h in history] == [1, 2, 3, 4, 5, 6]
+        assert all(h["template_key"] == "payment_reminder" for h in history)
+
+    def test_reconnects_when_the_server_drops_every_n_messages(self, notifications, smtp_server):
+        smtp_server.disconnect_every = 3
+        results = send(notifications, campaign(10), smtp_server)
+
+        assert all(r["success"] for r in results)
+        assert len(smtp_server.messages) == 10
+        assert smtp_server.connections == 4
+
+    def test_refused_recipient_fails_alone(self, notifications, smtp_server):
+        smtp_server.refuse.add("inq2@example.com")
+        results = send(notifications, campaign(4, without_email=[3]), smtp_server)
+
+        assert [r["success"] for r in results] == [True, False, False, True]
+        assert results[1]["message"] == "El servidor rechazó la dirección de email del destinatario."
+        assert results[2]["message"] == "El inquilino no tiene un email registrado."
+        assert smtp_server.recipients() == ["inq1@example.com", "inq4@example.com"]
+        assert smtp_server.connections == 1
+        assert [h["tenant_id"] for h in notifications.get_notification_history()] == [1, 4]
+
+    def test_nothing_is_sent_without_configuration(self, notifications, email_config, smtp_server):
+        email_config.config.update(email="", password="")
+        results = notifications.send_campaign(campaign(2), "payment_reminder")
+
+        assert [r["success"] for r in results] == [False, False]
+        assert smtp_server.connections == 0
+        assert notifications.get_notification_history() == []
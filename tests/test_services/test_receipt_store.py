@@ -0,0 +1,114 @@
+"""Tests del índice de recibos: PDF reemplazados, adjuntos pendientes y pagos eliminados."""
+
+import os
+
+import pytest
+
+from manager.app.services import email_outbox as outbox_module
+from manager.app.services import payment_service as payment_module
+from manager.app.services import receipt_store as store_module
+from manager.app.services.email_outbox import STATUS_SENT, EmailOutbox
+from manager.app.services.payment_service import PaymentService
+from manager.app.services.receipt_store import ReceiptStore
+
+TENANT = {"id": 7, "nombre": "Ana Pérez", "numero_documento": "123", "apartamento": "3"}
+
+
+@pytest.fixture
+def store(replace_service):
+    return replace_service(store_module.receipt_store, ReceiptStore())
+
+
+@pytest.fixture
+def outbox(monkeypatch, email_config, replace_service):
+    """Bandeja de salida sin hilo despachador (cada test despacha a mano)."""
+    email_config.config.update(email="admin@example.com", password="clave")
+    instance = replace_service(outbox_module.email_outbox, EmailOutbox())
+    monkeypatch.setattr(instance, "start", lambda connect=None: None)
+    return instance
+
+
+def payment(fecha="05/03/2025", payment_id=1):
+    return {"id": payment_id, "id_inquilino": TENANT["id"], "nombre_inquilino": TENANT["nombre"],
+            "fecha_pago": fecha, "monto": 1500000, "metodo": "Transferencia"}
+
+
+def receipt(store, pay):
+    return store.get_receipt(pay, TENANT, apartment="301", logo_path="")
+
+
+def queue_receipt(outbox, path):
+    return outbox.enqueue("receipt", "ana@example.com", TENANT["nombre"], pdf_path=path,
+                          payment_date="05/03/2025", payment_amount=1500000)
+
+
+class TestReplacedReceipt:
+
+    def test_unchanged_payment_reuses_pdf(self, store):
+        path = receipt(store, payment())
+        mtime = os.stat(path).st_mtime_ns
+
+        assert receipt(store, payment()) == path
+        assert os.stat(path).st_mtime_ns == mtime
+
+    def test_new_path_deletes_old_pdf(self, store, outbox):
+        old = receipt(store, payment())
+        new = receipt(store, payment(fecha="06/03/2025"))
+
+        assert new != old
+        assert os.path.exists(new)
+        assert not os.path.exists(old)
+
+    def test_old_pdf_is_kept_until_the_queued_email_is_sent(self, store, outbox, smtp_server):
+        old = receipt(store, payment())
+        outbox_id = queue_receipt(outbox, old)
+
+        receipt(store, payment(fecha="06/03/2025"))
+        assert os.path.exists(old)
+        assert ReceiptStore()._retired == {old: 1}
+
+        outbox._connect = smtp_server.connect
+        assert outbox.dispatch_due() == 1
+        assert outbox.get_status(outbox_id)["status"] == STATUS_SENT
+        assert not os.path.exists(old)
+        assert "retired_paths" not in ReceiptStore()._by_payment[1]
+
+    def test_restored_path_is_not_deleted(self, store, outbox):
+        old = receipt(store, payment())
+        queue_receipt(outbox, old)
+        receipt(store, payment(fecha="06/03/2025"))
+
+        assert receipt(store, payment()) == old
+        store.release(old)
+        assert os.path.exists(old)
+
+
+class TestForget:
+
+    def test_forget_drops_index_entry_and_pdf(self, store, outbox):
+        path = receipt(store, payment())
+        store.forget([1, 99])
+
+        assert not os.path.exists(path)
+        assert ReceiptStore().entries == []
+
+    def test_forgotten_pdf_waits_for_queued_email(self, store, outbox):
+        path = receipt(store, payment())
+        queue_receipt(outbox, path)
+        store.forget([1])
+
+        assert os.path.exists(path)
+        assert ReceiptStore().current_path(1, None) is None
+        outbox.entries[0]["status"] = STATUS_SENT
+        store.release(path)
+        assert not os.path.exists(path)
+        assert ReceiptStore().entries == []
+
+    def test_delete_payment_forgets_its_receipt(self, store, outbox, replace_service):
+        payments = replace_service(payment_module.payment_service, PaymentService())
+        created = payments.add_payment({k: v for k, v in payment().items() if k != "id"})
+        path = receipt(store, created)
+
+        assert payments.delete_payment(created["id"])
+        assert not os.path.exists(path)
+        assert created["id"] not in ReceiptStore()._by_payment
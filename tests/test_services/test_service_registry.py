@@ -0,0 +1,53 @@
+"""Tests de LazyService: la instancia real se construye solo al usar el servicio."""
+
+import inspect
+
+import pytest
+
+from manager.app.services import service_registry
+from manager.app.services.service_registry import LazyService
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+
+@pytest.fixture
+def built():
+    """Cantidad de construcciones del servicio de prueba."""
+    return []
+
+
+@pytest.fixture
+def proxy(built):
+    """LazyService de prueba; se quita del registro al terminar."""
+
+    def factory():
+        built.append(1)
+        return Counter()
+
+    yield LazyService("test_counter", factory)
+    service_registry._registry.pop("test_counter", None)
+
+
+class TestLazyService:
+
+    def test_issubclass_does_not_build_instance(self, proxy, built):
+        with pytest.raises(TypeError):
+            issubclass(proxy, object)
+        assert not proxy.is_initialized
+        assert built == []
+
+    def test_introspection_does_not_build_instance(self, proxy, built):
+        assert not hasattr(proxy, "__bases__")
+        assert not hasattr(proxy, "__wrapped__")
+        inspect.isclass(proxy)
+        inspect.unwrap(proxy)
+        assert built == []
+
+    def test_attribute_access_builds_instance_once(self, proxy, built):
+        proxy.value = 3
+        assert proxy.value == 3
+        assert proxy.is_initialized
+        assert built == [1]
@@ -0,0 +1,101 @@
+"""Tests de transaction(): confirmación y deshacer con recarga de índices y acumulados."""
+
+import pytest
+
+from manager.app import services
+from manager.app.services import accounting_service as accounting_module
+from manager.app.services import payment_service as payment_module
+from manager.app.services import tenant_service as tenant_module
+from manager.app.services.accounting_service import AccountingService
+from manager.app.services.payment_service import PaymentService
+from manager.app.services.tenant_service import TenantService
+
+
+@pytest.fixture
+def data(tmp_path, monkeypatch, replace_service):
+    """Contabilidad, pagos e inquilinos con sus archivos en tmp_path."""
+    monkeypatch.setattr(AccountingService, "DATA_FILE", tmp_path / "accounting.json")
+    monkeypatch.setattr(PaymentService, "DATA_FILE", tmp_path / "payments.json")
+    monkeypatch.setattr(tenant_module, "DATA_DIR", tmp_path)
+    return {
+        "accounting": replace_service(accounting_module.accounting_service, AccountingService()),
+        "payments": replace_service(payment_module.payment_service, PaymentService()),
+        "tenants": replace_service(tenant_module.tenant_service, TenantService()),
+        "dir": tmp_path,
+    }
+
+
+def manual_entry(fecha="10/03/2025", monto=500.0):
+    return {"tipo": "manual", "fecha": fecha, "direccion": "entrada", "tipo_ajuste": "ajuste", "monto": monto}
+
+
+def payment(tenant_id=1, fecha="05/03/2025", monto=1000.0):
+    return {"id_inquilino": tenant_id, "nombre_inquilino": "Inquilino", "fecha_pago": fecha, "monto": monto}
+
+
+class TestRollback:
+
+    def test_accounting_entries_and_rollup_are_reloaded(self, data):
+        accounting = data["accounting"]
+        accounting.add_entry(manual_entry(monto=500))
+
+        with pytest.raises(RuntimeError):
+            with services.transaction():
+                accounting.add_entry(manual_entry(monto=200))
+                assert len(accounting.get_all_entries()) == 2
+                raise RuntimeError("cancelado")
+
+        # Recargado al deshacer, no recién en el próximo acceso
+        assert [e["monto"] for e in accounting._data["manual"]] == [500]
+        assert accounting._rollup.totals() == (500, 1)
+        assert [e["monto"] for e in accounting.get_all_entries()] == [500]
+        assert accounting.monthly_rollup().totals("2025-03", "2025-03") == (500, 1)
+        assert accounting.monthly_rollup().group_by("direccion") == {"entrada": (500, 1)}
+
+    def test_payment_indexes_and_rollup_are_reloaded(self, data):
+        payments = data["payments"]
+        payments.add_payment(payment(tenant_id=1, monto=1000))
+
+        with pytest.raises(RuntimeError):
+            with services.transaction():
+                created = payments.add_payment(payment(tenant_id=2, fecha="06/03/2025", monto=700))
+                raise RuntimeError("cancelado")
+
+        assert payments.get_payment_by_id(created["id"]) is None
+        assert payments.get_payments_by_tenant(2) == []
+        assert [p["monto"] for p in payments.get_payments_by_month(2025, 3)] == [1000]
+        assert payments.monthly_rollup().totals("2025-03", "2025-03") == (1000, 1)
+
+    def test_changes_in_several_services_are_discarded(self, data):
+        accounting, payments = data["accounting"], data["payments"]
+
+        with pytest.raises(RuntimeError):
+            with services.transaction():
+                payments.add_payment(payment())
+                accounting.add_entry(manual_entry())
+                raise RuntimeError("cancelado")
+
+        assert payments.get_all_payments() == []
+        assert accounting._data["manual"] == []
+        assert accounting._rollup.totals() == (0, 0)
+        assert accounting.get_all_entries() == []
+        assert payments.monthly_rollup().totals() == (0, 0)
+        assert accounting.monthly_rollup().totals() == (0, 0)
+        assert PaymentService().get_all_payments() == []
+
+
+class TestCommit:
+
+    def test_changes_are_written_on_exit(self, data):
+        accounting, payments = data["accounting"], data["payments"]
+
+        with services.transaction():
+            payments.add_payment(payment())
+            accounting.add_entry(manual_entry())
+            assert PaymentService().get_all_payments() == []
+
+        reloaded_payments = PaymentService()
+        reloaded_accounting = AccountingService()
+        assert len(reloaded_payments.get_payments_by_tenant(1)) == 1
+        assert len(reloaded_accounting.get_all_entries()) == 1
+        assert reloaded_accounting.monthly_rollup().totals() == (500, 1)
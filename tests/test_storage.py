@@ -0,0 +1,205 @@
+"""Tests de los almacenes: bitácora de JournaledJsonRecordStore (recorte de línea incompleta, bitácora vieja, compactación) y SqliteRecordStore."""
+
+import json
+import os
+
+import pytest
+
+from manager.app import storage
+from manager.app.storage import JournaledJsonRecordStore
+
+
+def record(record_id, **fields):
+    return {"id": record_id, "nombre": f"Registro {record_id}", **fields}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JournaledJsonRecordStore("test", tmp_path / "records.json", compact_bytes=1 << 30)
+    assert store.save([record(1)])
+    return store
+
+
+def journal_lines(store):
+    return [json.loads(line) for line in store.journal_path.read_bytes().splitlines()]
+
+
+class TestJournal:
+
+    def test_appends_are_replayed_over_the_snapshot(self, store):
+        records = [record(1), record(2)]
+        store.save(records, upserted=[records[1]])
+        records[0] = record(1, nombre="Editado")
+        store.save(records, upserted=[records[0]])
+        store.save(records[:1], deleted=[2])
+
+        assert store.load() == [record(1, nombre="Editado")]
+        assert json.loads(store.json_path.read_text(encoding="utf-8")) == [record(1)]
+        assert [e["op"] for e in journal_lines(store)] == ["base", "upsert", "upsert", "delete"]
+
+    def test_torn_tail_line_is_discarded_and_truncated(self, store):
+        store.save([record(1), record(2)], upserted=[record(2)])
+        intact_size = store.journal_path.stat().st_size
+        with open(store.journal_path, "ab") as f:
+            f.write(b'{"op": "upsert", "id": 3, "fields": {"id": 3, "nom')
+
+        assert store.load() == [record(1), record(2)]
+        assert store.journal_path.stat().st_size == intact_size
+        # La siguiente escritura empieza en una línea nueva y se lee completa
+        store.save([record(1), record(2), record(4)], upserted=[record(4)])
+        assert store.load() == [record(1), record(2), record(4)]
+
+    def test_journal_of_another_snapshot_is_discarded(self, store):
+        store.save([record(1), record(2)], upserted=[record(2)])
+        # El JSON se reemplaza por fuera (p. ej. restauración de un backup)
+        with open(store.json_path, "w", encoding="utf-8") as f:
+            json.dump([record(7), record(8)], f)
+
+        assert store.load() == [record(7), record(8)]
+        assert not store.journal_path.exists()
+        store.save([record(7), record(8), record(9)], upserted=[record(9)])
+        assert store.load() == [record(7), record(8), record(9)]
+
+    def test_full_save_drops_the_journal(self, store):
+        store.save([record(1), record(2)], upserted=[record(2)])
+        assert store.save([record(5)])
+
+        assert not store.journal_path.exists()
+        assert store.load() == [record(5)]
+
+
+class TestCompaction:
+
+    def test_compact_writes_snapshot_and_removes_journal(self, store):
+        records = [record(i) for i in range(1, 6)]
+        store.save(records, upserted=records[1:])
+
+        assert store.compact()
+        assert json.loads(store.json_path.read_text(encoding="utf-8")) == records
+        assert not store.journal_path.exists()
+        assert not store.compacting_path.exists()
+        assert store.load() == records
+
+    def test_append_during_compaction_is_rebased(self, store, monkeypatch):
+        store.save([record(1), record(2)], upserted=[record(2)])
+        save_json_atomic = storage.save_json_atomic
+
+        def save_with_concurrent_append(path, data, **kwargs):
+            if str(path).endswith(".compact"):
+                # Mientras se escribe el snapshot nuevo llega otra alta (fuera del candado)
+                assert store.save([record(1), record(2), record(3)], upserted=[record(3)])
+            return save_json_atomic(path, data, **kwargs)
+
+        monkeypatch.setattr(storage, "save_json_atomic", save_with_concurrent_append)
+        assert store._compact()
+
+        assert json.loads(store.json_path.read_text(encoding="utf-8")) == [record(1), record(2)]
+        lines = journal_lines(store)
+        assert lines[0]["op"] == "base" and len(lines[0]["snapshots"]) == 2
+        assert [(e["op"], e["id"]) for e in lines[1:]] == [("upsert", 3)]
+        assert not store.compacting_path.exists()
+        assert store.load() == [record(1), record(2), record(3)]
+        # Otra instancia (otro proceso) ve lo mismo
+        other = JournaledJsonRecordStore("test", store.json_path, compact_bytes=1 << 30)
+        assert other.load() == [record(1), record(2), record(3)]
+
+        monkeypatch.setattr(storage, "save_json_atomic", save_json_atomic)
+        assert store.compact()
+        assert json.loads(store.json_path.read_text(encoding="utf-8")) == [record(1), record(2), record(3)]
+        assert not store.journal_path.exists()
+
+    def test_full_save_during_compaction_wins(self, store, monkeypatch):
+        store.save([record(1), record(2)], upserted=[record(2)])
+        save_json_atomic = storage.save_json_atomic
+
+        def save_with_concurrent_full_save(path, data, **kwargs):
+            if str(path).endswith(".compact"):
+                monkeypatch.setattr(storage, "save_json_atomic", save_json_atomic)
+                assert store.save([record(9)])
+            return save_json_atomic(path, data, **kwargs)
+
+        monkeypatch.setattr(storage, "save_json_atomic", save_with_concurrent_full_save)
+        assert not store._compact()
+
+        assert store.load() == [record(9)]
+        assert not os.path.exists(str(store.json_path) + ".compact")
+
+    def test_interrupted_compaction_is_applied_on_load(self, store):
+        store.save([record(1), record(2)], upserted=[record(2)])
+        # El proceso murió tras rotar la bitácora y antes de escribir el snapshot
+        os.replace(store.journal_path, store.compacting_path)
+        store.save([record(1), record(2), record(3)], upserted=[record(3)])
+
+        assert store.load() == [record(1), record(2), record(3)]
+        assert store.compact()
+        assert store.load() == [record(1), record(2), record(3)]
+        assert not store.compacting_path.exists()
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    """Almacén SQLite con su propia base en tmp_path; la conexión se cierra al terminar."""
+    db_path = tmp_path / "test.db"
+    yield storage.SqliteRecordStore("test", tmp_path / "records.json", index_fields=("fecha", "categoria"),
+                                    db_path=db_path)
+    storage.SqliteRecordStore._connections.pop(str(db_path)).close()
+
+
+def ids(records):
+    return [r["id"] for r in records]
+
+
+class TestSqliteRecordStore:
+
+    def test_round_trip_keeps_records_and_order(self, sqlite_store):
+        records = [record(3, fecha="2025-03-01", extra={"a": [1, 2]}), record(1, fecha=None), record(2)]
+        assert sqlite_store.save(records)
+
+        assert sqlite_store.load() == records
+
+    def test_upsert_updates_in_place_and_appends_new_records(self, sqlite_store):
+        records = [record(1), record(2)]
+        sqlite_store.save(records)
+        sqlite_store.save(records, upserted=[record(1, nombre="Editado"), record(5)])
+
+        assert sqlite_store.load() == [record(1, nombre="Editado"), record(2), record(5)]
+
+    def test_delete(self, sqlite_store):
+        sqlite_store.save([record(1), record(2), record(3)])
+        sqlite_store.save([], deleted=[2, 99])
+
+        assert ids(sqlite_store.load()) == [1, 3]
+
+    def test_full_save_replaces_table_and_order(self, sqlite_store):
+        sqlite_store.save([record(1), record(2), record(3)])
+        sqlite_store.save([record(3), record(1)])
+
+        assert ids(sqlite_store.load()) == [3, 1]
+
+    def test_queries_follow_record_order(self, sqlite_store):
+        sqlite_store.save([record(4, fecha="2025-03-09", categoria="agua"),
+                           record(2, fecha="2025-02-28", categoria="agua"),
+                           record(3, fecha="2025-03-01", categoria="luz"),
+                           record(1, fecha="2025-03-15", categoria="agua")])
+
+        assert ids(sqlite_store.select_prefix("fecha", "2025-03")) == [4, 3, 1]
+        assert ids(sqlite_store.select_prefix("fecha", "2025-03", categoria="agua")) == [4, 1]
+        assert ids(sqlite_store.select(categoria="agua", nombre="Registro 2")) == [2]
+        assert ids(sqlite_store.select_prefix("nombre", "Registro 3")) == [3]
+
+    def test_reopened_store_reads_the_same_table(self, sqlite_store):
+        sqlite_store.save([record(1), record(2)])
+        reopened = storage.SqliteRecordStore("test", sqlite_store.json_path, index_fields=("fecha", "categoria"),
+                                             db_path=sqlite_store.db_path)
+
+        assert reopened.load() == [record(1), record(2)]
+
+    def test_default_database_follows_the_data_directory(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "otra" / "base.db"
+        monkeypatch.setattr(storage, "SQLITE_DB_FILE", db_path)
+        store = storage.SqliteRecordStore("test", tmp_path / "records.json")
+        try:
+            assert store.db_path == db_path
+            assert db_path.exists()
+        finally:
+            storage.SqliteRecordStore._connections.pop(str(db_path)).close()
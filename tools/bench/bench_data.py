@@ -0,0 +1,98 @@
+"""
+Datos sintéticos y rutas aisladas para los benchmarks de tools/bench.
+
+Importar este módulo agrega el padre de la carpeta del proyecto a sys.path (el paquete
+es manager). use_data_dir() apunta los servicios a una carpeta temporal antes de que
+se construyan, así los benchmarks no leen ni escriben data/.
+"""
+
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from manager.app.services.date_keys import (  # noqa: E402
+    PAYMENT_DATE_FIELDS, TENANT_DATE_FIELDS, stamp_date_keys
+)
+
+SURNAMES = ("Pérez", "Gómez", "Rojas", "Díaz", "Muñoz", "Ramírez")
+STATUSES = ("al_dia", "moroso", "pendiente_pago", "inactivo")
+METHODS = ("Efectivo", "Transferencia", "Consignación")
+
+
+def make_dataset(tenants: int, payments_per_tenant: int, seed: int = 9) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Edificio, apartamentos, inquilinos (uno por apartamento) y pagos mensuales desde la
+    fecha de ingreso, con las claves de fecha ya calculadas como al guardar.
+    """
+    rng = random.Random(seed)
+    apartments, tenant_list, payments = [], [], []
+    for i in range(1, tenants + 1):
+        apartments.append({"id": i, "building_id": 1, "number": str(100 + i),
+                           "unit_type": "Apartamento Estándar", "status": "Ocupado"})
+        ingreso = datetime(2020, 1, 1) + timedelta(days=rng.randint(0, 1500))
+        tenant = {"id": i, "nombre": f"Inquilino {i} {rng.choice(SURNAMES)}",
+                  "numero_documento": str(1000000 + i), "telefono": f"300{i:07d}",
+                  "email": f"inquilino{i}@example.com", "valor_arriendo": 800000.0,
+                  "fecha_ingreso": ingreso.strftime("%d/%m/%Y"), "apartamento": i,
+                  "estado_pago": rng.choice(STATUSES)}
+        stamp_date_keys(tenant, TENANT_DATE_FIELDS)
+        tenant_list.append(tenant)
+        for k in range(payments_per_tenant):
+            payment = {"id": len(payments) + 1, "id_inquilino": i, "nombre_inquilino": tenant["nombre"],
+                       "monto": 800000.0, "metodo": rng.choice(METHODS), "observaciones": "",
+                       "fecha_pago": (ingreso + timedelta(days=30 * k)).strftime("%d/%m/%Y")}
+            stamp_date_keys(payment, PAYMENT_DATE_FIELDS)
+            payments.append(payment)
+    return {"buildings": [{"id": 1, "name": "Torre Central"}], "apartments": apartments,
+            "tenants": tenant_list, "payments": payments}
+
+
+def write_dataset(data_dir: Path, dataset: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Escribe el conjunto de make_dataset con los nombres de archivo de la aplicación."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    files = {"buildings": "building_structure.json", "apartments": "apartments.json",
+             "tenants": "tenants.json", "payments": "payments.json"}
+    for key, name in files.items():
+        with open(data_dir / name, "w", encoding="utf-8") as f:
+            json.dump(dataset[key], f, ensure_ascii=False)
+
+
+def use_data_dir(data_dir: Path) -> None:
+    """Apunta los servicios (backend JSON) a data_dir; llamar antes de usarlos."""
+    from manager.app import storage
+    from manager.app.reporting import receipt_batch
+    from manager.app.services import (
+        accounting_service, apartment_service, building_service, email_outbox, expense_service,
+        notification_service, payment_service, receipt_store, tenant_service
+    )
+
+    storage.get_backend_name = lambda: storage.BACKEND_JSON
+    storage.journal_enabled = lambda: True
+    tenant_service.DATA_DIR = data_dir
+    apartment_service.APARTMENTS_FILE = str(data_dir / "apartments.json")
+    building_service.BUILDING_STRUCTURE_FILE = str(data_dir / "building_structure.json")
+    payment_service.PaymentService.DATA_FILE = data_dir / "payments.json"
+    expense_service.ExpenseService.DATA_FILE = data_dir / "gastos.json"
+    accounting_service.AccountingService.DATA_FILE = data_dir / "accounting.json"
+    notification_service.NotificationService.DATA_FILE = data_dir / "notifications.json"
+    email_outbox.EmailOutbox.DATA_FILE = data_dir / "email_outbox.json"
+    receipt_store.ReceiptStore.DATA_FILE = data_dir / "receipts.json"
+    documents = data_dir / "documentos_inquilinos"
+    receipt_store.DOCUMENTOS_INQUILINOS_DIR = documents
+    receipt_batch.DOCUMENTOS_INQUILINOS_DIR = documents
+
+
+def make_logo(path: Path, width: int, height: int) -> str:
+    """PNG de prueba (degradado con transparencia) de width x height px; devuelve la ruta."""
+    from PIL import Image
+
+    image = Image.new("RGBA", (width, height))
+    image.putdata([(x * 255 // width, y * 255 // height, 128, 255 if (x + y) % 7 else 0)
+                   for y in range(height) for x in range(width)])
+    image.save(path)
+    return str(path)
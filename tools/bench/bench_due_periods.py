@@ -0,0 +1,58 @@
+"""
+Micro-benchmark del conteo de períodos vencidos (mora integral).
+
+Compara _count_due_periods (tiempo constante) con el conteo mes a mes con relativedelta
+que usaba antes _get_arrears_info, y mide compute_arrears_info completo por inquilino,
+para antigüedades de 1, 10 y 30 años.
+
+Uso (desde la carpeta del proyecto):
+    python tools/bench/bench_due_periods.py [--repeat 2000]
+"""
+
+import argparse
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from dateutil.relativedelta import relativedelta  # noqa: E402
+
+from manager.app.services.tenant_service import _count_due_periods, compute_arrears_info  # noqa: E402
+
+HOY = datetime(2025, 6, 15)
+
+
+def count_due_periods_loop(fecha_ingreso: datetime, hoy: datetime) -> int:
+    """Conteo anterior: un relativedelta por mes desde fecha_ingreso hasta hoy."""
+    n = 0
+    while fecha_ingreso + relativedelta(months=n) <= hoy:
+        n += 1
+    return n
+
+
+def per_call_us(func, repeat: int) -> float:
+    """Mejor de 5 mediciones, en microsegundos por llamada."""
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=2000, help="llamadas por medición")
+    args = parser.parse_args()
+
+    print(f"{'antigüedad':>10}  {'bucle relativedelta':>20}  {'_count_due_periods':>19}  {'compute_arrears_info':>21}")
+    for years in (1, 10, 30):
+        fecha_ingreso = datetime(HOY.year - years, 1, 31)
+        tenant = {"fecha_ingreso": fecha_ingreso.strftime("%d/%m/%Y"), "valor_arriendo": 1000}
+        payments = [{"monto": 1000}] * (years * 12)
+        assert _count_due_periods(fecha_ingreso, HOY) == count_due_periods_loop(fecha_ingreso, HOY)
+        loop_us = per_call_us(lambda: count_due_periods_loop(fecha_ingreso, HOY), max(args.repeat // 10, 1))
+        closed_us = per_call_us(lambda: _count_due_periods(fecha_ingreso, HOY), args.repeat)
+        arrears_us = per_call_us(lambda: compute_arrears_info(tenant, payments, HOY), args.repeat)
+        print(f"{years:>7} años  {loop_us:>17.1f} us  {closed_us:>16.1f} us  {arrears_us:>18.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Recibos por segundo: generación uno a uno en el hilo que llama frente al lote en un pool
+de procesos (reporting.receipt_batch.generate_documents) con 1, 2 y 4 procesos.
+
+Los recibos de --receipts pagos sintéticos se escriben en una carpeta temporal, con un
+logo PNG de prueba (o el indicado con --logo). En una máquina de un solo núcleo los
+procesos extra no pueden escalar.
+
+Uso (desde la carpeta del proyecto):
+    python tools/bench/bench_receipt_batch.py [--receipts 600] [--workers 1 2 4] [--logo ruta.png]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import bench_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--receipts", type=int, default=600)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--logo", help="logo PNG/JPG (por defecto, uno de prueba de 120x100 px)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        bench_data.use_data_dir(data_dir)
+        from manager.app.receipt_pdf import generate_payment_receipt_pdf
+        from manager.app.reporting import receipt_batch
+        from manager.app.reporting.snapshot import ReportSnapshot
+
+        logo = args.logo or bench_data.make_logo(data_dir / "logo.png", 120, 100)
+        data = bench_data.make_dataset(max(-(-args.receipts // 12), 1), 12)
+        snapshot = ReportSnapshot(data["payments"], data["tenants"], data["apartments"])
+        tasks, _, _ = receipt_batch.build_receipt_tasks(snapshot, snapshot.payments[:args.receipts])
+        total = len(tasks)
+        print(f"{total} recibos, logo {logo}, {os.cpu_count()} CPU")
+
+        start = time.perf_counter()
+        for task in tasks:
+            Path(task["path"]).parent.mkdir(parents=True, exist_ok=True)
+            generate_payment_receipt_pdf(task["payment"], task["tenant"], task["path"], logo_path=logo,
+                                         apartment=task["apartment"])
+        elapsed = time.perf_counter() - start
+        print(f"uno a uno (hilo que llama): {total / elapsed:7.1f} recibos/s")
+
+        for workers in args.workers:
+            summary = receipt_batch.generate_documents(tasks, workers=workers, logo_path=logo)
+            rate = summary["generated"] / summary["elapsed"]
+            print(f"lote, {workers} proceso(s):      {rate:7.1f} recibos/s  "
+                  f"({summary['generated']} generados, {len(summary['failed'])} fallidos)")
+
+
+if __name__ == "__main__":
+    main()
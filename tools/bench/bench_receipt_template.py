@@ -0,0 +1,99 @@
+"""
+Tiempo y tamaño de un recibo PDF con la plantilla del proceso (receipt_pdf.ReceiptTemplate:
+logo ya codificado y marco como form comprimido) frente a dibujarlo todo en cada recibo
+(logo decodificado con canvas.drawImage y marco dibujado de nuevo).
+
+Se mide sin logo y con logos PNG de prueba de 120x100 y 600x500 px (o el de --logo),
+generando --receipts recibos en una carpeta temporal tras unos recibos de calentamiento.
+
+Uso (desde la carpeta del proyecto):
+    python tools/bench/bench_receipt_template.py [--receipts 200] [--logo ruta.png]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import bench_data
+
+PAYMENT = {"id": 1, "nombre_inquilino": "Ana Pérez", "fecha_pago": "05/03/2025", "monto": 1500000,
+           "metodo": "Transferencia", "observaciones": "Marzo"}
+TENANT = {"id": 1, "nombre": "Ana Pérez", "apartamento": "3", "numero_documento": "123"}
+WARMUP = 5
+
+
+class UncachedTemplate:
+    """Lo que hacía cada recibo antes de la plantilla: decodificar el logo y dibujar el marco."""
+
+    def __init__(self, logo_path):
+        from reportlab.lib.pagesizes import letter
+        self.pagesize = letter
+        self.logo_path = logo_path
+        self.has_logo = bool(logo_path)
+
+    def draw_frame(self, c):
+        from manager.app import receipt_pdf
+        receipt_pdf._draw_receipt_frame(c, *c._pagesize, self.has_logo)
+
+    def draw_logo(self, c, x, y, w, h):
+        from manager.app import receipt_pdf
+        logo = receipt_pdf.load_logo(self.logo_path)
+        if logo is None:
+            return False
+        c.drawImage(logo, x, y, width=w, height=h, mask="auto")
+        return True
+
+
+def measure(out_dir: Path, logo, receipts: int):
+    """(ms por recibo, bytes del PDF) generando receipts recibos con logo."""
+    from manager.app.receipt_pdf import generate_payment_receipt_pdf
+    path = str(out_dir / "recibo.pdf")
+    for _ in range(WARMUP):
+        generate_payment_receipt_pdf(PAYMENT, TENANT, path, logo_path=logo, apartment="301")
+    start = time.perf_counter()
+    for _ in range(receipts):
+        generate_payment_receipt_pdf(PAYMENT, TENANT, path, logo_path=logo, apartment="301")
+    elapsed = time.perf_counter() - start
+    return elapsed / receipts * 1000, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--receipts", type=int, default=200)
+    parser.add_argument("--logo", help="medir también con este logo PNG/JPG")
+    args = parser.parse_args()
+
+    from manager.app import receipt_pdf
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        logos = [("sin logo", "")]
+        for width, height in ((120, 100), (600, 500)):
+            path = bench_data.make_logo(out_dir / f"logo_{width}x{height}.png", width, height)
+            logos.append((f"logo {width}x{height}", path))
+        if args.logo:
+            logos.append((Path(args.logo).name, args.logo))
+
+        print(f"{args.receipts} recibos por caso")
+        print(f"{'caso':<18}{'plantilla':>22}{'sin plantilla':>26}")
+        for label, logo in logos:
+            start = time.perf_counter()
+            receipt_pdf._templates.clear()
+            receipt_pdf.receipt_template(logo)
+            build_ms = (time.perf_counter() - start) * 1000
+            cached_ms, cached_size = measure(out_dir, logo, args.receipts)
+
+            original = receipt_pdf.receipt_template
+            receipt_pdf.receipt_template = UncachedTemplate
+            try:
+                plain_ms, plain_size = measure(out_dir, logo, args.receipts)
+            finally:
+                receipt_pdf.receipt_template = original
+            print(f"{label:<18}{cached_ms:7.2f} ms {cached_size:8d} B"
+                  f"{plain_ms:11.2f} ms {plain_size:8d} B   (preparar plantilla: {build_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
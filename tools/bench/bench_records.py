@@ -0,0 +1,87 @@
+"""
+Memoria y velocidad de los registros tipados (services.records) frente a copiar dicts.
+
+Con --payments pagos sintéticos (y un inquilino cada 12 pagos) mide:
+- memoria de una copia de los dicts (lo que hacía cada instantánea) y de los registros;
+- memoria de los pagos cargados desde JSON, sin y con intern_fields;
+- tiempo de copia, primera construcción de registros, RecordCache sin cambios, con una
+  versión nueva sin ediciones y tras editar un pago;
+- lectura de montos: dict.get, registro.get (Mapping) y atributo.
+
+Uso (desde la carpeta del proyecto):
+    python tools/bench/bench_records.py [--payments 200000]
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import bench_data
+
+from manager.app.services.records import PaymentRecord, RecordCache, intern_fields
+
+
+def traced(build):
+    """(resultado, MB retenidos) de build()."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, current / 1e6
+
+
+def load_interned(text: str):
+    """Pagos cargados como al abrir el archivo (los servicios internan al cargar)."""
+    loaded = json.loads(text)
+    intern_fields(loaded)
+    return loaded
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--payments", type=int, default=200000)
+    args = parser.parse_args()
+
+    data = bench_data.make_dataset(max(-(-args.payments // 12), 1), 12)
+    payments = data["payments"][:args.payments]
+    print(f"{len(payments)} pagos")
+
+    _, dict_mb = traced(lambda: [dict(p) for p in payments])
+    records, record_mb = traced(lambda: [PaymentRecord.from_dict(p) for p in payments])
+    print(f"memoria: copia de dicts {dict_mb:.1f} MB, registros {record_mb:.1f} MB")
+
+    text = json.dumps(payments, ensure_ascii=False)
+    _, loaded_mb = traced(lambda: json.loads(text))
+    _, interned_mb = traced(lambda: load_interned(text))
+    print(f"memoria cargada desde JSON: {loaded_mb:.1f} MB, con intern_fields {interned_mb:.1f} MB")
+
+    cache = RecordCache(PaymentRecord)
+    first = timed(lambda: cache.records(payments, 1))
+    same = timed(lambda: cache.records(payments, 1))
+    unchanged = timed(lambda: cache.records(payments, 2))
+    payments[len(payments) // 2]["monto"] = 900000.0
+    cache.invalidate([payments[len(payments) // 2]])
+    edited = timed(lambda: cache.records(payments, 3))
+    copy = timed(lambda: [dict(p) for p in payments])
+    print(f"instantánea: copia de dicts {copy:.3f}s, registros primera vez {first:.3f}s, "
+          f"misma versión {same * 1e6:.0f}us, versión nueva sin cambios {unchanged:.3f}s, "
+          f"tras editar un pago {edited:.3f}s")
+
+    dict_get = timed(lambda: sum(float(p.get("monto", 0)) for p in payments))
+    record_get = timed(lambda: sum(float(r.get("monto", 0)) for r in records))
+    attribute = timed(lambda: sum(r.monto for r in records))
+    print(f"suma de montos: dict.get {dict_get:.3f}s, registro.get {record_get:.3f}s, "
+          f"registro.monto {attribute:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
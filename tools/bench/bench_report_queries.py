@@ -0,0 +1,54 @@
+"""
+Escalamiento de la capa de consultas de reportes (reporting.queries) y de los reportes
+que la usan, sobre una ReportSnapshot en memoria con --payments pagos por inquilino.
+
+Cada medición usa una instantánea nueva (sin agrupaciones en caché): join de pagos con
+inquilino y apartamento, totales por inquilino, eficiencia de cobranza, pagos por
+apartamento del año y pagos pendientes.
+
+Uso (desde la carpeta del proyecto):
+    python tools/bench/bench_report_queries.py [--tenants 1000 5000 10000] [--payments 50]
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+import bench_data
+
+from manager.app.reporting import payment_reports, queries
+from manager.app.reporting.snapshot import ReportSnapshot
+
+NOW = datetime(2025, 12, 31)
+YEAR = {"type": "specific_year", "year": 2025}
+
+CASES = (
+    ("join", lambda s: sum(1 for _ in queries.payments_with_apartment(s))),
+    ("totales", queries.payment_totals_by_tenant),
+    ("eficiencia", payment_reports.build_collection_efficiency_report),
+    ("por apto.", lambda s: payment_reports.build_apartment_payments_report(s, YEAR)),
+    ("pendientes", payment_reports.build_pending_payments_report),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--payments", type=int, default=50, help="pagos por inquilino")
+    args = parser.parse_args()
+
+    print(f"{'inquilinos x pagos':>20}  " + "  ".join(f"{name:>10}" for name, _ in CASES))
+    for tenants in args.tenants:
+        data = bench_data.make_dataset(tenants, args.payments)
+        timings = []
+        for _, case in CASES:
+            snapshot = ReportSnapshot(data["payments"], data["tenants"], data["apartments"], now=NOW)
+            start = time.perf_counter()
+            case(snapshot)
+            timings.append(time.perf_counter() - start)
+        label = f"{tenants} x {len(data['payments'])}"
+        print(f"{label:>20}  " + "  ".join(f"{t:>9.3f}s" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
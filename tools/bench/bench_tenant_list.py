@@ -0,0 +1,120 @@
+"""
+Trabajo por pulsación de la lista de inquilinos (TenantsView), sin widgets.
+
+Mide, con datos sintéticos de --payments pagos por inquilino:
+- la recarga: mora de todos los inquilinos con get_arrears_info_bulk (_refresh_row_data);
+- cada pulsación de búsqueda: filtro del presentador, elementos de la lista virtual y
+  textos de las filas visibles (_get_row_data), con la caché de filas vacía. La primera
+  búsqueda construye el índice de texto y se informa aparte.
+Con --frames (requiere pantalla) mide además el tiempo de cuadro de la vista real: desde
+aplicar el filtro hasta que Tk termina de dibujar (update()).
+
+Uso (desde la carpeta del proyecto):
+    python tools/bench/bench_tenant_list.py [--tenants 100 1000 10000] [--payments 12] [--frames]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import bench_data
+
+QUERIES = ("I", "In", "Inq", "Inqu", "Inquilino 1", "Pé", "Gó", "3001", "")
+VIEWPORT_HEIGHT = 700
+
+
+def measure_frames(all_tenants_count: int) -> None:
+    """Tiempo de cuadro por pulsación con TenantsView en una ventana de Tk."""
+    import tkinter as tk
+
+    from manager.app.ui.views.tenants_view import TenantsView
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"        --frames: no hay pantalla disponible ({e})")
+        return
+    root.geometry("1280x800")
+    view = TenantsView(root)
+    view.pack(fill="both", expand=True)
+    root.update()
+    times = []
+    for query in QUERIES:
+        view.search_entry.delete(0, tk.END)
+        view.search_entry.insert(0, query)
+        start = time.perf_counter()
+        view._apply_filters()
+        root.update()
+        times.append((time.perf_counter() - start) * 1000)
+    root.destroy()
+    print(f"{all_tenants_count:>6} inquilinos: cuadro (filtro + dibujo) primera búsqueda {times[0]:6.1f} ms  "
+          f"mediana {statistics.median(times[1:]):6.1f} ms  máx {max(times[1:]):6.1f} ms")
+
+
+def measure(tenants: int, payments: int, frames: bool = False) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        bench_data.write_dataset(data_dir, bench_data.make_dataset(tenants, payments))
+        bench_data.use_data_dir(data_dir)
+
+        from manager.app.presenters.tenant_presenter import TenantPresenter
+        from manager.app.ui.components.virtual_list import visible_slice
+        from manager.app.ui.views import tenants_view
+
+        view = tenants_view.TenantsView.__new__(tenants_view.TenantsView)
+        view.presenter = TenantPresenter()
+        view._arrears_by_id = {}
+        view._row_cache = None
+        all_tenants = view.presenter.load_tenants()
+
+        start = time.perf_counter()
+        view._refresh_row_data()
+        refresh_ms = (time.perf_counter() - start) * 1000
+
+        times, rows = [], 0
+        for query in QUERIES:
+            view._row_cache = {}
+            start = time.perf_counter()
+            filtered = view.presenter.get_filtered_tenants(
+                all_tenants, {"search_text": query, "apartment": "Todos", "status": "Todos"})
+            items = tenants_view.build_tenant_list_items(filtered)
+            offsets, y = [], 0
+            for kind, _ in items:
+                offsets.append(y)
+                y += tenants_view.TENANT_ROW_HEIGHT if kind == "tenant" else tenants_view.GROUP_HEADER_HEIGHT
+            first, last = visible_slice(offsets, y, 0, VIEWPORT_HEIGHT)
+            for kind, data in items[first:last]:
+                if kind == "tenant":
+                    view._get_row_data(data[0])
+            times.append((time.perf_counter() - start) * 1000)
+            rows = max(rows, last - first)
+
+        first_ms, times = times[0], times[1:]
+        print(f"{len(all_tenants):>6} inquilinos: recarga (mora) {refresh_ms:7.1f} ms  "
+              f"primera búsqueda {first_ms:6.1f} ms  pulsación mediana {statistics.median(times):6.1f} ms  "
+              f"máx {max(times):6.1f} ms  filas materializadas <= {rows}")
+        if frames:
+            measure_frames(len(all_tenants))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--payments", type=int, default=12, help="pagos por inquilino")
+    parser.add_argument("--frames", action="store_true", help="medir también el dibujo en Tk")
+    args = parser.parse_args()
+    if len(args.tenants) == 1:
+        measure(args.tenants[0], args.payments, args.frames)
+        return
+    # Un proceso por tamaño: los servicios son singletons
+    for tenants in args.tenants:
+        command = [sys.executable, __file__, "--tenants", str(tenants), "--payments", str(args.payments)]
+        subprocess.run(command + (["--frames"] if args.frames else []), check=True)
+
+
+if __name__ == "__main__":
+    main()